@@ -1,8 +1,17 @@
 from mpi4py import MPI
+from petsc4py import PETSc
 import numpy as np
+from numpy.core.multiarray import normalize_axis_index
 
+from mpids.MPInumpy.buffer_pool import empty_buffer
 from mpids.MPInumpy.errors import ValueError, NotSupportedError
-from mpids.MPInumpy.utils import global_to_local_key
+from mpids.MPInumpy.futures import MPIFuture
+from mpids.MPInumpy.layout import get_layout, redistribute
+from mpids.MPInumpy.mpi_utils import all_reduce_moments
+from mpids.MPInumpy.utils import determine_local_moments, \
+                                 global_to_local_key,     \
+                                 is_block_distributed,    \
+                                 is_Replicated
 
 __all__ = ['MPIArray']
 
@@ -14,7 +23,7 @@ class MPIArray(np.ndarray):
     """ MPIArray subclass of numpy.ndarray """
 
     def __new__(cls, local_array, comm=MPI.COMM_WORLD, comm_dims=None,
-                comm_coord=None, local_to_global=None):
+                comm_coord=None, local_to_global=None, layout=None):
         """ Create MPIArray from process local array data.
 
         Parameters
@@ -37,6 +46,11 @@ class MPIArray(np.ndarray):
                 {0: (start_index, end_index),
                  1: (start_index, end_index),
                  ...}
+        layout : Layout, None
+            Precomputed layout of the distributed array, see
+            mpids.MPInumpy.layout.  When specified comm, comm_dims,
+            comm_coord, local_to_global, and all global properties are
+            derived from it.
 
         Returns
         -------
@@ -46,10 +60,11 @@ class MPIArray(np.ndarray):
             local_array = np.asarray(local_array)
 
         obj = local_array.view(cls)
-        obj.comm = comm
-        obj.comm_dims = comm_dims
-        obj.comm_coord = comm_coord
-        obj.local_to_global = local_to_global
+        obj.comm = comm if layout is None else layout.comm
+        obj._layout = layout
+        obj._comm_dims = comm_dims
+        obj._comm_coord = comm_coord
+        obj._local_to_global = local_to_global
         return obj
 
 
@@ -64,15 +79,81 @@ class MPIArray(np.ndarray):
     def __array_finalize__(self, obj):
         if obj is None: return
         self.comm = getattr(obj, 'comm', None)
-        self.comm_dims = getattr(obj, 'comm_dims', None)
-        self.comm_coord = getattr(obj, 'comm_coord', None)
-        self.local_to_global = getattr(obj, 'local_to_global', None)
+        self._layout = getattr(obj, '_layout', None)
+        self._comm_dims = getattr(obj, '_comm_dims', None)
+        self._comm_coord = getattr(obj, '_comm_coord', None)
+        self._local_to_global = getattr(obj, '_local_to_global', None)
         self._globalshape = getattr(obj, '_globalshape', None)
         self._globalsize = getattr(obj, '_globalsize', None)
         self._globalnbytes = getattr(obj, '_globalnbytes', None)
         self._globalndim = getattr(obj, '_globalndim', None)
 
 
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        """ Dispatch numpy ufuncs on the process local data of operands.
+
+            Elementwise(__call__) ufuncs are evaluated against the layout of
+            the first distributed operand:
+            - Operands sharing its layout contribute their local data as is.
+            - Replicated operands are broadcast by viewing the portion
+              matching the local data, following numpy broadcasting rules
+              on the global shapes.
+            - Distributed operands with a different layout of the same
+              global shape are redistributed with a single Alltoallv.
+            - Non MPIArray operands are assumed to be process local.
+            MPIArray outputs specified by 'out' are written in place.
+
+            All other ufunc methods(reduce, accumulate, ...) operate on
+            process local data only and return numpy results unless all
+            operands are Replicated.
+
+            Generalized ufuncs operate on core dimensions spanning
+            processes, np.matmul(and @) is dispatched to MPInumpy matmul.
+        """
+        out = kwargs.get('out', ())
+        mpi_arrays = [operand for operand in inputs + out
+                      if isinstance(operand, MPIArray)]
+        reference = _reference_operand(mpi_arrays)
+
+        if ufunc.signature is not None:
+            if ufunc is np.matmul and method == '__call__' and not kwargs:
+                #Imported here as _linalg depends on MPIArray
+                from mpids.MPInumpy._linalg import matmul
+                #Products of Replicated operands remain Replicated
+                dist = 'r' if is_Replicated(reference.dist) else 'b'
+                return matmul(*inputs, comm=reference.comm, dist=dist)
+            raise NotSupportedError(
+                '{}.{} not supported for MPIArrays'.format(ufunc.__name__,
+                                                           method))
+
+        if method != '__call__' or \
+            any(not _has_consistent_layout(operand) for operand in mpi_arrays):
+            #Process local operation, i.e. views of local data
+            local_inputs = tuple(_unwrap(operand) for operand in inputs)
+            if out:
+                kwargs['out'] = tuple(_unwrap(operand) for operand in out)
+            results = getattr(ufunc, method)(*local_inputs, **kwargs)
+            if out:
+                return out[0] if len(out) == 1 else out
+            if results is None or not is_Replicated(reference.dist) or \
+                any(not is_Replicated(operand.dist) for operand in mpi_arrays):
+                return results
+            return _wrap_results(results, reference)
+
+        local_inputs = tuple(_local_operand(operand, reference)
+                             for operand in inputs)
+        if out:
+            kwargs['out'] = tuple(_local_output(operand, reference)
+                                  for operand in out)
+        if isinstance(kwargs.get('where'), MPIArray):
+            kwargs['where'] = _local_operand(kwargs['where'], reference)
+
+        results = ufunc(*local_inputs, **kwargs)
+        if out:
+            return out[0] if len(out) == 1 else out
+        return _wrap_results(results, reference)
+
+
     def __iter__(self):
         return self.base.__iter__()
 
@@ -101,6 +182,56 @@ class MPIArray(np.ndarray):
 
 
     #Unique properties to MPIArray
+    @property
+    def layout(self):
+        """ Immutable layout of distributed array, None if unknown.
+
+        Returns
+        -------
+        layout : Layout, None
+        """
+        return self._layout
+
+
+    @property
+    def comm_dims(self):
+        """ Dimensions of processes in cartesian grid.
+
+        Returns
+        -------
+        comm_dims : list, None
+        """
+        if self._layout is not None:
+            return self._layout.comm_dims
+        return self._comm_dims
+
+
+    @property
+    def comm_coord(self):
+        """ Rank/Process cartesian coordinate in communicator process grid.
+
+        Returns
+        -------
+        comm_coord : list, None
+        """
+        if self._layout is not None:
+            return self._layout.comm_coord
+        return self._comm_coord
+
+
+    @property
+    def local_to_global(self):
+        """ Global index start/end of local data by axis.
+
+        Returns
+        -------
+        local_to_global : dict, None
+        """
+        if self._layout is not None:
+            return self._layout.local_to_global
+        return self._local_to_global
+
+
     @property
     def dist(self):
         """ Specified distribution of data among processes.
@@ -111,6 +242,8 @@ class MPIArray(np.ndarray):
             Default value 'b' : Block
             Supported types:
                 'b' : Block
+                'bb' : Block-Block
+                'bc' : Block-Cyclic
                 'r' : Replicated
         """
         raise NotImplementedError("Define a distribution")
@@ -171,6 +304,17 @@ class MPIArray(np.ndarray):
         return self.base
 
 
+    @property
+    def T(self):
+        """ Transposed distributed array, see mpids.MPInumpy.transpose.
+
+        Returns
+        -------
+        MPIArray : numpy.ndarray sub class
+        """
+        return self.transpose()
+
+
     #Custom reduction method implementations
     def max(self, **kwargs):
         """ Max of array elements in distributed matrix over a
@@ -183,6 +327,11 @@ class MPIArray(np.ndarray):
         dtype : dtype, optional
             Specified data type of returned array and of the
             accumulator in which the elements are summed.
+        keep_distributed : bool, optional
+            Default 'False' results are replicated.  If 'True' results of
+            reductions along an axis that is not partitioned among processes
+            keep the distribution of the array, aligned with its extents,
+            and are computed without any communication.
 
         Returns
         -------
@@ -204,6 +353,11 @@ class MPIArray(np.ndarray):
         dtype : dtype, optional
             Specified data type of returned array and of the
             accumulator in which the elements are summed.
+        keep_distributed : bool, optional
+            Default 'False' results are replicated.  If 'True' results of
+            reductions along an axis that is not partitioned among processes
+            keep the distribution of the array, aligned with its extents,
+            and are computed without any communication.
 
         Returns
         -------
@@ -225,6 +379,11 @@ class MPIArray(np.ndarray):
         dtype : dtype, optional
             Specified data type of returned array and of the
             accumulator in which the elements are summed.
+        keep_distributed : bool, optional
+            Default 'False' results are replicated.  If 'True' results of
+            reductions along an axis that is not partitioned among processes
+            keep the distribution of the array, aligned with its extents,
+            and are computed without any communication.
 
         Returns
         -------
@@ -246,6 +405,11 @@ class MPIArray(np.ndarray):
         dtype : dtype, optional
             Specified data type of returned array and of the
             accumulator in which the elements are summed.
+        keep_distributed : bool, optional
+            Default 'False' results are replicated.  If 'True' results of
+            reductions along an axis that is not partitioned among processes
+            keep the distribution of the array, aligned with its extents,
+            and are computed without any communication.
 
         Returns
         -------
@@ -267,6 +431,11 @@ class MPIArray(np.ndarray):
         dtype : dtype, optional
             Specified data type of returned array and of the
             accumulator in which the elements are summed.
+        keep_distributed : bool, optional
+            Default 'False' results are replicated.  If 'True' results of
+            reductions along an axis that is not partitioned among processes
+            keep the distribution of the array, aligned with its extents,
+            and are computed without any communication.
 
         Returns
         -------
@@ -277,14 +446,121 @@ class MPIArray(np.ndarray):
         raise NotImplementedError("Implement a custom sum method")
 
 
+    def var(self, **kwargs):
+        """ Variance of array elements in distributed matrix over a
+        given axis.
+
+        Parameters
+        ----------
+        axis : None or int
+            Axis along which the variance is computed.
+        dtype : dtype, optional
+            Specified data type of returned array.
+        ddof : int, optional
+            Delta degrees of freedom, the divisor is the number of elements
+            minus ddof.  Default value 0.
+        keep_distributed : bool, optional
+            Default 'False' results are replicated.  If 'True' results of
+            reductions along an axis that is not partitioned among processes
+            keep the distribution of the array, aligned with its extents,
+            and are computed without any communication.
+
+        Returns
+        -------
+        MPIArray : numpy.ndarray sub class
+            MPIArray with variance values along specified axis with
+            replicated(copies on all procs) distribution.
+        """
+        raise NotImplementedError("Implement a custom var method")
+
+
+    def sum_async(self, **kwargs):
+        """ Start the sum of array elements in distributed matrix over a
+        given axis, see sum for the parameters.  Communication overlaps
+        with local computation of the caller until the result is waited
+        for.
+
+        Returns
+        -------
+        future : MPIFuture
+            Future of the MPIArray returned by sum.
+        """
+        return MPIFuture(result=self.sum(**kwargs))
+
+
     def check_reduction_parms(self, axis=None, dtype=None, out=None):
-        if axis is not None and axis > self.ndim - 1:
+        if axis is not None and not -self.ndim <= axis < self.ndim:
             raise ValueError("'axis' entry is out of bounds")
         if out is not None:
             raise NotSupportedError("'out' field not supported")
         return
 
 
+    def reduction_layout(self, axis=None, keep_distributed=False):
+        """ Layout of a distributed reduction result along axis.
+
+        Parameters
+        ----------
+        axis : None or int
+            Axis along which the reduction is performed.
+        keep_distributed : bool
+            Whether reduction results should keep the distribution of the
+            array.
+
+        Returns
+        -------
+        layout : Layout, None
+            Layout of local reduction results when they need no
+            communication, i.e. axis is not partitioned among processes,
+            None when results are replicated.
+        """
+        if not keep_distributed or axis is None:
+            return None
+        axis = normalize_axis_index(axis, self.globalndim)
+        if axis < len(self.layout.comm_dims):
+            return None
+        return self.layout.drop_axis(axis)
+
+
+    def reduce_moments(self, axis=None, keep_distributed=False):
+        """ Count, mean and sum of squared differences from the mean(M2) of
+        distributed array elements over a given axis, computed in a single
+        pass over local data and merged with a single Allreduce.
+
+        Parameters
+        ----------
+        axis : None or int
+            Axis along which the moments are computed.
+        keep_distributed : bool, optional
+            If 'True' and axis is not partitioned among processes the
+            moments of the local data are returned without communication.
+
+        Returns
+        -------
+        global_moments : numpy.ndarray
+            Float64 array with global shape with axis removed and a
+            trailing axis of length 3 holding count, mean and M2.
+        """
+        if axis is not None:
+            axis = normalize_axis_index(axis, self.globalndim)
+        local_moments = determine_local_moments(self.base, axis=axis)
+        if self.reduction_layout(axis, keep_distributed) is not None:
+            return local_moments
+        if axis is None:
+            global_moments = local_moments
+        else:
+            #Place local moments in elements held by process, others
+            ## have a count of zero and leave the reduction unchanged
+            reduced_shape = tuple(np.delete(np.asarray(self.globalshape), axis))
+            global_moments = empty_buffer(reduced_shape + (3,), np.float64)
+            global_moments.fill(0.)
+            reduced_index = list(self.layout.rank_index())
+            del reduced_index[axis]
+            global_moments[tuple(reduced_index)] = local_moments
+
+        return all_reduce_moments(global_moments, comm=self.comm)
+
+
     #General methods
     def astype(self, dtype, order='K', casting='unsafe', subok=True, copy=True):
         """ Cast to specified data type.
@@ -318,7 +594,8 @@ class MPIArray(np.ndarray):
                               comm=self.comm,
                               comm_dims=self.comm_dims,
                               comm_coord=self.comm_coord,
-                              local_to_global=self.local_to_global)
+                              local_to_global=self.local_to_global,
+                              layout=self.layout)
 
 
     def collect_data(self):
@@ -337,6 +614,112 @@ class MPIArray(np.ndarray):
             "Implement a method to collect distributed array")
 
 
+    def collect_data_async(self):
+        """ Start collecting distributed array, see collect_data.
+
+        Returns
+        -------
+        future : MPIFuture
+            Future of the Replicated(resconstructed) MPIArray.
+        """
+        return MPIFuture(result=self.collect_data())
+
+
+    def rebalance(self, layout=None, threshold=None, weights=None):
+        """ Redistribute unevenly partitioned array data, e.g. results of
+            selections or arrays created from local chunks.  Extents of all
+            ranks are known from the layout, data is moved with a single
+            all to all exchange in which every element keeps its global
+            position.
+
+        Parameters
+        ----------
+        layout : Layout, None
+            Desired layout of the array data.  If none specified the evenly
+            partitioned layout of the distribution is used, see
+            mpids.MPInumpy.layout.get_layout.
+        threshold : float, None
+            Only redistribute data if the ratio of the largest number of
+            local elements to the share of a rank(Layout.imbalance) exceeds
+            threshold.  If none specified data is always redistributed.
+        weights : array_like, None
+            Relative weights of all ranks the default layout is partitioned
+            proportional to, see mpids.MPInumpy.layout.measure_weights.  If
+            none specified the weights of the current layout are used.
+
+        Returns
+        -------
+        MPIArray : numpy.ndarray sub class
+            Distributed MPIArray with desired layout, self when no data
+            needs to be moved.
+        """
+        if is_Replicated(self.dist):
+            return self
+        if layout is None:
+            if weights is None:
+                weights = self.layout.weights
+            layout = get_layout(self.globalshape, self.dist, comm=self.comm,
+                                block_size=self.layout.block_size,
+                                weights=weights)
+        if layout.globalshape != self.globalshape or \
+           layout.dist != self.dist or layout.comm != self.comm:
+            raise ValueError('layout must describe the global shape, ' +
+                             'distribution, and communicator of the array.')
+
+        if layout == self.layout or \
+           (threshold is not None and self.layout.imbalance <= threshold):
+            return self
+        local_data = redistribute(np.asarray(self), self.layout, layout)
+        return self.__class__(local_data, layout=layout)
+
+
+    def to_petsc(self):
+        """ Wrap the local data of a distributed array as a PETSc object.
+            Ownership ranges of the PETSc object are the rows held by each
+            process.  Local data is shared with the PETSc object when it is
+            stored as PETSc expects it:
+                - 1-D arrays: contiguous data of PETSc.ScalarType.
+                - 2-D arrays: Fortran(column major) ordered data of
+                  PETSc.ScalarType, i.e. arrays created with order='F' or
+                  obtained from mpids.MPInumpy.from_petsc.
+            Other local data and non Block distributions are copied once.
+
+        Returns
+        -------
+        petsc_object : PETSc.Vec, PETSc.Mat
+            MPI Vec of 1-D arrays, dense MPI Mat of 2-D arrays.
+        """
+        if is_Replicated(self.dist):
+            raise NotSupportedError('only distributed arrays can be wrapped.')
+        if self.globalndim not in (1, 2):
+            raise NotSupportedError('only 1-D and 2-D arrays can be wrapped.')
+
+        layout = self.layout
+        local_data = np.asarray(self)
+        #PETSc objects are row partitioned
+        if not is_block_distributed(self.dist):
+            layout = get_layout(self.globalshape, 'b', comm=self.comm)
+            local_data = redistribute(local_data, self.layout, layout)
+        local_rows = local_data.shape[0]
+        global_rows = layout.globalshape[0]
+
+        if self.globalndim == 1:
+            local_data = np.ascontiguousarray(local_data,
+                                              dtype=PETSc.ScalarType)
+            return PETSc.Vec().createWithArray(local_data,
+                                               size=(local_rows, global_rows),
+                                               comm=self.comm)
+
+        local_data = np.asfortranarray(local_data, dtype=PETSc.ScalarType)
+        petsc_mat = PETSc.Mat().createDense(
+            size=((local_rows, global_rows),
+                  (PETSc.DECIDE, layout.globalshape[1])),
+            array=local_data,
+            comm=self.comm)
+        petsc_mat.assemble()
+        return petsc_mat
+
+
     def reshape(self, *args):
         """ Reshape distributed array.
 
@@ -354,3 +737,116 @@ class MPIArray(np.ndarray):
         """
         raise NotImplementedError(
             "Implement a method to reshape distributed array")
+
+
+    def reshape_async(self, *args):
+        """ Start reshaping distributed array, see reshape.
+
+        Returns
+        -------
+        future : MPIFuture
+            Future of the distributed MPIArray with new shape.
+        """
+        return MPIFuture(result=self.reshape(*args))
+
+
+def _reference_operand(mpi_arrays):
+    """ Helper method to determine operand whose layout results follow,
+        the first distributed operand or first Replicated operand otherwise.
+    """
+    for operand in mpi_arrays:
+        if not is_Replicated(operand.dist):
+            return operand
+    return mpi_arrays[0]
+
+
+def _has_consistent_layout(operand):
+    """ Helper method to check local data of operand matches its layout. """
+    if is_Replicated(operand.dist):
+        return True
+    layout = operand.layout
+    return layout is not None and operand.shape == layout.local_shape
+
+
+def _unwrap(operand):
+    """ Helper method to access process local data of MPIArrays. """
+    return np.asarray(operand) if isinstance(operand, MPIArray) else operand
+
+
+def _local_operand(operand, reference):
+    """ Helper method to determine process local data of ufunc operand
+        matching the local data of the reference operand.
+    """
+    if not isinstance(operand, MPIArray) or operand is reference:
+        return _unwrap(operand)
+    if is_Replicated(reference.dist):
+        return np.asarray(operand)
+
+    layout = reference.layout
+    if is_Replicated(operand.dist):
+        return _broadcast_replicated(np.asarray(operand), layout)
+
+    if operand.layout == layout:
+        return np.asarray(operand)
+    if operand.globalshape != layout.globalshape:
+        raise NotSupportedError('broadcasting distributed operands of ' +
+                                'global shapes {} '.format(operand.globalshape) +
+                                'and {} '.format(layout.globalshape) +
+                                'is not supported')
+    return redistribute(np.asarray(operand), operand.layout, layout)
+
+
+def _local_output(operand, reference):
+    """ Helper method to verify ufunc output matches the layout of the
+        reference operand.
+    """
+    if not isinstance(operand, MPIArray) or operand is reference:
+        return _unwrap(operand)
+    if is_Replicated(operand.dist) != is_Replicated(reference.dist) or \
+        (not is_Replicated(operand.dist) and operand.layout != reference.layout):
+        raise ValueError("'out' must have the same distribution and layout " +
+                         "as the result")
+    return np.asarray(operand)
+
+
+def _broadcast_replicated(replicated_data, layout):
+    """ Helper method to view the portion of replicated data that broadcasts
+        against the local data of a distributed layout.
+    """
+    axis_offset = layout.globalndim - replicated_data.ndim
+    if axis_offset < 0:
+        raise NotSupportedError('broadcasting Replicated operands with more ' +
+                                'dimensions than distributed operands ' +
+                                'is not supported')
+
+    rank_index = layout.rank_index()
+    local_key = []
+    for axis, axis_len in enumerate(replicated_data.shape):
+        global_axis = axis + axis_offset
+        if axis_len == layout.globalshape[global_axis]:
+            local_key.append(rank_index[global_axis])
+        elif axis_len == 1:
+            local_key.append(slice(None))
+        else:
+            raise ValueError('operands could not be broadcast together ' +
+                             'with global shapes ' +
+                             '{} '.format(replicated_data.shape) +
+                             '{}'.format(layout.globalshape))
+    return replicated_data[tuple(local_key)]
+
+
+def _wrap_results(results, reference):
+    """ Helper method to wrap local ufunc results with the layout of the
+        reference operand.
+    """
+    if isinstance(results, tuple):
+        return tuple(_wrap_results(result, reference) for result in results)
+    if is_Replicated(reference.dist):
+        return reference.__class__(results, comm=reference.comm)
+    #Process local operands may broadcast local data beyond the layout
+    if np.shape(results) != reference.layout.local_shape:
+        raise NotSupportedError(
+            'result of shape {} does not match the local shape {} '
+            .format(np.shape(results), reference.layout.local_shape) +
+            'of distributed operands')
+    return reference.__class__(results, layout=reference.layout)
@@ -1,4 +1,13 @@
 from .array_creation import *
 from .MPIArray import *
 from .mpi_utils import get_comm, get_comm_size, get_rank
+from .buffer_pool import *
+from .futures import *
 from ._linalg import *
+from ._cumulative import *
+from ._indexing import *
+from ._sorting import *
+from ._statistics import *
+from ._transpose import *
+from ._petsc import *
+from . import linalg
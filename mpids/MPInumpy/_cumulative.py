@@ -0,0 +1,242 @@
+from mpi4py import MPI
+from mpi4py.util.dtlib import to_numpy_dtype
+import numpy as np
+
+from mpids.MPInumpy.MPIArray import MPIArray
+from mpids.MPInumpy.distributions.Replicated import Replicated
+from mpids.MPInumpy.errors import NotSupportedError, ValueError
+from mpids.MPInumpy.utils import get_reduction_identity, \
+                                 is_block_distributed,   \
+                                 is_Replicated
+
+__all__ = ['cummax', 'cummin', 'cumprod', 'cumsum', 'nancumprod', 'nancumsum']
+
+#Lazily created MPI reductions of inexact data by numpy ufunc
+_ufunc_operations = {}
+
+
+def cummax(a, axis=None, dtype=None, out=None):
+    """ Cumulative maximum of array elements along a given axis.
+
+    Parameters
+    ----------
+    a : MPIArray, array_like
+        Input array.
+    axis : None or int
+        Axis along which the cumulative maximum is computed.  If none
+        specified the maximum of the flattened array is computed.
+    dtype : dtype, optional
+        Specified data type of returned array.
+
+    Returns
+    -------
+    MPIArray : numpy.ndarray sub class
+        MPIArray with the distribution of a, flattened arrays of Block
+        distributed input keep the local elements of each process.
+    """
+    return _prefix_scan(a, _maximum_accumulate, np.maximum, MPI.MAX,
+                        axis=axis, dtype=dtype, out=out)
+
+
+def cummin(a, axis=None, dtype=None, out=None):
+    """ Cumulative minimum of array elements along a given axis.
+
+    Parameters
+    ----------
+    a : MPIArray, array_like
+        Input array.
+    axis : None or int
+        Axis along which the cumulative minimum is computed.  If none
+        specified the minimum of the flattened array is computed.
+    dtype : dtype, optional
+        Specified data type of returned array.
+
+    Returns
+    -------
+    MPIArray : numpy.ndarray sub class
+        MPIArray with the distribution of a, flattened arrays of Block
+        distributed input keep the local elements of each process.
+    """
+    return _prefix_scan(a, _minimum_accumulate, np.minimum, MPI.MIN,
+                        axis=axis, dtype=dtype, out=out)
+
+
+def cumprod(a, axis=None, dtype=None, out=None):
+    """ Cumulative product of array elements along a given axis.
+
+    Parameters
+    ----------
+    a : MPIArray, array_like
+        Input array.
+    axis : None or int
+        Axis along which the cumulative product is computed.  If none
+        specified the product of the flattened array is computed.
+    dtype : dtype, optional
+        Specified data type of returned array and of the
+        accumulator in which the elements are multiplied.
+
+    Returns
+    -------
+    MPIArray : numpy.ndarray sub class
+        MPIArray with the distribution of a, flattened arrays of Block
+        distributed input keep the local elements of each process.
+    """
+    return _prefix_scan(a, np.cumprod, np.multiply, MPI.PROD,
+                        axis=axis, dtype=dtype, out=out)
+
+
+def cumsum(a, axis=None, dtype=None, out=None):
+    """ Cumulative sum of array elements along a given axis.
+
+    Parameters
+    ----------
+    a : MPIArray, array_like
+        Input array.
+    axis : None or int
+        Axis along which the cumulative sum is computed.  If none
+        specified the sum of the flattened array is computed.
+    dtype : dtype, optional
+        Specified data type of returned array and of the
+        accumulator in which the elements are summed.
+
+    Returns
+    -------
+    MPIArray : numpy.ndarray sub class
+        MPIArray with the distribution of a, flattened arrays of Block
+        distributed input keep the local elements of each process.
+    """
+    return _prefix_scan(a, np.cumsum, np.add, MPI.SUM,
+                        axis=axis, dtype=dtype, out=out)
+
+
+def nancumprod(a, axis=None, dtype=None, out=None):
+    """ Cumulative product of array elements along a given axis, treating
+        NaNs as one.
+
+    Parameters
+    ----------
+    a : MPIArray, array_like
+        Input array.
+    axis : None or int
+        Axis along which the cumulative product is computed.  If none
+        specified the product of the flattened array is computed.
+    dtype : dtype, optional
+        Specified data type of returned array and of the
+        accumulator in which the elements are multiplied.
+
+    Returns
+    -------
+    MPIArray : numpy.ndarray sub class
+        MPIArray with the distribution of a, flattened arrays of Block
+        distributed input keep the local elements of each process.
+    """
+    return _prefix_scan(a, np.nancumprod, np.multiply, MPI.PROD,
+                        axis=axis, dtype=dtype, out=out)
+
+
+def nancumsum(a, axis=None, dtype=None, out=None):
+    """ Cumulative sum of array elements along a given axis, treating
+        NaNs as zero.
+
+    Parameters
+    ----------
+    a : MPIArray, array_like
+        Input array.
+    axis : None or int
+        Axis along which the cumulative sum is computed.  If none
+        specified the sum of the flattened array is computed.
+    dtype : dtype, optional
+        Specified data type of returned array and of the
+        accumulator in which the elements are summed.
+
+    Returns
+    -------
+    MPIArray : numpy.ndarray sub class
+        MPIArray with the distribution of a, flattened arrays of Block
+        distributed input keep the local elements of each process.
+    """
+    return _prefix_scan(a, np.nancumsum, np.add, MPI.SUM,
+                        axis=axis, dtype=dtype, out=out)
+
+
+def _maximum_accumulate(local_data, axis=None, dtype=None):
+    #Flattened array is scanned when no axis is specified, as np.cumsum
+    if axis is None:
+        local_data, axis = np.ravel(local_data), 0
+    return np.maximum.accumulate(local_data, axis=axis, dtype=dtype)
+
+
+def _minimum_accumulate(local_data, axis=None, dtype=None):
+    if axis is None:
+        local_data, axis = np.ravel(local_data), 0
+    return np.minimum.accumulate(local_data, axis=axis, dtype=dtype)
+
+
+def _scan_operation(operation, combine, dtype):
+    """ MPI reduction combining carries of dtype.  Built-in max/min
+        operations are undefined for complex data and don't propagate NaNs
+        as numpy does, these use a user defined operation applying combine.
+    """
+    if operation not in [MPI.MAX, MPI.MIN] or dtype.kind not in 'fc':
+        return operation
+    if combine not in _ufunc_operations:
+        def reduce_carry(in_buffer, inout_buffer, datatype):
+            dtype = to_numpy_dtype(datatype)
+            inout_carry = np.frombuffer(inout_buffer, dtype=dtype)
+            combine(np.frombuffer(in_buffer, dtype=dtype), inout_carry,
+                    out=inout_carry)
+        _ufunc_operations[combine] = MPI.Op.Create(reduce_carry, commute=True)
+    return _ufunc_operations[combine]
+
+
+def _prefix_scan(a, local_scan, combine, operation, axis=None, dtype=None,
+                 out=None):
+    """ Distributed inclusive scan.  Local data is scanned first, the carry
+        of all preceding ranks (the last local result along axis) is then
+        determined with a single Exscan and combined with the local result
+        in place.  Scans along axes that are not partitioned among the
+        processes need no communication.
+    """
+    if out is not None:
+        raise NotSupportedError("'out' field not supported")
+
+    #Numpy only arrays
+    if not isinstance(a, MPIArray):
+        return local_scan(np.asarray(a), axis=axis, dtype=dtype)
+    if axis is not None and not -a.globalndim <= axis < a.globalndim:
+        raise ValueError("'axis' entry is out of bounds")
+    #Replicated MPIArrays
+    if is_Replicated(a.dist):
+        return Replicated(local_scan(np.asarray(a), axis=axis, dtype=dtype),
+                          comm=a.comm)
+
+    if axis is None:
+        local_data = np.asarray(a).reshape(-1)
+        layout = a.layout.ravel()
+        axis = 0
+    else:
+        local_data = np.asarray(a)
+        layout = a.layout
+        axis = axis % a.globalndim
+
+    local_result = local_scan(local_data, axis=axis, dtype=dtype)
+
+    if axis < len(layout.comm_dims):
+        if not is_block_distributed(a.dist):
+            raise NotSupportedError(
+                "scans along partitioned axes only supported for 'b' dist.")
+        identity = get_reduction_identity(operation, local_result.dtype)
+        if local_result.shape[0] > 0:
+            carry = np.ascontiguousarray(local_result[-1])
+        else:
+            carry = np.full(local_result.shape[1:], identity,
+                            dtype=local_result.dtype)
+        prefix = np.empty_like(carry)
+        a.comm.Exscan(carry, prefix,
+                      op=_scan_operation(operation, combine, carry.dtype))
+        #Result of exclusive scan is undefined on first rank
+        if a.comm.Get_rank() == 0:
+            prefix[...] = identity
+        combine(local_result, prefix, out=local_result)
+
+    return a.__class__(local_result, layout=layout)
@@ -0,0 +1,260 @@
+from mpi4py import MPI
+import numpy as np
+
+from mpids.MPInumpy.MPIArray import MPIArray
+from mpids.MPInumpy.distributions.Replicated import Replicated
+from mpids.MPInumpy.errors import NotSupportedError, ValueError
+from mpids.MPInumpy.layout import Layout, get_layout, redistribute
+from mpids.MPInumpy.mpi_utils import all_to_all, all_to_all_v
+from mpids.MPInumpy.utils import is_block_distributed, is_Replicated
+
+__all__ = ['compress', 'take']
+
+
+def compress(condition, a, axis=None, out=None, rebalance=False):
+    """ Select slices of an array along a given axis with a boolean
+        condition.  Selected data of Block distributed arrays is kept by
+        the rank holding it, offsets of the compacted result are
+        determined from the selection counts of all ranks.
+
+    Parameters
+    ----------
+    condition : MPIArray, array_like
+        1-D boolean array selecting entries along axis.  Distributed
+        conditions of a different layout are redistributed to the
+        entries held by each rank.
+    a : MPIArray, array_like
+        Array from which to extract data.
+    axis : None or int
+        Axis along which to select.  If None the flattened array is
+        selected from.
+    rebalance : bool, float
+        Redistribute the result of Block distributed arrays to even
+        partitions, default False.  If a float is specified the result is
+        only redistributed when its imbalance exceeds the value, see
+        MPIArray.rebalance.
+
+    Returns
+    -------
+    MPIArray : numpy.ndarray sub class
+        MPIArray with the distribution of a.
+    """
+    if out is not None:
+        raise NotSupportedError("'out' field not supported")
+
+    #Numpy only arrays
+    if not isinstance(a, MPIArray):
+        return np.compress(np.asarray(condition), a, axis=axis)
+    if axis is not None and not -a.globalndim <= axis < a.globalndim:
+        raise ValueError("'axis' entry is out of bounds")
+    #Replicated MPIArrays
+    if is_Replicated(a.dist):
+        return Replicated(np.compress(np.asarray(condition), np.asarray(a),
+                                      axis=axis),
+                          comm=a.comm)
+    if not is_block_distributed(a.dist):
+        raise NotSupportedError("selections only supported for 'b' dist.")
+
+    local_data, layout, axis = _axis_data(a, axis)
+    axis_len = layout.globalshape[axis]
+    partitioned_axis = axis < len(layout.comm_dims)
+    distributed_condition = \
+        isinstance(condition, MPIArray) and not is_Replicated(condition.dist)
+    if distributed_condition and condition.globalshape != (axis_len,):
+        raise ValueError('condition must be distributed with ' +
+                         'shape {}'.format((axis_len,)))
+
+    #Local entries of condition along axis
+    if distributed_condition and partitioned_axis:
+        local_condition = redistribute(np.asarray(condition),
+                                       condition.layout,
+                                       _axis_layout(layout, axis))
+    else:
+        if distributed_condition:
+            condition = condition.collect_data()
+        global_condition = np.asarray(condition, dtype=bool)
+        if global_condition.ndim != 1 or global_condition.size > axis_len:
+            raise ValueError('condition must be 1-D of at most ' +
+                             'length {}'.format(axis_len))
+        local_condition = np.zeros(local_data.shape[axis], dtype=bool)
+        start, end = layout.rank_extents[a.comm.Get_rank(), axis]
+        #Entries beyond the length of condition are not selected
+        local_condition[:max(global_condition.size - start, 0)] = \
+            global_condition[start:end]
+    local_result = np.compress(local_condition.astype(bool, copy=False),
+                               local_data, axis=axis)
+
+    if not partitioned_axis:
+        return a.__class__(local_result,
+                           layout=_replace_axis(layout, axis,
+                                                local_result.shape[axis]))
+
+    #Compacted result starts after entries selected by preceding ranks
+    counts = np.empty(a.comm.Get_size(), dtype=np.int64)
+    a.comm.Allgather(np.array(local_result.shape[0], dtype=np.int64), counts)
+    ends = np.cumsum(counts)
+    result_layout = _replace_axis(layout, 0, int(ends[-1]),
+                                  np.stack((ends - counts, ends), axis=1))
+    result = a.__class__(local_result, layout=result_layout)
+    if rebalance is False:
+        return result
+    return result.rebalance(threshold=None if rebalance is True else rebalance)
+
+
+def take(a, indices, axis=None):
+    """ Take elements of an array along a given axis.  Indices are sent to
+        the ranks holding the selected entries which reply with their data,
+        each requiring a single Alltoallv.
+
+    Parameters
+    ----------
+    a : MPIArray, array_like
+        Source array.
+    indices : MPIArray, array_like
+        Indices of values to extract.  Indices distributed among the
+        processes('b' dist) are requested by the rank holding them,
+        replicated indices are evenly Block distributed among the ranks.
+    axis : None or int
+        Axis along which to select.  If None the flattened array is
+        selected from.
+
+    Returns
+    -------
+    MPIArray : numpy.ndarray sub class
+        MPIArray with the distribution of a.  Results of selections along
+        partitioned axes follow the distribution of indices.
+    """
+    #Numpy only arrays
+    if not isinstance(a, MPIArray):
+        return np.take(a, np.asarray(indices), axis=axis)
+    if axis is not None and not -a.globalndim <= axis < a.globalndim:
+        raise ValueError("'axis' entry is out of bounds")
+    #Replicated MPIArrays
+    if is_Replicated(a.dist):
+        return Replicated(np.take(np.asarray(a), np.asarray(indices),
+                                  axis=axis),
+                          comm=a.comm)
+    if not is_block_distributed(a.dist):
+        raise NotSupportedError("selections only supported for 'b' dist.")
+
+    local_data, layout, axis = _axis_data(a, axis)
+    axis_len = layout.globalshape[axis]
+    distributed_indices = \
+        isinstance(indices, MPIArray) and not is_Replicated(indices.dist)
+
+    if axis >= len(layout.comm_dims):
+        if distributed_indices:
+            raise NotSupportedError(
+                'distributed indices only supported along partitioned axes.')
+        global_indices = np.asarray(indices)
+        _check_indices(global_indices, axis_len, a.comm)
+        local_result = np.take(local_data, global_indices, axis=axis)
+        return a.__class__(local_result,
+                           layout=_replace_axis(layout, axis,
+                                                global_indices.shape))
+
+    #Indices are requested by the rank holding them in a Block layout
+    if distributed_indices:
+        if not is_block_distributed(indices.dist):
+            raise NotSupportedError("indices only supported for 'b' dist.")
+        indices_layout = indices.layout
+        local_indices = np.asarray(indices)
+    else:
+        global_indices = np.asarray(indices)
+        if global_indices.ndim == 0:
+            raise NotSupportedError('scalar indices not supported, ' +
+                                    'use __getitem__ instead.')
+        indices_layout = get_layout(global_indices.shape, 'b', comm=a.comm)
+        local_indices = global_indices[indices_layout.rank_slices()]
+    if not np.issubdtype(local_indices.dtype, np.integer):
+        raise IndexError('arrays used as indices must be of integer type')
+    _check_indices(local_indices, axis_len, a.comm)
+
+    local_result = _request_rows(local_data,
+                                 np.where(local_indices < 0,
+                                          local_indices + axis_len,
+                                          local_indices).ravel(),
+                                 layout.partitions(0),
+                                 a.comm)
+    result_shape = indices_layout.globalshape + layout.globalshape[1:]
+    rank_extents = np.zeros((len(indices_layout.rank_extents),
+                             len(result_shape), 2), dtype=np.int64)
+    rank_extents[:, :indices_layout.globalndim] = indices_layout.rank_extents
+    rank_extents[:, indices_layout.globalndim:, 1] = layout.globalshape[1:]
+    result_layout = Layout(result_shape, layout.dist, a.comm,
+                           indices_layout.comm_dims,
+                           indices_layout.comm_coord,
+                           rank_extents, weights=indices_layout.weights)
+    return a.__class__(local_result.reshape(result_layout.local_shape),
+                       layout=result_layout)
+
+
+def _axis_data(a, axis):
+    #Flattened array is selected from when no axis is specified
+    if axis is None:
+        return np.asarray(a).reshape(-1), a.layout.ravel(), 0
+    return np.asarray(a), a.layout, axis % a.globalndim
+
+
+def _axis_layout(layout, axis):
+    """ 1-D layout of the entries along axis held by each rank. """
+    return Layout((layout.globalshape[axis],), layout.dist, layout.comm,
+                  layout.comm_dims[:1], layout.comm_coord[:1],
+                  layout.rank_extents[:, axis:axis + 1])
+
+
+def _replace_axis(layout, axis, axis_shape, axis_extents=None):
+    """ Layout with the entries along axis replaced by axis_shape, either
+        partitioned by axis_extents or held entirely by every rank.
+    """
+    axis_shape = tuple(np.atleast_1d(axis_shape).astype(int))
+    globalshape = layout.globalshape[:axis] + axis_shape + \
+        layout.globalshape[axis + 1:]
+    rank_extents = np.zeros((len(layout.rank_extents), len(axis_shape), 2),
+                            dtype=np.int64)
+    rank_extents[..., 1] = axis_shape
+    if axis_extents is not None:
+        rank_extents[:, 0] = axis_extents
+    rank_extents = np.concatenate((layout.rank_extents[:, :axis],
+                                   rank_extents,
+                                   layout.rank_extents[:, axis + 1:]), axis=1)
+    return Layout(globalshape, layout.dist, layout.comm, layout.comm_dims,
+                  layout.comm_coord, rank_extents, weights=layout.weights)
+
+
+def _check_indices(indices, axis_len, comm):
+    #Out of range indices of any rank raise on all ranks
+    out_of_bounds = int(np.any((indices < -axis_len) | (indices >= axis_len)))
+    if comm.allreduce(out_of_bounds, op=MPI.MAX):
+        raise IndexError('index out of bounds for axis with ' +
+                         'global size {}'.format(axis_len))
+
+
+def _request_rows(local_data, row_indices, partitions, comm):
+    """ Rows of the global array at row_indices, requested from the ranks
+        holding them.  Requests are sent grouped by owner with an Alltoallv,
+        owners reply with their rows with a second Alltoallv.
+    """
+    size = comm.Get_size()
+    row_shape = local_data.shape[1:]
+    row_size = int(np.prod(row_shape))
+
+    owners = np.searchsorted(partitions[:, 0], row_indices, side='right') - 1
+    request_order = np.argsort(owners, kind='stable')
+    request_counts = np.bincount(owners, minlength=size).astype(np.int64)
+    reply_counts = all_to_all(request_counts, comm=comm)
+    requested_rows = all_to_all_v(row_indices[request_order],
+                                  request_counts, reply_counts, comm=comm)
+
+    rank = comm.Get_rank()
+    replies = np.ascontiguousarray(
+        local_data[requested_rows - partitions[rank, 0]]).reshape(-1)
+    received_rows = all_to_all_v(replies,
+                                 reply_counts * row_size,
+                                 request_counts * row_size,
+                                 comm=comm)
+    local_result = np.empty((row_indices.size,) + row_shape,
+                            dtype=local_data.dtype)
+    local_result[request_order] = \
+        received_rows.reshape((row_indices.size,) + row_shape)
+    return local_result
@@ -1,67 +1,847 @@
 from mpi4py import MPI
+import numpy as np
 from numpy import matmul as np_matmul
-from petsc4py import PETSc
 
 from mpids.MPInumpy.MPIArray import MPIArray
 from mpids.MPInumpy.distributions import Distribution_Dict
-from mpids.MPInumpy.errors import NotSupportedError
-from mpids.MPInumpy.utils import get_comm_dims, get_cart_coords
+from mpids.MPInumpy.errors import LinAlgError, NotSupportedError, ValueError
+from mpids.MPInumpy.layout import Layout, get_layout, redistribute
+from mpids.MPInumpy.mpi_utils import get_mpi_datatype, get_vector_counts
+from mpids.MPInumpy.utils import get_cart_coords,            \
+                                 is_block_block_distributed, \
+                                 is_block_distributed,       \
+                                 is_Replicated
 
 __all__ = ['matmul']
 
 def matmul(a, b, out=None, comm=MPI.COMM_WORLD, dist='b'):
+    """ Matrix product of two arrays.  Products of distributed operands are
+        computed on the local data of each process with dense numpy(BLAS)
+        kernels:
+            - Block x Replicated: local product of the held rows.
+            - Replicated x Block: local products reduced and scattered to
+              the rows of the Block result.
+            - Block x Block: blocks of b are passed around a ring of the
+              processes, overlapping communication with local products.
+            - Block-Block x Block-Block: SUMMA on the 2-D process grid.
+        Other distributed operands are redistributed to Block layouts.
+
+    Parameters
+    ----------
+    a, b : MPIArray, array_like
+        Input arrays, distributed operands must be 2-D.
+    comm : MPI Communicator, optional
+        MPI process communication object of results of non distributed
+        operands.  If none specified defaults to MPI.COMM_WORLD
+    dist : str, optional
+        Distribution of results of non distributed operands.
+        Default value 'b' : Block
+
+    Returns
+    -------
+    MPIArray : numpy.ndarray sub class
+        Block-Block distributed product of Block-Block operands, Block
+        distributed product otherwise.
+    """
     if out is not None:
         raise NotSupportedError("'out' field not supported")
 
     #Numpy only arrays
     if not isinstance(a, MPIArray) and not isinstance(b, MPIArray):
         return Distribution_Dict[dist](np_matmul(a, b), comm=comm)
-    #Numpy and MPIArray
+    #Numpy and MPIArray, products of process local data
     if not isinstance(a, MPIArray) or not isinstance(b, MPIArray):
-        return Distribution_Dict[dist](np_matmul(a, b), comm=comm)
+        return Distribution_Dict[dist](np_matmul(np.asarray(a),
+                                                 np.asarray(b)), comm=comm)
     #Replicated MPIArrays
     if a.dist == b.dist == 'r':
-        return Distribution_Dict[dist](np_matmul(a, b), comm=comm)
+        return Distribution_Dict[dist](np_matmul(np.asarray(a),
+                                                 np.asarray(b)), comm=comm)
+
+    if a.comm != b.comm:
+        raise ValueError('operands must share a communicator.')
+    if not all(is_Replicated(operand.dist) or operand.globalndim == 2
+               for operand in (a, b)):
+        raise NotSupportedError(
+            'only 2-D distributed operands are supported.')
+    if a.globalshape[-1] != b.globalshape[0]:
+        raise ValueError('matmul: mismatch in core dimension, ' +
+                         '{} != {}'.format(a.globalshape[-1], b.globalshape[0]))
+
+    if is_Replicated(b.dist):
+        return _local_mat_mult(_block_operand(a), np.asarray(b))
+    if is_Replicated(a.dist):
+        return _reduce_scatter_mat_mult(np.asarray(a), _block_operand(b))
+    if is_block_block_distributed(a.dist) and a.dist == b.dist and \
+       a.layout.comm_dims == b.layout.comm_dims:
+        return _summa_mat_mult(a, b)
+    return _ring_mat_mult(_block_operand(a), _block_operand(b))
 
-    return _block_mat_mult(a, b, comm=comm)
 
+def _block_operand(operand):
+    """ Helper method to redistribute distributed operands to Block layouts
+        holding entire rows.
+    """
+    if is_block_distributed(operand.dist):
+        return operand
+    layout = get_layout(operand.globalshape, 'b', comm=operand.comm)
+    return Distribution_Dict['b'](redistribute(np.asarray(operand),
+                                               operand.layout, layout),
+                                  layout=layout)
 
-def _block_mat_mult(a, b, comm=MPI.COMM_WORLD):
-    a_global_rows, a_global_cols = a.globalshape
-    a_local_rows, a_local_cols = a.shape
-    b_global_rows, b_global_cols = b.globalshape
-    b_local_rows, b_local_cols = b.shape
 
-    A = PETSc.Mat().create(comm=comm)
-    A.setSizes((a_global_rows, a_global_cols))
-    A.setFromOptions()
-    A.setPreallocationNNZ((a_global_rows, a_global_cols))
-    A_row_start, A_row_end = A.getOwnershipRange()
+def _row_layout(layout, shape):
+    """ Layout of shape partitioned by the rows of a Block layout. """
+    rank_extents = np.zeros((len(layout.rank_extents), len(shape), 2),
+                            dtype=np.int64)
+    rank_extents[:, 0] = layout.rank_extents[:, 0]
+    rank_extents[:, 1:, 1] = shape[1:]
+    return Layout(shape, 'b', layout.comm, layout.comm_dims, layout.comm_coord,
+                  rank_extents, weights=layout.weights)
 
-    A.setValues(range(A_row_start, A_row_end), range(a_global_cols), a)
-    A.assemblyBegin()
-    A.assemblyEnd()
 
-    B = PETSc.Mat().create(comm=comm)
-    B.setSizes((b_global_rows, b_global_cols))
-    B.setFromOptions()
-    B.setPreallocationNNZ((b_global_rows, b_global_cols))
-    B_row_start, B_row_end = B.getOwnershipRange()
+def _local_mat_mult(a, b):
+    """ Block x Replicated, rows of the product only depend on the local
+        rows of a.
+    """
+    local_result = np.ascontiguousarray(np_matmul(np.asarray(a), b))
+    return Distribution_Dict['b'](
+        local_result,
+        layout=_row_layout(a.layout,
+                           (a.globalshape[0],) + local_result.shape[1:]))
 
-    B.setValues(range(B_row_start, B_row_end), range(b_global_cols), b)
-    B.assemblyBegin()
-    B.assemblyEnd()
 
-    C = A.matMult(B)
+def _reduce_scatter_mat_mult(a, b):
+    """ Replicated x Block, products of the local rows of b with the
+        matching columns of a are summed and scattered by rows of the
+        result with a single Reduce_scatter.
+    """
+    comm = b.comm
+    row_start, row_end = b.layout.partitions(0)[comm.Get_rank()]
+    partial_result = np.ascontiguousarray(
+        np_matmul(a[..., row_start:row_end], np.asarray(b)))
 
+    layout = get_layout(partial_result.shape, 'b', comm=comm)
+    row_size = int(np.prod(partial_result.shape[1:]))
+    recv_counts, _ = get_vector_counts(
+        np.diff(layout.partitions(0), axis=1).ravel() * row_size)
+    local_result = np.empty(layout.local_shape, dtype=partial_result.dtype)
+    comm.Reduce_scatter(partial_result, local_result, recv_counts, op=MPI.SUM)
+    return Distribution_Dict['b'](local_result, layout=layout)
+
+
+def _ring_mat_mult(a, b):
+    """ Block x Block, rows of b held by each rank are passed to the next
+        rank in a ring.  The next block is received while the product of
+        the local rows of a with the current block is computed.
+    """
+    comm = b.comm
     size = comm.Get_size()
     rank = comm.Get_rank()
+    local_a = np.asarray(a)
+    b_partitions = b.layout.partitions(0)
+    b_cols = b.globalshape[1]
+    local_result = np.zeros((local_a.shape[0], b_cols),
+                            dtype=np.result_type(a.dtype, b.dtype))
+
+    #Double buffers large enough for the rows of b held by any rank
+    max_rows = int(np.max(np.diff(b_partitions, axis=1)))
+    buffers = [np.empty((max_rows, b_cols), dtype=b.dtype) for _ in range(2)]
+    current_rows = b_partitions[rank, 1] - b_partitions[rank, 0]
+    buffers[0][:current_rows] = np.asarray(b)
+    next_rank = (rank + 1) % size
+    prev_rank = (rank - 1) % size
+
+    for step in range(size):
+        #Rows of b held in the current buffer originate from owner
+        owner = (rank - step) % size
+        current = buffers[step % 2][:current_rows]
+        requests = []
+        if step < size - 1:
+            next_owner = (owner - 1) % size
+            next_rows = \
+                b_partitions[next_owner, 1] - b_partitions[next_owner, 0]
+            requests = [comm.Irecv(buffers[(step + 1) % 2][:next_rows],
+                                   source=prev_rank),
+                        comm.Isend(current, dest=next_rank)]
+        row_start, row_end = b_partitions[owner]
+        if current_rows:
+            local_result += np_matmul(local_a[:, row_start:row_end], current)
+        MPI.Request.Waitall(requests)
+        if step < size - 1:
+            current_rows = next_rows
+
+    return Distribution_Dict['b'](
+        local_result,
+        layout=_row_layout(a.layout, (a.globalshape[0], b_cols)))
+
+
+def _summa_mat_mult(a, b):
+    """ Block-Block x Block-Block, SUMMA on the 2-D process grid.  For every
+        panel of the inner dimension the owners broadcast their columns of
+        a along process rows and rows of b along process columns.  The next
+        panel is broadcast while the product of the current one is computed.
+    """
+    comm = a.comm
+    row_coord, col_coord = a.layout.comm_coord
+    row_comm = comm.Split(color=row_coord, key=col_coord)
+    col_comm = comm.Split(color=col_coord, key=row_coord)
+    rank = comm.Get_rank()
+
+    #Inner dimension is held by process columns of a and rows of b
+    a_partitions = a.layout.partitions(1)
+    b_partitions = b.layout.partitions(0)
+    a_coords = np.array([get_cart_coords(a.layout.comm_dims, comm.Get_size(),
+                                         grid_rank)
+                         for grid_rank in range(comm.Get_size())])
+    a_col_starts = np.unique(a_partitions[:, 0])
+    b_row_starts = np.unique(b_partitions[:, 0])
+    panel_bounds = np.union1d(np.union1d(a_col_starts, b_row_starts),
+                              [a.globalshape[1]])
+    panels = [(int(start), int(end)) for start, end in
+              zip(panel_bounds[:-1], panel_bounds[1:]) if end > start]
+
+    local_a = np.asarray(a)
+    local_b = np.asarray(b)
+    a_col_start = a_partitions[rank, 0]
+    b_row_start = b_partitions[rank, 0]
+    local_result = np.zeros((local_a.shape[0], local_b.shape[1]),
+                            dtype=np.result_type(a.dtype, b.dtype))
+
+    def post_panel(panel):
+        start, end = panel
+        #Grid coordinates of the owners of the panel
+        a_owner = a_coords[np.flatnonzero((a_partitions[:, 0] <= start) &
+                                          (a_partitions[:, 1] >= end))[0], 1]
+        b_owner = a_coords[np.flatnonzero((b_partitions[:, 0] <= start) &
+                                          (b_partitions[:, 1] >= end))[0], 0]
+        a_panel = np.ascontiguousarray(
+            local_a[:, start - a_col_start:end - a_col_start]) \
+            if a_owner == col_coord else \
+            np.empty((local_a.shape[0], end - start), dtype=a.dtype)
+        b_panel = np.ascontiguousarray(
+            local_b[start - b_row_start:end - b_row_start]) \
+            if b_owner == row_coord else \
+            np.empty((end - start, local_b.shape[1]), dtype=b.dtype)
+        requests = [row_comm.Ibcast(a_panel, root=int(a_owner)),
+                    col_comm.Ibcast(b_panel, root=int(b_owner))]
+        return a_panel, b_panel, requests
+
+    pending = post_panel(panels[0]) if panels else None
+    for index in range(len(panels)):
+        a_panel, b_panel, requests = pending
+        MPI.Request.Waitall(requests)
+        if index + 1 < len(panels):
+            pending = post_panel(panels[index + 1])
+        local_result += np_matmul(a_panel, b_panel)
+    row_comm.Free()
+    col_comm.Free()
+
+    rank_extents = np.stack((a.layout.partitions(0), b.layout.partitions(1)),
+                            axis=1)
+    return Distribution_Dict['bb'](
+        local_result,
+        layout=Layout((a.globalshape[0], b.globalshape[1]), 'bb', comm,
+                      a.layout.comm_dims, a.layout.comm_coord, rank_extents))
+
+
+
+def solve(a, b, comm=MPI.COMM_WORLD):
+    """ Solve the linear matrix equation a x = b.  Rows of a and b are
+        partitioned among the processes and reduced with Gauss-Jordan
+        elimination using partial pivoting.  Each column step selects its
+        pivot with a single MAXLOC Allreduce and broadcasts the pivot row
+        from its owner, rows are never exchanged.
+
+    Parameters
+    ----------
+    a : MPIArray, array_like
+        Coefficient matrix of shape (N, N).
+    b : MPIArray, array_like
+        Ordinate values of shape (N,) or (N, K).
+    comm : MPI Communicator, optional
+        MPI process communication object of non distributed operands.  If
+        none specified defaults to MPI.COMM_WORLD
+
+    Returns
+    -------
+    MPIArray : numpy.ndarray sub class
+        Block distributed solution of the shape of b, partitioned like the
+        rows of a.
+    """
+    a = _row_operand(a, comm)
+    comm = a.comm
+    if a.globalndim != 2 or a.globalshape[0] != a.globalshape[1]:
+        raise ValueError('a must be a square 2-D array.')
+    size = a.globalshape[0]
+    b = b if isinstance(b, MPIArray) else np.asarray(b)
+    b_shape = _operand_shape(b)
+    if len(b_shape) not in (1, 2) or b_shape[0] != size:
+        raise ValueError('b must be of shape ({},) or ({}, K).'.format(size,
+                                                                      size))
+    x_layout = _row_layout(a.layout, b_shape)
+    dtype = np.result_type(a.dtype, b.dtype, np.float64)
+    local_a = np.array(a, dtype=dtype)
+    #Columns follow from b, ranks may hold no rows
+    rhs_cols = b_shape[1] if len(b_shape) == 2 else 1
+    local_b = np.array(_local_rows(b, x_layout), dtype=dtype) \
+                .reshape(local_a.shape[0], rhs_cols)
+
+    rank = comm.Get_rank()
+    partitions = a.layout.partitions(0)
+    row_start = partitions[rank, 0]
+    pivot_columns = np.full(local_a.shape[0], -1, dtype=np.int64)
+    pivot_row = np.empty(size + rhs_cols, dtype=dtype)
+    for column in range(size):
+        #Pivot is the largest entry of the column among unpivoted rows
+        candidates = np.abs(local_a[:, column])
+        candidates[pivot_columns >= 0] = -1
+        local_pivot = int(np.argmax(candidates)) if len(candidates) else 0
+        local_value = float(candidates[local_pivot]) if len(candidates) \
+                      else -1.
+        value, pivot = comm.allreduce((local_value, row_start + local_pivot),
+                                      op=MPI.MAXLOC)
+        if not value > 0:
+            raise LinAlgError('Singular matrix')
+
+        owner = int(np.flatnonzero((partitions[:, 0] <= pivot) &
+                                   (partitions[:, 1] > pivot))[0])
+        row_length = size - column + rhs_cols
+        if rank == owner:
+            local_pivot = pivot - row_start
+            pivot_row[:size - column] = local_a[local_pivot, column:]
+            pivot_row[size - column:row_length] = local_b[local_pivot]
+            pivot_columns[local_pivot] = column
+        comm.Bcast(pivot_row[:row_length], root=owner)
+
+        #Entries left of the column are zero in the pivot row
+        factors = local_a[:, column] / pivot_row[0]
+        if rank == owner:
+            factors[local_pivot] = 0
+        local_a[:, column:] -= np.outer(factors, pivot_row[:size - column])
+        local_b -= np.outer(factors, pivot_row[size - column:row_length])
+
+    #Reduced rows hold a single non zero entry in their pivot column, the
+    ##solution rows are summed and scattered with a single Reduce_scatter
+    partial_x = np.zeros((size, rhs_cols), dtype=dtype)
+    partial_x[pivot_columns] = local_b / \
+        local_a[np.arange(local_a.shape[0]), pivot_columns][:, np.newaxis]
+    recv_counts, _ = get_vector_counts(
+        np.diff(partitions, axis=1).ravel() * rhs_cols)
+    local_x = np.empty((local_a.shape[0], rhs_cols), dtype=dtype)
+    comm.Reduce_scatter(partial_x, local_x, recv_counts, op=MPI.SUM)
+    return Distribution_Dict['b'](local_x.reshape(x_layout.local_shape),
+                                  layout=x_layout)
+
+
+def lstsq(a, b, rcond=None, comm=MPI.COMM_WORLD):
+    """ Least-squares solution of the linear matrix equation a x = b.  Each
+        process factors its rows of a with a local QR decomposition, the
+        triangular factors and projected ordinates of all processes are
+        gathered with a single Allgather and solved redundantly.
+
+    Parameters
+    ----------
+    a : MPIArray, array_like
+        Coefficient matrix of shape (M, N).
+    b : MPIArray, array_like
+        Ordinate values of shape (M,) or (M, K).
+    rcond : float, optional
+        Cut-off ratio for small singular values of a.  If none specified
+        defaults to machine precision times max(M, N).
+    comm : MPI Communicator, optional
+        MPI process communication object of non distributed operands.  If
+        none specified defaults to MPI.COMM_WORLD
+
+    Returns
+    -------
+    x : MPIArray
+        Block distributed least-squares solution of shape (N,) or (N, K).
+    residuals : MPIArray
+        Replicated sums of squared residuals of each column of b, empty if
+        the rank of a is less than N or M <= N.
+    rank : int
+        Rank of a.
+    s : MPIArray
+        Replicated singular values of a.
+    """
+    a = _row_operand(a, comm)
+    comm = a.comm
+    if a.globalndim != 2:
+        raise ValueError('a must be a 2-D array.')
+    rows, cols = a.globalshape
+    b = b if isinstance(b, MPIArray) else np.asarray(b)
+    b_shape = _operand_shape(b)
+    if len(b_shape) not in (1, 2) or b_shape[0] != rows:
+        raise ValueError('b must be of shape ({},) or ({}, K).'.format(rows,
+                                                                      rows))
+    dtype = np.result_type(a.dtype, b.dtype, np.float64)
+    local_a = np.asarray(a, dtype=dtype)
+    #Columns follow from b, ranks may hold no rows
+    rhs_cols = b_shape[1] if len(b_shape) == 2 else 1
+    local_b = np.asarray(_local_rows(b, _row_layout(a.layout, b_shape)),
+                         dtype=dtype).reshape(local_a.shape[0], rhs_cols)
+
+    #Projections onto the local Q factor preserve the residual norm
+    if local_a.shape[0]:
+        local_q, local_r = np.linalg.qr(local_a)
+        local_c = local_q.conj().T @ local_b
+    else:
+        local_r = np.empty((0, cols), dtype=dtype)
+        local_c = np.empty((0, local_b.shape[1]), dtype=dtype)
+    local_residuals = np.sum(np.abs(local_b)**2, axis=0) - \
+                      np.sum(np.abs(local_c)**2, axis=0)
+    factors = comm.allgather((local_r, local_c, local_residuals))
+    stacked_r = np.vstack([factor[0] for factor in factors])
+    stacked_c = np.vstack([factor[1] for factor in factors])
+
+    if rcond is None:
+        rcond = np.finfo(dtype).eps * max(rows, cols)
+    x, _, rank, s = np.linalg.lstsq(stacked_r, stacked_c, rcond=rcond)
+    if rank == cols and rows > cols:
+        residuals = np.sum(np.abs(stacked_c - stacked_r @ x)**2, axis=0) + \
+                    np.sum([factor[2] for factor in factors], axis=0)
+        residuals = np.maximum(residuals, 0)
+    else:
+        residuals = np.empty((0,), dtype=s.dtype)
+
+    x = x.reshape((cols,) + b_shape[1:])
+    x_layout = get_layout(x.shape, 'b', comm=comm)
+    return Distribution_Dict['b'](np.ascontiguousarray(
+                                      x[x_layout.rank_index()]),
+                                  layout=x_layout), \
+           Distribution_Dict['r'](residuals, comm=comm), \
+           int(rank), \
+           Distribution_Dict['r'](s, comm=comm)
+
+
+def cg(A, b, x0=None, tol=1e-05, maxiter=None, atol=0., comm=MPI.COMM_WORLD):
+    """ Solve A x = b for a Hermitian positive definite matrix with the
+        conjugate gradient method.  The Chronopoulos-Gear formulation
+        reduces both inner products of an iteration with a single Allreduce,
+        matrix vector products gather the vector with a single Allgatherv.
+
+    Parameters
+    ----------
+    A : MPIArray, array_like
+        Hermitian positive definite matrix of shape (N, N).
+    b : MPIArray, array_like
+        Right hand side of shape (N,).
+    x0 : MPIArray, array_like, optional
+        Starting guess for the solution.  If none specified defaults to
+        zeros.
+    tol, atol : float, optional
+        Tolerances for convergence, norm(b - A x) <= max(tol*norm(b), atol).
+    maxiter : int, optional
+        Maximum number of iterations.  If none specified defaults to 10*N.
+    comm : MPI Communicator, optional
+        MPI process communication object of non distributed operands.  If
+        none specified defaults to MPI.COMM_WORLD
+
+    Returns
+    -------
+    x : MPIArray
+        Block distributed solution, partitioned like the rows of A.
+    info : int
+        0 if converged, maxiter otherwise.
+    """
+    A, vector_layout, local_b, local_x, matvec = \
+        _krylov_operands(A, b, x0, comm)
+    comm = A.comm
+    maxiter = 10 * A.globalshape[0] if maxiter is None else maxiter
+
+    local_r = local_b - matvec(local_x)
+    local_w = matvec(local_r)
+    b_dot, gamma, delta = _fused_dots(comm, [(local_b, local_b),
+                                             (local_r, local_r),
+                                             (local_r, local_w)])
+    threshold = max(tol * np.sqrt(b_dot.real), atol)
+    gamma = gamma.real
+    local_p = np.zeros_like(local_r)
+    local_s = np.zeros_like(local_r)
+    for iteration in range(maxiter):
+        if np.sqrt(gamma) <= threshold:
+            break
+        if iteration == 0:
+            beta = 0.
+            alpha = gamma / delta
+        else:
+            beta = gamma / previous_gamma
+            alpha = gamma / (delta - beta * gamma / alpha)
+        #Search direction and its product with A follow by recurrence
+        local_p = local_r + beta * local_p
+        local_s = local_w + beta * local_s
+        local_x += alpha * local_p
+        local_r -= alpha * local_s
+        local_w = matvec(local_r)
+        previous_gamma = gamma
+        gamma, delta = _fused_dots(comm, [(local_r, local_r),
+                                          (local_r, local_w)])
+        gamma = gamma.real
+
+    info = 0 if np.sqrt(gamma) <= threshold else maxiter
+    return Distribution_Dict['b'](local_x, layout=vector_layout), info
+
+
+def gmres(A, b, x0=None, tol=1e-05, restart=20, maxiter=None, atol=0.,
+          comm=MPI.COMM_WORLD):
+    """ Solve A x = b with the restarted generalized minimal residual
+        method.  Krylov vectors are orthogonalized with two passes of
+        classical Gram-Schmidt, each reducing all projections and the norm
+        of the new vector with a single Allreduce.
+
+    Parameters
+    ----------
+    A : MPIArray, array_like
+        Matrix of shape (N, N).
+    b : MPIArray, array_like
+        Right hand side of shape (N,).
+    x0 : MPIArray, array_like, optional
+        Starting guess for the solution.  If none specified defaults to
+        zeros.
+    tol, atol : float, optional
+        Tolerances for convergence, norm(b - A x) <= max(tol*norm(b), atol).
+    restart : int, optional
+        Number of iterations between restarts.  Default value 20
+    maxiter : int, optional
+        Maximum number of restart cycles.  If none specified defaults to
+        10*N.
+    comm : MPI Communicator, optional
+        MPI process communication object of non distributed operands.  If
+        none specified defaults to MPI.COMM_WORLD
+
+    Returns
+    -------
+    x : MPIArray
+        Block distributed solution, partitioned like the rows of A.
+    info : int
+        0 if converged, maxiter otherwise.
+    """
+    A, vector_layout, local_b, local_x, matvec = \
+        _krylov_operands(A, b, x0, comm)
+    comm = A.comm
+    maxiter = 10 * A.globalshape[0] if maxiter is None else maxiter
+    restart = max(1, min(restart, A.globalshape[0]))
+
+    b_dot, = _fused_dots(comm, [(local_b, local_b)])
+    threshold = max(tol * np.sqrt(b_dot.real), atol)
+    basis = np.empty((restart + 1, len(local_b)), dtype=local_b.dtype)
+    hessenberg = np.zeros((restart + 1, restart), dtype=local_b.dtype)
+    residual_norm = np.inf
+    for cycle in range(maxiter + 1):
+        local_r = local_b - matvec(local_x)
+        residual_norm = np.sqrt(_fused_dots(comm, [(local_r, local_r)])[0]
+                                .real)
+        if residual_norm <= threshold or cycle == maxiter:
+            break
+
+        basis[0] = local_r / residual_norm
+        hessenberg[:] = 0
+        rhs = np.zeros(restart + 1, dtype=local_b.dtype)
+        rhs[0] = residual_norm
+        for column in range(restart):
+            local_w = matvec(basis[column])
+            for _ in range(2):
+                sums = np.append(basis[:column + 1].conj() @ local_w,
+                                 np.vdot(local_w, local_w))
+                comm.Allreduce(MPI.IN_PLACE, sums, op=MPI.SUM)
+                projections = sums[:-1]
+                local_w -= projections @ basis[:column + 1]
+                hessenberg[:column + 1, column] += projections
+            #Norm of the orthogonalized vector follows from Pythagoras
+            norm = np.sqrt(max(sums[-1].real -
+                               np.sum(np.abs(projections)**2), 0.))
+            hessenberg[column + 1, column] = norm
+
+            #Small least-squares problem is solved redundantly by every rank
+            y = np.linalg.lstsq(hessenberg[:column + 2, :column + 1],
+                                rhs[:column + 2], rcond=None)[0]
+            estimate = np.linalg.norm(rhs[:column + 2] -
+                                      hessenberg[:column + 2, :column + 1] @ y)
+            if estimate <= threshold or norm == 0:
+                break
+            basis[column + 1] = local_w / norm
+        local_x += y @ basis[:column + 1]
+
+    info = 0 if residual_norm <= threshold else maxiter
+    return Distribution_Dict['b'](local_x, layout=vector_layout), info
+
+
+def qr(a, mode='reduced', comm=MPI.COMM_WORLD):
+    """ QR factorization of a matrix partitioned by rows, computed with the
+        tall-skinny QR(TSQR) algorithm.  Each process factors its rows
+        locally, R factors are reduced along a binary tree of the processes
+        and Q is recovered walking the tree back down.  Only R sized factors
+        are communicated, O(N^2 log P) data for a matrix of N columns.
+
+    Parameters
+    ----------
+    a : MPIArray, array_like
+        Matrix of shape (M, N).
+    mode : {'reduced', 'r'}, optional
+        'reduced' returns Q and R with K = min(M, N), 'r' returns R only.
+        Default value 'reduced'
+    comm : MPI Communicator, optional
+        MPI process communication object of non distributed operands.  If
+        none specified defaults to MPI.COMM_WORLD
+
+    Returns
+    -------
+    q : MPIArray
+        Block distributed orthonormal matrix of shape (M, K), partitioned
+        like the rows of a.  Not returned for mode 'r'.
+    r : MPIArray
+        Replicated upper triangular matrix of shape (K, N).
+    """
+    if mode not in ('reduced', 'r'):
+        raise NotSupportedError("only 'reduced' and 'r' modes supported.")
+    a = _row_operand(a, comm)
+    if a.globalndim != 2:
+        raise ValueError('a must be a 2-D array.')
+    local_q, r = _tsqr(a, compute_q=mode == 'reduced')
+    r = Distribution_Dict['r'](r, comm=a.comm)
+    if mode == 'r':
+        return r
+    return Distribution_Dict['b'](
+        local_q,
+        layout=_row_layout(a.layout, (a.globalshape[0], r.shape[0]))), r
+
+
+def svd(a, full_matrices=False, compute_uv=True, comm=MPI.COMM_WORLD):
+    """ Singular value decomposition of a matrix partitioned by rows.  The
+        R factor of a TSQR factorization is decomposed redundantly by every
+        process, left singular vectors are the local rows of Q multiplied
+        by those of R.
+
+    Parameters
+    ----------
+    a : MPIArray, array_like
+        Matrix of shape (M, N).
+    full_matrices : bool, optional
+        Full matrices are only supported for M <= N.  Default value False
+    compute_uv : bool, optional
+        Compute u and vh in addition to s.  Default value True
+    comm : MPI Communicator, optional
+        MPI process communication object of non distributed operands.  If
+        none specified defaults to MPI.COMM_WORLD
+
+    Returns
+    -------
+    u : MPIArray
+        Block distributed left singular vectors, partitioned like the rows
+        of a.  Not returned if compute_uv is False.
+    s : MPIArray
+        Replicated singular values in descending order.
+    vh : MPIArray
+        Replicated right singular vectors.  Not returned if compute_uv is
+        False.
+    """
+    a = _row_operand(a, comm)
+    if a.globalndim != 2:
+        raise ValueError('a must be a 2-D array.')
+    rows, cols = a.globalshape
+    if compute_uv and full_matrices and rows > cols:
+        raise NotSupportedError(
+            'full_matrices only supported for matrices with M <= N.')
+    comm = a.comm
+    local_q, r = _tsqr(a, compute_q=compute_uv)
+    if not compute_uv:
+        return Distribution_Dict['r'](np.linalg.svd(r, compute_uv=False),
+                                      comm=comm)
+
+    r_u, s, vh = np.linalg.svd(r, full_matrices=full_matrices)
+    return Distribution_Dict['b'](
+               local_q @ r_u,
+               layout=_row_layout(a.layout, (rows, r_u.shape[1]))), \
+           Distribution_Dict['r'](s, comm=comm), \
+           Distribution_Dict['r'](vh, comm=comm)
+
+
+def pca(a, n_components=None, comm=MPI.COMM_WORLD):
+    """ Principal component analysis of samples partitioned by rows, based
+        on the singular value decomposition of the mean centered samples.
+
+    Parameters
+    ----------
+    a : MPIArray, array_like
+        Samples of shape (M, N), one sample of N features per row.
+    n_components : int, optional
+        Number of components kept.  If none specified defaults to
+        min(M, N).
+    comm : MPI Communicator, optional
+        MPI process communication object of non distributed operands.  If
+        none specified defaults to MPI.COMM_WORLD
+
+    Returns
+    -------
+    scores : MPIArray
+        Block distributed projections of the centered samples onto the
+        components, shape (M, n_components).
+    components : MPIArray
+        Replicated principal axes in feature space, shape (n_components, N).
+    explained_variance : MPIArray
+        Replicated variance explained by each component.
+    """
+    a = _row_operand(a, comm)
+    if a.globalndim != 2:
+        raise ValueError('a must be a 2-D array.')
+    rows, cols = a.globalshape
+    n_components = min(rows, cols) if n_components is None else n_components
+    if not 0 < n_components <= min(rows, cols):
+        raise ValueError('n_components must be between 1 and ' +
+                         '{}.'.format(min(rows, cols)))
+    comm = a.comm
+
+    centered = np.asarray(a) - np.asarray(a.mean(axis=0))
+    u, s, vh = svd(Distribution_Dict['b'](centered, layout=a.layout))
+    s = np.asarray(s)[:n_components]
+    scores = np.asarray(u)[:, :n_components] * s
+    return Distribution_Dict['b'](
+               np.ascontiguousarray(scores),
+               layout=_row_layout(a.layout, (rows, n_components))), \
+           Distribution_Dict['r'](np.asarray(vh)[:n_components], comm=comm), \
+           Distribution_Dict['r'](s**2 / max(rows - 1, 1), comm=comm)
+
+
+def _local_qr(data):
+    """ Reduced QR factorization of local data, empty data is factored into
+        empty matrices.
+    """
+    if data.shape[0] == 0:
+        return np.empty((0, 0), dtype=data.dtype), \
+               np.empty((0, data.shape[1]), dtype=data.dtype)
+    return np.linalg.qr(data)
+
+
+def _tsqr(a, compute_q=True):
+    """ TSQR factorization of the local rows of a Block matrix.  Returns the
+        local rows of Q, None if not computed, and the replicated R factor.
+    """
+    comm = a.comm
+    size = comm.Get_size()
+    rank = comm.Get_rank()
+    cols = a.globalshape[1]
+    dtype = a.dtype if a.dtype.kind in 'fc' else np.dtype(np.float64)
+    local_q, r = _local_qr(np.asarray(a, dtype=dtype))
+
+    #Rows of the R factor held by each rank before every level of the tree
+    rows = np.minimum(np.diff(a.layout.partitions(0), axis=1).ravel(), cols)
+    level_rows = []
+    step = 1
+    while step < size:
+        level_rows.append(rows.copy())
+        for receiver in range(0, size - step, 2 * step):
+            rows[receiver] = min(rows[receiver] + rows[receiver + step], cols)
+        step *= 2
+
+    #R factors of pairs of subtrees are stacked and factored by the receiver
+    levels = []
+    parent = None
+    for level in range(len(level_rows)):
+        step = 1 << level
+        if rank % (2 * step) == step:
+            comm.Send(np.ascontiguousarray(r), dest=rank - step, tag=level)
+            parent = (rank - step, level, level_rows[level][rank])
+            break
+        partner = rank + step
+        if partner < size:
+            received = np.empty((level_rows[level][partner], cols),
+                                dtype=dtype)
+            comm.Recv(received, source=partner, tag=level)
+            level_q, r = _local_qr(np.vstack((r, received)))
+            levels.append((partner, level, level_rows[level][rank], level_q))
+
+    final_rows = int(rows[0])
+    if rank != 0:
+        r = np.empty((final_rows, cols), dtype=dtype)
+    comm.Bcast(r, root=0)
+    if not compute_q:
+        return None, r
+
+    #Products of the Q factors of the tree are passed back down
+    if parent is None:
+        coefficients = np.eye(final_rows, dtype=dtype)
+    else:
+        coefficients = np.empty((parent[2], final_rows), dtype=dtype)
+        comm.Recv(coefficients, source=parent[0], tag=parent[1])
+    for partner, level, own_rows, level_q in reversed(levels):
+        stacked = level_q @ coefficients
+        comm.Send(np.ascontiguousarray(stacked[own_rows:]), dest=partner,
+                  tag=level)
+        coefficients = stacked[:own_rows]
+    return np.ascontiguousarray(local_q @ coefficients), r
+
+
+def _operand_shape(operand):
+    return operand.globalshape if isinstance(operand, MPIArray) \
+        else operand.shape
+
+
+def _row_operand(operand, comm):
+    """ Helper method to partition operands by rows in Block layouts,
+        non distributed operands are sliced without communication.
+    """
+    if isinstance(operand, MPIArray) and not is_Replicated(operand.dist):
+        return _block_operand(operand)
+    if isinstance(operand, MPIArray):
+        comm = operand.comm
+    operand = np.asarray(operand)
+    layout = get_layout(operand.shape, 'b', comm=comm)
+    return Distribution_Dict['b'](
+        np.ascontiguousarray(operand[layout.rank_index()]), layout=layout)
+
+
+def _local_rows(operand, layout):
+    """ Local data of operand for the rows held in a Block layout. """
+    if isinstance(operand, MPIArray) and not is_Replicated(operand.dist):
+        if operand.comm != layout.comm:
+            raise ValueError('operands must share a communicator.')
+        return redistribute(np.asarray(operand), operand.layout, layout)
+    return np.asarray(operand)[layout.rank_index()]
+
+
+def _fused_dots(comm, pairs):
+    """ Global inner products of pairs of local vectors reduced with a
+        single Allreduce.
+    """
+    sums = np.array([np.vdot(u, v) for u, v in pairs])
+    comm.Allreduce(MPI.IN_PLACE, sums, op=MPI.SUM)
+    return sums
+
+
+def _krylov_operands(A, b, x0, comm):
+    """ Helper method to partition the operands of iterative solvers by the
+        rows of A.  Returns A, the layout of vectors, local copies of b and
+        x0, and the matrix vector product of local vectors.
+    """
+    A = _row_operand(A, comm)
+    if A.globalndim != 2 or A.globalshape[0] != A.globalshape[1]:
+        raise ValueError('A must be a square 2-D array.')
+    size = A.globalshape[0]
+    b = b if isinstance(b, MPIArray) else np.asarray(b)
+    if _operand_shape(b) != (size,):
+        raise ValueError('b must be of shape ({},).'.format(size))
+    vector_layout = _row_layout(A.layout, (size,))
+    dtype = np.result_type(A.dtype, b.dtype, np.float64)
+    local_b = np.array(_local_rows(b, vector_layout), dtype=dtype)
+    if x0 is None:
+        local_x = np.zeros_like(local_b)
+    else:
+        x0 = x0 if isinstance(x0, MPIArray) else np.asarray(x0)
+        if _operand_shape(x0) != (size,):
+            raise ValueError('x0 must be of shape ({},).'.format(size))
+        local_x = np.array(_local_rows(x0, vector_layout), dtype=dtype)
+
+    #Vector is gathered with counts computed once
+    local_A = np.asarray(A)
+    counts, displacements = get_vector_counts(
+        np.diff(A.layout.partitions(0), axis=1).ravel())
+    full_vector = np.empty(size, dtype=dtype)
+    mpi_dtype = get_mpi_datatype(dtype)
 
-    comm_dims = get_comm_dims(size, 'b')
-    comm_coord = get_cart_coords(comm_dims, size, rank)
+    def matvec(local_vector):
+        A.comm.Allgatherv(np.ascontiguousarray(local_vector),
+                          [full_vector, counts, displacements, mpi_dtype])
+        return local_A @ full_vector
 
-    return Distribution_Dict['b'](C.getValues(range(A_row_start, A_row_end),
-                                              range(b_global_cols)),
-                                              comm=comm,
-                                              comm_dims=comm_dims,
-                                              comm_coord=comm_coord)
+    return A, vector_layout, local_b, local_x, matvec
@@ -0,0 +1,73 @@
+from mpi4py import MPI
+from petsc4py import PETSc
+import numpy as np
+
+from mpids.MPInumpy.distributions.Block import Block
+from mpids.MPInumpy.errors import NotSupportedError, ValueError
+from mpids.MPInumpy.layout import Layout
+from mpids.MPInumpy.utils import get_cart_coords, get_comm_dims
+
+__all__ = ['from_petsc']
+
+
+def from_petsc(petsc_object, comm=MPI.COMM_WORLD):
+    """ Block distributed view of the local data of a PETSc object, see
+        MPIArray.to_petsc for the reverse direction.  No data is copied, the
+        result shares the memory of the PETSc object and keeps it alive.
+
+    Parameters
+    ----------
+    petsc_object : PETSc.Vec, PETSc.Mat
+        Vec or dense Mat, rows are held by the process owning them in
+        PETSc.
+    comm : MPI Communicator, optional
+        MPI process communication object of the result, must contain the
+        processes of petsc_object in the same order.  If none specified
+        defaults to MPI.COMM_WORLD
+
+    Returns
+    -------
+    MPIArray : numpy.ndarray sub class
+        Block distributed array partitioned by the ownership ranges of
+        petsc_object.
+    """
+    if isinstance(petsc_object, PETSc.Vec):
+        local_data = petsc_object.getArray()
+        globalshape = (petsc_object.getSize(),)
+    elif isinstance(petsc_object, PETSc.Mat):
+        if petsc_object.getType() not in (PETSc.Mat.Type.SEQDENSE,
+                                          PETSc.Mat.Type.MPIDENSE):
+            raise NotSupportedError('only dense Mat objects can be viewed.')
+        local_data = petsc_object.getDenseArray()
+        globalshape = petsc_object.getSize()
+    else:
+        raise NotSupportedError('only PETSc Vec and Mat objects supported.')
+
+    #PETSc objects hold duplicates of communicators they are created with
+    if MPI.Comm.Compare(comm, petsc_object.getComm().tompi4py()) not in \
+       (MPI.IDENT, MPI.CONGRUENT):
+        raise ValueError('comm must match the communicator of petsc_object.')
+    size = comm.Get_size()
+    rank = comm.Get_rank()
+    ownership_ranges = np.asarray(petsc_object.getOwnershipRanges(),
+                                  dtype=np.int64)
+    rank_extents = np.zeros((size, len(globalshape), 2), dtype=np.int64)
+    rank_extents[:, 0, 0] = ownership_ranges[:-1]
+    rank_extents[:, 0, 1] = ownership_ranges[1:]
+    rank_extents[:, 1:, 1] = globalshape[1:]
+    comm_dims = get_comm_dims(size, 'b')
+    layout = Layout(tuple(globalshape), 'b', comm, comm_dims,
+                    get_cart_coords(comm_dims, size, rank), rank_extents)
+
+    return Block(np.asarray(_PETScBuffer(local_data, petsc_object)),
+                 layout=layout)
+
+
+class _PETScBuffer(object):
+    """ Array interface of memory owned by a PETSc object, referenced by
+        the base of arrays viewing it.
+    """
+
+    def __init__(self, local_data, petsc_object):
+        self.__array_interface__ = local_data.__array_interface__
+        self.petsc_object = petsc_object
@@ -0,0 +1,155 @@
+import numpy as np
+
+from mpids.MPInumpy.MPIArray import MPIArray
+from mpids.MPInumpy.distributions.Replicated import Replicated
+from mpids.MPInumpy.buffer_pool import release_buffer
+from mpids.MPInumpy.errors import NotSupportedError, ValueError
+from mpids.MPInumpy.layout import Layout
+from mpids.MPInumpy.mpi_utils import all_gather_v, all_to_all, all_to_all_v
+from mpids.MPInumpy.utils import is_block_distributed, is_Replicated
+
+__all__ = ['argsort', 'sort']
+
+
+def argsort(a, axis=-1, kind=None):
+    """ Indices that would sort an array along a given axis.
+
+    Parameters
+    ----------
+    a : MPIArray, array_like
+        Array to sort.
+    axis : None or int
+        Axis along which to sort, default -1.  If None the flattened array
+        is sorted.
+    kind : {'quicksort', 'mergesort', 'heapsort', 'stable'}, optional
+        Sorting algorithm of sorts along axes that are not distributed.
+        Distributed sorts are always stable.
+
+    Returns
+    -------
+    MPIArray : numpy.ndarray sub class
+        MPIArray of global indices with the distribution of a.  Indices of
+        distributed sorts are evenly Block distributed.
+    """
+    return _sort(a, axis=axis, kind=kind, return_indices=True)
+
+
+def sort(a, axis=-1, kind=None):
+    """ Sorted copy of an array along a given axis.  Arrays distributed
+        along axis are sorted with a parallel sample sort.
+
+    Parameters
+    ----------
+    a : MPIArray, array_like
+        Array to sort.
+    axis : None or int
+        Axis along which to sort, default -1.  If None the flattened array
+        is sorted.
+    kind : {'quicksort', 'mergesort', 'heapsort', 'stable'}, optional
+        Sorting algorithm of sorts along axes that are not distributed.
+        Distributed sorts are always stable.
+
+    Returns
+    -------
+    MPIArray : numpy.ndarray sub class
+        Sorted MPIArray with the distribution of a.  Results of distributed
+        sorts are evenly Block distributed.
+    """
+    return _sort(a, axis=axis, kind=kind, return_indices=False)
+
+
+def _sort(a, axis=-1, kind=None, return_indices=False):
+    local_sort = np.argsort if return_indices else np.sort
+
+    #Numpy only arrays
+    if not isinstance(a, MPIArray):
+        return local_sort(a, axis=axis, kind=kind)
+
+    if axis is not None and not -a.globalndim <= axis < a.globalndim:
+        raise ValueError("'axis' entry is out of bounds")
+    #Replicated MPIArrays
+    if is_Replicated(a.dist):
+        return Replicated(local_sort(np.asarray(a), axis=axis, kind=kind),
+                          comm=a.comm)
+
+    #Local data holds complete slices along axes that are not partitioned
+    if axis is not None and axis % a.globalndim >= len(a.layout.comm_dims):
+        return a.__class__(local_sort(np.asarray(a), axis=axis, kind=kind),
+                           layout=a.layout)
+
+    if not is_block_distributed(a.dist) or \
+       (axis is not None and a.globalndim > 1):
+        raise NotSupportedError(
+            "distributed sorts only supported for 1D or flattened 'b' arrays.")
+
+    layout = a.layout.ravel()
+    local_keys = np.asarray(a).reshape(-1)
+    if return_indices:
+        local_result = _sample_sort(local_keys, layout.local_offsets(), a.comm)
+    else:
+        local_result = _sample_sort(local_keys, None, a.comm)
+
+    #Rebalance results of all ranks to the partitions of the input
+    bucket_sizes = np.empty(a.comm.Get_size(), dtype=np.int64)
+    a.comm.Allgather(np.array(local_result.size, dtype=np.int64), bucket_sizes)
+    bucket_ends = np.cumsum(bucket_sizes)
+    bucket_layout = Layout(layout.globalshape, layout.dist, a.comm,
+                           layout.comm_dims, layout.comm_coord,
+                           np.stack((bucket_ends - bucket_sizes, bucket_ends),
+                                    axis=1)[:, np.newaxis, :],
+                           weights=layout.weights)
+
+    return a.__class__(local_result, layout=bucket_layout).rebalance()
+
+
+def _sample_sort(local_keys, local_indices, comm):
+    """ Parallel sort by regular sampling.  Local keys are sorted, every
+        rank contributes regularly spaced samples from which comm size - 1
+        splitters are selected.  Keys are then exchanged with a single
+        Alltoallv such that rank i receives the keys falling between
+        splitters i - 1 and i, which are merged locally.
+
+        Equal keys always land on the same rank and runs of keys of lower
+        ranks are merged first, keeping the sort stable.  If local_indices
+        are specified the global indices of the sorted keys are returned
+        instead of the keys.
+    """
+    size = comm.Get_size()
+
+    if local_indices is None:
+        send_data = np.sort(local_keys, kind='stable')
+        sorted_keys = send_data
+    else:
+        local_order = np.argsort(local_keys, kind='stable')
+        send_data = np.empty(local_keys.size,
+                             dtype=[('key', local_keys.dtype),
+                                    ('index', np.int64)])
+        send_data['key'] = local_keys[local_order]
+        send_data['index'] = local_indices[local_order]
+        sorted_keys = send_data['key']
+
+    #Regular sampling, local keys contribute size samples
+    local_samples = sorted_keys[(np.arange(size) * sorted_keys.size) // size] \
+        if sorted_keys.size else sorted_keys[:0]
+    samples = np.sort(all_gather_v(local_samples, comm=comm))
+    #No samples are drawn from empty arrays, any splitters will do
+    splitters = samples[(np.arange(1, size) * samples.size) // size] \
+        if samples.size else np.zeros(size - 1, dtype=samples.dtype)
+
+    #Keys equal to a splitter are kept with the lower bucket
+    bucket_ends = np.searchsorted(sorted_keys, splitters, side='right')
+    send_counts = np.diff(np.concatenate(([0], bucket_ends,
+                                          [sorted_keys.size]))).astype(np.int64)
+    recv_counts = all_to_all(send_counts, comm=comm)
+
+    if local_indices is None:
+        recv_data = all_to_all_v(send_data, send_counts, recv_counts, comm=comm)
+        #Received runs are sorted, stable sort merges them in source order
+        return np.sort(recv_data, kind='stable')
+
+    #Keys and indices are exchanged together as records
+    recv_data = all_to_all_v(send_data, send_counts, recv_counts, comm=comm)
+    merge_order = np.argsort(recv_data['key'], kind='stable')
+    sorted_indices = recv_data['index'][merge_order]
+    release_buffer(recv_data)
+    return sorted_indices
@@ -0,0 +1,123 @@
+from mpi4py import MPI
+import warnings
+import numpy as np
+
+from mpids.MPInumpy.MPIArray import MPIArray
+from mpids.MPInumpy.distributions.Replicated import Replicated
+from mpids.MPInumpy._transpose import transpose
+from mpids.MPInumpy.errors import NotSupportedError, ValueError
+from mpids.MPInumpy.layout import get_layout, redistribute
+from mpids.MPInumpy.mpi_utils import all_reduce_comoments
+from mpids.MPInumpy.utils import determine_local_comoments, \
+                                 is_block_distributed,      \
+                                 is_Replicated
+
+__all__ = ['corrcoef', 'cov']
+
+
+def cov(m, y=None, rowvar=True, bias=False, ddof=None, comm=MPI.COMM_WORLD):
+    """ Estimate a covariance matrix.  Each process centers its observations
+        on their local means and forms their Gram matrix, local results are
+        combined with the pairwise update of Chan et al. in a single
+        Allreduce of O(d^2) data.
+
+    Parameters
+    ----------
+    m : MPIArray, array_like
+        1-D or 2-D array of variables and observations.
+    rowvar : bool, optional
+        If True each row represents a variable with observations in the
+        columns, otherwise each column represents a variable.  Distributed
+        arrays with variables in rows are transposed first.
+        Default value True
+    bias : bool, optional
+        Normalize by the number of observations N instead of N - 1.
+        Default value False
+    ddof : int, optional
+        Normalize by N - ddof, overrides bias if specified.
+    comm : MPI Communicator, optional
+        MPI process communication object of non distributed arrays.  If none
+        specified defaults to MPI.COMM_WORLD
+
+    Returns
+    -------
+    MPIArray : numpy.ndarray sub class
+        Replicated covariance matrix of the variables.
+    """
+    if y is not None:
+        raise NotSupportedError("'y' field not supported")
+    #Numpy only arrays and Replicated MPIArrays
+    if not isinstance(m, MPIArray) or is_Replicated(m.dist):
+        comm = m.comm if isinstance(m, MPIArray) else comm
+        return Replicated(np.cov(np.asarray(m), rowvar=rowvar, bias=bias,
+                                 ddof=ddof),
+                          comm=comm)
+
+    if m.globalndim > 2:
+        raise ValueError('m has more than 2 dimensions')
+    if np.iscomplexobj(m):
+        raise NotSupportedError('complex data not supported.')
+    observations = _local_observations(m, rowvar)
+    variables = observations.shape[1]
+    comoments = all_reduce_comoments(determine_local_comoments(observations),
+                                     comm=m.comm)
+    if ddof is None:
+        ddof = 0 if bias else 1
+    fact = comoments[0] - ddof
+    if fact <= 0:
+        warnings.warn('Degrees of freedom <= 0 for slice', RuntimeWarning,
+                      stacklevel=2)
+        fact = 0.0
+    covariance = comoments[variables + 1:].reshape(variables, variables) * \
+                 np.true_divide(1, fact)
+    return Replicated(covariance.squeeze(), comm=m.comm)
+
+
+def corrcoef(x, y=None, rowvar=True, comm=MPI.COMM_WORLD):
+    """ Pearson product-moment correlation coefficients, see cov.
+
+    Parameters
+    ----------
+    x : MPIArray, array_like
+        1-D or 2-D array of variables and observations.
+    rowvar : bool, optional
+        If True each row represents a variable with observations in the
+        columns, otherwise each column represents a variable.
+        Default value True
+    comm : MPI Communicator, optional
+        MPI process communication object of non distributed arrays.  If none
+        specified defaults to MPI.COMM_WORLD
+
+    Returns
+    -------
+    MPIArray : numpy.ndarray sub class
+        Replicated correlation coefficient matrix of the variables.
+    """
+    covariance = cov(x, y, rowvar, comm=comm)
+    comm = covariance.comm
+    coefficients = np.array(covariance)
+    #Scalar covariance, nan if incorrect value(nan, inf, 0), 1 otherwise
+    if coefficients.ndim == 0:
+        return Replicated(coefficients / coefficients, comm=comm)
+
+    stddev = np.sqrt(np.diag(coefficients).real)
+    coefficients /= stddev[:, None]
+    coefficients /= stddev[None, :]
+    np.clip(coefficients, -1, 1, out=coefficients)
+    return Replicated(coefficients, comm=comm)
+
+
+def _local_observations(m, rowvar):
+    """ Local observations of a distributed array as rows of a Block
+        layout, one column per variable.
+    """
+    #Single rows are treated as a variable, as by numpy
+    if m.globalndim == 2 and (rowvar or m.globalshape[0] == 1):
+        m = transpose(m)
+    if not is_block_distributed(m.dist):
+        layout = get_layout(m.globalshape, 'b', comm=m.comm)
+        local_data = redistribute(np.asarray(m), m.layout, layout)
+    else:
+        local_data = np.asarray(m)
+    return local_data.reshape(local_data.shape[0],
+                              int(np.prod(m.globalshape[1:])))
@@ -0,0 +1,174 @@
+from mpi4py import MPI
+import numpy as np
+
+from mpids.MPInumpy.MPIArray import MPIArray
+from mpids.MPInumpy.distributions.Replicated import Replicated
+from mpids.MPInumpy.errors import ValueError
+from mpids.MPInumpy.layout import Layout, get_layout, redistribute
+from mpids.MPInumpy.mpi_utils import all_to_all_w, get_mpi_datatype
+from mpids.MPInumpy.utils import is_block_distributed, is_Replicated
+
+__all__ = ['swapaxes', 'transpose']
+
+
+def swapaxes(a, axis1, axis2):
+    """ Interchange two axes of an array.
+
+    Parameters
+    ----------
+    a : MPIArray, array_like
+        Input array.
+    axis1 : int
+        First axis.
+    axis2 : int
+        Second axis.
+
+    Returns
+    -------
+    MPIArray : numpy.ndarray sub class
+        MPIArray with the distribution of a, see transpose.
+    """
+    #Numpy only arrays
+    if not isinstance(a, MPIArray):
+        return np.swapaxes(a, axis1, axis2)
+    axes = list(range(a.globalndim))
+    axis1, axis2 = _check_axes((axis1, axis2), a.globalndim)
+    axes[axis1], axes[axis2] = axes[axis2], axes[axis1]
+    return transpose(a, axes)
+
+
+def transpose(a, axes=None):
+    """ Permute the axes of an array.  Block distributed arrays are
+        redistributed among the processes with a single Alltoallw, derived
+        datatypes select the data sent to each rank, also from strided views,
+        and place received data at its transposed position without
+        intermediate copies.
+
+    Parameters
+    ----------
+    a : MPIArray, array_like
+        Input array.
+    axes : tuple or list of ints, optional
+        Permutation of the axes of a.  If none specified the order of the
+        axes is reversed.
+
+    Returns
+    -------
+    MPIArray : numpy.ndarray sub class
+        MPIArray with the distribution of a.  Distributed results are
+        partitioned along the new axis 0.
+    """
+    #Numpy only arrays
+    if not isinstance(a, MPIArray):
+        return np.transpose(a, axes)
+    ndim = a.globalndim
+    axes = tuple(reversed(range(ndim))) if axes is None \
+        else _check_axes(axes, ndim)
+    if sorted(axes) != list(range(ndim)):
+        raise ValueError("axes don't match array")
+    #Replicated MPIArrays
+    if is_Replicated(a.dist):
+        return Replicated(np.ascontiguousarray(np.transpose(np.asarray(a),
+                                                            axes)),
+                          comm=a.comm)
+
+    layout = a.layout
+    if is_block_distributed(a.dist):
+        local_data = np.asarray(a)
+        if local_data.size and min(local_data.strides) < 0:
+            local_data = np.ascontiguousarray(local_data)
+        local_result, result_layout = \
+            _block_transpose(local_data, layout, axes)
+        return a.__class__(local_result, layout=result_layout)
+
+    #Other distributions are transposed through their Block equivalent
+    block_layout = get_layout(layout.globalshape, 'b', comm=a.comm)
+    local_result, result_layout = \
+        _block_transpose(redistribute(np.asarray(a), layout, block_layout),
+                         block_layout, axes)
+    desired_layout = get_layout(result_layout.globalshape, a.dist,
+                                comm=a.comm, block_size=layout.block_size)
+    return a.__class__(redistribute(local_result, result_layout,
+                                    desired_layout),
+                       layout=desired_layout)
+
+
+def _check_axes(axes, ndim):
+    #Axes are normalized to non-negative values
+    axes = tuple(int(axis) for axis in np.ravel(axes))
+    if any(not -ndim <= axis < ndim for axis in axes):
+        raise ValueError("'axis' entry is out of bounds")
+    return tuple(axis % ndim for axis in axes)
+
+
+def _block_transpose(local_data, layout, axes):
+    """ Transpose local data with non-negative strides of a Block layout,
+        returns the local data and layout of the result partitioned along
+        the new axis 0.
+    """
+    result_shape = tuple(layout.globalshape[axis] for axis in axes)
+    #Partitioned axis is kept, data is transposed locally
+    if axes[0] == 0:
+        result_layout = Layout(result_shape, layout.dist, layout.comm,
+                               layout.comm_dims, layout.comm_coord,
+                               layout.rank_extents[:, list(axes)],
+                               weights=layout.weights)
+        return np.ascontiguousarray(local_data.transpose(axes)), result_layout
+
+    comm = layout.comm
+    result_layout = get_layout(result_shape, layout.dist, comm=comm,
+                               weights=layout.weights)
+    local_result = np.empty(result_layout.local_shape, dtype=local_data.dtype)
+    base_type = get_mpi_datatype(local_data.dtype)
+    #Axis of the source partitioned in the result, and result axis
+    ##receiving the partitioned axis of the source
+    split_axis = axes[0]
+    merge_axis = axes.index(0)
+
+    datatypes = []
+    send_types = []
+    recv_types = []
+    local_start, local_end = result_layout.rank_extents[comm.Get_rank(), 0]
+    for rank in range(comm.Get_size()):
+        #Entries of the new axis 0 held by rank in the result
+        start, end = result_layout.rank_extents[rank, 0]
+        subsizes = list(local_data.shape)
+        subsizes[split_axis] = end - start
+        if min(subsizes) == 0:
+            send_types.append(None)
+        else:
+            #Sub-block is read in place following the strides of local data
+            send_type = base_type
+            for axis in reversed(range(local_data.ndim)):
+                send_type = send_type.Create_hvector(
+                    subsizes[axis], 1, local_data.strides[axis])
+                datatypes.append(send_type)
+            send_type = send_type.Create_hindexed_block(
+                1, [start * local_data.strides[split_axis]]).Commit()
+            datatypes.append(send_type)
+            send_types.append(send_type)
+
+        #Rows of the source held by rank, placed along merge_axis
+        start, end = layout.rank_extents[rank, 0]
+        counts = list(layout.globalshape)
+        counts[0] = end - start
+        counts[split_axis] = local_end - local_start
+        if min(counts) == 0:
+            recv_types.append(None)
+            continue
+        #Elements arrive in the order of the source axes
+        recv_type = base_type
+        for axis in reversed(range(local_data.ndim)):
+            recv_type = recv_type.Create_hvector(
+                counts[axis], 1, local_result.strides[axes.index(axis)])
+            datatypes.append(recv_type)
+        recv_type = recv_type.Create_hindexed_block(
+            1, [start * local_result.strides[merge_axis]]).Commit()
+        datatypes.append(recv_type)
+        recv_types.append(recv_type)
+
+    all_to_all_w(local_data, send_types, local_result, recv_types, comm=comm)
+    for datatype in datatypes:
+        datatype.Free()
+
+    return local_result, result_layout
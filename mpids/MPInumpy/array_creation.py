@@ -2,15 +2,17 @@ from mpi4py import MPI
 import numpy as np
 
 from mpids.MPInumpy.distributions import Distribution_Dict
-from mpids.MPInumpy.errors import TypeError, ValueError
-from mpids.MPInumpy.utils import distribute_array, \
-                                 distribute_range, \
-                                 distribute_shape
+from mpids.MPInumpy.errors import NotSupportedError, TypeError, ValueError
+from mpids.MPInumpy.layout import broadcast_layout, get_layout
+from mpids.MPInumpy.mpi_utils import broadcast_array, scatter_v
+from mpids.MPInumpy.utils import is_block_cyclic_distributed, \
+                                 is_block_distributed,        \
+                                 is_Replicated
 
 __all__ = ['arange', 'array', 'empty', 'ones', 'zeros']
 
 def arange(start, stop=None, step=None, dtype=None, comm=MPI.COMM_WORLD,
-           root=0, dist='b'):
+           root=0, dist='b', block_size=None, weights=None):
     """ Create a MPIArray Object with evenly spaced values within specified
         interval on all procs in comm.
         See docstring for mpids.MPInumpy.MPIArray
@@ -36,35 +38,44 @@ def arange(start, stop=None, step=None, dtype=None, comm=MPI.COMM_WORLD,
         Default value 'b' : Block
         Supported types:
             'b' : Block
+            'bc' : Block-Cyclic
             'r' : Replicated
+    block_size : int, optional
+        Block size of block-cyclic distribution. If none specified
+        defaults to mpids.MPInumpy.layout.DEFAULT_BLOCK_SIZE.
+    weights : array_like, optional
+        Relative weights of all processes in comm axis 0 of Block
+        distributions is partitioned proportional to, e.g. determined by
+        mpids.MPInumpy.layout.measure_weights.  If none specified
+        axis 0 is partitioned evenly.
 
     Returns
     -------
     MPIArray : numpy.ndarray sub class
         Distributed array of evenly spaced arguments among processes.
     """
-    local_range, comm_dims, comm_coord, local_to_global = \
-        distribute_range(start, stop, step, dist, comm=comm, root=root)
+    local_range, layout = \
+        _distribute_range(start, stop, step, dist, comm=comm, root=root,
+                          block_size=block_size, weights=weights)
     local_start, local_stop, local_step = local_range
 
-    np_local_data = np.arange(local_start, local_stop, local_step, dtype=dtype)
-
-    distributed_data = Distribution_Dict[dist](np_local_data,
-                                               comm=comm,
-                                               comm_dims=comm_dims,
-                                               comm_coord=comm_coord,
-                                               local_to_global=local_to_global)
-    #Resolve global properties
-    distributed_data.globalshape
-    distributed_data.globalsize
-    distributed_data.globalnbytes
-    distributed_data.globalndim
-
+    if is_block_cyclic_distributed(dist):
+        #Local values are not a single range, evaluate held global indices
+        local_indices = layout.axis_indices(0)
+    else:
+        #Number of values follows the layout, numpy.arange of the local
+        ##range may round differently for non integer steps
+        local_indices = np.arange(layout.local_shape[0])
+    np_local_data = np.asarray(local_start + local_indices * local_step,
+                               dtype=dtype)
+
+    distributed_data = Distribution_Dict[dist](np_local_data, layout=layout)
     return distributed_data
 
 
 def array(array_data, dtype=None, copy=True, order=None, subok=False, ndmin=0,
-          comm=MPI.COMM_WORLD, root=0, dist='b'):
+          comm=MPI.COMM_WORLD, root=0, dist='b', block_size=None,
+          weights=None):
     """ Create MPIArray Object on all procs in comm.
         See docstring for mpids.MPInumpy.MPIArray
 
@@ -97,15 +108,26 @@ def array(array_data, dtype=None, copy=True, order=None, subok=False, ndmin=0,
         Default value 'b' : Block
         Supported types:
             'b' : Block
+            'bb' : Block-Block
+            'bc' : Block-Cyclic
             'r' : Replicated
+    block_size : int, optional
+        Block size of block-cyclic distribution. If none specified
+        defaults to mpids.MPInumpy.layout.DEFAULT_BLOCK_SIZE.
+    weights : array_like, optional
+        Relative weights of all processes in comm axis 0 of Block
+        distributions is partitioned proportional to, e.g. determined by
+        mpids.MPInumpy.layout.measure_weights.  If none specified
+        axis 0 is partitioned evenly.
 
     Returns
     -------
     MPIArray : numpy.ndarray sub class
         Distributed among processes.
     """
-    local_data, comm_dims, comm_coord, local_to_global = \
-        distribute_array(array_data, dist, comm=comm, root=root)
+    local_data, layout = \
+        _distribute_array(array_data, dist, comm=comm, root=root,
+                          block_size=block_size, weights=weights)
 
     np_local_data = np.array(local_data,
                              dtype=dtype,
@@ -114,22 +136,26 @@ def array(array_data, dtype=None, copy=True, order=None, subok=False, ndmin=0,
                              subok=subok,
                              ndmin=ndmin)
 
-    distributed_data = Distribution_Dict[dist](np_local_data,
-                                               comm=comm,
-                                               comm_dims=comm_dims,
-                                               comm_coord=comm_coord,
-                                               local_to_global=local_to_global)
-    #Resolve global properties
-    distributed_data.globalshape
-    distributed_data.globalsize
-    distributed_data.globalnbytes
-    distributed_data.globalndim
-
+    if np_local_data.shape == layout.local_shape:
+        distributed_data = Distribution_Dict[dist](np_local_data, layout=layout)
+    elif is_block_cyclic_distributed(dist):
+        raise NotSupportedError(
+            "ndmin exceeding array dimensions not supported for 'bc' " +
+            "distribution.")
+    else:
+        #ndmin prepended axes, global properties are resolved from local data
+        distributed_data = \
+            Distribution_Dict[dist](np_local_data,
+                                    comm=comm,
+                                    comm_dims=layout.comm_dims,
+                                    comm_coord=layout.comm_coord,
+                                    local_to_global=layout.local_to_global)
     return distributed_data
 
 
 def empty(*args, dtype=np.float64, order='C',
-          comm=MPI.COMM_WORLD, root=0, dist='b'):
+          comm=MPI.COMM_WORLD, root=0, dist='b', block_size=None,
+          weights=None):
     """ Create an empty MPIArray Object, without initializing entries,
         on all procs in comm. See docstring for mpids.MPInumpy.MPIArray
 
@@ -152,7 +178,17 @@ def empty(*args, dtype=np.float64, order='C',
         Default value 'b' : Block
         Supported types:
             'b' : Block
+            'bb' : Block-Block
+            'bc' : Block-Cyclic
             'r' : Replicated
+    block_size : int, optional
+        Block size of block-cyclic distribution. If none specified
+        defaults to mpids.MPInumpy.layout.DEFAULT_BLOCK_SIZE.
+    weights : array_like, optional
+        Relative weights of all processes in comm axis 0 of Block
+        distributions is partitioned proportional to, e.g. determined by
+        mpids.MPInumpy.layout.measure_weights.  If none specified
+        axis 0 is partitioned evenly.
 
     Returns
     -------
@@ -160,27 +196,18 @@ def empty(*args, dtype=np.float64, order='C',
         Distributed among processes with unintialized values.
     """
     shape = _validate_shape(*args)
-    local_shape, comm_dims, comm_coord, local_to_global = \
-        distribute_shape(shape, dist, comm=comm, root=root)
-
-    np_local_data = np.empty(local_shape, dtype=dtype, order=order)
-
-    distributed_data = Distribution_Dict[dist](np_local_data,
-                                               comm=comm,
-                                               comm_dims=comm_dims,
-                                               comm_coord=comm_coord,
-                                               local_to_global=local_to_global)
-    #Resolve global properties
-    distributed_data.globalshape
-    distributed_data.globalsize
-    distributed_data.globalnbytes
-    distributed_data.globalndim
+    layout = broadcast_layout(shape, dist, comm=comm, root=root,
+                              block_size=block_size, weights=weights)
 
+    np_local_data = np.empty(layout.local_shape, dtype=dtype, order=order)
+
+    distributed_data = Distribution_Dict[dist](np_local_data, layout=layout)
     return distributed_data
 
 
 def ones(*args, dtype=np.float64, order='C',
-         comm=MPI.COMM_WORLD, root=0, dist='b'):
+         comm=MPI.COMM_WORLD, root=0, dist='b', block_size=None,
+         weights=None):
     """ Create an MPIArray Object with entries filled with ones
         on all procs in comm. See docstring for mpids.MPInumpy.MPIArray
 
@@ -203,7 +230,17 @@ def ones(*args, dtype=np.float64, order='C',
         Default value 'b' : Block
         Supported types:
             'b' : Block
+            'bb' : Block-Block
+            'bc' : Block-Cyclic
             'r' : Replicated
+    block_size : int, optional
+        Block size of block-cyclic distribution. If none specified
+        defaults to mpids.MPInumpy.layout.DEFAULT_BLOCK_SIZE.
+    weights : array_like, optional
+        Relative weights of all processes in comm axis 0 of Block
+        distributions is partitioned proportional to, e.g. determined by
+        mpids.MPInumpy.layout.measure_weights.  If none specified
+        axis 0 is partitioned evenly.
 
     Returns
     -------
@@ -211,27 +248,18 @@ def ones(*args, dtype=np.float64, order='C',
         Distributed among processes with values all equal to one.
     """
     shape = _validate_shape(*args)
-    local_shape, comm_dims, comm_coord, local_to_global = \
-        distribute_shape(shape, dist, comm=comm, root=root)
-
-    np_local_data = np.ones(local_shape, dtype=dtype, order=order)
-
-    distributed_data = Distribution_Dict[dist](np_local_data,
-                                               comm=comm,
-                                               comm_dims=comm_dims,
-                                               comm_coord=comm_coord,
-                                               local_to_global=local_to_global)
-    #Resolve global properties
-    distributed_data.globalshape
-    distributed_data.globalsize
-    distributed_data.globalnbytes
-    distributed_data.globalndim
+    layout = broadcast_layout(shape, dist, comm=comm, root=root,
+                              block_size=block_size, weights=weights)
+
+    np_local_data = np.ones(layout.local_shape, dtype=dtype, order=order)
 
+    distributed_data = Distribution_Dict[dist](np_local_data, layout=layout)
     return distributed_data
 
 
 def zeros(*args, dtype=np.float64, order='C',
-          comm=MPI.COMM_WORLD, root=0, dist='b'):
+          comm=MPI.COMM_WORLD, root=0, dist='b', block_size=None,
+          weights=None):
     """ Create an MPIArray Object with entries filled with zeros
         on all procs in comm. See docstring for mpids.MPInumpy.MPIArray
 
@@ -254,7 +282,17 @@ def zeros(*args, dtype=np.float64, order='C',
         Default value 'b' : Block
         Supported types:
             'b' : Block
+            'bb' : Block-Block
+            'bc' : Block-Cyclic
             'r' : Replicated
+    block_size : int, optional
+        Block size of block-cyclic distribution. If none specified
+        defaults to mpids.MPInumpy.layout.DEFAULT_BLOCK_SIZE.
+    weights : array_like, optional
+        Relative weights of all processes in comm axis 0 of Block
+        distributions is partitioned proportional to, e.g. determined by
+        mpids.MPInumpy.layout.measure_weights.  If none specified
+        axis 0 is partitioned evenly.
 
     Returns
     -------
@@ -262,25 +300,76 @@ def zeros(*args, dtype=np.float64, order='C',
         Distributed among processes with values all equal to zero.
     """
     shape = _validate_shape(*args)
-    local_shape, comm_dims, comm_coord, local_to_global = \
-        distribute_shape(shape, dist, comm=comm, root=root)
-
-    np_local_data = np.zeros(local_shape, dtype=dtype, order=order)
-
-    distributed_data = Distribution_Dict[dist](np_local_data,
-                                               comm=comm,
-                                               comm_dims=comm_dims,
-                                               comm_coord=comm_coord,
-                                               local_to_global=local_to_global)
-    #Resolve global properties
-    distributed_data.globalshape
-    distributed_data.globalsize
-    distributed_data.globalnbytes
-    distributed_data.globalndim
+    layout = broadcast_layout(shape, dist, comm=comm, root=root,
+                              block_size=block_size, weights=weights)
 
+    np_local_data = np.zeros(layout.local_shape, dtype=dtype, order=order)
+
+    distributed_data = Distribution_Dict[dist](np_local_data, layout=layout)
     return distributed_data
 
 
+def _distribute_array(array_data, dist, comm=MPI.COMM_WORLD, root=0,
+                      block_size=None, weights=None):
+    """ Helper method for array creation routine.
+        Distributes array like data from root process among processes and
+        determines the resulting layout.
+    """
+    if is_Replicated(dist):
+        local_data = broadcast_array(np.asarray(array_data, order='C'),
+                                     comm=comm,
+                                     root=root)
+        return local_data, get_layout(local_data.shape, dist, comm=comm,
+                                      weights=weights)
+
+    array_shape = np.shape(array_data) if comm.Get_rank() == root else None
+    layout = broadcast_layout(array_shape, dist, comm=comm, root=root,
+                              block_size=block_size, weights=weights)
+
+    array_data = np.asarray(array_data, order='C')
+    #Blocks spanning multiple axes or cycles are packed in rank order on root
+    if comm.Get_rank() == root and not is_block_distributed(dist):
+        array_data = np.concatenate(
+            [array_data[layout.rank_index(rank)].ravel()
+             for rank in range(comm.Get_size())])
+
+    #Layout already knows the shapes of all ranks, no gather required
+    local_data = scatter_v(array_data, comm=comm, root=root, layout=layout)
+    return local_data, layout
+
+
+def _distribute_range(start, stop, step, dist, comm=MPI.COMM_WORLD, root=0,
+                      block_size=None, weights=None):
+    """ Helper method for range based array creation routine.
+        Determines process local start, stop, and step of global range
+        on root process along with the resulting layout.
+    """
+    stop  = start if stop is None else stop
+    start = 0 if stop == start else start
+    step  = 1 if step is None else step
+
+    global_range_info = np.array([start, stop, step])
+    global_start, global_stop, global_step = \
+        broadcast_array(global_range_info, comm=comm, root=root)
+
+    #Length of numpy.arange, empty if stop is not reached by step
+    global_shape = \
+        tuple([max(0, int(np.ceil((global_stop - global_start) /
+                                  global_step)))])
+    layout = get_layout(global_shape, dist, comm=comm, block_size=block_size,
+                        weights=weights)
+
+    if is_Replicated(dist) or is_block_cyclic_distributed(dist):
+        local_start = global_start
+        local_stop  = global_stop
+    else:
+        local_start = global_start + layout.local_to_global[0][0] * global_step
+        local_stop  = global_start + layout.local_to_global[0][1] * global_step
+
+    local_range = (local_start, local_stop, global_step)
+    return local_range, layout
+
+
 def _validate_shape(*args):
     """ Helper method for shape based array creation routines.
         Verifies user specified shape is either int or tuple of ints.
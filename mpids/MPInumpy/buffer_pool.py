@@ -0,0 +1,213 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+import weakref
+import numpy as np
+
+from mpids.MPInumpy.errors import ValueError
+
+__all__ = ['BufferPool', 'buffer_pool', 'get_buffer_pool', 'release_buffer']
+
+#Smallest bucket, buffers are rounded up to powers of two bytes
+MIN_BUCKET_BYTES = 256
+#Default maximum number of bytes held by a pool
+DEFAULT_MAX_BYTES = 2**28
+#Pools activated with buffer_pool, innermost last
+_active_pools = []
+
+
+class BufferPool(object):
+    """ Size bucketed pool of receive buffers.  Buffers are drawn with
+        empty and handed back with release, held buffers are reused by
+        later requests of the same bucket.  Least recently released
+        buffers are freed once more than max_bytes are held.
+
+    Attributes
+    ----------
+    max_bytes : int
+        Maximum number of bytes held by the pool.
+    hits : int
+        Number of requests served with a held buffer.
+    misses : int
+        Number of requests served with a newly allocated buffer.
+    evictions : int
+        Number of held buffers freed to stay within max_bytes.
+    bytes_held : int
+        Number of bytes of buffers held by the pool.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        if max_bytes < 0:
+            raise ValueError('max_bytes must be non-negative.')
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_held = 0
+        #Held buffers of each bucket, and of all buckets in release order
+        self._buckets = {}
+        self._held = OrderedDict()
+        #Buffers drawn from the pool, only these are accepted by release
+        self._lent = weakref.WeakValueDictionary()
+
+
+    def empty(self, shape, dtype=np.float64):
+        """ Uninitialized array drawn from the pool.
+
+        Parameters
+        ----------
+        shape : int, tuple of int
+            Shape of the array.
+        dtype : numpy.dtype, optional
+            Data type of the array.  If none specified defaults to float64.
+
+        Returns
+        -------
+        array : numpy.ndarray
+            C contiguous array viewing a pooled buffer.
+        """
+        dtype = np.dtype(dtype)
+        shape = tuple(int(length) for length in np.ravel(shape))
+        nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        if nbytes == 0:
+            return np.empty(shape, dtype=dtype)
+
+        bucket = max(MIN_BUCKET_BYTES, 1 << (nbytes - 1).bit_length())
+        held = self._buckets.get(bucket)
+        if held:
+            #Most recently released buffers are most likely still cached
+            buffer_id, buffer = held.popitem()
+            del self._held[buffer_id]
+            self.bytes_held -= bucket
+            self.hits += 1
+        else:
+            buffer = np.empty(bucket, dtype=np.uint8)
+            self.misses += 1
+        self._lent[id(buffer)] = buffer
+        return buffer[:nbytes].view(dtype).reshape(shape)
+
+
+    def release(self, array):
+        """ Hand back the buffer viewed by an array drawn from the pool.
+            The array and all other views of the buffer must not be used
+            afterwards.  Arrays not drawn from the pool are ignored.
+
+        Parameters
+        ----------
+        array : numpy.ndarray
+            Array returned by empty, or any view of it.
+
+        Returns
+        -------
+        released : bool
+            'True' if the buffer was handed back to the pool.
+        """
+        buffer = array
+        while isinstance(buffer.base, np.ndarray):
+            buffer = buffer.base
+        if self._lent.get(id(buffer)) is not buffer:
+            return False
+        del self._lent[id(buffer)]
+        if buffer.size > self.max_bytes:
+            return True
+
+        buffer_id = id(buffer)
+        bucket = self._buckets.setdefault(buffer.size, OrderedDict())
+        bucket[buffer_id] = buffer
+        self._held[buffer_id] = buffer
+        self.bytes_held += buffer.size
+        while self.bytes_held > self.max_bytes:
+            buffer_id, buffer = self._held.popitem(last=False)
+            del self._buckets[buffer.size][buffer_id]
+            self.bytes_held -= buffer.size
+            self.evictions += 1
+        return True
+
+
+    def clear(self):
+        """ Free all buffers held by the pool. """
+        self._buckets.clear()
+        self._held.clear()
+        self.bytes_held = 0
+
+
+    def stats(self):
+        """ Usage statistics of the pool.
+
+        Returns
+        -------
+        stats : dict
+            Number of hits, misses and evictions, and the number of
+            buffers and bytes held by the pool.
+        """
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'buffers_held': len(self._held),
+                'bytes_held': self.bytes_held}
+
+
+@contextmanager
+def buffer_pool(max_bytes=DEFAULT_MAX_BYTES, pool=None):
+    """ Context in which MPInumpy collectives and reductions draw their
+        receive buffers from a pool instead of allocating new ones.
+        Temporary buffers are handed back by the routines themselves,
+        results can be handed back with release_buffer once no longer
+        used.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Maximum number of bytes held by a new pool.  If none specified
+        defaults to DEFAULT_MAX_BYTES.
+    pool : BufferPool, None
+        Pool to activate, allows buffers to be reused across contexts.
+        If none specified a new pool is created and cleared on exit.
+
+    Returns
+    -------
+    pool : BufferPool
+        Active pool of the context, holding its usage statistics.
+    """
+    created = pool is None
+    if created:
+        pool = BufferPool(max_bytes)
+    _active_pools.append(pool)
+    try:
+        yield pool
+    finally:
+        _active_pools.pop()
+        if created:
+            pool.clear()
+
+
+def get_buffer_pool():
+    """ Get innermost active pool, see buffer_pool.
+
+    Returns
+    -------
+    pool : BufferPool, None
+        Active pool, None outside of buffer_pool contexts.
+    """
+    return _active_pools[-1] if _active_pools else None
+
+
+def empty_buffer(shape, dtype):
+    """ Uninitialized receive buffer, drawn from the active pool if any. """
+    pool = get_buffer_pool()
+    if pool is None:
+        return np.empty(shape, dtype=dtype)
+    return pool.empty(shape, dtype)
+
+
+def release_buffer(array):
+    """ Hand back the buffer of an array to the active pool, see
+        BufferPool.release.  Does nothing outside of buffer_pool contexts.
+
+    Parameters
+    ----------
+    array : numpy.ndarray
+        Array returned by an MPInumpy routine, must not be used afterwards.
+    """
+    pool = get_buffer_pool()
+    if pool is not None:
+        pool.release(array)
@@ -2,13 +2,19 @@ from mpi4py import MPI
 import numpy as np
 
 from mpids.MPInumpy.MPIArray import MPIArray
+from mpids.MPInumpy._cumulative import cumprod, cumsum
+from mpids.MPInumpy._indexing import compress, take
+from mpids.MPInumpy._sorting import argsort, sort
+from mpids.MPInumpy._transpose import swapaxes, transpose
+from mpids.MPInumpy.buffer_pool import empty_buffer, release_buffer
 from mpids.MPInumpy.errors import NotSupportedError, ValueError
-from mpids.MPInumpy.utils import determine_redistribution_counts_from_shape, \
-                                 distribute_shape,                           \
-                                 format_indexed_result,                      \
-                                 global_to_local_key
+from mpids.MPInumpy.futures import MPIFuture
+from mpids.MPInumpy.layout import Layout, gather_layout, get_layout, \
+                                  redistribute, redistribute_async
+from mpids.MPInumpy.utils import determine_global_selection, is_Replicated
 
-from mpids.MPInumpy.mpi_utils import all_gather_v, all_to_all_v
+from mpids.MPInumpy.mpi_utils import all_gather_v, all_gather_v_async, \
+                                     get_mpi_datatype, get_vector_counts
 from mpids.MPInumpy.distributions.Replicated import Replicated
 
 
@@ -17,36 +23,227 @@ from mpids.MPInumpy.distributions.Replicated import Replicated
 """
 class Block(MPIArray):
 
-    def __getitem__(self, key):
-        local_key = global_to_local_key(key,
-                                        self.globalshape,
-                                        self.local_to_global)
-        indexed_result = self.base.__getitem__(local_key)
-        indexed_result = format_indexed_result(key, indexed_result)
-
-        distributed_result =  self.__class__(np.copy(indexed_result),
-                                             comm=self.comm,
-                                             comm_dims=self.comm_dims,
-                                             comm_coord=self.comm_coord)
-        #Return replicated copy of data
-        return distributed_result.collect_data()
+    def __new__(cls, local_array, comm=MPI.COMM_WORLD, comm_dims=None,
+                comm_coord=None, local_to_global=None, layout=None):
+        obj = super(Block, cls).__new__(cls, local_array,
+                                        comm=comm,
+                                        comm_dims=comm_dims,
+                                        comm_coord=comm_coord,
+                                        local_to_global=local_to_global,
+                                        layout=layout)
+        #Resolve global metadata once, properties never communicate
+        if layout is None:
+            obj._layout = gather_layout(obj.shape, 'b',
+                                        comm=comm,
+                                        comm_dims=comm_dims,
+                                        comm_coord=comm_coord,
+                                        local_to_global=local_to_global)
+        return obj
 
 
-    def __setitem__(self, key, value):
-        #Check input, will throw np.ValueError if data type of passed
-        ## value can't be converted to objects type
-        np_value = np.asarray(value, dtype=self.dtype)
+    def __getitem__(self, key):
+        #Integer array and boolean mask keys select Block distributed results
+        if isinstance(key, (list, np.ndarray)):
+            return self.__select(key)
+
+        global_indices, int_axes = \
+            determine_global_selection(key, self.globalshape)
+        selected_shape = [len(axis_indices) for axis_indices in global_indices]
+        result_shape = [length for axis, length in enumerate(selected_shape)
+                        if axis not in int_axes]
+        selected_result = empty_buffer(selected_shape, self.dtype)
+        if selected_result.size == 0:
+            return Replicated(selected_result.reshape(result_shape),
+                              comm=self.comm)
+
+        #Owners of selected rows follow from the layout, no communication
+        row_owners = np.searchsorted(self.layout.partitions(0)[:, 0],
+                                     global_indices[0], side='right') - 1
+        row_start = self.layout.partitions(0)[self.comm.Get_rank(), 0]
+        local_rows = \
+            global_indices[0][row_owners == self.comm.Get_rank()] - row_start
+        indexed_result = np.ascontiguousarray(
+            self.base[np.ix_(local_rows, *global_indices[1:])])
+        mpi_dtype = get_mpi_datatype(self.dtype)
+
+        #Selections held by a single rank are broadcast from their owner
+        if np.all(row_owners == row_owners[0]):
+            if self.comm.Get_rank() == row_owners[0]:
+                selected_result[...] = indexed_result
+            self.comm.Bcast([selected_result, mpi_dtype],
+                            root=int(row_owners[0]))
+            return Replicated(selected_result.reshape(result_shape),
+                              comm=self.comm)
+
+        #Selected rows are gathered in rank order with a single Allgatherv
+        row_size = int(np.prod(selected_shape[1:]))
+        counts, displacements = get_vector_counts(
+            np.bincount(row_owners, minlength=self.comm.Get_size()) * row_size)
+        gather_order = np.argsort(row_owners, kind='stable')
+        in_order = np.all(np.diff(row_owners) >= 0)
+        gathered_result = selected_result if in_order else \
+            empty_buffer(selected_shape, self.dtype)
+        self.comm.Allgatherv([indexed_result, mpi_dtype],
+                             [gathered_result, (counts, displacements),
+                              mpi_dtype])
+        if not in_order:
+            selected_result[gather_order] = gathered_result
+            release_buffer(gathered_result)
 
-#TODO: Sort out mapping, potentially two pass try-catch distributing the input
-## as necessary for target distribution
-        if np_value.size != 1:
+        #Return replicated copy of data
+        return Replicated(selected_result.reshape(result_shape),
+                          comm=self.comm)
+
+
+    def __select(self, key):
+        if not isinstance(key, np.ndarray):
+            key = np.asarray(key)
+        if key.dtype != bool:
+            return take(self, key, axis=0)
+
+        key_shape = key.globalshape if isinstance(key, MPIArray) else key.shape
+        if key_shape == self.globalshape[:1]:
+            return compress(key, self, axis=0)
+        if key_shape != self.globalshape:
+            raise IndexError('boolean index of shape {} '.format(key_shape) +
+                             'did not match indexed array of global ' +
+                             'shape {}'.format(self.globalshape))
+        #Masks of all axes select from the flattened array
+        if isinstance(key, MPIArray) and not is_Replicated(key.dist):
+            key = key.__class__(np.asarray(key).reshape(-1),
+                                layout=key.layout.ravel())
+        else:
+            key = np.ravel(key)
+        return compress(key, self, axis=None)
+
+
+    def get_view(self, key):
+        """ Block distributed view of a basic slice of the global array.
+            Every rank keeps the part of the slice it holds as a view of its
+            local data, neither data nor metadata is communicated.  Use
+            __getitem__ for a replicated copy of the selection.
+
+        Parameters
+        ----------
+        key : int, slice, tuple
+            Selection indices.  Axis 0 must be selected with a slice of
+            positive step.
+
+        Returns
+        -------
+        Block : MPIArray
+            Block distributed view sharing memory with self.
+        """
+        global_indices, int_axes, rank_positions, local_key = \
+            self.__local_selection(key)
+        if 0 in int_axes or np.any(np.diff(global_indices[0]) < 0):
             raise NotSupportedError(
-                "values of length 1 only currently supported.")
+                'views only supported for slices of positive step along axis 0.')
+
+        layout = self.__selection_layout(global_indices, int_axes,
+                                         rank_positions)
+        return self.__class__(self.base[local_key], layout=layout)
+
 
-        local_key = global_to_local_key(key,
-                                        self.globalshape,
-                                        self.local_to_global)
-        self.base.__setitem__(local_key, np_value)
+    def __setitem__(self, key, value):
+        global_indices, int_axes, rank_positions, local_key = \
+            self.__local_selection(key)
+        result_shape = [len(axis_indices)
+                        for axis, axis_indices in enumerate(global_indices)
+                        if axis not in int_axes]
+        positions = slice(*rank_positions[self.comm.Get_rank()])
+
+        if isinstance(value, MPIArray) and not is_Replicated(value.dist):
+            #Distributed values are routed to owners with a single Alltoallv
+            if value.globalshape != tuple(result_shape):
+                raise ValueError('could not broadcast input array from ' +
+                                 'shape {} '.format(value.globalshape) +
+                                 'into shape {}'.format(tuple(result_shape)))
+            if np.any(np.diff(global_indices[0]) < 0):
+                raise NotSupportedError(
+                    'distributed values only supported for selections of ' +
+                    'positive step along axis 0.')
+            layout = self.__selection_layout(global_indices, int_axes,
+                                             rank_positions)
+            local_value = redistribute(np.asarray(value), value.layout, layout)
+        else:
+            #Check input, will throw np.ValueError if data type of passed
+            ## value can't be converted to objects type
+            np_value = np.asarray(value, dtype=self.dtype)
+            #Replicated values are selected locally, no communication
+            local_value = np.broadcast_to(np_value, result_shape)
+            if 0 not in int_axes:
+                local_value = local_value[positions]
+
+        if positions.stop > positions.start:
+            self.base[local_key] = local_value
+
+
+    def __local_selection(self, key):
+        """ Local part of a basic selection of the global array.
+
+        Returns
+        -------
+        global_indices : list of numpy.ndarray
+            Selected global indices along each axis.
+        int_axes : list of int
+            Axes selected with an int.
+        rank_positions : numpy.ndarray
+            Array of shape (comm size, 2) listing the [start, end) positions
+            among the selected indices along axis 0 held by each rank.
+        local_key : tuple
+            Basic key selecting the local part of the selection from the
+            local data.
+        """
+        global_indices, int_axes = \
+            determine_global_selection(key, self.globalshape)
+        if not isinstance(key, tuple):
+            key = (key,)
+
+        #Selected rows are monotonic, rows of each rank are consecutive
+        rows = global_indices[0]
+        partitions = self.layout.partitions(0)
+        row_owners = np.searchsorted(partitions[:, 0], rows, side='right') - 1
+        counts = np.bincount(row_owners, minlength=len(partitions))
+        if np.any(np.diff(rows) < 0):
+            starts = np.cumsum(counts[::-1])[::-1] - counts
+        else:
+            starts = np.cumsum(counts) - counts
+        rank_positions = np.stack((starts, starts + counts), axis=1)
+
+        rank = self.comm.Get_rank()
+        local_rows = rows[slice(*rank_positions[rank])] - partitions[rank, 0]
+        if 0 in int_axes:
+            local_row_key = int(local_rows[0]) if local_rows.size else 0
+        elif local_rows.size:
+            step = int(rows[1] - rows[0]) if rows.size > 1 else 1
+            stop = int(local_rows[-1]) + (1 if step > 0 else -1)
+            local_row_key = slice(int(local_rows[0]),
+                                  stop if stop >= 0 else None,
+                                  step)
+        else:
+            local_row_key = slice(0, 0)
+
+        return global_indices, int_axes, rank_positions, \
+            (local_row_key,) + tuple(key[1:])
+
+
+    def __selection_layout(self, global_indices, int_axes, rank_positions):
+        """ Block layout of a selection with monotonically increasing rows,
+            every rank holding the part of the selection in its local data.
+        """
+        globalshape = [len(axis_indices)
+                       for axis, axis_indices in enumerate(global_indices)
+                       if axis not in int_axes]
+        rank_extents = np.zeros((len(rank_positions), len(globalshape), 2),
+                                dtype=np.int64)
+        #Selections of a single row are held entirely by its owner
+        rank_extents[:, 0, :] = rank_positions if 0 not in int_axes \
+            else rank_positions * globalshape[0]
+        rank_extents[:, 1:, 1] = globalshape[1:]
+        return Layout(globalshape, self.dist, self.comm,
+                      self.layout.comm_dims, self.layout.comm_coord,
+                      rank_extents, weights=self.layout.weights)
 
 
     #Unique properties to MPIArray
@@ -57,74 +254,85 @@ class Block(MPIArray):
 
     @property
     def globalshape(self):
-        if self._globalshape is None:
-            self.__globalshape()
-        return self._globalshape
-
-    def __globalshape(self):
-        local_ndim = np.asarray(self.ndim, dtype=np.int32)
-        max_ndim = np.empty(1, dtype=np.int32)
-        self.comm.Allreduce(local_ndim, max_ndim, op=MPI.MAX)
-        #Pad local shape with zeros until it matches the global maximum ndim
-        padded_shape = np.pad(self.shape,
-                              (0, max_ndim[0] - local_ndim),
-                              mode='constant')
-
-        comm_shape = []
-        for axis in range(max_ndim[0]):
-            #Leading partition
-            if axis == 0:
-                axis_len = self.__custom_reduction(MPI.SUM,
-                                                   np.asarray(padded_shape[axis]))
-            else:
-                #Max necessary for resolving empty slicing
-                axis_len = self.__custom_reduction(MPI.MAX,
-                                                   np.asarray(padded_shape[axis]))
-
-            comm_shape.append(int(axis_len[0]))
-
-        self._globalshape = tuple(comm_shape)
+        return self.layout.globalshape
 
 
     @property
     def globalsize(self):
-        if self._globalsize is None:
-            self.__globalsize()
-        return self._globalsize
-
-    def __globalsize(self):
-        comm_size = np.empty(1, dtype=np.int64)
-        self.comm.Allreduce(np.array(self.size), comm_size, op=MPI.SUM)
-        self._globalsize = int(comm_size)
+        return self.layout.globalsize
 
 
     @property
     def globalnbytes(self):
-        if self._globalnbytes is None:
-            self.__globalnbytes()
-        return self._globalnbytes
-
-    def __globalnbytes(self):
-        comm_nbytes = np.empty(1, dtype=np.int64)
-        self.comm.Allreduce(np.array(self.nbytes), comm_nbytes, op=MPI.SUM)
-        self._globalnbytes = int(comm_nbytes)
+        return self.layout.globalsize * self.itemsize
 
 
     @property
     def globalndim(self):
-        if self._globalndim is None:
-            self.__globalndim()
-        return self._globalndim
+        return self.layout.globalndim
+
+
+    #Custom cumulative method implementations
+    def cumprod(self, axis=None, dtype=None, out=None):
+        return cumprod(self, axis=axis, dtype=dtype, out=out)
 
-    def __globalndim(self):
-        self._globalndim = int(len(self.globalshape))
+
+    def cumsum(self, axis=None, dtype=None, out=None):
+        return cumsum(self, axis=axis, dtype=dtype, out=out)
+
+
+    #Custom selection method implementations
+    def compress(self, condition, axis=None, out=None):
+        return compress(condition, self, axis=axis, out=out)
+
+
+    def take(self, indices, axis=None, out=None, mode='raise'):
+        if out is not None:
+            raise NotSupportedError("'out' field not supported")
+        if mode != 'raise':
+            raise NotSupportedError("only 'raise' mode supported")
+        return take(self, indices, axis=axis)
+
+
+    #Custom sorting method implementations
+    def argsort(self, axis=-1, kind=None, order=None):
+        if order is not None:
+            raise NotSupportedError("'order' field not supported")
+        return argsort(self, axis=axis, kind=kind)
+
+
+    def sort(self, axis=-1, kind=None, order=None):
+        if order is not None:
+            raise NotSupportedError("'order' field not supported")
+        sorted_array = sort(self, axis=axis, kind=kind)
+        #Sorting in place requires results to keep the local shape
+        if sorted_array.layout != self.layout:
+            raise NotSupportedError(
+                "array is not evenly partitioned, use mpids.MPInumpy.sort.")
+        np.asarray(self)[...] = sorted_array
+
+
+    #Custom transposition method implementations
+    def swapaxes(self, axis1, axis2):
+        return swapaxes(self, axis1, axis2)
+
+
+    def transpose(self, *axes):
+        #Axes are specified as a single sequence or separate ints
+        if len(axes) == 1 and (axes[0] is None or np.ndim(axes[0]) > 0):
+            axes = axes[0]
+        return transpose(self, axes if axes else None)
 
 
     #Custom reduction method implementations
     def max(self, **kwargs):
+        keep_distributed = kwargs.pop('keep_distributed', False)
         self.check_reduction_parms(**kwargs)
         axis = kwargs.get('axis')
         local_max = np.asarray(self.base.max(**kwargs))
+        layout = self.reduction_layout(axis, keep_distributed)
+        if layout is not None:
+            return self.__class__(local_max, layout=layout)
         global_max = self.__custom_reduction(MPI.MAX, local_max, **kwargs)
         if self.globalndim > 2 and axis is not None:
             global_max = \
@@ -139,14 +347,20 @@ class Block(MPIArray):
             global_mean = global_sum * 1. / self.globalshape[axis]
         else:
             global_mean = global_sum * 1. / self.globalsize
+        release_buffer(global_sum)
 
-        return Replicated(global_mean, comm=self.comm)
+        #Result keeps distribution of sum
+        return global_mean
 
 
     def min(self, **kwargs):
+        keep_distributed = kwargs.pop('keep_distributed', False)
         self.check_reduction_parms(**kwargs)
         axis = kwargs.get('axis')
         local_min = np.asarray(self.base.min(**kwargs))
+        layout = self.reduction_layout(axis, keep_distributed)
+        if layout is not None:
+            return self.__class__(local_min, layout=layout)
         global_min = self.__custom_reduction(MPI.MIN, local_min, **kwargs)
         if self.globalndim > 2 and axis is not None:
             global_min = \
@@ -155,45 +369,31 @@ class Block(MPIArray):
 
 
     def std(self, **kwargs):
-        local_mean = self.mean(**kwargs)
-
+        keep_distributed = kwargs.pop('keep_distributed', False)
+        self.check_reduction_parms(**kwargs)
         axis = kwargs.get('axis')
-#TODO: Need to revisit for higher dim
-        if axis is not None and self.globalndim > 3 and axis > 1:
-            raise NotSupportedError(
-            "axis 0 and 1 only currently supported for 4+ dimensional matrices.")
-
-        if axis is not None and axis > 0:
-            block_min, block_max = self.local_to_global[0]
-            local_mean = local_mean[block_min: block_max]
-            if self.globalndim - 1 == axis:
-                #Force a transpose
-                local_mean = local_mean.reshape(-1, 1)
-
-        local_square_diff = (self - local_mean)**2
-        local_sum_square_diff = np.asarray(local_square_diff.base.sum(**kwargs))
-        global_sum_square_diff = \
-            self.__custom_reduction(MPI.SUM,
-                                    local_sum_square_diff,
-                                    dtype=local_sum_square_diff.dtype,
-                                    **kwargs)
-        if axis is not None:
-            global_std = \
-                np.sqrt(global_sum_square_diff * 1. / self.globalshape[axis])
-        else:
-            global_std = np.sqrt(global_sum_square_diff * 1. / self.globalsize)
+        moments = self.reduce_moments(axis=axis,
+                                      keep_distributed=keep_distributed)
+        std = np.sqrt(moments[..., 2] / moments[..., 0])
+        release_buffer(moments)
+        dtype = kwargs.get('dtype')
+        if dtype is None:
+            dtype = self.dtype if self.dtype.kind == 'f' else np.float64
 
-        if self.globalndim > 2 and axis is not None:
-            global_std = \
-                self.__higher_dimension_reduction_reshape(global_std, axis)
-
-        return Replicated(global_std, comm=self.comm)
+        layout = self.reduction_layout(axis, keep_distributed)
+        if layout is not None:
+            return self.__class__(std.astype(dtype), layout=layout)
+        return Replicated(std.astype(dtype), comm=self.comm)
 
 
     def sum(self, **kwargs):
+        keep_distributed = kwargs.pop('keep_distributed', False)
         self.check_reduction_parms(**kwargs)
         axis = kwargs.get('axis')
         local_sum = np.asarray(self.base.sum(**kwargs))
+        layout = self.reduction_layout(axis, keep_distributed)
+        if layout is not None:
+            return self.__class__(local_sum, layout=layout)
         global_sum = self.__custom_reduction(MPI.SUM, local_sum, **kwargs)
         if self.globalndim > 2 and axis is not None:
             global_sum = \
@@ -201,48 +401,121 @@ class Block(MPIArray):
         return Replicated(global_sum, comm=self.comm)
 
 
+    def var(self, **kwargs):
+        keep_distributed = kwargs.pop('keep_distributed', False)
+        ddof = kwargs.pop('ddof', 0)
+        self.check_reduction_parms(**kwargs)
+        axis = kwargs.get('axis')
+        moments = self.reduce_moments(axis=axis,
+                                      keep_distributed=keep_distributed)
+        var = moments[..., 2] / (moments[..., 0] - ddof)
+        release_buffer(moments)
+        dtype = kwargs.get('dtype')
+        if dtype is None:
+            dtype = self.dtype if self.dtype.kind == 'f' else np.float64
+
+        layout = self.reduction_layout(axis, keep_distributed)
+        if layout is not None:
+            return self.__class__(var.astype(dtype), layout=layout)
+        return Replicated(var.astype(dtype), comm=self.comm)
+
+
+    def sum_async(self, **kwargs):
+        keep_distributed = kwargs.pop('keep_distributed', False)
+        self.check_reduction_parms(**kwargs)
+        axis = kwargs.get('axis')
+        local_sum = np.asarray(self.base.sum(**kwargs))
+        layout = self.reduction_layout(axis, keep_distributed)
+        if layout is not None:
+            return MPIFuture(result=self.__class__(local_sum, layout=layout))
+
+        def replicate(global_sum):
+            if self.globalndim > 2 and axis is not None:
+                global_sum = \
+                    self.__higher_dimension_reduction_reshape(global_sum, axis)
+            return Replicated(global_sum, comm=self.comm)
+
+        return self.__custom_reduction_async(MPI.SUM, local_sum, **kwargs) \
+                   .then(replicate)
+
+
     def __custom_reduction(self, operation, local_red, axis=None, dtype=None,
                            out=None):
         if dtype is None: dtype = local_red.dtype
 
         if axis is None or axis == 0:
-            global_red = np.empty(local_red.size, dtype=dtype)
+            global_red = empty_buffer(local_red.size, dtype)
             self.comm.Allreduce(local_red, global_red, op=operation)
         else:
-            global_red = all_gather_v(local_red, comm=self.comm)
+            global_red = all_gather_v(local_red, comm=self.comm,
+                                      counts=self.__reduced_counts(axis))
 
         return global_red
 
 
+    def __custom_reduction_async(self, operation, local_red, axis=None,
+                                 dtype=None, out=None):
+        if dtype is None: dtype = local_red.dtype
+
+        if axis is None or axis == 0:
+            #Reduced in place, local_red may be freed before completion
+            global_red = empty_buffer(local_red.size, dtype)
+            global_red[...] = local_red.ravel()
+            return MPIFuture([self.comm.Iallreduce(MPI.IN_PLACE, global_red,
+                                                   op=operation)],
+                             result=global_red)
+        return all_gather_v_async(local_red, comm=self.comm,
+                                  counts=self.__reduced_counts(axis))
+
+
+    def __reduced_counts(self, axis):
+        #Reduced rows held by all ranks follow from the layout
+        return np.prod(np.delete(self.layout.rank_shapes, axis, axis=1),
+                       axis=1)
+
+
     def __higher_dimension_reduction_reshape(self, global_reduction, axis):
         reduced_shape = np.delete(np.asarray(self.globalshape), axis)
         return global_reduction.reshape(reduced_shape)
 
 
     def collect_data(self):
-        global_data = all_gather_v(self, shape=self.globalshape, comm=self.comm)
+        global_data = all_gather_v(np.asarray(self),
+                                   shape=self.globalshape, comm=self.comm,
+                                   layout=self.layout)
         return Replicated(global_data, comm=self.comm)
 
 
+    def collect_data_async(self):
+        return all_gather_v_async(np.asarray(self),
+                                  shape=self.globalshape, comm=self.comm,
+                                  layout=self.layout) \
+                   .then(lambda global_data: Replicated(global_data,
+                                                        comm=self.comm))
+
+
     def reshape(self, *args):
+        layout = self.__reshaped_layout(args)
+        local_data = redistribute(np.asarray(self), self.layout, layout)
+
+        return self.__class__(local_data, layout=layout)
+
+
+    def reshape_async(self, *args):
+        layout = self.__reshaped_layout(args)
+        return redistribute_async(np.asarray(self), self.layout, layout) \
+                   .then(lambda local_data: self.__class__(local_data,
+                                                           layout=layout))
+
+
+    def __reshaped_layout(self, args):
+        #Allow shape to be supplied as a tuple or as separate ints
+        if len(args) == 1 and isinstance(args[0], (tuple, list)):
+            args = tuple(args[0])
+
         if np.prod(args) != self.globalsize:
             raise ValueError("cannot reshape global array of size",
                              self.globalsize,"into shape", tuple(args))
 
-        local_shape, comm_dims, comm_coord, local_to_global = \
-            distribute_shape(args, self.dist, comm=self.comm)
-
-        send_counts, recv_counts = \
-            determine_redistribution_counts_from_shape(self.globalshape,
-                                                       args,
-                                                       self.dist,
-                                                       comm=self.comm)
-        # Get new local data from personalized data exchange
-        local_data = all_to_all_v(self, send_counts, recv_counts,
-                                  recv_shape=local_shape, comm=self.comm)
-
-        return self.__class__(np.copy(local_data),
-                              comm=self.comm,
-                              comm_dims=comm_dims,
-                              comm_coord=comm_coord,
-                              local_to_global=local_to_global)
+        return get_layout(args, self.dist, comm=self.comm,
+                          weights=self.layout.weights)
@@ -0,0 +1,356 @@
+from mpi4py import MPI
+import numpy as np
+
+from mpids.MPInumpy.MPIArray import MPIArray
+from mpids.MPInumpy._cumulative import cumprod, cumsum
+from mpids.MPInumpy._sorting import argsort, sort
+from mpids.MPInumpy._transpose import swapaxes, transpose
+from mpids.MPInumpy.buffer_pool import empty_buffer, release_buffer
+from mpids.MPInumpy.errors import NotSupportedError, ValueError
+from mpids.MPInumpy.futures import MPIFuture
+from mpids.MPInumpy.layout import gather_layout, get_layout, redistribute, \
+                                  redistribute_async
+from mpids.MPInumpy.utils import determine_global_selection, \
+                                 get_reduction_identity
+
+from mpids.MPInumpy.mpi_utils import all_gather_v, all_gather_v_async
+from mpids.MPInumpy.distributions.Replicated import Replicated
+
+
+"""
+    Block-Block implementation of MPIArray abstract base class.
+    The two leading axes are partitioned along a 2-D cartesian process grid.
+"""
+class BlockBlock(MPIArray):
+
+    def __new__(cls, local_array, comm=MPI.COMM_WORLD, comm_dims=None,
+                comm_coord=None, local_to_global=None, layout=None):
+        obj = super(BlockBlock, cls).__new__(cls, local_array,
+                                             comm=comm,
+                                             comm_dims=comm_dims,
+                                             comm_coord=comm_coord,
+                                             local_to_global=local_to_global,
+                                             layout=layout)
+        #Resolve global metadata once, properties never communicate
+        if layout is None:
+            obj._layout = gather_layout(obj.shape, 'bb',
+                                        comm=comm,
+                                        comm_dims=comm_dims,
+                                        comm_coord=comm_coord,
+                                        local_to_global=local_to_global)
+        return obj
+
+
+    def __getitem__(self, key):
+        global_indices, int_axes = \
+            determine_global_selection(key, self.globalshape)
+        local_indices = self.__local_indices(global_indices)
+        indexed_result = np.ascontiguousarray(
+            self.base[np.ix_(*local_indices)])
+
+        #Place selections of all ranks in position of selected indices
+        gathered_result = all_gather_v(indexed_result, comm=self.comm)
+        selected_result = \
+            np.empty([len(axis_indices) for axis_indices in global_indices],
+                     dtype=self.dtype)
+        offset = 0
+        for extents in self.layout.rank_extents:
+            positions = \
+                [np.flatnonzero((axis_indices >= start) & (axis_indices < end))
+                 for axis_indices, (start, end) in zip(global_indices, extents)]
+            positions_shape = [len(axis_positions) for axis_positions in positions]
+            count = int(np.prod(positions_shape))
+            selected_result[np.ix_(*positions)] = \
+                gathered_result[offset: offset + count].reshape(positions_shape)
+            offset += count
+
+        #Drop axes selected with an int
+        result_shape = [len(axis_indices)
+                        for axis, axis_indices in enumerate(global_indices)
+                        if axis not in int_axes]
+        #Return replicated copy of data
+        return Replicated(selected_result.reshape(result_shape), comm=self.comm)
+
+
+    def __setitem__(self, key, value):
+        #Check input, will throw np.ValueError if data type of passed
+        ## value can't be converted to objects type
+        np_value = np.asarray(value, dtype=self.dtype)
+
+        if np_value.size != 1:
+            raise NotSupportedError(
+                "values of length 1 only currently supported.")
+
+        global_indices, _ = determine_global_selection(key, self.globalshape)
+        local_indices = self.__local_indices(global_indices)
+        self.base[np.ix_(*local_indices)] = np_value.reshape(())
+
+
+    def __local_indices(self, global_indices):
+        """ Local indices of selected global indices present on rank. """
+        local_indices = []
+        for axis_indices, (start, end) in \
+            zip(global_indices, self.layout.rank_extents[self.comm.Get_rank()]):
+            present = (axis_indices >= start) & (axis_indices < end)
+            local_indices.append(axis_indices[present] - start)
+        return local_indices
+
+
+    #Unique properties to MPIArray
+    @property
+    def dist(self):
+        return 'bb'
+
+
+    @property
+    def globalshape(self):
+        return self.layout.globalshape
+
+
+    @property
+    def globalsize(self):
+        return self.layout.globalsize
+
+
+    @property
+    def globalnbytes(self):
+        return self.layout.globalsize * self.itemsize
+
+
+    @property
+    def globalndim(self):
+        return self.layout.globalndim
+
+
+    #Custom cumulative method implementations
+    def cumprod(self, axis=None, dtype=None, out=None):
+        return cumprod(self, axis=axis, dtype=dtype, out=out)
+
+
+    def cumsum(self, axis=None, dtype=None, out=None):
+        return cumsum(self, axis=axis, dtype=dtype, out=out)
+
+
+    #Custom sorting method implementations
+    def argsort(self, axis=-1, kind=None, order=None):
+        if order is not None:
+            raise NotSupportedError("'order' field not supported")
+        return argsort(self, axis=axis, kind=kind)
+
+
+    def sort(self, axis=-1, kind=None, order=None):
+        if order is not None:
+            raise NotSupportedError("'order' field not supported")
+        sorted_array = sort(self, axis=axis, kind=kind)
+        #Sorting in place requires results to keep the local shape
+        if sorted_array.layout != self.layout:
+            raise NotSupportedError(
+                "array is not evenly partitioned, use mpids.MPInumpy.sort.")
+        np.asarray(self)[...] = sorted_array
+
+
+    #Custom transposition method implementations
+    def swapaxes(self, axis1, axis2):
+        return swapaxes(self, axis1, axis2)
+
+
+    def transpose(self, *axes):
+        #Axes are specified as a single sequence or separate ints
+        if len(axes) == 1 and (axes[0] is None or np.ndim(axes[0]) > 0):
+            axes = axes[0]
+        return transpose(self, axes if axes else None)
+
+
+    #Custom reduction method implementations
+    def max(self, **kwargs):
+        keep_distributed = kwargs.pop('keep_distributed', False)
+        self.check_reduction_parms(**kwargs)
+        axis = kwargs.get('axis')
+        identity = get_reduction_identity(MPI.MAX, self.dtype)
+        local_max = np.asarray(self.base.max(axis=axis, initial=identity))
+        layout = self.reduction_layout(axis, keep_distributed)
+        if layout is not None:
+            return self.__class__(local_max, layout=layout)
+        global_max = self.__custom_reduction(MPI.MAX, local_max, axis=axis)
+        return Replicated(global_max, comm=self.comm)
+
+
+    def mean(self, **kwargs):
+        global_sum = self.sum(**kwargs)
+        axis = kwargs.get('axis')
+        if axis is not None:
+            global_mean = global_sum * 1. / self.globalshape[axis]
+        else:
+            global_mean = global_sum * 1. / self.globalsize
+        release_buffer(global_sum)
+
+        #Result keeps distribution of sum
+        return global_mean
+
+
+    def min(self, **kwargs):
+        keep_distributed = kwargs.pop('keep_distributed', False)
+        self.check_reduction_parms(**kwargs)
+        axis = kwargs.get('axis')
+        identity = get_reduction_identity(MPI.MIN, self.dtype)
+        local_min = np.asarray(self.base.min(axis=axis, initial=identity))
+        layout = self.reduction_layout(axis, keep_distributed)
+        if layout is not None:
+            return self.__class__(local_min, layout=layout)
+        global_min = self.__custom_reduction(MPI.MIN, local_min, axis=axis)
+        return Replicated(global_min, comm=self.comm)
+
+
+    def std(self, **kwargs):
+        keep_distributed = kwargs.pop('keep_distributed', False)
+        self.check_reduction_parms(**kwargs)
+        axis = kwargs.get('axis')
+        moments = self.reduce_moments(axis=axis,
+                                      keep_distributed=keep_distributed)
+        std = np.sqrt(moments[..., 2] / moments[..., 0])
+        release_buffer(moments)
+        dtype = kwargs.get('dtype')
+        if dtype is None:
+            dtype = self.dtype if self.dtype.kind == 'f' else np.float64
+
+        layout = self.reduction_layout(axis, keep_distributed)
+        if layout is not None:
+            return self.__class__(std.astype(dtype), layout=layout)
+        return Replicated(std.astype(dtype), comm=self.comm)
+
+
+    def sum(self, **kwargs):
+        keep_distributed = kwargs.pop('keep_distributed', False)
+        self.check_reduction_parms(**kwargs)
+        axis = kwargs.get('axis')
+        local_sum = np.asarray(self.base.sum(**kwargs))
+        layout = self.reduction_layout(axis, keep_distributed)
+        if layout is not None:
+            return self.__class__(local_sum, layout=layout)
+        global_sum = self.__custom_reduction(MPI.SUM, local_sum, axis=axis)
+        return Replicated(global_sum, comm=self.comm)
+
+
+    def var(self, **kwargs):
+        keep_distributed = kwargs.pop('keep_distributed', False)
+        ddof = kwargs.pop('ddof', 0)
+        self.check_reduction_parms(**kwargs)
+        axis = kwargs.get('axis')
+        moments = self.reduce_moments(axis=axis,
+                                      keep_distributed=keep_distributed)
+        var = moments[..., 2] / (moments[..., 0] - ddof)
+        release_buffer(moments)
+        dtype = kwargs.get('dtype')
+        if dtype is None:
+            dtype = self.dtype if self.dtype.kind == 'f' else np.float64
+
+        layout = self.reduction_layout(axis, keep_distributed)
+        if layout is not None:
+            return self.__class__(var.astype(dtype), layout=layout)
+        return Replicated(var.astype(dtype), comm=self.comm)
+
+
+    def sum_async(self, **kwargs):
+        keep_distributed = kwargs.pop('keep_distributed', False)
+        self.check_reduction_parms(**kwargs)
+        axis = kwargs.get('axis')
+        local_sum = np.asarray(self.base.sum(**kwargs))
+        layout = self.reduction_layout(axis, keep_distributed)
+        if layout is not None:
+            return MPIFuture(result=self.__class__(local_sum, layout=layout))
+        return self.__custom_reduction_async(MPI.SUM, local_sum, axis=axis) \
+                   .then(lambda global_sum: Replicated(global_sum,
+                                                       comm=self.comm))
+
+
+    def __custom_reduction(self, operation, local_red, axis=None):
+        """ Combine partial reductions of all ranks with a single Allreduce.
+            Partial results are placed in a global result padded with the
+            identity of the reduction operation.
+        """
+        global_red = self.__reduction_buffer(operation, local_red, axis)
+        self.comm.Allreduce(MPI.IN_PLACE, global_red, op=operation)
+        return global_red
+
+
+    def __custom_reduction_async(self, operation, local_red, axis=None):
+        """ Start combining partial reductions of all ranks with a single
+            Iallreduce, see __custom_reduction.
+        """
+        global_red = self.__reduction_buffer(operation, local_red, axis)
+        return MPIFuture([self.comm.Iallreduce(MPI.IN_PLACE, global_red,
+                                               op=operation)],
+                         result=global_red)
+
+
+    def __reduction_buffer(self, operation, local_red, axis=None):
+        """ Global result holding the partial reduction of the rank. """
+        if axis is None:
+            global_red = empty_buffer(local_red.shape, local_red.dtype)
+            global_red[...] = local_red
+        else:
+            reduced_shape = np.delete(np.asarray(self.globalshape), axis)
+            identity = get_reduction_identity(operation, local_red.dtype)
+            global_red = empty_buffer(reduced_shape, local_red.dtype)
+            global_red.fill(identity)
+            global_red[self.__reduced_slices(axis)] = local_red
+        return global_red
+
+
+    def __reduced_slices(self, axis):
+        """ Global slices of local data with the reduced axis removed. """
+        local_slices = list(self.layout.rank_slices())
+        del local_slices[axis]
+        return tuple(local_slices)
+
+
+    def collect_data(self):
+        gathered_data = all_gather_v(np.asarray(self),
+                                     comm=self.comm, layout=self.layout)
+        return self.__assemble(gathered_data)
+
+
+    def collect_data_async(self):
+        return all_gather_v_async(np.asarray(self), comm=self.comm,
+                                  layout=self.layout).then(self.__assemble)
+
+
+    def __assemble(self, gathered_data):
+        """ Replicated global array of data gathered in rank order. """
+        global_data = empty_buffer(self.globalshape, self.dtype)
+        offset = 0
+        for rank, rank_shape in enumerate(self.layout.rank_shapes):
+            count = int(np.prod(rank_shape))
+            global_data[self.layout.rank_slices(rank)] = \
+                gathered_data[offset: offset + count].reshape(rank_shape)
+            offset += count
+        release_buffer(gathered_data)
+
+        return Replicated(global_data, comm=self.comm)
+
+
+    def reshape(self, *args):
+        layout = self.__reshaped_layout(args)
+        local_data = redistribute(np.asarray(self), self.layout, layout)
+
+        return self.__class__(local_data, layout=layout)
+
+
+    def reshape_async(self, *args):
+        layout = self.__reshaped_layout(args)
+        return redistribute_async(np.asarray(self), self.layout, layout) \
+                   .then(lambda local_data: self.__class__(local_data,
+                                                           layout=layout))
+
+
+    def __reshaped_layout(self, args):
+        #Allow shape to be supplied as a tuple or as separate ints
+        if len(args) == 1 and isinstance(args[0], (tuple, list)):
+            args = tuple(args[0])
+
+        if np.prod(args) != self.globalsize:
+            raise ValueError("cannot reshape global array of size",
+                             self.globalsize,"into shape", tuple(args))
+
+        return get_layout(args, self.dist, comm=self.comm)
+
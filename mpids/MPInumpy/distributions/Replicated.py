@@ -3,6 +3,7 @@ import numpy as np
 
 from mpids.MPInumpy.MPIArray import MPIArray
 from mpids.MPInumpy.errors import ValueError
+from mpids.MPInumpy.layout import get_layout
 from mpids.MPInumpy.utils import global_to_local_key
 
 """
@@ -35,6 +36,14 @@ class Replicated(MPIArray):
         return 'r'
 
 
+    @property
+    def layout(self):
+        #Replicated layouts only depend on the local shape, no communication
+        if self._layout is None or self._layout.globalshape != self.shape:
+            self._layout = get_layout(self.shape, self.dist, comm=self.comm)
+        return self._layout
+
+
     @property
     def globalshape(self):
         if self._globalshape is None:
@@ -65,39 +74,66 @@ class Replicated(MPIArray):
 
     #Custom reduction method implementations
     def max(self, **kwargs):
+        #Results of replicated arrays are always replicated
+        kwargs.pop('keep_distributed', None)
         self.check_reduction_parms(**kwargs)
         return Replicated(np.asarray(self.base.max(**kwargs)),
                              comm=self.comm)
 
 
     def mean(self, **kwargs):
+        kwargs.pop('keep_distributed', None)
         self.check_reduction_parms(**kwargs)
         return Replicated(np.asarray(self.base.mean(**kwargs)),
                              comm=self.comm)
 
 
     def min(self, **kwargs):
+        kwargs.pop('keep_distributed', None)
         self.check_reduction_parms(**kwargs)
         return Replicated(np.asarray(self.base.min(**kwargs)),
                              comm=self.comm)
 
 
     def std(self, **kwargs):
+        kwargs.pop('keep_distributed', None)
         self.check_reduction_parms(**kwargs)
         return Replicated(np.asarray(self.base.std(**kwargs)),
                              comm=self.comm)
 
 
     def sum(self, **kwargs):
+        kwargs.pop('keep_distributed', None)
         self.check_reduction_parms(**kwargs)
         return Replicated(np.asarray(self.base.sum(**kwargs)),
                              comm=self.comm)
 
 
+    def var(self, **kwargs):
+        kwargs.pop('keep_distributed', None)
+        ddof = kwargs.pop('ddof', 0)
+        self.check_reduction_parms(**kwargs)
+        return Replicated(np.asarray(self.base.var(ddof=ddof, **kwargs)),
+                             comm=self.comm)
+
+
     def collect_data(self):
         return self.__class__(self, comm=self.comm)
 
 
+    #Transposed copies, reductions operate on the base of replicated data
+    def swapaxes(self, axis1, axis2):
+        return self.__class__(
+            np.ascontiguousarray(np.asarray(self).swapaxes(axis1, axis2)),
+            comm=self.comm)
+
+
+    def transpose(self, *axes):
+        return self.__class__(
+            np.ascontiguousarray(np.asarray(self).transpose(*axes)),
+            comm=self.comm)
+
+
     def reshape(self, *args):
         if np.prod(args) != self.globalsize and np.prod(args) > 0:
             raise ValueError("cannot reshape global array of size",
@@ -1,8 +1,12 @@
 from .Replicated import Replicated
 from .Block import Block
+from .BlockBlock import BlockBlock
+from .BlockCyclic import BlockCyclic
 
-__all__ = ['Replicated', 'Block']
+__all__ = ['Replicated', 'Block', 'BlockBlock', 'BlockCyclic']
 
 
 Distribution_Dict = {'b' : Block,
+                     'bb' : BlockBlock,
+                     'bc' : BlockCyclic,
                      'r' : Replicated}
@@ -17,3 +17,7 @@ class NotSupportedError(MPInumpyError):
 class TypeError(MPInumpyError):
     """ Exception class for when invalid data type is supplied. """
     pass
+
+class LinAlgError(MPInumpyError):
+    """ Exception class for when a linear algebra routine fails. """
+    pass
@@ -0,0 +1,54 @@
+import sys
+import time
+
+from mpi4py import MPI
+import numpy as np
+
+import mpids.MPInumpy as mpi_np
+
+"""
+    Strong scaling benchmark of the distributed sample sort.  The global
+    number of float64 keys is fixed, run with an increasing number of
+    processes and compare the reported times, e.g.:
+        for procs in 1 2 4 8 16; do
+            mpiexec -n $procs python3 mpiarray_sort_benchmark.py 100000000
+        done
+"""
+
+def time_operation(operation, comm, repetitions):
+    """ Minimum over repetitions of the slowest process' runtime. """
+    timings = []
+    for _ in range(repetitions):
+        comm.Barrier()
+        start = MPI.Wtime()
+        operation()
+        local_time = MPI.Wtime() - start
+        timings.append(comm.allreduce(local_time, op=MPI.MAX))
+    return min(timings)
+
+
+if __name__ == "__main__":
+
+    #Capture default communicator, MPI process rank, and number of processes
+    comm = MPI.COMM_WORLD
+    rank = comm.Get_rank()
+    size = comm.Get_size()
+
+    #Global number of keys and repetitions of each measurement
+    num_keys = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10**7
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    #Uniformly distributed float64 keys generated locally by each process
+    keys = mpi_np.empty(num_keys, dtype=np.float64, comm=comm, dist='b')
+    rng = np.random.RandomState(rank)
+    np.asarray(keys)[...] = rng.random_sample(keys.shape)
+
+    sort_time = time_operation(lambda: mpi_np.sort(keys), comm, repetitions)
+    argsort_time = time_operation(lambda: mpi_np.argsort(keys), comm,
+                                  repetitions)
+
+    if rank == 0:
+        print('procs,keys,sort_seconds,argsort_seconds,sort_keys_per_second')
+        print('{},{},{:.4f},{:.4f},{:.4e}'.format(size, num_keys,
+                                                  sort_time, argsort_time,
+                                                  num_keys / sort_time))
@@ -0,0 +1,109 @@
+from mpi4py import MPI
+
+__all__ = ['MPIFuture', 'wait_all']
+
+
+class MPIFuture(object):
+    """ Result of a non-blocking MPInumpy operation.  Communication is
+        started when the future is created and progresses while the
+        caller continues with local computation.  Buffers involved in the
+        operation must not be accessed before the future completed.
+
+    Parameters
+    ----------
+    requests : list of MPI Request, optional
+        Outstanding requests of the operation.  If none specified the
+        future is completed.
+    result : object, optional
+        Result of the operation once all requests completed.
+    buffers : list, optional
+        Buffers read by the requests, such as temporary send buffers, kept
+        alive until the operation completed.
+    """
+    __slots__ = ('_requests', '_result', '_callbacks', '_done', '_buffers')
+
+    def __init__(self, requests=(), result=None, buffers=()):
+        self._requests = list(requests)
+        self._buffers = list(buffers)
+        self._result = result
+        self._callbacks = []
+        self._done = False
+
+
+    def then(self, callback):
+        """ Replace the result of the future with callback(result) once the
+            operation completed, callbacks are applied in order.
+
+        Parameters
+        ----------
+        callback : callable
+            Function of the current result returning the new result.
+
+        Returns
+        -------
+        future : MPIFuture
+            This future.
+        """
+        if self._done:
+            self._result = callback(self._result)
+        else:
+            self._callbacks.append(callback)
+        return self
+
+
+    def test(self):
+        """ Check for completion of the operation without blocking.
+
+        Returns
+        -------
+        done : bool
+            'True' if the operation completed, the result is available
+            with wait.
+        """
+        if not self._done and MPI.Request.Testall(self._requests):
+            self._complete()
+        return self._done
+
+
+    def wait(self):
+        """ Block until the operation completed.
+
+        Returns
+        -------
+        result : object
+            Result of the operation.
+        """
+        if not self._done:
+            MPI.Request.Waitall(self._requests)
+            self._complete()
+        return self._result
+
+
+    def _complete(self):
+        """ Helper method applying callbacks of completed requests. """
+        self._done = True
+        self._requests = []
+        self._buffers = []
+        for callback in self._callbacks:
+            self._result = callback(self._result)
+        self._callbacks = []
+
+
+def wait_all(futures):
+    """ Block until all operations completed, outstanding requests of all
+        futures are completed together.
+
+    Parameters
+    ----------
+    futures : iterable of MPIFuture
+        Futures of non-blocking operations.
+
+    Returns
+    -------
+    results : list
+        Results of the operations in the order of futures.
+    """
+    futures = list(futures)
+    MPI.Request.Waitall([request for future in futures
+                         for request in future._requests])
+    return [future.wait() for future in futures]
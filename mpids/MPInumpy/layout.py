@@ -0,0 +1,817 @@
+from collections import OrderedDict
+from mpi4py import MPI
+import numpy as np
+
+from mpids.MPInumpy.buffer_pool import empty_buffer, release_buffer
+from mpids.MPInumpy.errors import NotSupportedError, ValueError
+from mpids.MPInumpy.mpi_utils import all_to_all_v, all_to_all_v_async, \
+                                     get_vector_counts
+from mpids.MPInumpy.utils import determine_redistribution_plan, \
+                                 get_block_cyclic_counts,       \
+                                 get_block_cyclic_index,        \
+                                 get_block_cyclic_indices,      \
+                                 get_block_indices,             \
+                                 get_weighted_block_indices,    \
+                                 get_cart_coords,               \
+                                 get_comm_dims,                 \
+                                 is_block_block_distributed,    \
+                                 is_block_cyclic_distributed,   \
+                                 is_block_distributed,          \
+                                 is_Replicated
+
+__all__ = ['DEFAULT_BLOCK_SIZE', 'Layout', 'broadcast_layout', 'gather_layout',
+           'get_layout', 'measure_weights', 'redistribute',
+           'redistribute_async']
+
+#Maximum number of layouts kept alive by get_layout per communicator
+_LAYOUT_CACHE_SIZE = 128
+#Attribute key of layout caches attached to communicators
+_layout_cache_keyval = None
+#Maximum number of array dimensions supported by numpy
+_MAX_NDIM = 32
+#Block size of block-cyclic layouts when none specified
+DEFAULT_BLOCK_SIZE = 1
+
+
+class Layout(object):
+    """ Immutable description of how a global array is distributed among the
+        processes of a communicator.  All global properties of a distributed
+        array can be derived from its layout without any communication.
+
+    Attributes
+    ----------
+    globalshape : tuple
+        Combined shape of distributed array.
+    dist : str
+        Specified distribution of data among processes.
+    comm : MPI Communicator
+        MPI process communication object.
+    comm_dims : list, None
+        Dimensions of cartesian grid.
+    comm_coord : list, None
+        Coordinates of local rank in grid.
+    rank_extents : numpy.ndarray
+        Read-only array of shape (comm size, ndim, 2) listing the
+        [inclusive start, exclusive end) global indices held by each rank
+        along each axis.  Along a block-cyclic axis the extents index the
+        data of all ranks packed in rank order instead.
+    block_size : int, None
+        Block size of block-cyclic layouts along axis 0, None otherwise.
+    weights : tuple of float, None
+        Relative weights of all ranks axis 0 of Block layouts is partitioned
+        by, None for even partitions.
+    """
+
+    __slots__ = ('_globalshape', '_dist', '_comm', '_comm_dims',
+                 '_comm_coord', '_rank_extents', '_rank', '_block_size',
+                 '_weights', '_gather_counts')
+
+    def __init__(self, globalshape, dist, comm, comm_dims, comm_coord,
+                 rank_extents, block_size=None, weights=None):
+        self._globalshape = tuple(int(dim) for dim in globalshape)
+        self._dist = dist
+        self._comm = comm
+        self._comm_dims = None if comm_dims is None else tuple(comm_dims)
+        self._comm_coord = None if comm_coord is None else tuple(comm_coord)
+        self._rank_extents = np.array(rank_extents, dtype=np.int64)
+        self._rank_extents.flags.writeable = False
+        self._rank = comm.Get_rank()
+        self._block_size = None if block_size is None else int(block_size)
+        self._weights = None if weights is None else tuple(weights)
+        self._gather_counts = None
+
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, Layout):
+            return NotImplemented
+        return (self._globalshape == other._globalshape and
+                self._dist == other._dist and
+                self._comm == other._comm and
+                self._block_size == other._block_size and
+                np.array_equal(self._rank_extents, other._rank_extents))
+
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+
+    def __hash__(self):
+        return hash((self._globalshape, self._dist, self._block_size))
+
+
+    def __repr__(self):
+        return '{}(globalshape={}, dist={}, comm_dims={})' \
+                   .format('Layout',
+                           self._globalshape,
+                           self._dist,
+                           self.comm_dims)
+
+
+    @property
+    def globalshape(self):
+        return self._globalshape
+
+
+    @property
+    def globalsize(self):
+        return int(np.prod(self._globalshape, dtype=np.int64))
+
+
+    @property
+    def globalndim(self):
+        return len(self._globalshape)
+
+
+    @property
+    def dist(self):
+        return self._dist
+
+
+    @property
+    def comm(self):
+        return self._comm
+
+
+    @property
+    def comm_dims(self):
+        return None if self._comm_dims is None else list(self._comm_dims)
+
+
+    @property
+    def comm_coord(self):
+        return None if self._comm_coord is None else list(self._comm_coord)
+
+
+    @property
+    def rank_extents(self):
+        return self._rank_extents
+
+
+    @property
+    def block_size(self):
+        return self._block_size
+
+
+    @property
+    def weights(self):
+        return self._weights
+
+
+    @property
+    def rank_shapes(self):
+        """ Local shapes of all ranks, array of shape (comm size, ndim). """
+        return self._rank_extents[..., 1] - self._rank_extents[..., 0]
+
+
+    @property
+    def rank_sizes(self):
+        """ Number of local elements of all ranks, array of length comm size.
+        """
+        return np.prod(self.rank_shapes, axis=1, dtype=np.int64)
+
+
+    def gather_counts(self):
+        """ Number of local elements of all ranks and their offsets when
+            packed in rank order, for gathers and scatters of the local data
+            of all ranks, see mpi_utils.get_vector_counts.  Computed once
+            per layout.
+
+        Returns
+        -------
+        counts, displacements : numpy.ndarray
+        """
+        if self._gather_counts is None:
+            counts, displacements = get_vector_counts(self.rank_sizes)
+            counts.flags.writeable = False
+            displacements.flags.writeable = False
+            self._gather_counts = (counts, displacements)
+        return self._gather_counts
+
+
+    @property
+    def imbalance(self):
+        """ Largest ratio of the number of local elements of a rank to its
+            share of all elements, 1.0 for evenly partitioned layouts.
+            Shares are proportional to the weights of weighted layouts.
+        """
+        rank_sizes = self.rank_sizes
+        if rank_sizes.sum() == 0:
+            return 1.0
+        shares = np.ones(len(rank_sizes)) if self._weights is None \
+            else np.asarray(self._weights, dtype=np.float64)
+        shares = shares / shares.sum() * rank_sizes.sum()
+        with np.errstate(divide='ignore'):
+            return float(np.max(rank_sizes / shares))
+
+
+    @property
+    def local_shape(self):
+        return tuple(int(dim) for dim in self.rank_shapes[self._rank])
+
+
+    @property
+    def local_to_global(self):
+        """ Dictionary specifying global index start/end of local data by axis.
+            None for Replicated layouts.  Along a block-cyclic axis the
+            range bounds the global indices held by the local rank.
+        """
+        if is_Replicated(self._dist):
+            return None
+        local_to_global = \
+            {axis: (int(start), int(end))
+             for axis, (start, end) in enumerate(self._rank_extents[self._rank])}
+        if self._block_size is not None and self.globalndim > 0:
+            axis_indices = self.axis_indices(0)
+            if axis_indices.size:
+                local_to_global[0] = \
+                    (int(axis_indices[0]), int(axis_indices[-1]) + 1)
+            else:
+                local_to_global[0] = (self._globalshape[0],
+                                      self._globalshape[0])
+        return local_to_global
+
+
+    def axis_indices(self, axis, rank=None):
+        """ Global indices along axis held by rank, in local order.
+
+        Parameters
+        ----------
+        axis : int
+            Axis of interest.
+        rank : int, None
+            Rank of interest. If none specified defaults to local rank.
+
+        Returns
+        -------
+        axis_indices : numpy.ndarray
+        """
+        rank = self._rank if rank is None else rank
+        if self._block_size is not None and axis == 0:
+            axis_coord = np.unravel_index(rank, self._comm_dims)[0]
+            return get_block_cyclic_indices(self._globalshape[0],
+                                            self._comm_dims[0],
+                                            axis_coord,
+                                            self._block_size)
+        start, end = self._rank_extents[rank, axis]
+        return np.arange(start, end, dtype=np.int64)
+
+
+    def rank_index(self, rank=None):
+        """ Global index of data held by rank, suitable to select the
+            local data of rank from the global array.
+
+        Parameters
+        ----------
+        rank : int, None
+            Rank of interest. If none specified defaults to local rank.
+
+        Returns
+        -------
+        index : tuple of slice, numpy.ndarray
+        """
+        if self._block_size is None:
+            return self.rank_slices(rank)
+        return (self.axis_indices(0, rank),) + self.rank_slices(rank)[1:]
+
+
+    def drop_axis(self, axis):
+        """ Layout of the data left after removing an axis that is not
+            partitioned among the processes, e.g. the result of a reduction
+            along axis.  Local data keeps its extents along all other axes.
+
+        Parameters
+        ----------
+        axis : int
+            Axis to remove.
+
+        Returns
+        -------
+        layout : Layout
+        """
+        if is_Replicated(self._dist) or \
+           not len(self._comm_dims) <= axis < self.globalndim:
+            raise ValueError('axis {} is partitioned or out of bounds.'
+                             .format(axis))
+        globalshape = self._globalshape[:axis] + self._globalshape[axis + 1:]
+        return Layout(globalshape, self._dist, self._comm,
+                      self._comm_dims, self._comm_coord,
+                      np.delete(self._rank_extents, axis, axis=1),
+                      block_size=self._block_size,
+                      weights=self._weights)
+
+
+    def partitions(self, axis=0):
+        """ [start, end) global indices along axis held by all ranks.
+
+        Parameters
+        ----------
+        axis : int
+            Axis of interest.
+
+        Returns
+        -------
+        partitions : numpy.ndarray
+            Array of shape (comm size, 2).
+        """
+        return self._rank_extents[:, axis, :]
+
+
+    def ravel(self):
+        """ Layout of the flattened(C order) data, keeping the local data of
+            every rank.  Only valid for Block layouts, where ranks hold
+            consecutive ranges of the flattened global array in rank order.
+
+        Returns
+        -------
+        layout : Layout
+        """
+        if not is_block_distributed(self._dist):
+            raise NotSupportedError(
+                "only Block layouts can be flattened without communication.")
+        ends = np.cumsum(self.rank_sizes)
+        rank_extents = np.stack((ends - self.rank_sizes, ends), axis=1)
+        return Layout((self.globalsize,), self._dist, self._comm,
+                      self._comm_dims, self._comm_coord,
+                      rank_extents[:, np.newaxis, :],
+                      weights=self._weights)
+
+
+    def rank_slices(self, rank=None):
+        """ Global index slices of data held by rank.  Along a block-cyclic
+            axis the slice indexes the data of all ranks packed in rank
+            order, see rank_index for global indices.
+
+        Parameters
+        ----------
+        rank : int, None
+            Rank of interest. If none specified defaults to local rank.
+
+        Returns
+        -------
+        slices : tuple of slice
+        """
+        rank = self._rank if rank is None else rank
+        return tuple(slice(int(start), int(end))
+                     for start, end in self._rank_extents[rank])
+
+
+    def owners(self, global_offsets):
+        """ Ranks holding the elements at the specified flattened global
+            offsets.  Only valid for partitioned(non Replicated) layouts.
+
+        Parameters
+        ----------
+        global_offsets : numpy.ndarray
+            Flattened(C order) global offsets of elements.
+
+        Returns
+        -------
+        owners : numpy.ndarray
+            Rank holding each element.
+        """
+        global_index = np.unravel_index(global_offsets, self._globalshape)
+        rank_coords = np.unravel_index(np.arange(len(self._rank_extents)),
+                                       self._comm_dims)
+        grid_coords = []
+        for axis, axis_size in enumerate(self._comm_dims):
+            if self._block_size is not None and axis == 0:
+                axis_coords, _ = get_block_cyclic_index(global_index[axis],
+                                                        axis_size,
+                                                        self._block_size)
+                grid_coords.append(axis_coords)
+                continue
+            #Start index of each grid coordinate along axis
+            axis_starts = np.zeros(axis_size, dtype=np.int64)
+            axis_starts[rank_coords[axis]] = self._rank_extents[:, axis, 0]
+            grid_coords.append(np.searchsorted(axis_starts,
+                                               global_index[axis],
+                                               side='right') - 1)
+        return np.ravel_multi_index(grid_coords, self._comm_dims)
+
+
+    def local_offsets(self):
+        """ Flattened(C order) global offsets of the elements held by
+            local rank, in local C order.
+
+        Returns
+        -------
+        local_offsets : numpy.ndarray
+        """
+        strides = np.cumprod((self._globalshape + (1,))[:0:-1])[::-1]
+        local_offsets = np.zeros((), dtype=np.int64)
+        for axis, stride in enumerate(strides):
+            local_offsets = np.add.outer(local_offsets,
+                                         self.axis_indices(axis) * stride)
+        return local_offsets.ravel()
+
+
+def get_layout(shape, dist, comm=MPI.COMM_WORLD, block_size=None,
+               weights=None):
+    """ Get layout of global array shape among MPI processes based on the
+        specified distribution.  Layouts are cached per shape, distribution,
+        and communicator; no communication is performed.  Caches are
+        attached to communicators and released when they are freed.
+
+    Parameters
+    ----------
+    shape : int, tuple of int
+        Global shape of data to distribute, must be known on all processes.
+    dist : str
+        Specified distribution of data among processes.
+        Default value 'b' : Block
+        Supported types:
+            'b' : Block
+            'bb' : Block-Block
+            'bc' : Block-Cyclic
+            'r' : Replicated
+    comm : MPI Communicator, optional
+        MPI process communication object.  If none specified
+        defaults to MPI.COMM_WORLD
+    block_size : int, optional
+        Block size of block-cyclic distributions. If none specified
+        defaults to DEFAULT_BLOCK_SIZE, ignored for other distributions.
+    weights : array_like, optional
+        Relative weights of all processes in comm, e.g. determined by
+        measure_weights, axis 0 of Block distributions is partitioned
+        proportional to.  Must be identical on all processes.  If none
+        specified axis 0 is partitioned evenly.
+
+    Returns
+    -------
+    layout : Layout
+        Immutable layout of distributed array.
+    """
+    globalshape = tuple(int(dim) for dim in np.ravel(shape))
+    block_size = _check_block_size(dist, block_size)
+    size = comm.Get_size()
+    rank = comm.Get_rank()
+    weights = _check_weights(dist, weights, size)
+    key = (globalshape, dist, block_size, weights)
+
+    layout_cache = _get_layout_cache(comm)
+    layout = layout_cache.get(key)
+    if layout is not None:
+        layout_cache.move_to_end(key)
+        return layout
+
+    layout = _create_layout(globalshape, dist, comm, size, rank, block_size,
+                            weights)
+    layout_cache[key] = layout
+    if len(layout_cache) > _LAYOUT_CACHE_SIZE:
+        layout_cache.popitem(last=False)
+
+    return layout
+
+
+def _get_layout_cache(comm):
+    """ Helper method to get the layout cache attached to a communicator.
+        Handles of freed communicators may be reused by MPI, attributes are
+        deleted on free so new communicators never see stale layouts.
+    """
+    global _layout_cache_keyval
+    if _layout_cache_keyval is None:
+        _layout_cache_keyval = MPI.Comm.Create_keyval()
+    layout_cache = comm.Get_attr(_layout_cache_keyval)
+    if layout_cache is None:
+        layout_cache = OrderedDict()
+        comm.Set_attr(_layout_cache_keyval, layout_cache)
+    return layout_cache
+
+
+def broadcast_layout(shape, dist, comm=MPI.COMM_WORLD, root=0,
+                     block_size=None, weights=None):
+    """ Get layout of global array shape that is only known on the root
+        process.  The shape is transmitted with a single broadcast of a
+        fixed size header.  See docstring for get_layout.
+
+    Parameters
+    ----------
+    shape : int, tuple of int, None
+        Global shape of data to distribute.  Only referenced on root.
+    dist : str
+        Specified distribution of data among processes.
+    comm : MPI Communicator, optional
+        MPI process communication object.  If none specified
+        defaults to MPI.COMM_WORLD
+    root : int, optional
+        Rank of root process that has the global shape data. If none
+        specified defaults to 0.
+    block_size : int, optional
+        Block size of block-cyclic distributions, must be specified on all
+        processes.
+    weights : array_like, optional
+        Relative weights of all processes in comm of Block distributions,
+        must be specified on all processes.
+
+    Returns
+    -------
+    layout : Layout
+        Immutable layout of distributed array.
+    """
+    #Header format: [ndim, axis 0 length, axis 1 length, ...]
+    shape_header = np.zeros(_MAX_NDIM + 1, dtype=np.int64)
+    if comm.Get_rank() == root:
+        array_shape = np.ravel(shape)
+        shape_header[0] = array_shape.size
+        shape_header[1: array_shape.size + 1] = array_shape
+    comm.Bcast(shape_header, root=root)
+
+    ndim = shape_header[0]
+    return get_layout(shape_header[1: ndim + 1], dist, comm=comm,
+                      block_size=block_size, weights=weights)
+
+
+def gather_layout(local_shape, dist, comm=MPI.COMM_WORLD, comm_dims=None,
+                  comm_coord=None, local_to_global=None, block_size=None):
+    """ Get layout of distributed array from the shape of its process local
+        data.  Shapes and global start indices of all ranks are exchanged with
+        a single Allgather of a fixed size header, from which the global
+        shape and extents of all ranks are determined.
+
+        Axes without a specified global start index are assumed to be
+        partitioned as consecutive blocks along the cartesian grid, and to be
+        complete along all other axes.
+
+    Parameters
+    ----------
+    local_shape : tuple of int
+        Shape of process local data.
+    dist : str
+        Specified distribution of data among processes.
+    comm : MPI Communicator, optional
+        MPI process communication object.  If none specified
+        defaults to MPI.COMM_WORLD
+    comm_dims : list, None
+        Dimensions of cartesian grid. If none specified determined from
+        distribution.
+    comm_coord : list, None
+        Coordinates of local rank in grid. If none specified determined from
+        comm_dims.
+    local_to_global : dict, None
+        Dictionary specifying global index start/end of local data by axis.
+        Ignored along block-cyclic axes.
+    block_size : int, optional
+        Block size of block-cyclic distributions. If none specified
+        defaults to DEFAULT_BLOCK_SIZE, ignored for other distributions.
+
+    Returns
+    -------
+    layout : Layout
+        Immutable layout of distributed array.
+    """
+    size = comm.Get_size()
+    rank = comm.Get_rank()
+    local_ndim = len(local_shape)
+    block_size = _check_block_size(dist, block_size)
+
+    #Header format: [ndim, axis lengths (padded), axis starts (padded)]
+    ## Unknown starts are marked with -1
+    local_header = np.zeros(2 * _MAX_NDIM + 1, dtype=np.int64)
+    local_header[0] = local_ndim
+    local_header[1: local_ndim + 1] = local_shape
+    local_header[_MAX_NDIM + 1:] = -1
+    if local_to_global is not None:
+        for axis, (start, _) in local_to_global.items():
+            local_header[_MAX_NDIM + 1 + axis] = start
+    #Block-cyclic data is packed in rank order along axis 0
+    if block_size is not None:
+        local_header[_MAX_NDIM + 1] = -1
+    headers = np.empty((size, local_header.size), dtype=np.int64)
+    comm.Allgather(local_header, headers)
+
+    ndim = int(headers[:, 0].max())
+    _check_dimensions(dist, ndim)
+    if comm_dims is None:
+        comm_dims = get_comm_dims(size, dist)
+    if comm_coord is None:
+        comm_coord = get_cart_coords(comm_dims, size, rank)
+
+    lengths = headers[:, 1: ndim + 1]
+    starts = headers[:, _MAX_NDIM + 1: _MAX_NDIM + 1 + ndim]
+    #Grid axes default to consecutive blocks along the cartesian grid
+    grid_dims = comm_dims if int(np.prod(comm_dims)) == size else [size]
+    for axis in range(min(ndim, len(grid_dims))):
+        grid_lengths = lengths[:, axis].reshape(grid_dims)
+        block_starts = \
+            (np.cumsum(grid_lengths, axis=axis) - grid_lengths).ravel()
+        starts[:, axis] = \
+            np.where(starts[:, axis] < 0, block_starts, starts[:, axis])
+    starts = np.where(starts < 0, 0, starts)
+
+    rank_extents = np.stack((starts, starts + lengths), axis=-1)
+    globalshape = rank_extents[..., 1].max(axis=0)
+
+    return Layout(globalshape, dist, comm, comm_dims, comm_coord, rank_extents,
+                  block_size=block_size)
+
+
+def measure_weights(comm=MPI.COMM_WORLD, size=1 << 18, repetitions=5):
+    """ Measure relative weights of processes for weighted Block layouts
+        with a calibration microbenchmark.  Every process times a local
+        element-wise kernel, weights are the inverse of the fastest of
+        repetitions runs and identical on all processes.
+
+    Parameters
+    ----------
+    comm : MPI Communicator, optional
+        MPI process communication object.  If none specified
+        defaults to MPI.COMM_WORLD
+    size : int, optional
+        Number of elements processed by the kernel.
+    repetitions : int, optional
+        Number of timed runs of the kernel.
+
+    Returns
+    -------
+    weights : numpy.ndarray
+        Weights of all processes in comm normalized to a mean of 1.
+    """
+    if size < 1 or repetitions < 1:
+        raise ValueError('size and repetitions must be positive.')
+    data = np.arange(size, dtype=np.float64)
+    result = np.empty_like(data)
+    best_time = np.inf
+    for _ in range(repetitions):
+        start = MPI.Wtime()
+        np.multiply(data, 1.5, out=result)
+        np.add(result, data, out=result)
+        result.sum()
+        best_time = min(best_time, MPI.Wtime() - start)
+
+    #Clock resolution bounds time of fast kernels
+    rate = np.array(1. / max(best_time, MPI.Wtick()), dtype=np.float64)
+    rates = np.empty(comm.Get_size(), dtype=np.float64)
+    comm.Allgather(rate, rates)
+    return rates / rates.mean()
+
+
+def redistribute(array_data, current_layout, desired_layout):
+    """ Redistribute process local data between two partitioned layouts with
+        a single personalized all to all exchange.  The layouts may describe
+        different global shapes of the same size, elements are matched by
+        their flattened(C order) global offset.
+
+    Parameters
+    ----------
+    array_data : numpy.ndarray
+        Process local data described by current_layout.
+    current_layout : Layout
+        Layout of array_data.
+    desired_layout : Layout
+        Layout of redistributed data.
+
+    Returns
+    -------
+    local_data : numpy.ndarray
+        Process local data described by desired_layout.
+    """
+    exchange, recv_order = \
+        _redistribution_exchange(array_data, current_layout, desired_layout)
+    return _place_received(all_to_all_v(**exchange), recv_order,
+                           desired_layout)
+
+
+def redistribute_async(array_data, current_layout, desired_layout):
+    """ Start redistributing process local data between two partitioned
+        layouts with a single non-blocking all to all exchange, see
+        redistribute.
+
+    Returns
+    -------
+    future : MPIFuture
+        Future of the process local data described by desired_layout.
+    """
+    exchange, recv_order = \
+        _redistribution_exchange(array_data, current_layout, desired_layout)
+    return all_to_all_v_async(**exchange).then(
+        lambda recv_data: _place_received(recv_data, recv_order,
+                                          desired_layout))
+
+
+def _redistribution_exchange(array_data, current_layout, desired_layout):
+    """ Helper method returning the all_to_all_v arguments of a
+        redistribution, and the positions of received elements in the
+        local data if they do not arrive in order.
+    """
+    comm = current_layout.comm
+    size = comm.Get_size()
+
+    #Row partitions of Block layouts determine the exchange in closed form
+    if is_block_distributed(current_layout.dist) and \
+       is_block_distributed(desired_layout.dist):
+        plan = determine_redistribution_plan(
+            current_layout.globalshape, desired_layout.globalshape, comm=comm,
+            current_partitions=current_layout.partitions(0),
+            desired_partitions=desired_layout.partitions(0))
+        return {'array_data': array_data,
+                'send_counts': plan.send_counts,
+                'recv_counts': plan.recv_counts,
+                'send_displacements': plan.send_displacements,
+                'recv_displacements': plan.recv_displacements,
+                'recv_shape': desired_layout.local_shape,
+                'comm': comm}, None
+
+    #Local elements are sent grouped by destination, in global offset order
+    destinations = desired_layout.owners(current_layout.local_offsets())
+    send_order = np.argsort(destinations, kind='stable')
+    send_counts = np.bincount(destinations, minlength=size)
+    send_data = np.ascontiguousarray(array_data).ravel()[send_order]
+
+    #Received elements arrive grouped by source, in global offset order
+    sources = current_layout.owners(desired_layout.local_offsets())
+    recv_order = np.argsort(sources, kind='stable')
+    recv_counts = np.bincount(sources, minlength=size)
+
+    return {'array_data': send_data,
+            'send_counts': send_counts,
+            'recv_counts': recv_counts,
+            'comm': comm}, recv_order
+
+
+def _place_received(recv_data, recv_order, desired_layout):
+    """ Helper method placing received elements of a redistribution. """
+    if recv_order is None:
+        return recv_data
+    local_data = empty_buffer(recv_data.size, recv_data.dtype)
+    local_data[recv_order] = recv_data
+    release_buffer(recv_data)
+
+    return local_data.reshape(desired_layout.local_shape)
+
+
+def _create_layout(globalshape, dist, comm, size, rank, block_size=None,
+                   weights=None):
+    """ Helper method to determine extents of all ranks for a new layout. """
+    ndim = len(globalshape)
+    rank_extents = np.zeros((size, ndim, 2), dtype=np.int64)
+    rank_extents[..., 1] = globalshape
+
+    comm_dims = get_comm_dims(size, dist)
+    if is_Replicated(dist):
+        return Layout(globalshape, dist, comm, None, None, rank_extents)
+
+    _check_dimensions(dist, ndim)
+    rank_coords = np.array([get_cart_coords(comm_dims, size, proc)
+                            for proc in range(size)], dtype=np.int64)
+    #Leading axes are partitioned along the cartesian grid
+    for axis in range(min(ndim, len(comm_dims))):
+        if block_size is not None and axis == 0:
+            #Block-cyclic data is packed in rank order
+            counts = get_block_cyclic_counts(globalshape[axis],
+                                             comm_dims[axis],
+                                             block_size)
+            ends = np.cumsum(counts)
+            block_indices = np.stack((ends - counts, ends), axis=1)
+        elif weights is not None and axis == 0:
+            block_indices = get_weighted_block_indices(globalshape[axis],
+                                                       weights)
+        else:
+            block_indices = get_block_indices(globalshape[axis],
+                                              comm_dims[axis])
+        rank_extents[:, axis, :] = block_indices[rank_coords[:, axis]]
+
+    return Layout(globalshape, dist, comm, comm_dims,
+                  get_cart_coords(comm_dims, size, rank), rank_extents,
+                  block_size=block_size, weights=weights)
+
+
+def _check_dimensions(dist, ndim):
+    """ Helper method to verify array dimensions are compatible with
+        distribution.
+    """
+    if is_block_block_distributed(dist) and ndim < 2:
+        raise NotSupportedError(
+            "'bb' distribution requires arrays with 2 or more dimensions.")
+
+
+def _check_block_size(dist, block_size):
+    """ Helper method to determine block size of distribution, None for
+        distributions that are not block-cyclic.
+    """
+    if not is_block_cyclic_distributed(dist):
+        return None
+    if block_size is None:
+        return DEFAULT_BLOCK_SIZE
+    if int(block_size) < 1:
+        raise ValueError('block_size must be a positive int.')
+    return int(block_size)
+
+
+def _check_weights(dist, weights, size):
+    """ Helper method to normalize weights of processes to a hashable
+        tuple, None for evenly partitioned distributions.
+    """
+    if weights is None:
+        return None
+    if not is_block_distributed(dist):
+        raise NotSupportedError(
+            "weights only supported for 'b' distribution.")
+    weights = np.asarray(weights, dtype=np.float64).ravel()
+    if weights.size != size or np.any(weights < 0) or \
+       not np.all(np.isfinite(weights)) or weights.sum() <= 0:
+        raise ValueError('weights must be {} '.format(size) +
+                         'non-negative values with a positive sum.')
+    return tuple(weights / weights.sum())
@@ -0,0 +1,3 @@
+from mpids.MPInumpy._linalg import cg, gmres, lstsq, pca, qr, solve, svd
+
+__all__ = ['cg', 'gmres', 'lstsq', 'pca', 'qr', 'solve', 'svd']
@@ -1,58 +1,287 @@
+from collections import OrderedDict
 from mpi4py import MPI
+from mpi4py.util.dtlib import from_numpy_dtype
 import numpy as np
 
-from mpids.MPInumpy.errors import TypeError
-
-__all__ = ['all_gather_v', 'all_to_all', 'all_to_all_v', 'broadcast_array',
-           'broadcast_shape', 'get_comm', 'get_comm_size',
-           'get_rank', 'scatter_v']
-
-def all_gather_v(array_data, shape=None, comm=MPI.COMM_WORLD):
+from mpids.MPInumpy.buffer_pool import empty_buffer
+from mpids.MPInumpy.errors import NotSupportedError, TypeError
+from mpids.MPInumpy.futures import MPIFuture
+
+__all__ = ['all_gather_v', 'all_gather_v_async', 'all_reduce_comoments',
+           'all_reduce_moments', 'all_to_all', 'all_to_all_v',
+           'all_to_all_v_async', 'all_to_all_w', 'broadcast_array',
+           'broadcast_shape', 'combine_comoments', 'combine_moments',
+           'get_comm', 'get_comm_size', 'get_mpi_datatype', 'get_mpi_message',
+           'get_rank', 'get_vector_counts', 'scatter_v']
+
+#Lazily created MPI objects for reductions of (count, mean, M2) moments
+_MOMENTS_DATATYPE = None
+_MOMENTS_OP = None
+#Lazily created MPI reduction of (count, mean, C) comoments
+_COMOMENTS_OP = None
+#Committed MPI datatypes of numpy dtypes, created once on first use
+_DATATYPES = {}
+#Committed MPI datatypes of strided views keyed by (dtype, shape, strides),
+##least recently used datatypes are freed beyond STRIDED_DATATYPES_LIMIT
+_STRIDED_DATATYPES = OrderedDict()
+STRIDED_DATATYPES_LIMIT = 256
+#Largest count or displacement of vector collectives without MPI-4 large
+##count support
+_MAX_INT_COUNT = np.iinfo(np.int32).max
+
+def all_gather_v(array_data, shape=None, comm=MPI.COMM_WORLD, counts=None,
+                 displacements=None, layout=None):
     """ Gather distributed array data to all processes
 
     Parameters
     ----------
     array_data : numpy.ndarray
-        Numpy array data distributed among processes.
+        Numpy array data distributed among processes.  Data is placed in
+        the gathered array directly, strided views are not packed into
+        intermediate buffers.
     shape : int, tuple of int, None
         Final desired shape of gathered array data
     comm : MPI Communicator, optional
         MPI process communication object.  If none specified
         defaults to MPI.COMM_WORLD
+    counts : numpy.ndarray, None
+        Number of elements contributed by each process, known to all
+        processes.  If none specified counts are taken from layout, or
+        determined with a single Allgather.
+    displacements : numpy.ndarray, None
+        Element offsets of the data of each process in the gathered array.
+        If none specified data is gathered in rank order.
+    layout : Layout, None
+        Layout describing array_data, see mpids.MPInumpy.layout.  Counts are
+        taken from the local sizes of all ranks without communication.
 
     Returns
     -------
     gathered_array : numpy.ndarray
         Collected numpy array from all process in MPI Comm.
     """
+    gathered_array, recv_spec = _prepare_all_gather_v(
+        array_data, comm, counts, displacements, layout)
+    comm.Allgatherv(MPI.IN_PLACE, recv_spec)
+    #Reshape if necessary
+    if shape is not None:
+        gathered_array = gathered_array.reshape(shape)
+
+    return gathered_array
+
+
+def all_gather_v_async(array_data, shape=None, comm=MPI.COMM_WORLD,
+                       counts=None, displacements=None, layout=None):
+    """ Start gathering distributed array data to all processes with a
+        single Iallgatherv, see all_gather_v for the parameters.  If counts
+        are neither specified nor taken from layout they are determined
+        with a blocking Allgather first.
+
+    Returns
+    -------
+    future : MPIFuture
+        Future of the gathered numpy array, see all_gather_v.
+    """
+    gathered_array, recv_spec = _prepare_all_gather_v(
+        array_data, comm, counts, displacements, layout)
+    future = MPIFuture([comm.Iallgatherv(MPI.IN_PLACE, recv_spec)],
+                       result=gathered_array)
+    if shape is not None:
+        future.then(lambda gathered_array: gathered_array.reshape(shape))
+
+    return future
+
+
+def _prepare_all_gather_v(array_data, comm, counts, displacements, layout):
+    """ Helper method returning the gathered array holding the local data
+        of the process, and its receive specification.
+    """
     if not isinstance(array_data, np.ndarray):
         raise TypeError('invalid data type for all_gather_v.')
 
-    comm_size = comm.Get_size()
-    local_displacement = np.empty(1, dtype=np.int32)
-    displacements = np.empty(comm_size, dtype=np.int32)
-    local_count = np.asarray(array_data.size, dtype=np.int32)
-    counts = np.empty(comm_size, dtype=np.int32)
-    total_count = np.empty(1, dtype=np.int32)
+    if counts is None and layout is not None:
+        counts, layout_displacements = layout.gather_counts()
+        if displacements is None:
+            displacements = layout_displacements
+    elif counts is None:
+        #Single collective to learn the counts of all processes
+        counts = np.empty(comm.Get_size(), dtype=np.int64)
+        comm.Allgather(np.asarray(array_data.size, dtype=np.int64), counts)
+    counts, displacements = get_vector_counts(counts, displacements)
+
+    gathered_array = empty_buffer(int(counts.sum()), array_data.dtype)
+    #Local data is copied to its place, gathered in place
+    rank = comm.Get_rank()
+    gathered_array[displacements[rank]:
+                   displacements[rank] + counts[rank]] \
+        .reshape(array_data.shape)[...] = array_data
 
-    #Exclusive scan to determine displacements
-    comm.Exscan(local_count, local_displacement, op=MPI.SUM)
-    comm.Allreduce(local_count, total_count, op=MPI.SUM)
-    comm.Allgather(local_displacement, displacements)
-    comm.Allgather(local_count, counts)
+    return gathered_array, [gathered_array, (counts, displacements),
+                            get_mpi_datatype(array_data.dtype)]
 
-    gathered_array = np.empty(total_count, dtype=array_data.dtype)
-    #Reshape if necessary
-    if shape is not None:
-        gathered_array = gathered_array.reshape(shape)
-    # Final conditioning of displacements list
-    displacements[0] = 0
 
-    mpi_dtype = MPI._typedict[np.sctype2char(array_data.dtype)]
-    comm.Allgatherv(array_data,
-                    [gathered_array, (counts, displacements), mpi_dtype])
+def all_reduce_moments(moments, comm=MPI.COMM_WORLD):
+    """ Combine (count, mean, M2) moments of all processes in place with a
+        single Allreduce, using the pairwise update of Chan et al.
 
-    return gathered_array
+    Parameters
+    ----------
+    moments : numpy.ndarray
+        Contiguous float64 array of shape (..., 3) holding count, mean and
+        sum of squared differences from the mean(M2) of the local data for
+        each reduced element.  Elements not held by the process are
+        expected to have a count of zero.
+    comm : MPI Communicator, optional
+        MPI process communication object.  If none specified
+        defaults to MPI.COMM_WORLD
+
+    Returns
+    -------
+    moments : numpy.ndarray
+        Passed array holding global moments of every reduced element.
+    """
+    if not isinstance(moments, np.ndarray) or \
+       moments.dtype != np.float64 or \
+       moments.shape[-1:] != (3,) or \
+       not moments.flags['C_CONTIGUOUS']:
+        raise TypeError('invalid moments for all_reduce_moments.')
+
+    global _MOMENTS_DATATYPE, _MOMENTS_OP
+    if _MOMENTS_OP is None:
+        #Each moment triple is transferred and reduced as a single element
+        _MOMENTS_DATATYPE = MPI.DOUBLE.Create_contiguous(3).Commit()
+        _MOMENTS_OP = MPI.Op.Create(_reduce_moments, commute=True)
+
+    comm.Allreduce(MPI.IN_PLACE,
+                   [moments, moments.size // 3, _MOMENTS_DATATYPE],
+                   op=_MOMENTS_OP)
+    return moments
+
+
+def _reduce_moments(in_buffer, inout_buffer, datatype):
+    """ User defined MPI reduction of (count, mean, M2) triples. """
+    in_moments = np.frombuffer(in_buffer, dtype=np.float64).reshape(-1, 3)
+    inout_moments = np.frombuffer(inout_buffer, dtype=np.float64).reshape(-1, 3)
+    inout_moments[...] = combine_moments(in_moments, inout_moments)
+
+
+def combine_moments(moments, other_moments):
+    """ Combine two sets of (count, mean, M2) moments, where M2 is the sum
+        of squared differences from the mean, without revisiting the data.
+
+    Parameters
+    ----------
+    moments, other_moments : numpy.ndarray
+        Arrays of shape (..., 3) holding count, mean and M2 of each element.
+        A count of zero marks an empty set of values.
+
+    Returns
+    -------
+    combined_moments : numpy.ndarray
+        Moments of the union of both sets of values.
+    """
+    count, mean, m2 = np.moveaxis(moments, -1, 0)
+    other_count, other_mean, other_m2 = np.moveaxis(other_moments, -1, 0)
+
+    combined_count = count + other_count
+    other_weight = np.divide(other_count, combined_count,
+                             out=np.zeros_like(combined_count),
+                             where=combined_count > 0)
+    delta = other_mean - mean
+
+    return np.stack([combined_count,
+                     mean + delta * other_weight,
+                     m2 + other_m2 + delta**2 * count * other_weight],
+                    axis=-1)
+
+
+def all_reduce_comoments(comoments, comm=MPI.COMM_WORLD):
+    """ Combine (count, mean, C) comoments of all processes in place with a
+        single Allreduce, using the pairwise update of Chan et al.
+
+    Parameters
+    ----------
+    comoments : numpy.ndarray
+        Contiguous float64 array of length 1 + d + d**2 holding count, means
+        of d variables and sums of products of differences from the
+        means(C, d x d in C order) of the local observations.  Processes
+        without observations are expected to have a count of zero.
+    comm : MPI Communicator, optional
+        MPI process communication object.  If none specified
+        defaults to MPI.COMM_WORLD
+
+    Returns
+    -------
+    comoments : numpy.ndarray
+        Passed array holding global comoments.
+    """
+    if not isinstance(comoments, np.ndarray) or \
+       comoments.dtype != np.float64 or \
+       comoments.ndim != 1 or \
+       _comoment_variables(comoments.size) is None or \
+       not comoments.flags['C_CONTIGUOUS']:
+        raise TypeError('invalid comoments for all_reduce_comoments.')
+
+    global _COMOMENTS_OP
+    if _COMOMENTS_OP is None:
+        _COMOMENTS_OP = MPI.Op.Create(_reduce_comoments, commute=True)
+
+    #Comoments are transferred and reduced as a single element
+    datatype = MPI.DOUBLE.Create_contiguous(comoments.size).Commit()
+    comm.Allreduce(MPI.IN_PLACE, [comoments, 1, datatype], op=_COMOMENTS_OP)
+    datatype.Free()
+    return comoments
+
+
+def _reduce_comoments(in_buffer, inout_buffer, datatype):
+    """ User defined MPI reduction of (count, mean, C) comoments. """
+    element_size = datatype.Get_size() // MPI.DOUBLE.Get_size()
+    in_comoments = \
+        np.frombuffer(in_buffer, dtype=np.float64).reshape(-1, element_size)
+    inout_comoments = \
+        np.frombuffer(inout_buffer, dtype=np.float64).reshape(-1, element_size)
+    for in_element, inout_element in zip(in_comoments, inout_comoments):
+        inout_element[...] = combine_comoments(in_element, inout_element)
+
+
+def _comoment_variables(size):
+    """ Number of variables d of comoments of length 1 + d + d**2, None if
+        no such number exists.
+    """
+    variables = int(round((np.sqrt(max(4 * size - 3, 0)) - 1) / 2))
+    return variables if 1 + variables + variables**2 == size else None
+
+
+def combine_comoments(comoments, other_comoments):
+    """ Combine two sets of (count, mean, C) comoments, where C holds the
+        sums of products of differences from the means, without revisiting
+        the data.
+
+    Parameters
+    ----------
+    comoments, other_comoments : numpy.ndarray
+        Arrays of length 1 + d + d**2 holding count, means of d variables and
+        C in C order.  A count of zero marks an empty set of observations.
+
+    Returns
+    -------
+    combined_comoments : numpy.ndarray
+        Comoments of the union of both sets of observations.
+    """
+    variables = _comoment_variables(comoments.size)
+    count, other_count = comoments[0], other_comoments[0]
+    mean = comoments[1:variables + 1]
+    delta = other_comoments[1:variables + 1] - mean
+
+    combined_count = count + other_count
+    other_weight = other_count / combined_count if combined_count > 0 else 0.
+    combined_comoments = np.empty_like(comoments)
+    combined_comoments[0] = combined_count
+    combined_comoments[1:variables + 1] = mean + delta * other_weight
+    combined_comoments[variables + 1:] = \
+        comoments[variables + 1:] + other_comoments[variables + 1:] + \
+        np.outer(delta, delta * count * other_weight).ravel()
+    return combined_comoments
 
 
 def all_to_all(array_data, comm=MPI.COMM_WORLD):
@@ -89,8 +318,9 @@ def all_to_all(array_data, comm=MPI.COMM_WORLD):
     return all_to_all_exchanged
 
 
-def all_to_all_v(array_data, send_counts, recv_counts, send_displacements=None,
-                 recv_displacements=None, recv_shape=None, comm=MPI.COMM_WORLD):
+def all_to_all_v(array_data, send_counts, recv_counts=None,
+                 send_displacements=None, recv_displacements=None,
+                 recv_shape=None, comm=MPI.COMM_WORLD):
     """ All to all exchange of distributed array data among processes in
         communicator where each exchange is unique.
 
@@ -111,10 +341,13 @@ def all_to_all_v(array_data, send_counts, recv_counts, send_displacements=None,
                 send_counts[1] = 3
                 send_counts[2] = 4
                 ...
-    recv_counts : numpy.ndarray
+    recv_counts : numpy.ndarray, None
         Constructed local numpy array of length communicator size that lists
         how much data it will be receiving for a given process.  The position in
         the array is the equivalent rank of the sending process.
+        Notes:
+            If not supplied the counts are exchanged with a single Alltoall
+            of send_counts.
         Requirements:
             Array length must be equal to the number of ranks in specified comm.
         Format:
@@ -175,25 +408,121 @@ def all_to_all_v(array_data, send_counts, recv_counts, send_displacements=None,
         Constructed local numpy array from all process in MPI Comm.
     """
 #TODO: Think about type checking here
+    send_spec, recv_spec = _prepare_all_to_all_v(
+        array_data, send_counts, recv_counts, send_displacements,
+        recv_displacements, comm)
+    comm.Alltoallv(send_spec, recv_spec)
+
+    recv_local_array = recv_spec[0]
+    if recv_shape is None:
+        recv_shape = (recv_local_array.size,)
+    #Reshape
+    return recv_local_array.reshape(recv_shape)
+
+
+def all_to_all_v_async(array_data, send_counts, recv_counts=None,
+                       send_displacements=None, recv_displacements=None,
+                       recv_shape=None, comm=MPI.COMM_WORLD):
+    """ Start an all to all exchange of distributed array data with a single
+        Ialltoallv, see all_to_all_v for the parameters.  If recv_counts
+        are not specified they are determined with a blocking Alltoall
+        first.
+
+    Returns
+    -------
+    future : MPIFuture
+        Future of the constructed local numpy array, see all_to_all_v.
+    """
+    send_spec, recv_spec = _prepare_all_to_all_v(
+        array_data, send_counts, recv_counts, send_displacements,
+        recv_displacements, comm)
+    recv_local_array = recv_spec[0]
+    if recv_shape is None:
+        recv_shape = (recv_local_array.size,)
+
+    return MPIFuture([comm.Ialltoallv(send_spec, recv_spec)],
+                     result=recv_local_array, buffers=[send_spec]) \
+        .then(lambda recv_local_array: recv_local_array.reshape(recv_shape))
+
+
+def _prepare_all_to_all_v(array_data, send_counts, recv_counts,
+                          send_displacements, recv_displacements, comm):
+    """ Helper method returning send and receive specifications of an all
+        to all exchange, the receive buffer is the first entry of the
+        receive specification.
+    """
     #Perform calculation on non-user provided information
+    send_counts = np.asarray(send_counts, dtype=np.int64)
     if send_displacements is None:
         send_displacements = _displacments_from_counts(send_counts)
+    send_counts, send_displacements = \
+        get_vector_counts(send_counts, send_displacements)
 
+    if recv_counts is None:
+        recv_counts = all_to_all(send_counts.astype(np.int64), comm=comm)
+    recv_counts = np.asarray(recv_counts, dtype=np.int64)
     if recv_displacements is None:
         recv_displacements = _displacments_from_counts(recv_counts)
+    recv_counts, recv_displacements = \
+        get_vector_counts(recv_counts, recv_displacements)
 
-    recv_local_array = np.empty(recv_counts.sum(), dtype=array_data.dtype)
-    mpi_dtype = MPI._typedict[np.sctype2char(array_data.dtype)]
-    comm.Alltoallv(
-        [array_data, (send_counts, send_displacements), mpi_dtype],
-        [recv_local_array, (recv_counts, recv_displacements), mpi_dtype])
+    recv_local_array = empty_buffer(recv_counts.sum(), array_data.dtype)
+    mpi_dtype = get_mpi_datatype(array_data.dtype)
+    #Displacements address elements of the flattened data
+    return [np.ascontiguousarray(array_data),
+            (send_counts, send_displacements), mpi_dtype], \
+           [recv_local_array, (recv_counts, recv_displacements), mpi_dtype]
 
-    if recv_shape is None:
-        recv_shape = (recv_counts.sum(),)
-    #Reshape
-    recv_local_array = recv_local_array.reshape(recv_shape)
 
-    return recv_local_array
+def all_to_all_w(array_data, send_types, recv_array, recv_types,
+                 comm=MPI.COMM_WORLD):
+    """ All to all exchange of distributed array data among processes in
+        communicator where each exchange is described by a derived datatype.
+        Data is packed and unpacked by MPI, no intermediate buffers are
+        created.
+
+    Parameters
+    ----------
+    array_data : numpy.ndarray
+        Numpy array data distributed among processes, with non-negative
+        strides.
+    send_types : list of MPI Datatype, None
+        Committed datatypes selecting the data of array_data destined for
+        each rank, relative to the address of its first element.  None if
+        no data is sent to a rank.
+    recv_array : numpy.ndarray
+        C contiguous numpy array the received data is placed in.
+    recv_types : list of MPI Datatype, None
+        Committed datatypes placing the data received from each rank,
+        relative to the start of recv_array.  None if no data is received
+        from a rank.
+    comm : MPI Communicator, optional
+        MPI process communication object.  If none specified
+        defaults to MPI.COMM_WORLD
+
+    Returns
+    -------
+    recv_array : numpy.ndarray
+        Receiving numpy array with data from all process in MPI Comm.
+    """
+    if not isinstance(array_data, np.ndarray) or \
+       not isinstance(recv_array, np.ndarray):
+        raise TypeError('invalid data type for all_to_all_w.')
+
+    size = comm.Get_size()
+    displacements = [0] * size
+    send_counts = [0 if datatype is None else 1 for datatype in send_types]
+    recv_counts = [0 if datatype is None else 1 for datatype in recv_types]
+    #Ranks without data are still described by a valid datatype
+    send_types = [MPI.BYTE if datatype is None else datatype
+                  for datatype in send_types]
+    recv_types = [MPI.BYTE if datatype is None else datatype
+                  for datatype in recv_types]
+    comm.Alltoallw([_memory_of(array_data), send_counts, displacements,
+                    send_types],
+                   [recv_array, recv_counts, displacements, recv_types])
+
+    return recv_array
 
 
 def _displacments_from_counts(counts):
@@ -246,17 +575,17 @@ def broadcast_array(array_data, comm=MPI.COMM_WORLD, root=0):
     array_shape = array_data.shape if rank == root else None
     array_shape = broadcast_shape(array_shape, comm=comm, root=root)
 
-#TODO: Look into str/char buffer send for this operation
-    array_dtype = np.sctype2char(array_data.dtype) if rank == root else None
+    array_dtype = array_data.dtype if rank == root else None
     array_dtype = comm.bcast(array_dtype, root=root)
 
     #Create empty buffer on non-root ranks
     if rank != root:
-        array_data = np.empty(array_shape, dtype=np.dtype(array_dtype))
-
-    #Broadcast the array
-    mpi_dtype = MPI._typedict[array_dtype]
-    comm.Bcast([array_data, array_data.size, mpi_dtype], root=root)
+        array_data = empty_buffer(array_shape, array_dtype)
+        comm.Bcast([array_data, array_data.size,
+                    get_mpi_datatype(array_dtype)], root=root)
+    else:
+        #Strided views of root are broadcast in place
+        comm.Bcast(get_mpi_message(array_data), root=root)
 
     return array_data
 
@@ -330,6 +659,177 @@ def get_comm_size(comm=MPI.COMM_WORLD):
     return comm.Get_size()
 
 
+def get_mpi_datatype(dtype):
+    """ Get committed MPI datatype of a numpy dtype from the datatype
+        registry, created on first use.
+
+        Record dtypes map to struct datatypes of their fields, dates and
+        durations to their 64 bit integer values.  Booleans, numbers and
+        characters map to the predefined MPI datatypes, other dtypes(half
+        precision, non native byte order, strings and opaque void data)
+        are transferred as bytes.
+
+    Parameters
+    ----------
+    dtype : numpy.dtype, str
+        Numpy data type of transferred elements.
+
+    Returns
+    -------
+    datatype : MPI Datatype
+        Committed datatype describing a single element of dtype, owned by
+        the registry.
+    """
+    dtype = np.dtype(dtype)
+    datatype = _DATATYPES.get(dtype)
+    if datatype is None:
+        datatype = _create_mpi_datatype(dtype)
+        _DATATYPES[dtype] = datatype
+    return datatype
+
+
+def _create_mpi_datatype(dtype):
+    """ Helper method creating the committed MPI datatype of a dtype. """
+    if dtype.hasobject:
+        raise TypeError('object arrays can not be communicated.')
+    if dtype.fields is not None:
+        names = dtype.names
+        struct_type = MPI.Datatype.Create_struct(
+            [1] * len(names),
+            [dtype.fields[name][1] for name in names],
+            [get_mpi_datatype(dtype.fields[name][0]) for name in names])
+        #Trailing padding is kept in the extent of the record
+        datatype = struct_type.Create_resized(0, dtype.itemsize)
+        struct_type.Free()
+        return datatype.Commit()
+    if dtype.subdtype is not None:
+        base_dtype, shape = dtype.subdtype
+        return get_mpi_datatype(base_dtype) \
+            .Create_contiguous(int(np.prod(shape))).Commit()
+    if dtype.kind in 'mM':
+        return MPI.INT64_T
+    if dtype.kind in 'biufc' and dtype.isnative:
+        try:
+            return from_numpy_dtype(dtype).Commit()
+        except MPI.Exception:
+            pass
+    return MPI.BYTE.Create_contiguous(dtype.itemsize).Commit()
+
+
+def get_mpi_message(array_data):
+    """ Get mpi4py message [buffer, count, datatype] of array data.
+
+        C contiguous arrays are described by the datatype of their dtype.
+        Strided views are described by a single element of a cached vector
+        datatype over their memory, MPI reads the view in place and no
+        contiguous copy is created.  Views with negative strides are
+        copied.
+
+    Parameters
+    ----------
+    array_data : numpy.ndarray
+        Numpy array data sent by the process.
+
+    Returns
+    -------
+    message : list
+        Message specification of array_data for mpi4py communication
+        routines, valid as long as array_data is referenced.
+    """
+    if array_data.flags['C_CONTIGUOUS'] or array_data.size == 0:
+        return [array_data, array_data.size,
+                get_mpi_datatype(array_data.dtype)]
+    if min(array_data.strides) < 0:
+        array_data = np.ascontiguousarray(array_data)
+        return [array_data, array_data.size,
+                get_mpi_datatype(array_data.dtype)]
+    return [_memory_of(array_data), 1,
+            _get_strided_datatype(array_data.dtype, array_data.shape,
+                                  array_data.strides)]
+
+
+def _memory_of(array_data):
+    """ Helper method returning a buffer spanning the memory of array data
+        with non-negative strides, starting at its first element.
+    """
+    if array_data.flags['C_CONTIGUOUS'] or array_data.size == 0:
+        return array_data
+    span = array_data.itemsize + \
+        sum((length - 1) * stride
+            for length, stride in zip(array_data.shape, array_data.strides))
+    return MPI.buffer.fromaddress(array_data.ctypes.data, span,
+                                  readonly=not array_data.flags['WRITEABLE'])
+
+
+def _get_strided_datatype(dtype, shape, strides):
+    """ Helper method returning the cached datatype of a strided view. """
+    #Axes of a single element are dropped and contiguous axes merged
+    axes = []
+    for length, stride in zip(shape, strides):
+        if length == 1:
+            continue
+        if axes and axes[-1][1] == length * stride:
+            axes[-1] = (axes[-1][0] * length, stride)
+        else:
+            axes.append((length, stride))
+    key = (dtype, tuple(axes))
+    datatype = _STRIDED_DATATYPES.pop(key, None)
+    if datatype is None:
+        element_type = get_mpi_datatype(dtype)
+        datatype = element_type
+        if axes[-1][1] == dtype.itemsize:
+            datatype = datatype.Create_contiguous(axes.pop()[0])
+        #Nested vectors of the remaining axes, innermost first
+        intermediate_types = []
+        for length, stride in reversed(axes):
+            intermediate_types.append(datatype)
+            datatype = datatype.Create_hvector(length, 1, stride)
+        datatype.Commit()
+        for intermediate_type in intermediate_types:
+            if intermediate_type != element_type:
+                intermediate_type.Free()
+        while len(_STRIDED_DATATYPES) >= STRIDED_DATATYPES_LIMIT:
+            _STRIDED_DATATYPES.popitem(last=False)[1].Free()
+    _STRIDED_DATATYPES[key] = datatype
+    return datatype
+
+
+def get_vector_counts(counts, displacements=None):
+    """ Element counts and displacements of vector collectives
+        (Allgatherv, Alltoallv, Scatterv) computed without overflow.
+
+    Parameters
+    ----------
+    counts : numpy.ndarray, list
+        Number of elements exchanged with each process.
+    displacements : numpy.ndarray, list, None
+        Element offsets of the data exchanged with each process.  If none
+        specified data is packed in rank order.
+
+    Returns
+    -------
+    counts, displacements : numpy.ndarray
+        Int32 arrays if all elements are addressable by int counts, int64
+        arrays exchanged by the large count variants of the collectives
+        otherwise.
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    if displacements is None:
+        displacements = np.cumsum(counts) - counts
+    else:
+        displacements = np.asarray(displacements, dtype=np.int64)
+
+    if counts.size and (displacements + counts).max() > _MAX_INT_COUNT:
+        #Large count collectives were introduced with MPI-4
+        if MPI.Get_version() < (4, 0):
+            raise NotSupportedError(
+                'exchanges of more than {} elements require MPI large count '
+                'support.'.format(_MAX_INT_COUNT))
+        return counts, displacements
+
+    return counts.astype(np.int32), displacements.astype(np.int32)
+
+
 def get_rank(comm=MPI.COMM_WORLD):
     """ Get rank of MPI process in communicator
 
@@ -347,17 +847,19 @@ def get_rank(comm=MPI.COMM_WORLD):
     return comm.Get_rank()
 
 #TODO find elegant way to handle type checking in this
-def scatter_v(array_data, displacements, shapes, comm=MPI.COMM_WORLD, root=0):
+def scatter_v(array_data, displacements=None, shapes=None,
+              comm=MPI.COMM_WORLD, root=0, layout=None, dtype=None):
     """ Scatter local array data to all processes
 
     Parameters
     ----------
     array_data : numpy.ndarray
         Numpy array data scattered(distributed) among processes.
-    displacements : numpy.ndarray
+    displacements : numpy.ndarray, None
         Numpy array of integers that specifies the element start local
         in the original array_data array that should be scattered to a given
-        process.
+        process.  Only required on root, if none specified data is
+        scattered in rank order.
         Requirements:
             Array length must be equal to the number of ranks in specified comm.
         Format:
@@ -367,9 +869,10 @@ def scatter_v(array_data, displacements, shapes, comm=MPI.COMM_WORLD, root=0):
             disp[2] = length of array data assigned to rank 0 + 1
             disp[3] = length of array data assigned to rank 0 + 1 + 2
             ...
-    shapes : numpy.ndarray
+    shapes : numpy.ndarray, None
         Numpy array of numpy.ndarray shape representations that specifies the
         final desired shape of the scattered array data to a given process.
+        Only required on root if no layout is specified.
         Notes:
             Acting as counts in typical scatter_v operation, with the
             benefit of allowing you to reconstruct a given numpy.ndarray shape.
@@ -388,6 +891,13 @@ def scatter_v(array_data, displacements, shapes, comm=MPI.COMM_WORLD, root=0):
     root : int, optional
         Rank of root process that has the local shape data. If none specified
         defaults to 0.
+    layout : Layout, None
+        Layout of the scattered data known to all processes, see
+        mpids.MPInumpy.layout.  Shapes are taken from the local shapes of
+        all ranks without communication.
+    dtype : numpy.dtype, None
+        Data type of array_data known to all processes.  If none specified
+        it is broadcast from root.
 
     Returns
     -------
@@ -396,20 +906,30 @@ def scatter_v(array_data, displacements, shapes, comm=MPI.COMM_WORLD, root=0):
         arrays to processes in MPI Comm.
     """
     rank = comm.Get_rank()
-    #Transmit information needed to reconstruct array
-    displacements = broadcast_array(displacements, root=root)
-    shapes = broadcast_array(shapes, root=root)
-
-#TODO: Look into str/char buffer send for this operation
-    array_dtype = np.sctype2char(array_data.dtype) if rank == root else None
-    array_dtype = comm.bcast(array_dtype, root=root)
-
-    counts = [np.prod(shape) for shape in shapes]
-    local_data = np.empty(shapes[rank], dtype=np.dtype(array_dtype))
+    if layout is not None:
+        shapes = layout.rank_shapes
+        counts, layout_displacements = layout.gather_counts()
+        if displacements is None:
+            displacements = layout_displacements
+        if dtype is None:
+            array_dtype = array_data.dtype if rank == root else None
+            array_dtype = comm.bcast(array_dtype, root=root)
+        else:
+            array_dtype = np.dtype(dtype)
+    else:
+        #Transmit information needed to reconstruct array in one collective
+        metadata = (displacements, shapes,
+                    array_data.dtype if dtype is None else np.dtype(dtype)) \
+            if rank == root else None
+        displacements, shapes, array_dtype = comm.bcast(metadata, root=root)
+        counts = np.prod(shapes, axis=1, dtype=np.int64) \
+            if np.ndim(shapes) == 2 else np.asarray(shapes, dtype=np.int64)
+    counts, displacements = get_vector_counts(counts, displacements)
+    local_data = empty_buffer(shapes[rank], array_dtype)
 
     #Scatter the array
-    mpi_dtype = MPI._typedict[array_dtype]
+    mpi_dtype = get_mpi_datatype(array_dtype)
     comm.Scatterv([array_data, counts, displacements, mpi_dtype],
-                  local_data, root=root)
+                  [local_data, local_data.size, mpi_dtype], root=root)
 
     return local_data
@@ -1,22 +1,126 @@
+from functools import lru_cache
+from numbers import Integral
 from mpi4py import MPI
 import numpy as np
+from numpy.core.multiarray import normalize_axis_index
 
 from mpids.MPInumpy.errors import InvalidDistributionError,  NotSupportedError
 from mpids.MPInumpy.mpi_utils import all_gather_v,                \
-                                     all_to_all,                  \
                                      broadcast_array,             \
                                      broadcast_shape,             \
+                                     combine_comoments,           \
+                                     combine_moments,             \
                                      get_comm_size, get_rank,     \
-                                     scatter_v
+                                     get_vector_counts, scatter_v
 
-__all__ = ['determine_local_shape_and_mapping',
+__all__ = ['RedistributionPlan', 'determine_local_comoments',
+           'determine_local_moments',
+           'determine_local_shape_and_mapping',
            'determine_redistribution_counts_from_shape',
-           'determine_global_offset', 'distribute_array', 'distribute_range',
-           'distribute_shape', 'get_block_index', 'get_cart_coords',
-           'get_comm_dims', 'global_to_local_key', 'distribution_to_dimensions',
-           'is_Replicated', 'is_block_distributed',
+           'determine_redistribution_plan',
+           'determine_global_offset', 'determine_global_selection',
+           'distribute_array', 'distribute_range',
+           'distribute_shape', 'get_block_cyclic_counts',
+           'get_block_cyclic_index', 'get_block_cyclic_indices',
+           'get_block_index', 'get_block_indices',
+           'get_cart_coords',
+           'get_comm_dims', 'get_reduction_identity',
+           'get_weighted_block_indices',
+           'global_to_local_key', 'distribution_to_dimensions',
+           'is_Replicated', 'is_block_block_distributed',
+           'is_block_cyclic_distributed', 'is_block_distributed',
            'slice_local_data_and_determine_mapping']
 
+#Upper bound of elements per temporary when computing local moments
+MOMENTS_CHUNK_SIZE = 2**16
+
+
+def determine_local_moments(local_data, axis=None):
+    """ Determine count, mean and sum of squared differences from the mean(M2)
+        of local data along axis.  Data is visited in chunks of at most
+        MOMENTS_CHUNK_SIZE elements which are merged pairwise, avoiding
+        temporaries the size of the local data.
+
+    Parameters
+    ----------
+    local_data : numpy.ndarray
+        Local data of distributed array.
+    axis : int, None
+        Axis along which moments are computed.  If none specified
+        moments of all elements are computed.
+
+    Returns
+    -------
+    local_moments : numpy.ndarray
+        Contiguous float64 array with shape of local_data with axis removed
+        and a trailing axis of length 3 holding count, mean and M2.
+    """
+    local_data = np.asarray(local_data)
+    if axis is None:
+        local_data = local_data.reshape(-1)
+        axis = 0
+    axis = normalize_axis_index(axis, local_data.ndim)
+
+    axis_len = local_data.shape[axis]
+    reduced_shape = local_data.shape[:axis] + local_data.shape[axis + 1:]
+    local_moments = np.zeros(reduced_shape + (3,), dtype=np.float64)
+    if local_data.size == 0:
+        return local_moments
+
+    chunk_len = max(1, MOMENTS_CHUNK_SIZE // (local_data.size // axis_len))
+    chunk_moments = np.empty_like(local_moments)
+    for chunk_start in range(0, axis_len, chunk_len):
+        chunk_key = (slice(None),) * axis + \
+                    (slice(chunk_start, chunk_start + chunk_len),)
+        chunk = local_data[chunk_key]
+        chunk_moments[..., 0] = chunk.shape[axis]
+        chunk_moments[..., 1] = chunk.mean(axis=axis, dtype=np.float64)
+        square_diff = \
+            np.subtract(chunk, np.expand_dims(chunk_moments[..., 1], axis),
+                        dtype=np.float64)
+        np.square(square_diff, out=square_diff)
+        chunk_moments[..., 2] = square_diff.sum(axis=axis)
+        local_moments = combine_moments(local_moments, chunk_moments)
+
+    return local_moments
+
+
+def determine_local_comoments(local_data):
+    """ Determine count, means and sums of products of differences from the
+        means(C) of local observations.  Observations are visited in chunks
+        of at most MOMENTS_CHUNK_SIZE elements which are merged pairwise.
+
+    Parameters
+    ----------
+    local_data : numpy.ndarray
+        Local observations of shape (n, d), one observation of d variables
+        per row.
+
+    Returns
+    -------
+    local_comoments : numpy.ndarray
+        Contiguous float64 array of length 1 + d + d**2 holding count,
+        means and C in C order, see mpi_utils.all_reduce_comoments.
+    """
+    local_data = np.asarray(local_data)
+    observations, variables = local_data.shape
+    local_comoments = np.zeros(1 + variables + variables**2, dtype=np.float64)
+    if local_data.size == 0:
+        return local_comoments
+
+    chunk_len = max(1, MOMENTS_CHUNK_SIZE // variables)
+    chunk_comoments = np.empty_like(local_comoments)
+    for chunk_start in range(0, observations, chunk_len):
+        chunk = local_data[chunk_start:chunk_start + chunk_len]
+        chunk_comoments[0] = chunk.shape[0]
+        chunk_comoments[1:variables + 1] = chunk.mean(axis=0, dtype=np.float64)
+        centered = np.subtract(chunk, chunk_comoments[1:variables + 1],
+                               dtype=np.float64)
+        chunk_comoments[variables + 1:] = (centered.T @ centered).ravel()
+        local_comoments = combine_comoments(local_comoments, chunk_comoments)
+
+    return local_comoments
+
 
 def determine_local_shape_and_mapping(array_shape, dist, comm_dims, comm_coord):
     """ Determine expected distributed local shape and global mapping based on
@@ -56,12 +160,13 @@ def determine_local_shape_and_mapping(array_shape, dist, comm_dims, comm_coord):
     local_to_global = {}
     local_shape = []
     for axis, axis_length in enumerate(array_shape):
-        if axis == 0:
-            row_start, row_end = get_block_index(axis_length,
-                                                 comm_dims[0],
-                                                 comm_coord[0])
-            local_to_global[axis] = (int(row_start), int(row_end))
-            local_shape.append(row_end - row_start)
+        #Leading axes are partitioned along the cartesian grid
+        if axis < len(comm_dims):
+            axis_start, axis_end = get_block_index(axis_length,
+                                                   comm_dims[axis],
+                                                   comm_coord[axis])
+            local_to_global[axis] = (int(axis_start), int(axis_end))
+            local_shape.append(axis_end - axis_start)
         else:
             local_to_global[axis] = (0, int(axis_length))
             local_shape.append(axis_length)
@@ -107,6 +212,44 @@ def determine_global_offset(index, global_shape):
     return int(global_offset)
 
 
+class RedistributionPlan(object):
+    """ Reusable description of the personalized data exchange required to
+        move distributed array data from one partitioning of global element
+        offsets to another.  Consumed by mpi_utils.all_to_all_v.
+
+    Attributes
+    ----------
+    send_counts : numpy.ndarray
+        Array of length communicator size that lists how much data the local
+        process will be sending to a given process.
+    recv_counts : numpy.ndarray
+        Array of length communicator size that lists how much data the local
+        process will be receiving from a given process.
+    send_displacements : numpy.ndarray
+        Element start location in the local array data for each destination.
+    recv_displacements : numpy.ndarray
+        Element start location in the local receive buffer for each source.
+    """
+
+    def __init__(self, send_counts, recv_counts, send_displacements,
+                 recv_displacements):
+        self.send_counts = send_counts
+        self.recv_counts = recv_counts
+        self.send_displacements = send_displacements
+        self.recv_displacements = recv_displacements
+        #Plans are shared between callers, guard against modification
+        for counts in (self.send_counts, self.recv_counts,
+                       self.send_displacements, self.recv_displacements):
+            counts.flags.writeable = False
+
+
+    def __repr__(self):
+        return '{}(send_counts={}, recv_counts={})' \
+                   .format('RedistributionPlan',
+                           self.send_counts.tolist(),
+                           self.recv_counts.tolist())
+
+
 #TODO: Rethink the need for dist, it's practically irrevelant here
 def determine_redistribution_counts_from_shape(current_shape, desired_shape,
                                                dist, comm=MPI.COMM_WORLD):
@@ -139,59 +282,113 @@ def determine_redistribution_counts_from_shape(current_shape, desired_shape,
         much data it will be receiving for a given process.  The position in the
         array is the equivalent rank of the sending process.
     """
+    plan = determine_redistribution_plan(current_shape, desired_shape,
+                                         comm=comm)
+    return plan.send_counts, plan.recv_counts
+
+
+def determine_redistribution_plan(current_shape, desired_shape,
+                                  comm=MPI.COMM_WORLD,
+                                  current_partitions=None,
+                                  desired_partitions=None):
+    """ Determine send/recv counts and displacements required to redistribute
+        a row partitioned array.  Computed in closed form by intersecting the
+        global element offset ranges of the current and desired partitions,
+        no communication is required.
+
+    Parameters
+    ----------
+    current_shape : int, tuple of int
+        Current global shape of distributed array.
+    desired_shape : int, tuple of int
+        Global shape array data should be mapped to.
+    comm : MPI Communicator, optional
+        MPI process communication object.  If none specified
+        defaults to MPI.COMM_WORLD
+    current_partitions : numpy.ndarray, None
+        Optional array of shape (communicator size, 2) listing the
+        [inclusive start, exclusive end) indices along axis 0 currently held
+        by each rank.  If none specified the partitioning determined by
+        get_block_index is assumed.
+    desired_partitions : numpy.ndarray, None
+        Optional array of shape (communicator size, 2) listing the
+        [inclusive start, exclusive end) indices along axis 0 each rank
+        should hold after redistribution.  If none specified the
+        partitioning determined by get_block_index is assumed.
+
+    Returns
+    -------
+    plan : RedistributionPlan
+        Counts and displacements for use with mpi_utils.all_to_all_v.
+    """
     size = comm.Get_size()
     rank = comm.Get_rank()
-    current_ndim = len(current_shape)
-    current_leading_dim = current_shape[0]
-    #Zeroing rest of indices to determine global offset of current partition
-    current_index_pad = [0] * (current_ndim - 1)
-
-    current_partition_start, current_partition_end = \
-        get_block_index(current_leading_dim, size, rank)
-    current_index = [current_partition_start] + current_index_pad
-    current_offset = determine_global_offset(current_index, current_shape)
-
-    desired_leading_dim = desired_shape[0]
-    #Distribute work of determining desired partitioning
-    desired_partitoning = \
-        np.array(get_block_index(desired_leading_dim, size, rank),
-                 dtype=np.int32)
-    #Collect global start/stops of rank based partitions
-    global_desired_partitoning = all_gather_v(desired_partitoning,
-                                             shape=(size, 2),
-                                             comm=comm)
-
-    current_over_paritioning = current_partition_end - current_partition_start
-    current_remaining_dim = int(np.prod(current_shape[1:]) * current_over_paritioning)
-    desired_remaining_dim = int(np.prod(desired_shape[1:]))
-    send_counts = np.zeros(size, dtype=np.int32)
-    for global_rank in range(size):
-        partition_start, partition_stop = global_desired_partitoning[global_rank]
-        partition_min = partition_start * desired_remaining_dim
-        partition_max = partition_stop * desired_remaining_dim
-
-        #Trying to reduce the number of iterations
-        if __is_offset_beyond_bounds(current_offset, current_remaining_dim,
-                                     partition_min, partition_max):
-            continue
-
-        for offset in range(current_offset, current_offset + current_remaining_dim):
-            if (offset >= partition_min and offset < partition_max):
-                send_counts[global_rank] += 1
-
-    #Use all to all to distribute what's being sent
-    recv_counts = all_to_all(send_counts, comm=comm)
-
-    return send_counts, recv_counts
-
-
-def __is_offset_beyond_bounds(current_offset, current_remaining_dim,
-                              partition_min, partition_max):
-    """ Helper method to check if current global offset is outside bounds
-        of target repartiton.
-    """
-    return (current_offset > partition_max or
-        current_offset + current_remaining_dim < partition_min)
+    current_shape = tuple(int(dim) for dim in np.ravel(current_shape))
+    desired_shape = tuple(int(dim) for dim in np.ravel(desired_shape))
+
+    if current_partitions is None and desired_partitions is None:
+        return _block_redistribution_plan(current_shape, desired_shape,
+                                          size, rank)
+
+    if current_partitions is None:
+        current_partitions = get_block_indices(current_shape[0], size)
+    if desired_partitions is None:
+        desired_partitions = get_block_indices(desired_shape[0], size)
+
+    return _redistribution_plan_from_partitions(current_shape,
+                                                current_partitions,
+                                                desired_shape,
+                                                desired_partitions,
+                                                rank)
+
+
+@lru_cache(maxsize=128)
+def _block_redistribution_plan(current_shape, desired_shape, size, rank):
+    """ Helper method to cache plans between evenly block partitioned arrays.
+    """
+    return _redistribution_plan_from_partitions(
+        current_shape, get_block_indices(current_shape[0], size),
+        desired_shape, get_block_indices(desired_shape[0], size),
+        rank)
+
+
+def _redistribution_plan_from_partitions(current_shape, current_partitions,
+                                         desired_shape, desired_partitions,
+                                         rank):
+    """ Helper method to construct redistribution plan from the axis 0
+        partitions of all ranks.
+    """
+    current_offsets = np.asarray(current_partitions, dtype=np.int64) * \
+        int(np.prod(current_shape[1:]))
+    desired_offsets = np.asarray(desired_partitions, dtype=np.int64) * \
+        int(np.prod(desired_shape[1:]))
+
+    send_counts, send_displacements = \
+        _intersect_offsets(current_offsets[rank], desired_offsets)
+    recv_counts, recv_displacements = \
+        _intersect_offsets(desired_offsets[rank], current_offsets)
+
+    return RedistributionPlan(send_counts, recv_counts,
+                              send_displacements, recv_displacements)
+
+
+def _intersect_offsets(local_offsets, global_offsets):
+    """ Helper method to intersect a local [start, end) element offset range
+        with the offset ranges of all ranks.
+
+        Returns
+        -------
+        counts : np.ndarray
+            Number of elements in common with each rank.
+        displacements : np.ndarray
+            Start of common elements relative to the local start offset.
+    """
+    local_start, local_end = local_offsets
+    starts = np.maximum(global_offsets[:, 0], local_start)
+    ends = np.minimum(global_offsets[:, 1], local_end)
+    counts = np.maximum(ends - starts, 0)
+    displacements = np.where(counts > 0, starts - local_start, 0)
+    return get_vector_counts(counts, displacements)
 
 
 def distribute_array(array_data, dist, comm=MPI.COMM_WORLD, root=0):
@@ -414,6 +611,10 @@ def distribution_to_dimensions(distribution, procs):
     """
     if is_block_distributed(distribution):
         return 1
+    if is_block_cyclic_distributed(distribution):
+        return 1
+    if is_block_block_distributed(distribution):
+        return 2
     raise InvalidDistributionError(
         'Invalid distribution encountered: {}'.format(distribution))
 
@@ -461,6 +662,138 @@ def format_indexed_result(global_key, indexed_result):
     return indexed_result
 
 
+def determine_global_selection(global_key, globalshape):
+    """ Determine global indices selected along each axis by a
+        __getitem__/__setitem__ style key.
+
+    Parameters
+    ----------
+    global_key : int, slice, tuple
+        Selection indices, i.e. keys to object access dunder methods
+        __getitem__, __setitem__, ...
+    globalshape : tuple
+        Combined shape of distributed array.
+
+    Returns
+    -------
+    global_indices : list of numpy.ndarray
+        Selected global indices along each axis, in order of selection.
+    int_axes : list of int
+        Axes selected with an int, i.e. removed from the result.
+    """
+    global_key = _normalize_integer_keys(global_key)
+    if not isinstance(global_key, tuple):
+        global_key = (global_key,)
+    if any(not isinstance(dim_key, (int, slice)) for dim_key in global_key):
+        raise NotSupportedError('index/slice key ' +
+                                '{} '.format(global_key) +
+                                'is not supported')
+    if len(global_key) > len(globalshape):
+        raise IndexError('too many indices for array with'  +
+                         ' global shape {}'.format(globalshape))
+
+    global_indices = []
+    int_axes = []
+    for axis, axis_len in enumerate(globalshape):
+        dim_key = global_key[axis] if axis < len(global_key) else slice(None)
+        if isinstance(dim_key, int):
+            index = dim_key + axis_len if dim_key < 0 else dim_key
+            if index < 0 or index >= axis_len:
+                raise IndexError('index {}'.format(dim_key) +
+                                 ' is out of bounds for axis {} with'.format(axis) +
+                                 ' global shape {}'.format(axis_len))
+            global_indices.append(np.array([index], dtype=np.int64))
+            int_axes.append(axis)
+        else:
+            global_indices.append(np.arange(*dim_key.indices(axis_len),
+                                            dtype=np.int64))
+
+    return global_indices, int_axes
+
+
+def get_block_cyclic_counts(axis_len, axis_size, block_size):
+    """ Get number of indices along axis held by each process when
+        distributed block-cyclically.
+
+    Parameters
+    ----------
+    axis_len : int
+        Length of array data along axis.
+    axis_size : int
+        Number of processes along axis.
+    block_size : int
+        Number of consecutive indices in each block.
+
+    Returns
+    -------
+    counts : numpy.ndarray
+        Array of length axis_size with the number of indices held by each
+        cartesian coordinate along axis.
+    """
+    axis_coords = np.arange(axis_size, dtype=np.int64)
+    num_blocks, last_block_len = divmod(axis_len, block_size)
+    full_cycles, rem_blocks = divmod(num_blocks, axis_size)
+
+    counts = np.full(axis_size, full_cycles * block_size, dtype=np.int64)
+    counts[axis_coords < rem_blocks] += block_size
+    counts[rem_blocks % axis_size] += last_block_len
+    return counts
+
+
+def get_block_cyclic_index(global_indices, axis_size, block_size):
+    """ Get owning cartesian coordinate and local index of global indices
+        along axis distributed block-cyclically.
+
+    Parameters
+    ----------
+    global_indices : int, numpy.ndarray
+        Global indices along axis.
+    axis_size : int
+        Number of processes along axis.
+    block_size : int
+        Number of consecutive indices in each block.
+
+    Returns
+    -------
+    axis_coords : int, numpy.ndarray
+        Cartesian coordinate along axis holding each global index.
+    local_indices : int, numpy.ndarray
+        Index of each global index in the local data of its owner.
+    """
+    global_blocks, block_offsets = np.divmod(global_indices, block_size)
+    local_blocks, axis_coords = np.divmod(global_blocks, axis_size)
+    return axis_coords, local_blocks * block_size + block_offsets
+
+
+def get_block_cyclic_indices(axis_len, axis_size, axis_coord, block_size):
+    """ Get global indices along axis held by process when distributed
+        block-cyclically, i.e. blocks of block_size consecutive indices are
+        dealt to the processes along axis in round robin order.
+
+    Parameters
+    ----------
+    axis_len : int
+        Length of array data along axis.
+    axis_size : int
+        Number of processes along axis.
+    axis_coord : int
+        Cartesian coorindate along axis for local process.
+    block_size : int
+        Number of consecutive indices in each block.
+
+    Returns
+    -------
+    global_indices : numpy.ndarray
+        Global indices along axis held by process, in local order.
+    """
+    block_starts = np.arange(axis_coord * block_size, axis_len,
+                             axis_size * block_size, dtype=np.int64)
+    global_indices = \
+        np.add.outer(block_starts, np.arange(block_size, dtype=np.int64))
+    global_indices = global_indices.ravel()
+    return global_indices[global_indices < axis_len]
+
+
 def get_block_index(axis_len, axis_size, axis_coord):
     """ Get start/end array index range along axis for data block.
 
@@ -493,6 +826,64 @@ def get_block_index(axis_len, axis_size, axis_coord):
     return (start_index, end_index)
 
 
+def get_block_indices(axis_len, axis_size):
+    """ Get start/end array index ranges along axis for the data blocks of
+        all processes.  Vectorized equivalent of get_block_index.
+
+    Parameters
+    ----------
+    axis_len : int
+        Length of array data along axis.
+    axis_size : int
+        Number of processes along axis.
+
+    Returns
+    -------
+    block_indices : numpy.ndarray
+        Array of shape (axis_size, 2) where each row is the
+        [start_index, end_index) range along axis for that coordinate.
+    """
+    axis_coords = np.arange(axis_size, dtype=np.int64)
+    axis_num = axis_len // axis_size
+    axis_rem = axis_len % axis_size
+
+    start_indices = axis_coords * axis_num + np.minimum(axis_coords, axis_rem)
+    end_indices = start_indices + axis_num + (axis_coords < axis_rem)
+
+    return np.stack((start_indices, end_indices), axis=1)
+
+
+def get_weighted_block_indices(axis_len, weights):
+    """ Get start/end array index ranges along axis for data blocks
+        proportional to the weights of all processes.  Every block holds
+        the integer part of its exact share, remaining indices are assigned
+        to the blocks with the largest fractional shares, lower coordinates
+        first.  Equal weights yield the blocks of get_block_indices.
+
+    Parameters
+    ----------
+    axis_len : int
+        Length of array data along axis.
+    weights : array_like
+        Non-negative relative weights of all processes along axis.
+
+    Returns
+    -------
+    block_indices : numpy.ndarray
+        Array of shape (number of weights, 2) where each row is the
+        [start_index, end_index) range along axis for that coordinate.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    shares = weights / weights.sum() * axis_len
+    block_lengths = np.floor(shares).astype(np.int64)
+    remainder = axis_len - block_lengths.sum()
+    block_lengths[np.argsort(block_lengths - shares,
+                             kind='stable')[:remainder]] += 1
+    end_indices = np.cumsum(block_lengths)
+
+    return np.stack((end_indices - block_lengths, end_indices), axis=1)
+
+
 def get_cart_coords(comm_dims, procs, rank):
     """ Get coordinates of process placed on cartesian grid.
         Implementation based on OpenMPI.mca.topo.topo_base_cart_coords
@@ -550,7 +941,36 @@ def get_comm_dims(procs, dist):
     return MPI.Compute_dims(procs, distribution_to_dimensions(dist, procs))
 
 
-def global_to_local_key(global_key, globalshape, local_to_global_dict):
+def get_reduction_identity(operation, dtype):
+    """ Get identity value of reduction operation for data type, i.e. the
+        value that leaves the result of the reduction unchanged.
+
+    Parameters
+    ----------
+    operation : MPI.Op
+        Reduction operation, one of MPI.SUM, MPI.PROD, MPI.MAX, MPI.MIN.
+    dtype : data-type
+        Data type of reduced data.
+
+    Returns
+    -------
+    identity : scalar
+    """
+    dtype = np.dtype(dtype)
+    if operation == MPI.SUM:
+        return dtype.type(0)
+    if operation == MPI.PROD:
+        return dtype.type(1)
+    if dtype.kind == 'b':
+        return operation == MPI.MIN
+    if dtype.kind in 'iu':
+        info = np.iinfo(dtype)
+        return info.min if operation == MPI.MAX else info.max
+    return -np.inf if operation == MPI.MAX else np.inf
+
+
+def global_to_local_key(global_key, globalshape, local_to_global_dict,
+                        block_size=None, comm_dims=None, comm_coord=None):
     """ Determine array like data to be distributed among processes
         Convert global slice/index key to process local key
 
@@ -568,11 +988,21 @@ def global_to_local_key(global_key, globalshape, local_to_global_dict):
             {0: [start_index, end_index),
              1: [start_index, end_index),
              ...}
+    block_size : int, None
+        Block size of block-cyclic distribution along axis 0. If none
+        specified data is assumed to be distributed in consecutive blocks.
+    comm_dims : list, None
+        Dimensions of cartesian grid, required for block-cyclic distributions.
+    comm_coord : list, None
+        Coordinates of local rank in grid, required for block-cyclic
+        distributions.
 
     Returns
     -------
-    local_key : int, slice, tuple
+    local_key : int, slice, numpy.ndarray, tuple
         Selection indices present in locally distributed array.
+        Selections along a block-cyclic axis are returned as arrays of
+        local indices.
     """
     __global_to_local_key_map = {int   : _global_to_local_key_int,
                                  slice : _global_to_local_key_slice,
@@ -583,6 +1013,14 @@ def global_to_local_key(global_key, globalshape, local_to_global_dict):
                                 '{} '.format(global_key) +
                                 'is not supported')
 
+    global_key = _normalize_integer_keys(global_key)
+    if block_size is not None and type(global_key) in __global_to_local_key_map:
+        return _global_to_local_key_block_cyclic(global_key,
+                                                 globalshape,
+                                                 block_size,
+                                                 comm_dims[0],
+                                                 comm_coord[0])
+
     local_key = __global_to_local_key_map\
         .get(type(global_key), __unsupported_key)(global_key,
                                                   globalshape,
@@ -659,6 +1097,58 @@ def _global_to_local_key_tuple(global_key, globalshape, local_to_global_dict):
     return tuple(local_key)
 
 
+def _normalize_integer_keys(global_key):
+    """ Helper method to convert integer keys of any integral type, e.g.
+        numpy.int64 or entries of numpy index arrays, to int.
+    """
+    def __normalize(dim_key):
+        if isinstance(dim_key, Integral) and not isinstance(dim_key, int):
+            return int(dim_key)
+        return dim_key
+
+    if isinstance(global_key, tuple):
+        return tuple(__normalize(dim_key) for dim_key in global_key)
+    return __normalize(global_key)
+
+
+def _global_to_local_key_block_cyclic(global_key, globalshape, block_size,
+                                      axis_size, axis_coord):
+    """ Helper method to process keys of data distributed block-cyclically
+        along axis 0
+    """
+    key_is_tuple = isinstance(global_key, tuple)
+    global_key = global_key if key_is_tuple else (global_key,)
+    if len(global_key) > len(globalshape):
+        raise IndexError('too many indices for array with'  +
+                         ' global shape {}'.format(globalshape))
+
+    axis_key = global_key[0]
+    if isinstance(axis_key, int):
+        global_indices = np.array([_global_to_local_key_int(axis_key,
+                                                            globalshape,
+                                                            None)])
+    else:
+        global_indices = np.arange(*axis_key.indices(globalshape[0]))
+    axis_coords, local_indices = \
+        get_block_cyclic_index(global_indices, axis_size, block_size)
+    local_indices = local_indices[axis_coords == axis_coord]
+
+    if isinstance(axis_key, int):
+        local_axis_key = \
+            int(local_indices[0]) if local_indices.size else slice(0, 0)
+    else:
+        local_axis_key = local_indices
+
+    #Remaining axes are not partitioned, global and local keys are identical
+    local_key = [local_axis_key]
+    for axis, dim_key in enumerate(global_key[1:], start=1):
+        if isinstance(dim_key, int):
+            dim_key = _global_to_local_key_int(dim_key, globalshape, None, axis)
+        local_key.append(dim_key)
+
+    return tuple(local_key) if key_is_tuple else local_key[0]
+
+
 def is_Replicated(distribution):
     """ Check if distribution is of type Replicated
 
@@ -696,6 +1186,47 @@ def is_block_distributed(distribution):
     """
     return distribution[0] == 'b' and len(distribution) == 1
 
+
+def is_block_block_distributed(distribution):
+    """ Check if distribution is of type block block
+
+    Parameters
+    ----------
+    distribution : str, list, tuple
+        Specified distribution of data among processes.
+        Default value 'b' : Block
+        Supported types:
+            'b' : Block
+            'bb' : BlockBlock
+            'r' : Replicated
+
+    Returns
+    -------
+    result : boolean
+    """
+    return distribution == 'bb'
+
+
+def is_block_cyclic_distributed(distribution):
+    """ Check if distribution is of type block cyclic
+
+    Parameters
+    ----------
+    distribution : str, list, tuple
+        Specified distribution of data among processes.
+        Default value 'b' : Block
+        Supported types:
+            'b' : Block
+            'bb' : BlockBlock
+            'bc' : BlockCyclic
+            'r' : Replicated
+
+    Returns
+    -------
+    result : boolean
+    """
+    return distribution == 'bc'
+
 #NOTE: Legacy method, good candidate for removal
 def slice_local_data_and_determine_mapping(array_data, dist, comm_dims, comm_coord):
     """ Slice array like data to be distributed among processes and determine
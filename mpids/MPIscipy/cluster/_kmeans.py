@@ -3,6 +3,7 @@ import numpy as np
 import mpids.MPInumpy as mpi_np
 from mpids.MPInumpy.distributions.Block import Block
 from mpids.MPInumpy.distributions.Replicated import Replicated
+from mpids.MPInumpy.futures import MPIFuture
 from mpids.MPInumpy.MPIArray import MPIArray
 from mpids.MPIscipy.errors import TypeError, ValueError
 
@@ -84,14 +85,15 @@ def kmeans(observations, k, thresh=1e-5, comm=MPI.COMM_WORLD):
 
         comm.Allreduce(MPI.IN_PLACE, temp_centroids, op=MPI.SUM)
         comm.Allreduce(MPI.IN_PLACE, counts, op=MPI.SUM)
-        req_error = comm.Iallreduce(MPI.IN_PLACE, error, op=MPI.SUM)
+        error_future = MPIFuture(
+            [comm.Iallreduce(MPI.IN_PLACE, error, op=MPI.SUM)], result=error)
 
         #Update all centroids
         for j in range(num_centroids):
             centroids[j] = \
                 temp_centroids[j] / counts[j] if counts[j] else temp_centroids[j]
 
-        req_error.Wait()
+        error_future.wait()
         # Continue until centroid changes reach threshold
         if np.abs(error - old_error) < thresh:
             break
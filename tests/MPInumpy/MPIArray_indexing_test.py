@@ -53,7 +53,7 @@ class MPIArrayIndexingDefaultTest(unittest.TestCase):
 
         #Check that not supported is raised when trying to set value(s)
         ## with multiple elements for distributed arrays
-        if not isinstance(self.mpi_array, Replicated):
+        if self.dist in ['bb', 'bc']:
             with self.assertRaises(NotSupportedError):
                 self.mpi_array[:,0] = [0] * self.mpi_array.globalshape[0]
 
@@ -187,6 +187,22 @@ class MPIArrayIndexingDefaultTest(unittest.TestCase):
         self.assertTrue(np.alltrue(collected_array == self.data))
 
 
+    def test_numpy_integer_keys(self):
+        row_indices = np.array([3, 1])
+        for key in [np.int64(3), row_indices[0], (np.int32(3), slice(None)),
+                    (slice(np.int64(1), np.int64(4)), row_indices[1]),
+                    (np.uint8(2), np.int16(4))]:
+            returned_array = self.mpi_array[key]
+            self.assertTrue(np.alltrue(
+                np.asarray(returned_array.collect_data()) == self.data[key]))
+
+        self.mpi_array[np.int64(0)] = -1
+        self.data[0] = -1
+        self.mpi_array[row_indices[0], np.int32(2)] = -2
+        self.data[3, 2] = -2
+        self.assertTrue(np.alltrue(self.mpi_array.collect_data() == self.data))
+
+
     def test_custom_getitem_indexing_exceptions_behavior(self):
         #Check Index Error for index outside global range
         with self.assertRaises(IndexError):
@@ -204,8 +220,9 @@ class MPIArrayIndexingDefaultTest(unittest.TestCase):
             self.mpi_array[over_index]
 
         #Check Not Supported Error is thrown when non int/slice/tuple key provided
-        with self.assertRaises(NotSupportedError):
-            self.mpi_array[[0, 1]]
+        if self.dist != 'b':
+            with self.assertRaises(NotSupportedError):
+                self.mpi_array[[0, 1]]
 
 
     def test_custom_getitem_full_copy_return(self):
@@ -457,6 +474,99 @@ class MPIArrayIndexingDefaultTest(unittest.TestCase):
         self.assertTrue(np.alltrue(returned_array == self.data[:, middle_col:last_col]))
 
 
+class MPIArrayIndexingBlockTest(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = MPI.COMM_WORLD
+        self.data = np.arange(50).reshape(10,5)
+        self.mpi_array = mpi_np.array(self.data, comm=self.comm, dist='b')
+
+
+    def test_custom_getitem_single_element_return(self):
+        for key in [(0, 0), (4, 3), (-1, -2), (slice(6, 7), 1)]:
+            returned_array = self.mpi_array[key]
+            self.assertTrue(isinstance(returned_array, Replicated))
+            self.assertEqual(returned_array.shape, self.data[key].shape)
+            self.assertTrue(np.alltrue(returned_array == self.data[key]))
+
+
+    def test_custom_getitem_strided_rows_return(self):
+        for key in [slice(None, None, -3), (slice(1, 9, 2), slice(1, 4)),
+                    (slice(8, 0, -1), -1), slice(3, 3)]:
+            returned_array = self.mpi_array[key]
+            self.assertTrue(isinstance(returned_array, Replicated))
+            self.assertEqual(returned_array.shape, self.data[key].shape)
+            self.assertTrue(np.alltrue(returned_array == self.data[key]))
+
+
+    def test_custom_setitem_array_values(self):
+        for key in [slice(None), slice(1, 9, 2), (slice(2, None), 3),
+                    (slice(8, 0, -3), slice(None, None, -2)), 4, (6, 1),
+                    slice(4, 4)]:
+            value = -np.arange(self.data[key].size).reshape(self.data[key].shape)
+            self.mpi_array[key] = value
+            self.data[key] = value
+            self.assertTrue(np.alltrue(self.mpi_array.collect_data() == self.data))
+
+            replicated_value = mpi_np.array(value - 1, comm=self.comm, dist='r')
+            self.mpi_array[key] = replicated_value
+            self.data[key] = value - 1
+            self.assertTrue(np.alltrue(self.mpi_array.collect_data() == self.data))
+
+        #Values broadcast to shape of selection
+        self.mpi_array[3:7] = np.arange(5)
+        self.data[3:7] = np.arange(5)
+        self.assertTrue(np.alltrue(self.mpi_array.collect_data() == self.data))
+
+        with self.assertRaises(ValueError):
+            self.mpi_array[0] = [2, 3]
+
+
+    def test_custom_setitem_distributed_values(self):
+        for key, dist in [(slice(None), 'b'), (slice(1, 9, 2), 'b'),
+                          ((slice(2, None), 3), 'b'), (4, 'b'),
+                          ((slice(0, 8), slice(1, 5)), 'bb'),
+                          ((slice(None), slice(None, None, -1)), 'bc')]:
+            value = -np.arange(self.data[key].size).reshape(self.data[key].shape)
+            self.mpi_array[key] = mpi_np.array(value, comm=self.comm, dist=dist)
+            self.data[key] = value
+            self.assertTrue(np.alltrue(self.mpi_array.collect_data() == self.data))
+
+        with self.assertRaises(mpi_np.errors.ValueError):
+            self.mpi_array[:5] = mpi_np.array(self.data[:4], comm=self.comm)
+
+        with self.assertRaises(NotSupportedError):
+            self.mpi_array[::-1] = mpi_np.array(self.data, comm=self.comm)
+
+
+    def test_get_view_shares_local_data(self):
+        for key in [slice(None), slice(1, 9, 2), (slice(2, None), 3),
+                    (slice(None, 7, 3), slice(None, None, -2)), slice(4, 4)]:
+            view = self.mpi_array.get_view(key)
+            self.assertTrue(isinstance(view, mpi_np.MPIArray))
+            self.assertEqual(view.dist, 'b')
+            self.assertEqual(view.globalshape, self.data[key].shape)
+            self.assertTrue(view.size == 0 or
+                            np.shares_memory(view, self.mpi_array))
+            self.assertTrue(np.alltrue(view.collect_data() == self.data[key]))
+
+        view = self.mpi_array.get_view((slice(1, 9, 2), 0))
+        view[:] = -1
+        self.data[1:9:2, 0] = -1
+        self.assertTrue(np.alltrue(self.mpi_array.collect_data() == self.data))
+
+
+    def test_get_view_exceptions_behavior(self):
+        with self.assertRaises(NotSupportedError):
+            self.mpi_array.get_view(0)
+
+        with self.assertRaises(NotSupportedError):
+            self.mpi_array.get_view(slice(None, None, -1))
+
+        with self.assertRaises(IndexError):
+            self.mpi_array.get_view((slice(None), 5))
+
+
 class MPIArrayIndexingReplicatedTest(MPIArrayIndexingDefaultTest):
 
     def create_setUp_parms(self):
@@ -468,5 +578,53 @@ class MPIArrayIndexingReplicatedTest(MPIArrayIndexingDefaultTest):
         return parms
 
 
+class MPIArrayIndexingBlockBlockTest(MPIArrayIndexingDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        # Block-Block distribution
+        parms['dist'] = 'bb'
+        parms['data'] = np.arange(25).reshape(5,5)
+        return parms
+
+
+    def test_custom_getitem_strided_sub_block_return(self):
+        key = (slice(None, None, -2), slice(1, 5, 2))
+        returned_array = self.mpi_array[key]
+
+        self.assertTrue(isinstance(returned_array, Replicated))
+        self.assertEqual(returned_array.shape, self.data[key].shape)
+        self.assertTrue(np.alltrue(returned_array == self.data[key]))
+
+
+    def test_custom_getitem_single_element_return(self):
+        for key in [(0, 0), (2, 4), (-1, -2)]:
+            returned_array = self.mpi_array[key]
+            self.assertEqual(returned_array.shape, ())
+            self.assertEqual(returned_array, self.data[key])
+
+
+class MPIArrayIndexingBlockCyclicTest(MPIArrayIndexingDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        # Block-Cyclic distribution
+        parms['dist'] = 'bc'
+        parms['data'] = np.arange(25).reshape(5,5)
+        return parms
+
+
+    def test_custom_getitem_strided_rows_return(self):
+        for key in [slice(None, None, -2), (slice(1, 5, 3), slice(1, 4)),
+                    (-1, slice(None, None, 2))]:
+            returned_array = self.mpi_array[key]
+
+            self.assertTrue(isinstance(returned_array, Replicated))
+            self.assertEqual(returned_array.shape, self.data[key].shape)
+            self.assertTrue(np.alltrue(returned_array == self.data[key]))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,5 @@
 import numpy as np
 from mpi4py import MPI
-from mpids.MPInumpy.errors import NotSupportedError
 from mpids.MPInumpy.distributions.Replicated import Replicated
 from .MPIArray_test import MPIArrayDefaultTest
 
@@ -75,6 +74,64 @@ class MPIArray3DReplicatedTest(MPIArray3DDefaultTest):
         return parms
 
 
+class MPIArray3DBlockBlockTest(MPIArray3DDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        parms['rank'] = MPI.COMM_WORLD.Get_rank()
+        parms['comm_size'] = MPI.COMM_WORLD.Get_size()
+        # Block-Block distribution
+        parms['dist'] = 'bb'
+        #Add 1 to avoid divide by zero errors/warnings
+        np_data = np.arange(16).reshape(4,2,2) + 1
+        parms['data'] = np_data
+        local_data_map = {0: np_data[:2, :1],
+                          1: np_data[:2, 1:],
+                          2: np_data[2:, :1],
+                          3: np_data[2:, 1:]}
+        parms['local_data'] = local_data_map[parms['rank']].tolist()
+        parms['comm_dims'] = [2, 2]
+        comm_coord_map = {0: [0, 0],
+                          1: [0, 1],
+                          2: [1, 0],
+                          3: [1, 1]}
+        parms['comm_coord'] = comm_coord_map[parms['rank']]
+        local_to_global_map = {0 : {0 : (0, 2), 1 : (0, 1), 2 : (0, 2)},
+                               1 : {0 : (0, 2), 1 : (1, 2), 2 : (0, 2)},
+                               2 : {0 : (2, 4), 1 : (0, 1), 2 : (0, 2)},
+                               3 : {0 : (2, 4), 1 : (1, 2), 2 : (0, 2)}}
+        parms['local_to_global'] = local_to_global_map[parms['rank']]
+        return parms
+
+
+class MPIArray3DBlockCyclicTest(MPIArray3DDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        parms['rank'] = MPI.COMM_WORLD.Get_rank()
+        parms['comm_size'] = MPI.COMM_WORLD.Get_size()
+        # Block-Cyclic distribution
+        parms['dist'] = 'bc'
+        #Add 1 to avoid divide by zero errors/warnings
+        np_data = np.arange(24).reshape(6,2,2) + 1
+        parms['data'] = np_data
+        local_data_map = {0: np_data[[0, 4]],
+                          1: np_data[[1, 5]],
+                          2: np_data[[2]],
+                          3: np_data[[3]]}
+        parms['local_data'] = local_data_map[parms['rank']].tolist()
+        parms['comm_dims'] = [parms['comm_size']]
+        parms['comm_coord'] = [parms['rank']]
+        local_to_global_map = {0 : {0 : (0, 5), 1 : (0, 2), 2 : (0, 2)},
+                               1 : {0 : (1, 6), 1 : (0, 2), 2 : (0, 2)},
+                               2 : {0 : (2, 3), 1 : (0, 2), 2 : (0, 2)},
+                               3 : {0 : (3, 4), 1 : (0, 2), 2 : (0, 2)}}
+        parms['local_to_global'] = local_to_global_map[parms['rank']]
+        return parms
+
+
 class MPIArray4DDefaultTest(MPIArrayDefaultTest):
 
     def create_setUp_parms(self):
@@ -121,16 +178,9 @@ class MPIArray4DDefaultTest(MPIArrayDefaultTest):
 
 
     def test_custom_std_higher_dim_method(self):
-        if isinstance(self.mpi_array, Replicated):
-            #Std along specified axies
-            self.assertTrue(np.alltrue(self.np_array.std(axis=2) == self.mpi_array.std(axis=2)))
-            self.assertTrue(np.alltrue(self.np_array.std(axis=3) == self.mpi_array.std(axis=3)))
-        else:
-#TODO: Need to revisit for higher dim
-            with self.assertRaises(NotSupportedError):
-                self.mpi_array.std(axis=2)
-            with self.assertRaises(NotSupportedError):
-                self.mpi_array.std(axis=3)
+        #Std along specified axies
+        self.assertTrue(np.alltrue(self.np_array.std(axis=2) == self.mpi_array.std(axis=2)))
+        self.assertTrue(np.alltrue(self.np_array.std(axis=3) == self.mpi_array.std(axis=3)))
 
 
     def test_custom_sum_higher_dim_method(self):
@@ -206,19 +256,10 @@ class MPIArray5DDefaultTest(MPIArrayDefaultTest):
 
 
     def test_custom_std_higher_dim_method(self):
-        if isinstance(self.mpi_array, Replicated):
-            #Std along specified axies
-            self.assertTrue(np.alltrue(self.np_array.std(axis=2) == self.mpi_array.std(axis=2)))
-            self.assertTrue(np.alltrue(self.np_array.std(axis=3) == self.mpi_array.std(axis=3)))
-            self.assertTrue(np.alltrue(self.np_array.std(axis=4) == self.mpi_array.std(axis=4)))
-        else:
-#TODO: Need to revisit for higher dim
-            with self.assertRaises(NotSupportedError):
-                self.mpi_array.std(axis=2)
-            with self.assertRaises(NotSupportedError):
-                self.mpi_array.std(axis=3)
-            with self.assertRaises(NotSupportedError):
-                self.mpi_array.std(axis=4)
+        #Std along specified axies
+        self.assertTrue(np.alltrue(self.np_array.std(axis=2) == self.mpi_array.std(axis=2)))
+        self.assertTrue(np.alltrue(self.np_array.std(axis=3) == self.mpi_array.std(axis=3)))
+        self.assertTrue(np.alltrue(self.np_array.std(axis=4) == self.mpi_array.std(axis=4)))
 
 
     def test_custom_sum_higher_dim_method(self):
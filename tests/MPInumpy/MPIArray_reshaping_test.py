@@ -274,5 +274,64 @@ class MPIArrayReshapeReplicatedTest(MPIArrayReshapeDefaultTest):
         return parms
 
 
+class MPIArrayReshapeBlockBlockTest(unittest.TestCase):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        # Block-Block distribution
+        parms['dist'] = 'bb'
+        parms['data'] = np.arange(16).reshape(4,4)
+        return parms
+
+
+    def setUp(self):
+        parms = self.create_setUp_parms()
+        self.comm = parms.get('comm')
+        self.data = parms.get('data')
+        self.mpi_array = mpi_np.array(self.data, comm=self.comm,
+                                      dist=parms.get('dist'))
+
+
+    def test_reshaping_to_shape_not_equal_to_array_size_raise_value_error(self):
+        with self.assertRaises(ValueError):
+            self.mpi_array.reshape(self.mpi_array.globalsize + 1, 1)
+
+
+    def test_change_shape_preserves_global_data(self):
+        for shape in [(2, 8), (8, 2), (1, 16), (4, 2, 2), (2, 2, 2, 2)]:
+            reshaped_array = self.mpi_array.reshape(shape)
+            np_reshaped = self.data.reshape(shape)
+
+            self.assertEqual(reshaped_array.dist, self.mpi_array.dist)
+            self.assertEqual(reshaped_array.globalshape, shape)
+            self.assertEqual(reshaped_array.layout.local_shape,
+                             reshaped_array.shape)
+            self.assertTrue(np.alltrue(
+                np_reshaped[reshaped_array.layout.rank_index()] ==
+                reshaped_array))
+            self.assertTrue(np.alltrue(
+                np_reshaped == reshaped_array.collect_data()))
+
+
+class MPIArrayReshapeBlockCyclicTest(MPIArrayReshapeBlockBlockTest):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        # Block-Cyclic distribution
+        parms['dist'] = 'bc'
+        parms['data'] = np.arange(16).reshape(4,4)
+        return parms
+
+
+    def test_flattening_to_one_dimension(self):
+        reshaped_array = self.mpi_array.reshape(16)
+        self.assertEqual((16,), reshaped_array.globalshape)
+        self.assertTrue(np.alltrue(
+            self.data.ravel()[reshaped_array.layout.axis_indices(0)] ==
+            reshaped_array))
+
+
 if __name__ == '__main__':
     unittest.main()
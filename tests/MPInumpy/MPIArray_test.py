@@ -4,7 +4,9 @@ import numpy as np
 from mpi4py import MPI
 import mpids.MPInumpy as mpi_np
 from mpids.MPInumpy.errors import ValueError, NotSupportedError
+from mpids.MPInumpy.distributions.BlockCyclic import BlockCyclic
 from mpids.MPInumpy.distributions.Replicated import Replicated
+from mpids.MPInumpy.layout import Layout
 
 
 class MPIArrayAbstractBaseClassTest(unittest.TestCase):
@@ -54,6 +56,9 @@ class MPIArrayAbstractBaseClassTest(unittest.TestCase):
         with self.assertRaises(NotImplementedError):
             self.mpi_array.sum()
 
+        with self.assertRaises(NotImplementedError):
+            self.mpi_array.var()
+
         with self.assertRaises(NotImplementedError):
             self.mpi_array.collect_data()
 
@@ -151,8 +156,11 @@ class MPIArrayDefaultTest(unittest.TestCase):
         self.assertTrue(isinstance(self.mpi_array.local, np.ndarray))
         self.assertTrue(np.alltrue(self.mpi_array.local == self.np_local_array))
 
+        #Transposes are distributed
+        self.assertTrue(np.alltrue(self.data.T ==
+                                   self.mpi_array.T.collect_data()))
+
         #Replicated numpy.ndarray properties
-        self.assertTrue(np.alltrue(self.np_local_array.T == self.mpi_array.T))
         self.assertEqual(self.np_local_array.data, self.mpi_array.data)
         self.assertEqual(self.np_local_array.dtype, self.mpi_array.dtype)
         self.assertTrue(np.alltrue(self.np_local_array.imag == self.mpi_array.imag))
@@ -257,8 +265,11 @@ class MPIArrayDefaultTest(unittest.TestCase):
         #Mean along specified axies
         self.assertTrue(np.alltrue(self.np_array.mean(axis=0) == self.mpi_array.mean(axis=0)))
         self.assertTrue(np.alltrue(self.np_array.mean(axis=1) == self.mpi_array.mean(axis=1)))
+        self.assertTrue(np.alltrue(self.np_array.mean(axis=-1) == self.mpi_array.mean(axis=-1)))
         with self.assertRaises(ValueError):
             self.mpi_array.mean(axis=self.mpi_array.ndim)
+        with self.assertRaises(ValueError):
+            self.mpi_array.mean(axis=-self.mpi_array.ndim - 1)
 
         #Use of 'out' field
         mpi_out = np.zeros(())
@@ -295,8 +306,13 @@ class MPIArrayDefaultTest(unittest.TestCase):
         #Std along specified axies
         self.assertTrue(np.alltrue(self.np_array.std(axis=0) == self.mpi_array.std(axis=0)))
         self.assertTrue(np.alltrue(self.np_array.std(axis=1) == self.mpi_array.std(axis=1)))
+        self.assertTrue(np.allclose(self.np_array.std(axis=-1), self.mpi_array.std(axis=-1)))
+        self.assertTrue(np.allclose(self.np_array.std(axis=-self.np_array.ndim),
+                                    self.mpi_array.std(axis=-self.mpi_array.ndim)))
         with self.assertRaises(ValueError):
             self.mpi_array.std(axis=self.mpi_array.ndim)
+        with self.assertRaises(ValueError):
+            self.mpi_array.std(axis=-self.mpi_array.ndim - 1)
 
         #Use of 'out' field
         mpi_out = np.zeros(())
@@ -304,6 +320,28 @@ class MPIArrayDefaultTest(unittest.TestCase):
             self.mpi_array.std(out=mpi_out)
 
 
+    def test_custom_var_method(self):
+        #Returned object is Replicated
+        self.assertTrue(isinstance(self.mpi_array.var(), Replicated))
+
+        #Default var of entire array contents
+        self.assertTrue(np.allclose(self.np_array.var(), self.mpi_array.var()))
+
+        #Var along specified axies, negative axes count from the last axis
+        for axis in [0, 1, -1, -self.np_array.ndim]:
+            self.assertTrue(np.allclose(self.np_array.var(axis=axis),
+                                        self.mpi_array.var(axis=axis)))
+        self.assertTrue(np.allclose(self.np_array.var(axis=-1, ddof=1),
+                                    self.mpi_array.var(axis=-1, ddof=1)))
+        with self.assertRaises(ValueError):
+            self.mpi_array.var(axis=self.mpi_array.ndim)
+
+        #Use of 'out' field
+        mpi_out = np.zeros(())
+        with self.assertRaises(NotSupportedError):
+            self.mpi_array.var(out=mpi_out)
+
+
     def test_custom_sum_method(self):
         #Returned object is Replicated
         self.assertTrue(isinstance(self.mpi_array.sum(), Replicated))
@@ -330,6 +368,75 @@ class MPIArrayDefaultTest(unittest.TestCase):
             self.mpi_array.sum(out=mpi_out)
 
 
+    def test_custom_reductions_keep_distributed(self):
+        for method in ['max', 'mean', 'min', 'std', 'sum', 'var']:
+            np_result = getattr(self.np_array, method)(axis=1)
+            mpi_result = \
+                getattr(self.mpi_array, method)(axis=1, keep_distributed=True)
+            self.assertTrue(np.allclose(np_result, mpi_result.collect_data()))
+
+            if self.dist in ['b', 'bc']:
+                #Row-wise results are aligned with the local rows
+                self.assertTrue(isinstance(mpi_result, type(self.mpi_array)))
+                self.assertEqual(self.dist, mpi_result.dist)
+                self.assertEqual(np_result.shape, mpi_result.globalshape)
+                self.assertEqual(self.mpi_array.local_to_global[0],
+                                 mpi_result.local_to_global[0])
+                self.assertTrue(np.allclose(
+                    getattr(self.np_local_array, method)(axis=1),
+                    mpi_result))
+            else:
+                #Partitioned and replicated axes are reduced as before
+                self.assertTrue(isinstance(mpi_result, Replicated))
+
+            #Reductions along axis 0 are always replicated
+            self.assertTrue(isinstance(
+                getattr(self.mpi_array, method)(axis=0, keep_distributed=True),
+                Replicated))
+
+            #Negative axes are reduced as the matching axis
+            last_axis = self.mpi_array.ndim - 1
+            self.assertEqual(
+                type(getattr(self.mpi_array, method)(
+                    axis=last_axis, keep_distributed=True)),
+                type(getattr(self.mpi_array, method)(
+                    axis=-1, keep_distributed=True)))
+
+
+    def test_rebalance_method(self):
+        #Evenly partitioned arrays need no data movement
+        self.assertTrue(self.mpi_array.rebalance() is self.mpi_array)
+        if self.dist == 'r':
+            return
+        with self.assertRaises(ValueError):
+            self.mpi_array.rebalance(
+                layout=mpi_np.array(self.np_array[..., :1], comm=self.comm,
+                                    dist=self.dist).layout)
+
+        if self.dist != 'b':
+            return
+        #All rows held by the last rank
+        rank_extents = np.zeros((self.comm_size, self.np_array.ndim, 2),
+                                dtype=np.int64)
+        rank_extents[:, :, 1] = self.np_array.shape
+        rank_extents[:, 0, 0] = self.np_array.shape[0]
+        rank_extents[-1, 0, 0] = 0
+        uneven_layout = Layout(self.np_array.shape, self.dist, self.comm,
+                               self.comm_dims, self.comm_coord, rank_extents)
+        uneven_array = self.mpi_array.rebalance(layout=uneven_layout)
+        self.assertEqual(uneven_layout, uneven_array.layout)
+        self.assertTrue(np.alltrue(self.np_array == uneven_array.collect_data()))
+        self.assertEqual(float(self.comm_size), uneven_array.layout.imbalance)
+
+        #Rebalanced only when exceeding threshold
+        self.assertTrue(uneven_array.rebalance(threshold=self.comm_size)
+                        is uneven_array)
+        rebalanced_array = uneven_array.rebalance(threshold=1.5)
+        self.assertEqual(self.mpi_array.layout, rebalanced_array.layout)
+        self.assertTrue(np.alltrue(self.np_local_array ==
+                                   np.asarray(rebalanced_array)))
+
+
     def test_astype_method_cast_to_float32(self):
         np_type_casted = self.np_array.astype(np.float32)
         mpi_np_type_casted = self.mpi_array.astype(np.float32)
@@ -395,6 +502,81 @@ class MPIArrayDefaultTest(unittest.TestCase):
         self.assertTrue(np.alltrue((collected_array) == (self.np_array)))
 
 
+class MPIArrayBlockBlockTest(MPIArrayDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        parms['rank'] = MPI.COMM_WORLD.Get_rank()
+        parms['comm_size'] = MPI.COMM_WORLD.Get_size()
+        # Block-Block distribution
+        parms['dist'] = 'bb'
+        #Add 1 to avoid divide by zero errors/warnings
+        np_data = np.arange(25).reshape(5,5) + 1
+        parms['data'] = np_data
+        local_data_map = {0: np_data[:3, :3],
+                          1: np_data[:3, 3:],
+                          2: np_data[3:, :3],
+                          3: np_data[3:, 3:]}
+        parms['local_data'] = local_data_map[parms['rank']].tolist()
+        parms['comm_dims'] = [2, 2]
+        comm_coord_map = {0: [0, 0],
+                          1: [0, 1],
+                          2: [1, 0],
+                          3: [1, 1]}
+        parms['comm_coord'] = comm_coord_map[parms['rank']]
+        local_to_global_map = {0 : {0 : (0, 3), 1 : (0, 3)},
+                               1 : {0 : (0, 3), 1 : (3, 5)},
+                               2 : {0 : (3, 5), 1 : (0, 3)},
+                               3 : {0 : (3, 5), 1 : (3, 5)}}
+        parms['local_to_global'] = local_to_global_map[parms['rank']]
+        return parms
+
+
+class MPIArrayBlockCyclicTest(MPIArrayDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        parms['rank'] = MPI.COMM_WORLD.Get_rank()
+        parms['comm_size'] = MPI.COMM_WORLD.Get_size()
+        # Block-Cyclic distribution, default block size of 1
+        parms['dist'] = 'bc'
+        #Add 1 to avoid divide by zero errors/warnings
+        np_data = np.arange(25).reshape(5,5) + 1
+        parms['data'] = np_data
+        local_data_map = {0: np_data[[0, 4]],
+                          1: np_data[[1]],
+                          2: np_data[[2]],
+                          3: np_data[[3]]}
+        parms['local_data'] = local_data_map[parms['rank']].tolist()
+        parms['comm_dims'] = [parms['comm_size']]
+        parms['comm_coord'] = [parms['rank']]
+        local_to_global_map = {0 : {0 : (0, 5), 1 : (0, 5)},
+                               1 : {0 : (1, 2), 1 : (0, 5)},
+                               2 : {0 : (2, 3), 1 : (0, 5)},
+                               3 : {0 : (3, 4), 1 : (0, 5)}}
+        parms['local_to_global'] = local_to_global_map[parms['rank']]
+        return parms
+
+
+    def test_block_size_and_conversion_to_block(self):
+        self.assertEqual(1, self.mpi_array.block_size)
+
+        block_array = self.mpi_array.to_block()
+        self.assertEqual('b', block_array.dist)
+        self.assertTrue(np.alltrue(
+            self.np_array[block_array.layout.rank_slices()] == block_array))
+
+        block_cyclic_array = BlockCyclic.from_block(block_array, block_size=2)
+        self.assertEqual(2, block_cyclic_array.block_size)
+        self.assertTrue(np.alltrue(
+            self.np_array[block_cyclic_array.layout.rank_index()] ==
+            block_cyclic_array))
+        self.assertTrue(np.alltrue(
+            self.np_array == block_cyclic_array.collect_data()))
+
+
 class MPIArrayReplicatedTest(MPIArrayDefaultTest):
 
     def create_setUp_parms(self):
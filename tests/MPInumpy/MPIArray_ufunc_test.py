@@ -0,0 +1,204 @@
+import unittest
+import numpy as np
+from mpi4py import MPI
+import mpids.MPInumpy as mpi_np
+from mpids.MPInumpy.errors import NotSupportedError, ValueError
+from mpids.MPInumpy.distributions.Replicated import Replicated
+
+
+class MPIArrayUfuncDefaultTest(unittest.TestCase):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        # Default distribution
+        parms['dist'] = 'b'
+        parms['other_dist'] = 'bc'
+        #Add 1 to avoid divide by zero errors/warnings
+        parms['data'] = np.arange(35, dtype=np.float64).reshape(7,5) + 1
+        return parms
+
+
+    def setUp(self):
+        parms = self.create_setUp_parms()
+        self.comm = parms.get('comm')
+        self.dist = parms.get('dist')
+        self.other_dist = parms.get('other_dist')
+        self.data = parms.get('data')
+
+        self.mpi_array = mpi_np.array(self.data, comm=self.comm, dist=self.dist)
+
+
+    def test_ufunc_result_shares_layout(self):
+        result = np.sqrt(self.mpi_array)
+
+        self.assertTrue(isinstance(result, type(self.mpi_array)))
+        self.assertTrue(result.layout is self.mpi_array.layout)
+        self.assertTrue(np.allclose(np.sqrt(self.data), result.collect_data()))
+
+        quotient, remainder = np.divmod(self.mpi_array, 3)
+        self.assertTrue(isinstance(remainder, type(self.mpi_array)))
+        self.assertTrue(np.alltrue(self.data // 3 == quotient.collect_data()))
+        self.assertTrue(np.alltrue(self.data % 3 == remainder.collect_data()))
+
+
+    def test_ufunc_broadcasts_replicated_operands(self):
+        row = mpi_np.array(self.data[0], comm=self.comm, dist='r')
+        column = mpi_np.array(self.data[:, :1], comm=self.comm, dist='r')
+        full = mpi_np.array(self.data, comm=self.comm, dist='r')
+
+        self.assertTrue(np.alltrue((self.data - self.data[0]) ==
+                                   (self.mpi_array - row).collect_data()))
+        self.assertTrue(np.alltrue((self.data[:, :1] * self.data) ==
+                                   (column * self.mpi_array).collect_data()))
+        self.assertTrue(np.alltrue((self.data + self.data) ==
+                                   (self.mpi_array + full).collect_data()))
+        self.assertTrue(np.alltrue((self.data > self.data.mean()) ==
+                                   (self.mpi_array >
+                                    self.mpi_array.mean()).collect_data()))
+
+
+    def test_ufunc_with_out_operates_in_place(self):
+        local_buffer = self.mpi_array.base
+        result = np.multiply(self.mpi_array, 2, out=self.mpi_array)
+        self.assertTrue(result is self.mpi_array)
+        self.assertTrue(self.mpi_array.base is local_buffer)
+        self.assertTrue(np.alltrue(self.data * 2 ==
+                                   self.mpi_array.collect_data()))
+
+        self.mpi_array += 1
+        self.assertTrue(self.mpi_array.base is local_buffer)
+        self.assertTrue(np.alltrue(self.data * 2 + 1 ==
+                                   self.mpi_array.collect_data()))
+
+
+    def test_ufunc_redistributes_mismatched_layouts(self):
+        other_array = \
+            mpi_np.array(self.data, comm=self.comm, dist=self.other_dist)
+        result = self.mpi_array + other_array
+
+        self.assertEqual(self.dist, result.dist)
+        self.assertTrue(result.layout is self.mpi_array.layout)
+        self.assertTrue(np.alltrue(self.data * 2 == result.collect_data()))
+
+
+    def test_ufunc_with_incompatible_operands_raises(self):
+        other_array = \
+            mpi_np.array(self.data[:3], comm=self.comm, dist=self.other_dist)
+        with self.assertRaises(NotSupportedError):
+            self.mpi_array + other_array
+
+        replicated_array = mpi_np.array(self.data[0, :3], comm=self.comm,
+                                        dist='r')
+        with self.assertRaises(ValueError):
+            self.mpi_array * replicated_array
+
+        with self.assertRaises(ValueError):
+            np.add(self.mpi_array, 1, out=replicated_array)
+
+
+    def test_matmul_operator_dispatches_to_distributed_matmul(self):
+        replicated_vector = mpi_np.array(self.data[0], comm=self.comm,
+                                         dist='r')
+        result = self.mpi_array @ replicated_vector
+        self.assertEqual((7,), result.globalshape)
+        self.assertEqual(result.layout.local_shape, result.shape)
+        self.assertTrue(np.allclose(self.data @ self.data[0],
+                                    result.collect_data()))
+
+        transposed = mpi_np.array(self.data.T, comm=self.comm, dist=self.dist)
+        for result in [self.mpi_array @ transposed,
+                       np.matmul(self.mpi_array, transposed)]:
+            self.assertEqual((7, 7), result.globalshape)
+            self.assertTrue(np.allclose(self.data @ self.data.T,
+                                        result.collect_data()))
+
+        replicated_matrix = mpi_np.array(self.data.T, comm=self.comm,
+                                         dist='r')
+        result = replicated_matrix @ self.mpi_array
+        self.assertEqual((5, 5), result.globalshape)
+        self.assertTrue(np.allclose(self.data.T @ self.data,
+                                    result.collect_data()))
+
+        with self.assertRaises(NotSupportedError):
+            np.matmul(self.mpi_array, replicated_vector,
+                      out=np.empty(self.mpi_array.shape[0]))
+
+
+    def test_ufunc_results_beyond_layout_raise(self):
+        #Process local operands broadcasting local data beyond the layout
+        with self.assertRaises(NotSupportedError):
+            self.mpi_array + np.ones((2, 1, 1))
+
+
+    def test_ufunc_local_methods_return_local_results(self):
+        local_data = np.asarray(self.mpi_array)
+        self.assertEqual(np.add.reduce(local_data, axis=None),
+                         np.add.reduce(self.mpi_array, axis=None))
+        self.assertTrue(np.alltrue(np.negative(self.mpi_array.local.T) ==
+                                   -local_data.T))
+
+
+class MPIArrayUfuncBlockBlockTest(MPIArrayUfuncDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        # Block-Block distribution
+        parms['dist'] = 'bb'
+        parms['other_dist'] = 'b'
+        #Add 1 to avoid divide by zero errors/warnings
+        parms['data'] = np.arange(35, dtype=np.float64).reshape(7,5) + 1
+        return parms
+
+
+class MPIArrayUfuncBlockCyclicTest(MPIArrayUfuncDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        # Block-Cyclic distribution
+        parms['dist'] = 'bc'
+        parms['other_dist'] = 'bb'
+        #Add 1 to avoid divide by zero errors/warnings
+        parms['data'] = np.arange(35, dtype=np.float64).reshape(7,5) + 1
+        return parms
+
+
+class MPIArrayUfuncReplicatedTest(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = MPI.COMM_WORLD
+        self.data = np.arange(35, dtype=np.float64).reshape(7,5) + 1
+        self.mpi_array = mpi_np.array(self.data, comm=self.comm, dist='r')
+
+
+    def test_ufunc_of_replicated_operands_is_replicated(self):
+        result = np.sqrt(self.mpi_array) + self.mpi_array[0]
+        self.assertTrue(isinstance(result, Replicated))
+        self.assertTrue(np.allclose(np.sqrt(self.data) + self.data[0], result))
+
+
+    def test_ufunc_with_distributed_operand_follows_its_layout(self):
+        block_array = mpi_np.array(self.data, comm=self.comm, dist='b')
+        result = self.mpi_array - block_array
+
+        self.assertEqual('b', result.dist)
+        self.assertTrue(result.layout is block_array.layout)
+        self.assertTrue(np.alltrue(0 == result.collect_data()))
+
+
+    def test_matmul_operator_of_replicated_operands_is_replicated(self):
+        result = self.mpi_array @ self.mpi_array.T
+        self.assertTrue(isinstance(result, Replicated))
+        self.assertTrue(np.allclose(self.data @ self.data.T, result))
+
+
+    def test_ufunc_reductions_of_replicated_operands_are_replicated(self):
+        result = np.add.reduce(self.mpi_array, axis=0)
+        self.assertTrue(isinstance(result, Replicated))
+        self.assertTrue(np.alltrue(self.data.sum(axis=0) == result))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -5,9 +5,11 @@ from mpi4py import MPI
 import mpids.MPInumpy as mpi_np
 from mpids.MPInumpy.distributions import *
 from mpids.MPInumpy.errors import InvalidDistributionError, \
+                                  NotSupportedError,        \
                                   TypeError,                \
                                   ValueError
 from mpids.MPInumpy.array_creation import _validate_shape
+from mpids.MPInumpy.utils import get_weighted_block_indices
 
 class ValidateShapeTest(unittest.TestCase):
 
@@ -133,6 +135,67 @@ class ArrayDefaultTest(unittest.TestCase):
             self.assertEqual(mpi_np_array.dist, self.dist)
 
 
+class ArrayBlockBlockTest(ArrayDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['np_data'] = np.arange(20).reshape(5,4)
+        parms['array_like_data'] = parms['np_data'].tolist()
+        parms['comm'] = MPI.COMM_WORLD
+        # Block-Block distribution
+        parms['dist'] = 'bb'
+        parms['dist_class'] = BlockBlock
+        return parms
+
+
+    def test_local_blocks_from_all_ranks(self):
+        for root in range(self.size):
+            np_data = self.np_data if self.rank == root else None
+            mpi_np_array = mpi_np.array(np_data,
+                                        comm=self.comm,
+                                        root=root,
+                                        dist=self.dist)
+            row_start, row_end = mpi_np_array.local_to_global[0]
+            col_start, col_end = mpi_np_array.local_to_global[1]
+            self.assertTrue(np.alltrue(
+                self.np_data[row_start:row_end, col_start:col_end] ==
+                mpi_np_array))
+            self.assertTrue(np.alltrue(
+                self.np_data == mpi_np_array.collect_data()))
+
+
+class ArrayBlockCyclicTest(ArrayDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['np_data'] = np.arange(20).reshape(5,4)
+        parms['array_like_data'] = parms['np_data'].tolist()
+        parms['comm'] = MPI.COMM_WORLD
+        # Block-Cyclic distribution
+        parms['dist'] = 'bc'
+        parms['dist_class'] = BlockCyclic
+        return parms
+
+
+    def test_local_rows_from_all_ranks_with_block_size(self):
+        for root in range(self.size):
+            np_data = self.np_data if self.rank == root else None
+            mpi_np_array = mpi_np.array(np_data,
+                                        comm=self.comm,
+                                        root=root,
+                                        dist=self.dist,
+                                        block_size=2)
+            self.assertEqual(2, mpi_np_array.block_size)
+            self.assertTrue(np.alltrue(
+                self.np_data[mpi_np_array.layout.axis_indices(0)] ==
+                mpi_np_array))
+
+
+    def test_ndmin_not_supported(self):
+        with self.assertRaises(NotSupportedError):
+            mpi_np.array(self.np_data, comm=self.comm, dist=self.dist, ndmin=3)
+
+
 class ArrayReplicatedTest(ArrayDefaultTest):
 
     def create_setUp_parms(self):
@@ -292,6 +355,42 @@ class ArangeDefaultTest(unittest.TestCase):
             self.assertTrue(np.alltrue(mpi_np_arange[:] == np_arange))
 
 
+    def test_non_integer_steps_match_layout(self):
+        #Rounding of local ranges must not change the number of values
+        for args in [(0, 1, 0.1), (0.5, 3.3, 0.7), (0, 2.2, 0.2), (1, 0, 0.3)]:
+            np_arange = np.arange(*args)
+            mpi_np_arange = mpi_np.arange(*args, comm=self.comm,
+                                          dist=self.dist)
+            self.assertEqual(np_arange.shape, mpi_np_arange.globalshape)
+            self.assertEqual(mpi_np_arange.layout.local_shape,
+                             mpi_np_arange.shape)
+            self.assertTrue(np.allclose(np_arange,
+                                        mpi_np_arange.collect_data()))
+
+
+class ArangeBlockCyclicTest(ArangeDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        # Block-Cyclic distribution
+        parms['dist'] = 'bc'
+        parms['dist_class'] = BlockCyclic
+        return parms
+
+
+    def test_local_values_with_block_size(self):
+        mpi_np_arange = mpi_np.arange(1, 40, 3,
+                                      comm=self.comm,
+                                      dist=self.dist,
+                                      block_size=2)
+        np_arange = np.arange(1, 40, 3)
+        self.assertEqual(2, mpi_np_arange.block_size)
+        self.assertTrue(np.alltrue(
+            np_arange[mpi_np_arange.layout.axis_indices(0)] == mpi_np_arange))
+        self.assertTrue(np.alltrue(np_arange == mpi_np_arange.collect_data()))
+
+
 class ArangeReplicatedTest(ArangeDefaultTest):
 
     def create_setUp_parms(self):
@@ -378,6 +477,40 @@ class EmptyDefaultTest(unittest.TestCase):
                 mpi_np.empty(1)
 
 
+class EmptyBlockBlockTest(EmptyDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['int_shape'] = 4
+        parms['tuple_shape'] = (5, 4)
+        parms['comm'] = MPI.COMM_WORLD
+        # Block-Block distribution
+        parms['dist'] = 'bb'
+        parms['dist_class'] = BlockBlock
+        return parms
+
+
+    def test_return_behavior_from_all_ranks_with_int_shape(self):
+        #Block-Block requires 2 or more dimensions
+        for root in range(self.size):
+            shape = self.int_shape if self.rank == root else None
+            with self.assertRaises(NotSupportedError):
+                mpi_np.empty(shape, comm=self.comm, root=root, dist=self.dist)
+
+
+class EmptyBlockCyclicTest(EmptyDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['int_shape'] = 4
+        parms['tuple_shape'] = (5, 4)
+        parms['comm'] = MPI.COMM_WORLD
+        # Block-Cyclic distribution
+        parms['dist'] = 'bc'
+        parms['dist_class'] = BlockCyclic
+        return parms
+
+
 class EmptyReplicatedTest(EmptyDefaultTest):
 
     def create_setUp_parms(self):
@@ -468,6 +601,40 @@ class OnesDefaultTest(unittest.TestCase):
                 mpi_np.ones(1)
 
 
+class OnesBlockBlockTest(OnesDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['int_shape'] = 4
+        parms['tuple_shape'] = (5, 4)
+        parms['comm'] = MPI.COMM_WORLD
+        # Block-Block distribution
+        parms['dist'] = 'bb'
+        parms['dist_class'] = BlockBlock
+        return parms
+
+
+    def test_return_behavior_from_all_ranks_with_int_shape(self):
+        #Block-Block requires 2 or more dimensions
+        for root in range(self.size):
+            shape = self.int_shape if self.rank == root else None
+            with self.assertRaises(NotSupportedError):
+                mpi_np.ones(shape, comm=self.comm, root=root, dist=self.dist)
+
+
+class OnesBlockCyclicTest(OnesDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['int_shape'] = 4
+        parms['tuple_shape'] = (5, 4)
+        parms['comm'] = MPI.COMM_WORLD
+        # Block-Cyclic distribution
+        parms['dist'] = 'bc'
+        parms['dist_class'] = BlockCyclic
+        return parms
+
+
 class OnesReplicatedTest(OnesDefaultTest):
 
     def create_setUp_parms(self):
@@ -558,6 +725,40 @@ class ZerosDefaultTest(unittest.TestCase):
                 mpi_np.zeros(1)
 
 
+class ZerosBlockBlockTest(ZerosDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['int_shape'] = 4
+        parms['tuple_shape'] = (5, 4)
+        parms['comm'] = MPI.COMM_WORLD
+        # Block-Block distribution
+        parms['dist'] = 'bb'
+        parms['dist_class'] = BlockBlock
+        return parms
+
+
+    def test_return_behavior_from_all_ranks_with_int_shape(self):
+        #Block-Block requires 2 or more dimensions
+        for root in range(self.size):
+            shape = self.int_shape if self.rank == root else None
+            with self.assertRaises(NotSupportedError):
+                mpi_np.zeros(shape, comm=self.comm, root=root, dist=self.dist)
+
+
+class ZerosBlockCyclicTest(ZerosDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['int_shape'] = 4
+        parms['tuple_shape'] = (5, 4)
+        parms['comm'] = MPI.COMM_WORLD
+        # Block-Cyclic distribution
+        parms['dist'] = 'bc'
+        parms['dist_class'] = BlockCyclic
+        return parms
+
+
 class ZerosReplicatedTest(ZerosDefaultTest):
 
     def create_setUp_parms(self):
@@ -571,5 +772,94 @@ class ZerosReplicatedTest(ZerosDefaultTest):
         return parms
 
 
+
+class WeightedCreationTest(unittest.TestCase):
+    """ Block distributed creation routines partitioned by weights. """
+
+    def setUp(self):
+        self.comm = MPI.COMM_WORLD
+        self.rank = self.comm.Get_rank()
+        self.size = self.comm.Get_size()
+        #Last rank is weighted as 5 times faster than the others
+        self.weights = [1] * (self.size - 1) + [5]
+        self.np_data = np.arange(60).reshape(15, 4)
+        self.rows = get_weighted_block_indices(15, self.weights)[self.rank]
+
+
+    def test_creation_routines_partitioned_by_weights(self):
+        mpi_np_arrays = [mpi_np.array(self.np_data, comm=self.comm,
+                                      weights=self.weights),
+                         mpi_np.arange(60, comm=self.comm,
+                                       weights=self.weights).reshape(15, 4),
+                         mpi_np.zeros((15, 4), comm=self.comm,
+                                      weights=self.weights),
+                         mpi_np.ones((15, 4), comm=self.comm,
+                                     weights=self.weights),
+                         mpi_np.empty((15, 4), comm=self.comm,
+                                      weights=self.weights)]
+        for mpi_np_array in mpi_np_arrays:
+            self.assertTrue(isinstance(mpi_np_array, Block))
+            self.assertEqual(tuple(self.rows),
+                             mpi_np_array.local_to_global[0])
+            self.assertEqual((15, 4), mpi_np_array.globalshape)
+        self.assertTrue(np.alltrue(
+            self.np_data[slice(*self.rows)] == mpi_np_arrays[0]))
+        self.assertTrue(np.alltrue(
+            self.np_data[slice(*self.rows)] == mpi_np_arrays[1]))
+        self.assertTrue(np.alltrue(
+            self.np_data.ravel()[slice(*get_weighted_block_indices(
+                60, self.weights)[self.rank])] ==
+            mpi_np.arange(60, comm=self.comm, weights=self.weights)))
+
+
+    def test_operations_honor_weighted_partitions(self):
+        mpi_np_array = mpi_np.array(self.np_data, comm=self.comm,
+                                    weights=self.weights)
+        self.assertTrue(np.alltrue(self.np_data == mpi_np_array.collect_data()))
+        self.assertEqual(self.np_data.sum(), mpi_np_array.sum())
+        self.assertTrue(np.alltrue(self.np_data.mean(axis=0) ==
+                                   mpi_np_array.mean(axis=0)))
+        self.assertTrue(np.alltrue(self.np_data.max(axis=1) ==
+                                   mpi_np_array.max(axis=1).collect_data()))
+        self.assertTrue(np.alltrue(self.np_data[3:12:2] ==
+                                   mpi_np_array[3:12:2]))
+        self.assertTrue(np.alltrue(self.np_data[[14, 0, 7]] ==
+                                   mpi_np_array[[14, 0, 7]].collect_data()))
+        reshaped = mpi_np_array.reshape(4, 15)
+        self.assertEqual(self.weights[-1] / sum(self.weights),
+                         reshaped.layout.weights[-1])
+        self.assertTrue(np.alltrue(self.np_data.reshape(4, 15) ==
+                                   reshaped.collect_data()))
+        self.assertTrue(np.alltrue((self.np_data + 1) ==
+                                   (mpi_np_array + 1).collect_data()))
+
+
+    def test_rebalance_with_weights(self):
+        mpi_np_array = mpi_np.array(self.np_data, comm=self.comm)
+        weighted_array = mpi_np_array.rebalance(weights=self.weights)
+        self.assertEqual(tuple(self.rows), weighted_array.local_to_global[0])
+        self.assertTrue(np.alltrue(self.np_data[slice(*self.rows)] ==
+                                   weighted_array))
+        #Weights of the layout are kept by default
+        self.assertTrue(weighted_array is
+                        weighted_array.rebalance(threshold=1.))
+        selected = weighted_array[weighted_array[:, 0] > 10]
+        self.assertEqual(weighted_array.layout.weights,
+                         selected.layout.weights)
+        balanced = selected.rebalance()
+        self.assertTrue(np.alltrue(self.np_data[self.np_data[:, 0] > 10] ==
+                                   balanced.collect_data()))
+        self.assertLessEqual(balanced.layout.imbalance, 1.5)
+
+
+    def test_weights_not_supported_for_other_distributions(self):
+        for dist in ['bb', 'bc', 'r']:
+            with self.assertRaises(NotSupportedError):
+                mpi_np.array(self.np_data, comm=self.comm, dist=dist,
+                             weights=self.weights)
+        with self.assertRaises(ValueError):
+            mpi_np.zeros((15, 4), comm=self.comm, weights=[1] * (self.size + 1))
+
+
 if __name__ == '__main__':
     unittest.main()
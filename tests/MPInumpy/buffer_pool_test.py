@@ -0,0 +1,186 @@
+import unittest
+import numpy as np
+from mpi4py import MPI
+import mpids.MPInumpy as mpi_np
+from mpids.MPInumpy.buffer_pool import *
+from mpids.MPInumpy.buffer_pool import MIN_BUCKET_BYTES, empty_buffer
+from mpids.MPInumpy.errors import ValueError
+from mpids.MPInumpy.mpi_utils import all_gather_v
+
+
+class BufferPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = BufferPool(max_bytes=4 * MIN_BUCKET_BYTES)
+
+
+    def test_buffers_are_reused_within_buckets(self):
+        array = self.pool.empty((3, 4), dtype=np.int32)
+        self.assertEqual((3, 4), array.shape)
+        self.assertEqual(np.int32, array.dtype)
+        self.assertTrue(array.flags['C_CONTIGUOUS'])
+        self.assertTrue(self.pool.release(array))
+        self.assertEqual(MIN_BUCKET_BYTES, self.pool.bytes_held)
+
+        #Requests rounded up to the same bucket share buffers
+        reused = self.pool.empty(MIN_BUCKET_BYTES // 8, dtype=np.float64)
+        self.assertTrue(np.shares_memory(array, reused))
+        self.assertEqual({'hits': 1, 'misses': 1, 'evictions': 0,
+                          'buffers_held': 0, 'bytes_held': 0},
+                         self.pool.stats())
+
+        #Larger requests are served from larger buckets
+        larger = self.pool.empty(MIN_BUCKET_BYTES + 1, dtype=np.uint8)
+        self.assertFalse(np.shares_memory(reused, larger))
+        self.assertEqual(2, self.pool.misses)
+
+
+    def test_views_and_foreign_arrays_on_release(self):
+        array = self.pool.empty(10)
+        self.assertFalse(self.pool.release(np.empty(10)))
+        self.assertTrue(self.pool.release(array[2:].reshape(2, 4)))
+        #Buffers are only handed back once
+        self.assertFalse(self.pool.release(array))
+        self.assertEqual(1, self.pool.stats()['buffers_held'])
+
+        #Empty arrays are not pooled
+        empty_array = self.pool.empty((0, 3))
+        self.assertEqual((0, 3), empty_array.shape)
+        self.assertFalse(self.pool.release(empty_array))
+
+
+    def test_least_recently_released_buffers_are_evicted(self):
+        small_arrays = [self.pool.empty(MIN_BUCKET_BYTES, dtype=np.uint8)
+                        for _ in range(3)]
+        large_array = self.pool.empty(2 * MIN_BUCKET_BYTES, dtype=np.uint8)
+        for array in small_arrays:
+            self.pool.release(array)
+        self.pool.release(large_array)
+        self.assertEqual(4 * MIN_BUCKET_BYTES, self.pool.bytes_held)
+
+        self.pool.release(self.pool.empty(2 * MIN_BUCKET_BYTES,
+                                          dtype=np.uint8))
+        self.pool.release(self.pool.empty(4 * MIN_BUCKET_BYTES - 1,
+                                          dtype=np.uint8))
+        self.assertEqual(4 * MIN_BUCKET_BYTES, self.pool.bytes_held)
+        self.assertEqual(4, self.pool.evictions)
+        self.assertEqual(1, self.pool.stats()['buffers_held'])
+
+        #Buffers larger than the pool are never held
+        self.pool.release(self.pool.empty(5 * MIN_BUCKET_BYTES,
+                                          dtype=np.uint8))
+        self.assertEqual(1, self.pool.stats()['buffers_held'])
+        self.pool.clear()
+        self.assertEqual(0, self.pool.bytes_held)
+        self.assertEqual(0, self.pool.stats()['buffers_held'])
+
+
+    def test_invalid_max_bytes_raise_value_error(self):
+        with self.assertRaises(ValueError):
+            BufferPool(max_bytes=-1)
+
+
+class BufferPoolContextTest(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = MPI.COMM_WORLD
+        self.rank = self.comm.Get_rank()
+        self.size = self.comm.Get_size()
+
+
+    def test_pools_are_only_active_within_contexts(self):
+        self.assertTrue(get_buffer_pool() is None)
+        with buffer_pool() as pool:
+            self.assertTrue(get_buffer_pool() is pool)
+            with buffer_pool(pool=BufferPool()) as inner_pool:
+                self.assertTrue(get_buffer_pool() is inner_pool)
+            self.assertTrue(get_buffer_pool() is pool)
+            release_buffer(empty_buffer(10, np.float64))
+            self.assertEqual(1, pool.stats()['buffers_held'])
+        self.assertTrue(get_buffer_pool() is None)
+        #Pools created by the context are cleared on exit
+        self.assertEqual(0, pool.bytes_held)
+
+        #Outside of contexts buffers are allocated and release is ignored
+        array = empty_buffer(10, np.float64)
+        release_buffer(array)
+
+
+    def test_collectives_draw_from_active_pool(self):
+        local_data = np.arange(100, dtype=np.float64) + self.rank
+        pool = BufferPool()
+        for _ in range(3):
+            with buffer_pool(pool=pool):
+                gathered_data = all_gather_v(local_data, comm=self.comm)
+                self.assertTrue(np.alltrue(
+                    np.add.outer(np.arange(self.size), np.arange(100))
+                    .ravel() == gathered_data))
+                release_buffer(gathered_data)
+        self.assertEqual({'hits': 2, 'misses': 1, 'evictions': 0,
+                          'buffers_held': 1},
+                         {key: value for key, value in pool.stats().items()
+                          if key != 'bytes_held'})
+
+
+class BufferPoolDefaultTest(unittest.TestCase):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        # Default distribution
+        parms['dist'] = 'b'
+        parms['data'] = np.arange(40, dtype=np.float64).reshape(8, 5)
+        return parms
+
+
+    def setUp(self):
+        parms = self.create_setUp_parms()
+        self.comm = parms.get('comm')
+        self.dist = parms.get('dist')
+        self.data = parms.get('data')
+        self.mpi_array = mpi_np.array(self.data, comm=self.comm, dist=self.dist)
+
+
+    def test_iterated_reductions_and_gathers_reuse_buffers(self):
+        with buffer_pool() as pool:
+            for _ in range(3):
+                for axis in [None, 0, 1]:
+                    global_sum = self.mpi_array.sum(axis=axis)
+                    self.assertTrue(np.allclose(self.data.sum(axis=axis),
+                                                global_sum))
+                    release_buffer(global_sum)
+                    self.assertTrue(np.allclose(
+                        self.data.std(axis=axis),
+                        self.mpi_array.std(axis=axis)))
+                    self.assertTrue(np.allclose(
+                        self.data.mean(axis=axis),
+                        self.mpi_array.mean(axis=axis)))
+                collected_data = self.mpi_array.collect_data()
+                self.assertTrue(np.alltrue(self.data == collected_data))
+                release_buffer(collected_data)
+            stats = pool.stats()
+        self.assertTrue(stats['misses'] > 0)
+        self.assertTrue(stats['hits'] >= stats['misses'])
+        self.assertEqual(0, pool.bytes_held)
+
+
+class BufferPoolBlockBlockTest(BufferPoolDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Block-Block distribution
+        parms['dist'] = 'bb'
+        return parms
+
+
+class BufferPoolBlockCyclicTest(BufferPoolDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Block-Cyclic distribution
+        parms['dist'] = 'bc'
+        return parms
+
+
+if __name__ == '__main__':
+    unittest.main()
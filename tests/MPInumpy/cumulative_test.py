@@ -0,0 +1,165 @@
+import unittest
+import numpy as np
+from mpi4py import MPI
+import mpids.MPInumpy as mpi_np
+from mpids.MPInumpy.errors import NotSupportedError, ValueError
+from mpids.MPInumpy.distributions.Replicated import Replicated
+
+
+class CumulativeDefaultTest(unittest.TestCase):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        # Default distribution
+        parms['dist'] = 'b'
+        #Axes scanned without restrictions
+        parms['axes'] = [None, 0, 1, 2, -1]
+        parms['data'] = np.arange(105, dtype=np.float64).reshape(7,5,3) % 4 + 1
+        return parms
+
+
+    def setUp(self):
+        parms = self.create_setUp_parms()
+        self.comm = parms.get('comm')
+        self.dist = parms.get('dist')
+        self.axes = parms.get('axes')
+        self.data = parms.get('data')
+        self.functions = {'cummax': np.maximum.accumulate,
+                          'cummin': np.minimum.accumulate,
+                          'cumprod': np.cumprod,
+                          'cumsum': np.cumsum,
+                          'nancumprod': np.nancumprod,
+                          'nancumsum': np.nancumsum}
+
+        self.mpi_array = mpi_np.array(self.data, comm=self.comm, dist=self.dist)
+
+
+    def numpy_scan(self, name, data, axis):
+        if axis is None:
+            data, axis = data.ravel(), 0
+        return self.functions[name](data, axis=axis)
+
+
+    def collect(self, mpi_array):
+        return np.asarray(mpi_array.collect_data())
+
+
+    def test_scans_match_numpy(self):
+        for name in self.functions:
+            for axis in self.axes:
+                result = getattr(mpi_np, name)(self.mpi_array, axis=axis)
+                self.assertTrue(isinstance(result, type(self.mpi_array)))
+                self.assertEqual(self.dist, result.dist)
+                self.assertTrue(np.allclose(self.numpy_scan(name, self.data, axis),
+                                            self.collect(result)))
+
+
+    def test_scans_propagate_and_skip_nans(self):
+        nan_data = self.data.copy()
+        nan_data[1, 2, 0] = np.nan
+        nan_array = mpi_np.array(nan_data, comm=self.comm, dist=self.dist)
+        for name in self.functions:
+            for axis in self.axes:
+                result = getattr(mpi_np, name)(nan_array, axis=axis)
+                self.assertTrue(np.allclose(self.numpy_scan(name, nan_data, axis),
+                                            self.collect(result),
+                                            equal_nan=True))
+
+
+    def test_scan_methods_and_numpy_functions(self):
+        axis = self.axes[-1]
+        self.assertTrue(np.alltrue(self.data.cumsum(axis=axis) ==
+                                   self.collect(self.mpi_array.cumsum(axis=axis))))
+        self.assertTrue(np.alltrue(self.data.cumprod(axis=axis) ==
+                                   self.collect(np.cumprod(self.mpi_array,
+                                                           axis=axis))))
+        int_result = mpi_np.cumsum(self.mpi_array.astype(np.int32),
+                                   axis=axis, dtype=np.int64)
+        self.assertEqual(np.int64, int_result.dtype)
+
+
+    def test_unsupported_functionality(self):
+        with self.assertRaises(ValueError):
+            mpi_np.cumsum(self.mpi_array, axis=self.data.ndim)
+
+        #Use of 'out' field
+        mpi_out = np.zeros(())
+        with self.assertRaises(NotSupportedError):
+            mpi_np.cumsum(self.mpi_array, out=mpi_out)
+
+
+class CumulativeBlockBlockTest(CumulativeDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Block-Block distribution
+        parms['dist'] = 'bb'
+        parms['axes'] = [2, -1]
+        return parms
+
+
+    def test_scans_along_partitioned_axes_not_supported(self):
+        for axis in [None, 0, 1]:
+            with self.assertRaises(NotSupportedError):
+                mpi_np.cumsum(self.mpi_array, axis=axis)
+
+
+class CumulativeBlockCyclicTest(CumulativeDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Block-Cyclic distribution
+        parms['dist'] = 'bc'
+        parms['axes'] = [1, 2, -1]
+        return parms
+
+
+    def test_scans_along_partitioned_axes_not_supported(self):
+        for axis in [None, 0]:
+            with self.assertRaises(NotSupportedError):
+                mpi_np.cumsum(self.mpi_array, axis=axis)
+
+
+class CumulativeReplicatedTest(CumulativeDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Replicated distribution
+        parms['dist'] = 'r'
+        return parms
+
+
+    def collect(self, mpi_array):
+        self.assertTrue(isinstance(mpi_array, Replicated))
+        return np.asarray(mpi_array)
+
+
+class CumulativeBlockTest(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = MPI.COMM_WORLD
+        self.size = self.comm.Get_size()
+
+
+    def test_flattened_scan_keeps_local_elements(self):
+        data = np.arange(12).reshape(6, 2)
+        mpi_array = mpi_np.array(data, comm=self.comm, dist='b')
+        result = mpi_np.cumsum(mpi_array)
+
+        self.assertEqual((data.size,), result.globalshape)
+        self.assertEqual(mpi_array.size, result.size)
+        self.assertTrue(np.alltrue(np.cumsum(data) == result.collect_data()))
+
+
+    def test_scan_with_processes_holding_no_data(self):
+        data = np.arange(1, self.size - 1 + 1, dtype=np.int64)
+        mpi_array = mpi_np.array(data, comm=self.comm, dist='b')
+        self.assertTrue(np.alltrue(np.cumprod(data) ==
+                                   mpi_np.cumprod(mpi_array).collect_data()))
+        self.assertTrue(np.alltrue(np.minimum.accumulate(data) ==
+                                   mpi_np.cummin(mpi_array).collect_data()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import unittest
+import numpy as np
+from mpi4py import MPI
+import mpids.MPInumpy as mpi_np
+from mpids.MPInumpy.futures import *
+from mpids.MPInumpy.distributions.Replicated import Replicated
+
+
+class MPIFutureTest(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = MPI.COMM_WORLD
+        self.rank = self.comm.Get_rank()
+        self.size = self.comm.Get_size()
+
+
+    def test_completed_futures_apply_callbacks_immediately(self):
+        future = MPIFuture(result=2)
+        self.assertTrue(future.test())
+        self.assertTrue(future.then(lambda result: result * 3) is future)
+        self.assertEqual(6, future.wait())
+        self.assertEqual(6, future.wait())
+
+
+    def test_callbacks_are_applied_in_order_on_completion(self):
+        data = np.array(self.rank + 1, dtype=np.int64)
+        future = MPIFuture([self.comm.Iallreduce(MPI.IN_PLACE, data,
+                                                 op=MPI.SUM)],
+                           result=data)
+        future.then(lambda result: result * 2).then(lambda result: result + 1)
+        #Progress until completed without blocking
+        while not future.test():
+            pass
+        self.assertEqual(self.size * (self.size + 1) + 1, future.wait())
+
+
+    def test_wait_all_completes_futures_together(self):
+        first = np.array(self.rank, dtype=np.int64)
+        second = np.array([self.rank] * 2, dtype=np.float64)
+        futures = [
+            MPIFuture([self.comm.Iallreduce(MPI.IN_PLACE, first, op=MPI.MAX)],
+                      result=first),
+            MPIFuture([self.comm.Iallreduce(MPI.IN_PLACE, second,
+                                            op=MPI.SUM)],
+                      result=second).then(lambda result: result.sum()),
+            MPIFuture(result='done')]
+        results = wait_all(futures)
+        self.assertEqual(self.size - 1, results[0])
+        self.assertEqual(self.size * (self.size - 1), results[1])
+        self.assertEqual('done', results[2])
+        self.assertTrue(all(future.test() for future in futures))
+
+
+class MPIArrayFuturesDefaultTest(unittest.TestCase):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        # Default distribution
+        parms['dist'] = 'b'
+        parms['data'] = np.arange(40, dtype=np.float64).reshape(8, 5)
+        return parms
+
+
+    def setUp(self):
+        parms = self.create_setUp_parms()
+        self.comm = parms.get('comm')
+        self.dist = parms.get('dist')
+        self.data = parms.get('data')
+        self.mpi_array = mpi_np.array(self.data, comm=self.comm, dist=self.dist)
+
+
+    def test_sum_async_matches_blocking_sum(self):
+        for axis in [None, 0, 1]:
+            future = self.mpi_array.sum_async(axis=axis)
+            self.assertTrue(isinstance(future, MPIFuture))
+            global_sum = future.wait()
+            self.assertTrue(isinstance(global_sum, Replicated))
+            self.assertTrue(np.allclose(self.data.sum(axis=axis), global_sum))
+
+        if self.dist != 'r':
+            distributed_sum = \
+                self.mpi_array.sum_async(axis=1, keep_distributed=True).wait()
+            self.assertEqual(self.mpi_array.sum(axis=1, keep_distributed=True)
+                                 .layout,
+                             distributed_sum.layout)
+
+
+    def test_sum_async_overlaps_local_work(self):
+        vector = mpi_np.arange(400, dtype=np.float64, comm=self.comm,
+                               dist='b' if self.dist == 'bb' else self.dist)
+        for mpi_array, axis in [(vector, None), (self.mpi_array, None),
+                                (self.mpi_array, 0)]:
+            future = mpi_array.sum_async(axis=axis)
+            #Allocate and compute while the reduction is outstanding
+            local_work = [np.full(1000, -1.) * i for i in range(50)]
+            self.assertTrue(np.allclose(-1225000., sum(local_work).sum()))
+            global_sum = future.wait()
+            self.assertTrue(np.allclose(mpi_array.sum(axis=axis), global_sum))
+
+
+    def test_collect_data_async_matches_blocking_collect_data(self):
+        collected_data = self.mpi_array.collect_data_async().wait()
+        self.assertTrue(isinstance(collected_data, Replicated))
+        self.assertTrue(np.alltrue(self.data == collected_data))
+
+
+    def test_reshape_async_matches_blocking_reshape(self):
+        for shape in [(5, 8), (4, 10), (2, 4, 5)]:
+            reshaped_array = self.mpi_array.reshape_async(shape).wait()
+            expected_array = self.mpi_array.reshape(shape)
+            self.assertTrue(isinstance(reshaped_array, type(expected_array)))
+            self.assertEqual(expected_array.layout, reshaped_array.layout)
+            self.assertTrue(np.alltrue(self.data.reshape(shape) ==
+                                       reshaped_array.collect_data()))
+
+
+    def test_overlapping_operations_complete_with_wait_all(self):
+        global_sum, collected_data, reshaped_array = wait_all(
+            [self.mpi_array.sum_async(axis=0),
+             self.mpi_array.collect_data_async(),
+             self.mpi_array.reshape_async(5, 8)])
+        self.assertTrue(np.allclose(self.data.sum(axis=0), global_sum))
+        self.assertTrue(np.alltrue(self.data == collected_data))
+        self.assertTrue(np.alltrue(self.data.reshape(5, 8) ==
+                                   reshaped_array.collect_data()))
+
+
+class MPIArrayFuturesBlockBlockTest(MPIArrayFuturesDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Block-Block distribution
+        parms['dist'] = 'bb'
+        return parms
+
+
+class MPIArrayFuturesBlockCyclicTest(MPIArrayFuturesDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Block-Cyclic distribution
+        parms['dist'] = 'bc'
+        return parms
+
+
+class MPIArrayFuturesReplicatedTest(MPIArrayFuturesDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Replicated distribution
+        parms['dist'] = 'r'
+        return parms
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import unittest
+import numpy as np
+from mpi4py import MPI
+import mpids.MPInumpy as mpi_np
+from mpids.MPInumpy.errors import NotSupportedError, ValueError
+from mpids.MPInumpy.distributions.Replicated import Replicated
+
+
+class SelectionDefaultTest(unittest.TestCase):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        # Default distribution
+        parms['dist'] = 'b'
+        parms['data'] = np.arange(50, dtype=np.float64).reshape(10,5)
+        return parms
+
+
+    def setUp(self):
+        parms = self.create_setUp_parms()
+        self.comm = parms.get('comm')
+        self.dist = parms.get('dist')
+        self.data = parms.get('data')
+
+        self.mpi_array = mpi_np.array(self.data, comm=self.comm, dist=self.dist)
+
+
+    def collect(self, mpi_array):
+        if isinstance(mpi_array, Replicated):
+            return np.asarray(mpi_array)
+        return np.asarray(mpi_array.collect_data())
+
+
+    def test_take(self):
+        for indices, axis in [([9, 0, 3, 3, -1], 0),
+                              ([[49, 0], [7, 22]], None),
+                              ([4, 0], 1),
+                              (np.array([], dtype=np.int64), 0)]:
+            result = mpi_np.take(self.mpi_array, indices, axis=axis)
+            self.assertEqual(self.dist, result.dist)
+            self.assertTrue(np.alltrue(np.take(self.data, indices, axis=axis) ==
+                                       self.collect(result)))
+
+        with self.assertRaises(IndexError):
+            mpi_np.take(self.mpi_array, [0, 10], axis=0)
+        with self.assertRaises(ValueError):
+            mpi_np.take(self.mpi_array, [0], axis=2)
+
+
+    def test_compress(self):
+        for condition, axis in [(self.data[:, 0] % 20 == 0, 0),
+                                ([True, False, True], 1),
+                                ([True, False, True], None),
+                                (np.zeros(10, dtype=bool), 0)]:
+            result = mpi_np.compress(condition, self.mpi_array, axis=axis)
+            self.assertEqual(self.dist, result.dist)
+            self.assertTrue(np.alltrue(
+                np.compress(condition, self.data, axis=axis) ==
+                self.collect(result)))
+
+        #Numpy raises IndexError for Replicated arrays
+        if self.dist != 'r':
+            with self.assertRaises(ValueError):
+                mpi_np.compress(np.ones(11, dtype=bool), self.mpi_array,
+                                axis=0)
+        with self.assertRaises(NotSupportedError):
+            mpi_np.compress([True], self.mpi_array, out=self.data)
+
+
+class SelectionReplicatedTest(SelectionDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Replicated distribution
+        parms['dist'] = 'r'
+        return parms
+
+
+    def test_take(self):
+        result = mpi_np.take(self.mpi_array, [[49, 0], [7, 22]])
+        self.assertTrue(isinstance(result, Replicated))
+        self.assertTrue(np.alltrue(np.take(self.data, [[49, 0], [7, 22]]) ==
+                                   result))
+
+
+class SelectionBlockTest(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = MPI.COMM_WORLD
+        self.data = np.arange(50).reshape(10,5)
+        self.mpi_array = mpi_np.array(self.data, comm=self.comm, dist='b')
+
+
+    def test_take_with_distributed_indices(self):
+        indices = np.array([8, 1, 5, 5, 2, 0, 9])
+        mpi_indices = mpi_np.array(indices, comm=self.comm, dist='b')
+        result = self.mpi_array.take(mpi_indices, axis=0)
+
+        self.assertEqual(result.globalshape, self.data[indices].shape)
+        #Selected rows are held by the rank holding their indices
+        self.assertTrue(np.alltrue(self.data[np.asarray(mpi_indices)] ==
+                                   np.asarray(result)))
+        self.assertTrue(np.alltrue(self.data[indices] ==
+                                   result.collect_data()))
+
+
+    def test_getitem_with_index_arrays(self):
+        for key, expected in [([1, 7, 2], self.data[[1, 7, 2]]),
+                              (np.array([-1, 0]), self.data[[-1, 0]]),
+                              (mpi_np.array([3, 3, 9], comm=self.comm, dist='b'),
+                               self.data[[3, 3, 9]])]:
+            result = self.mpi_array[key]
+            self.assertEqual('b', result.dist)
+            self.assertTrue(np.alltrue(expected == result.collect_data()))
+
+
+    def test_getitem_with_boolean_masks(self):
+        row_mask = self.data[:, 0] % 20 == 0
+        mask = self.data % 3 == 0
+        for key, expected in [(row_mask, self.data[row_mask]),
+                              (list(row_mask), self.data[row_mask]),
+                              (mpi_np.array(row_mask, comm=self.comm, dist='b'),
+                               self.data[row_mask]),
+                              (mask, self.data[mask]),
+                              (self.mpi_array % 3 == 0, self.data[mask])]:
+            result = self.mpi_array[key]
+            self.assertEqual('b', result.dist)
+            self.assertEqual(result.globalshape, expected.shape)
+            self.assertTrue(np.alltrue(expected == result.collect_data()))
+
+        with self.assertRaises(IndexError):
+            self.mpi_array[mask[:, :2]]
+
+
+    def test_compressed_results_keep_local_data(self):
+        condition = self.data[:, 0] % 20 == 0
+        result = self.mpi_array.compress(condition, axis=0)
+        local_condition = condition[self.mpi_array.layout.rank_slices()[0]]
+        self.assertTrue(np.alltrue(np.asarray(self.mpi_array)[local_condition] ==
+                                   np.asarray(result)))
+
+        result = mpi_np.compress(condition, self.mpi_array, axis=0,
+                                 rebalance=True)
+        self.assertEqual(result.layout,
+                         mpi_np.array(self.data[condition], comm=self.comm,
+                                      dist='b').layout)
+        self.assertTrue(np.alltrue(self.data[condition] ==
+                                   result.collect_data()))
+
+
+if __name__ == '__main__':
+    unittest.main()
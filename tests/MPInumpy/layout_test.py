@@ -0,0 +1,446 @@
+import unittest
+import numpy as np
+from mpi4py import MPI
+import mpids.MPInumpy as mpi_np
+from mpids.MPInumpy.distributions import Block, BlockBlock, BlockCyclic
+from mpids.MPInumpy.errors import NotSupportedError, ValueError
+from mpids.MPInumpy.layout import *
+from mpids.MPInumpy.utils import determine_local_shape_and_mapping, \
+                                 get_block_cyclic_indices,          \
+                                 get_cart_coords,                   \
+                                 get_comm_dims,                     \
+                                 get_weighted_block_indices
+
+
+class LayoutDefaultTest(unittest.TestCase):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        parms['dist'] = 'b'
+        parms['globalshape'] = (7, 3)
+        return parms
+
+
+    def setUp(self):
+        parms = self.create_setUp_parms()
+        self.comm = parms.get('comm')
+        self.dist = parms.get('dist')
+        self.globalshape = parms.get('globalshape')
+        self.procs = self.comm.Get_size()
+        self.rank = self.comm.Get_rank()
+        self.layout = get_layout(self.globalshape, self.dist, comm=self.comm)
+
+
+    def test_global_properties(self):
+        self.assertEqual(self.globalshape, self.layout.globalshape)
+        self.assertEqual(int(np.prod(self.globalshape)), self.layout.globalsize)
+        self.assertEqual(len(self.globalshape), self.layout.globalndim)
+        self.assertEqual(self.dist, self.layout.dist)
+        self.assertEqual(self.comm, self.layout.comm)
+
+
+    def test_local_properties_match_legacy_mapping(self):
+        comm_dims = get_comm_dims(self.procs, self.dist)
+        comm_coord = get_cart_coords(comm_dims, self.procs, self.rank)
+        local_shape, local_to_global = \
+            determine_local_shape_and_mapping(self.globalshape,
+                                              self.dist,
+                                              comm_dims,
+                                              comm_coord)
+
+        self.assertEqual(comm_dims, self.layout.comm_dims)
+        self.assertEqual(comm_coord, self.layout.comm_coord)
+        self.assertEqual(tuple(local_shape), self.layout.local_shape)
+        self.assertEqual(local_to_global, self.layout.local_to_global)
+
+
+    def test_rank_shapes_cover_global_shape(self):
+        rank_shapes = self.layout.rank_shapes
+        self.assertEqual((self.procs, len(self.globalshape)), rank_shapes.shape)
+        self.assertEqual(self.layout.globalsize, self.layout.rank_sizes.sum())
+        self.assertEqual(self.layout.local_shape,
+                         tuple(rank_shapes[self.rank]))
+
+
+    def test_gather_counts_are_computed_once(self):
+        counts, displacements = self.layout.gather_counts()
+        self.assertEqual(np.int32, counts.dtype)
+        self.assertTrue(np.array_equal(self.layout.rank_sizes, counts))
+        self.assertTrue(np.array_equal(np.cumsum(counts) - counts,
+                                       displacements))
+        self.assertTrue(counts is self.layout.gather_counts()[0])
+
+
+    def test_layout_is_cached_and_immutable(self):
+        self.assertTrue(self.layout is
+                        get_layout(self.globalshape, self.dist, comm=self.comm))
+        self.assertTrue(self.layout is
+                        get_layout(list(self.globalshape), self.dist,
+                                   comm=self.comm))
+        self.assertFalse(self.layout.rank_extents.flags.writeable)
+        with self.assertRaises(AttributeError):
+            self.layout.globalshape = (1,)
+
+
+    def test_layout_caches_follow_communicators(self):
+        dup_comm = self.comm.Dup()
+        dup_layout = get_layout(self.globalshape, self.dist, comm=dup_comm)
+        self.assertFalse(self.layout is dup_layout)
+        self.assertTrue(dup_layout is
+                        get_layout(self.globalshape, self.dist,
+                                   comm=MPI.Intracomm(dup_comm)))
+
+        #Handles of freed communicators may be reused by new ones
+        dup_comm.Free()
+        new_comm = self.comm.Dup()
+        new_layout = get_layout(self.globalshape, self.dist, comm=new_comm)
+        self.assertFalse(new_layout is dup_layout)
+        self.assertTrue(new_layout.comm is new_comm)
+        new_comm.Free()
+
+
+    def test_layout_equality(self):
+        other_shape = tuple(dim + 1 for dim in self.globalshape)
+        other_layout = get_layout(other_shape, self.dist, comm=self.comm)
+        self.assertEqual(self.layout, self.layout)
+        self.assertNotEqual(self.layout, other_layout)
+        self.assertEqual(hash(self.layout),
+                         hash(get_layout(self.globalshape, self.dist,
+                                         comm=self.comm)))
+
+
+    def test_drop_axis(self):
+        axis = len(self.globalshape) - 1
+        comm_dims = self.layout.comm_dims
+        if comm_dims is None or axis < len(comm_dims):
+            with self.assertRaises(ValueError):
+                self.layout.drop_axis(axis)
+            return
+
+        reduced_layout = self.layout.drop_axis(axis)
+        self.assertEqual(self.globalshape[:axis], reduced_layout.globalshape)
+        self.assertEqual(self.layout.local_shape[:axis],
+                         reduced_layout.local_shape)
+        self.assertEqual(self.layout.block_size, reduced_layout.block_size)
+        self.assertTrue(np.array_equal(self.layout.axis_indices(0),
+                                       reduced_layout.axis_indices(0)))
+        with self.assertRaises(ValueError):
+            self.layout.drop_axis(0)
+
+
+    def test_ravel(self):
+        if self.dist != 'b':
+            with self.assertRaises(NotSupportedError):
+                self.layout.ravel()
+            return
+
+        flat_layout = self.layout.ravel()
+        self.assertEqual((self.layout.globalsize,), flat_layout.globalshape)
+        self.assertEqual((int(self.layout.rank_sizes[self.rank]),),
+                         flat_layout.local_shape)
+        self.assertTrue(np.array_equal(self.layout.local_offsets(),
+                                       flat_layout.local_offsets()))
+
+
+    def test_broadcast_layout(self):
+        shape = self.globalshape if self.rank == 0 else None
+        self.assertTrue(self.layout is
+                        broadcast_layout(shape, self.dist,
+                                         comm=self.comm, root=0))
+
+
+    def test_created_arrays_share_layout(self):
+        mpi_array = mpi_np.zeros(self.globalshape, dist=self.dist)
+        self.assertTrue(mpi_array.layout is self.layout)
+        self.assertEqual(self.layout.local_shape, mpi_array.shape)
+        self.assertEqual(self.layout.comm_dims, mpi_array.comm_dims)
+        self.assertEqual(self.layout.comm_coord, mpi_array.comm_coord)
+        self.assertEqual(self.layout.local_to_global,
+                         mpi_array.local_to_global)
+        self.assertEqual(self.globalshape, mpi_array.globalshape)
+        self.assertEqual(mpi_array.globalsize * mpi_array.itemsize,
+                         mpi_array.globalnbytes)
+
+
+class LayoutReplicatedTest(LayoutDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        parms['dist'] = 'r'
+        parms['globalshape'] = (7, 3)
+        return parms
+
+
+    def test_local_properties_match_legacy_mapping(self):
+        self.assertTrue(self.layout.comm_dims is None)
+        self.assertTrue(self.layout.comm_coord is None)
+        self.assertTrue(self.layout.local_to_global is None)
+        self.assertEqual(self.globalshape, self.layout.local_shape)
+
+
+    def test_rank_shapes_cover_global_shape(self):
+        rank_shapes = self.layout.rank_shapes
+        self.assertEqual((self.procs, len(self.globalshape)), rank_shapes.shape)
+        for rank_shape in rank_shapes:
+            self.assertEqual(self.globalshape, tuple(rank_shape))
+
+
+class LayoutBlockBlockTest(LayoutDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        parms['dist'] = 'bb'
+        parms['globalshape'] = (7, 3)
+        return parms
+
+
+    def test_rank_slices_cover_global_shape(self):
+        covered = np.zeros(self.globalshape, dtype=np.int64)
+        for rank in range(self.procs):
+            covered[self.layout.rank_slices(rank)] += 1
+        self.assertTrue(np.all(covered == 1))
+
+
+    def test_owners_of_global_offsets(self):
+        global_offsets = np.arange(self.layout.globalsize)
+        owners = self.layout.owners(global_offsets)
+        expected_owners = np.empty(self.globalshape, dtype=np.int64)
+        for rank in range(self.procs):
+            expected_owners[self.layout.rank_slices(rank)] = rank
+        self.assertTrue(np.array_equal(expected_owners.ravel(), owners))
+
+
+    def test_one_dimensional_shape_not_supported(self):
+        with self.assertRaises(NotSupportedError):
+            get_layout((7,), self.dist, comm=self.comm)
+
+
+class LayoutBlockCyclicTest(LayoutDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        parms['dist'] = 'bc'
+        parms['globalshape'] = (11, 3)
+        return parms
+
+
+    def test_local_properties_match_legacy_mapping(self):
+        local_rows = get_block_cyclic_indices(self.globalshape[0], self.procs,
+                                              self.rank, DEFAULT_BLOCK_SIZE)
+        self.assertEqual([self.procs], self.layout.comm_dims)
+        self.assertEqual([self.rank], self.layout.comm_coord)
+        self.assertEqual((local_rows.size, 3), self.layout.local_shape)
+        self.assertTrue(np.array_equal(local_rows,
+                                       self.layout.axis_indices(0)))
+        self.assertEqual({0: (int(local_rows[0]), int(local_rows[-1]) + 1),
+                          1: (0, 3)}, self.layout.local_to_global)
+
+
+    def test_block_size_distinguishes_layouts(self):
+        self.assertEqual(DEFAULT_BLOCK_SIZE, self.layout.block_size)
+        other_layout = get_layout(self.globalshape, self.dist,
+                                  comm=self.comm, block_size=2)
+        self.assertEqual(2, other_layout.block_size)
+        self.assertNotEqual(self.layout, other_layout)
+        self.assertTrue(other_layout is
+                        get_layout(self.globalshape, self.dist,
+                                   comm=self.comm, block_size=2))
+        with self.assertRaises(ValueError):
+            get_layout(self.globalshape, self.dist, comm=self.comm,
+                       block_size=0)
+
+
+    def test_owners_of_global_offsets(self):
+        layout = get_layout(self.globalshape, self.dist, comm=self.comm,
+                            block_size=2)
+        owners = layout.owners(np.arange(layout.globalsize))
+        expected_owners = np.empty(self.globalshape, dtype=np.int64)
+        for rank in range(self.procs):
+            expected_owners[layout.rank_index(rank)] = rank
+        self.assertTrue(np.array_equal(expected_owners.ravel(), owners))
+
+
+    def test_cyclic_distribution_balances_triangular_work(self):
+        #Work of row i of a lower triangular matrix is proportional to i
+        row_work = np.arange(64)
+        block_layout = get_layout((64, 64), 'b', comm=self.comm)
+        cyclic_layout = get_layout((64, 64), self.dist, comm=self.comm)
+        block_work = [row_work[block_layout.axis_indices(0, rank)].sum()
+                      for rank in range(self.procs)]
+        cyclic_work = [row_work[cyclic_layout.axis_indices(0, rank)].sum()
+                       for rank in range(self.procs)]
+        self.assertLessEqual(max(cyclic_work) - min(cyclic_work),
+                             max(block_work) - min(block_work))
+        self.assertLessEqual(max(cyclic_work) - min(cyclic_work),
+                             64 // self.procs * (self.procs - 1))
+
+
+class WeightedLayoutTest(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = MPI.COMM_WORLD
+        self.procs = self.comm.Get_size()
+        self.rank = self.comm.Get_rank()
+        #Last rank is weighted as 3 times faster than the others
+        self.weights = [1] * (self.procs - 1) + [3]
+        self.globalshape = (2 * sum(self.weights), 3)
+        self.layout = get_layout(self.globalshape, 'b', comm=self.comm,
+                                 weights=self.weights)
+
+
+    def test_extents_proportional_to_weights(self):
+        expected_rows = get_weighted_block_indices(self.globalshape[0],
+                                                   self.weights)
+        self.assertTrue(np.array_equal(expected_rows,
+                                       self.layout.partitions(0)))
+        self.assertEqual(tuple(expected_rows[self.rank]),
+                         self.layout.local_to_global[0])
+        self.assertEqual((0, 3), self.layout.local_to_global[1])
+        self.assertAlmostEqual(1., sum(self.layout.weights))
+        #Imbalance is relative to the shares of the weights
+        self.assertAlmostEqual(1., self.layout.imbalance)
+        even_layout = get_layout(self.globalshape, 'b', comm=self.comm)
+        self.assertIsNone(even_layout.weights)
+        if self.procs > 1:
+            self.assertNotEqual(even_layout, self.layout)
+            self.assertGreater(Layout(even_layout.globalshape, 'b', self.comm,
+                                      even_layout.comm_dims,
+                                      even_layout.comm_coord,
+                                      even_layout.rank_extents,
+                                      weights=self.layout.weights).imbalance,
+                               1.)
+
+
+    def test_weighted_layouts_are_cached(self):
+        self.assertTrue(self.layout is
+                        get_layout(self.globalshape, 'b', comm=self.comm,
+                                   weights=self.weights))
+        #Weights are normalized
+        self.assertTrue(self.layout is
+                        get_layout(self.globalshape, 'b', comm=self.comm,
+                                   weights=2 * np.array(self.weights)))
+        self.assertEqual(self.layout.weights, self.layout.drop_axis(1).weights)
+        self.assertEqual(self.layout.weights, self.layout.ravel().weights)
+
+
+    def test_invalid_weights(self):
+        with self.assertRaises(NotSupportedError):
+            get_layout((12, 3), 'bb', comm=self.comm, weights=self.weights)
+        with self.assertRaises(ValueError):
+            get_layout((12, 3), 'b', comm=self.comm,
+                       weights=self.weights + [1])
+        with self.assertRaises(ValueError):
+            get_layout((12, 3), 'b', comm=self.comm,
+                       weights=[-1] * self.procs)
+        with self.assertRaises(ValueError):
+            get_layout((12, 3), 'b', comm=self.comm, weights=[0] * self.procs)
+
+
+    def test_measure_weights(self):
+        weights = measure_weights(comm=self.comm, size=1024, repetitions=2)
+        self.assertEqual((self.procs,), weights.shape)
+        self.assertTrue(np.all(weights > 0))
+        self.assertAlmostEqual(1., weights.mean())
+        #All ranks agree on weights
+        self.assertTrue(np.array_equal(weights,
+                                       self.comm.bcast(weights, root=0)))
+        layout = get_layout((12, 3), 'b', comm=self.comm, weights=weights)
+        self.assertEqual(12, layout.partitions(0)[-1][1])
+        with self.assertRaises(ValueError):
+            measure_weights(comm=self.comm, repetitions=0)
+
+
+class RedistributeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = MPI.COMM_WORLD
+        self.rank = self.comm.Get_rank()
+        self.data = np.arange(42).reshape(7, 6)
+
+
+    def test_redistribute_between_layouts(self):
+        for current_dist, desired_dist in [('b', 'bb'), ('bb', 'b'),
+                                           ('bb', 'bb'), ('b', 'bc'),
+                                           ('bc', 'bb'), ('b', 'b')]:
+            current_layout = get_layout((7, 6), current_dist, comm=self.comm)
+            desired_layout = get_layout((6, 7), desired_dist, comm=self.comm)
+            local_data = self.data[current_layout.rank_index()]
+            redistributed_data = \
+                redistribute(local_data, current_layout, desired_layout)
+            self.assertEqual(desired_layout.local_shape,
+                             redistributed_data.shape)
+            self.assertTrue(np.array_equal(
+                self.data.reshape(6, 7)[desired_layout.rank_index()],
+                redistributed_data))
+
+
+class GatherLayoutTest(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = MPI.COMM_WORLD
+        self.procs = self.comm.Get_size()
+        self.rank = self.comm.Get_rank()
+
+
+    def test_gather_layout_matches_block_layout(self):
+        layout = get_layout((7, 3), 'b', comm=self.comm)
+        gathered_layout = gather_layout(layout.local_shape, 'b', comm=self.comm)
+        self.assertEqual(layout, gathered_layout)
+        self.assertEqual(layout.local_to_global,
+                         gathered_layout.local_to_global)
+
+
+    def test_gather_layout_with_uneven_and_empty_blocks(self):
+        #Rank r holds r rows of data
+        local_shape = (self.rank, 2)
+        layout = gather_layout(local_shape, 'b', comm=self.comm)
+        global_rows = sum(range(self.procs))
+        local_start = sum(range(self.rank))
+
+        self.assertEqual((global_rows, 2), layout.globalshape)
+        self.assertEqual(local_shape, layout.local_shape)
+        self.assertEqual({0: (local_start, local_start + self.rank),
+                          1: (0, 2)}, layout.local_to_global)
+        #Largest block holds twice the mean number of rows
+        self.assertAlmostEqual(2. if self.procs > 1 else 1., layout.imbalance)
+
+
+    def test_gather_layout_with_specified_global_starts(self):
+        #Column blocks of width 2 specified by local_to_global
+        local_shape = (3, 2)
+        local_to_global = {0: (0, 3), 1: (2 * self.rank, 2 * self.rank + 2)}
+        layout = gather_layout(local_shape, 'b', comm=self.comm,
+                               local_to_global=local_to_global)
+
+        self.assertEqual((3, 2 * self.procs), layout.globalshape)
+        self.assertEqual(local_to_global, layout.local_to_global)
+        self.assertEqual(2 * self.procs, layout.partitions(axis=1)[-1][1])
+
+
+    def test_block_global_metadata_resolved_at_construction(self):
+        local_data = np.arange(2 * self.rank).reshape(self.rank, 2)
+        mpi_array = Block(local_data, comm=self.comm)
+
+        self.assertTrue(mpi_array.layout is not None)
+        self.assertEqual((sum(range(self.procs)), 2), mpi_array.globalshape)
+        self.assertEqual(2 * sum(range(self.procs)), mpi_array.globalsize)
+        self.assertEqual(mpi_array.globalsize * mpi_array.itemsize,
+                         mpi_array.globalnbytes)
+        self.assertEqual(2, mpi_array.globalndim)
+
+
+    def test_block_block_global_metadata_resolved_at_construction(self):
+        layout = get_layout((5, 6), 'bb', comm=self.comm)
+        mpi_array = BlockBlock(np.zeros(layout.local_shape), comm=self.comm)
+
+        self.assertEqual(layout, mpi_array.layout)
+        self.assertEqual((5, 6), mpi_array.globalshape)
+        self.assertEqual(layout.local_to_global, mpi_array.local_to_global)
+
+
+if __name__ == '__main__':
+    unittest.main()
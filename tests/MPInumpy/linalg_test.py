@@ -1,8 +1,10 @@
+import itertools
 import unittest
 import numpy as np
 from mpi4py import MPI
 import mpids.MPInumpy as mpi_np
-from mpids.MPInumpy.errors import NotSupportedError
+from mpids.MPInumpy.distributions import Block, BlockBlock, Replicated
+from mpids.MPInumpy.errors import LinAlgError, NotSupportedError, ValueError
 
 class LinAlgTest(unittest.TestCase):
 
@@ -71,7 +73,7 @@ class LinAlgTest(unittest.TestCase):
                      "Functionality missing from numpy version")
     def test_under_partitioned_block_distribution_matmul(self):
         #Current version of code will under partition a 2x8 matrix.
-        #Want to make sure logic is sound with petsc4py.
+        #Want to make sure logic is sound with empty blocks.
         np_8x2_array = self.np_array_a.reshape(8,2)
         np_2x8_array = self.np_array_b.reshape(2,8)
         mpi_array_a = mpi_np.array(np_8x2_array, dist='b')
@@ -86,5 +88,489 @@ class LinAlgTest(unittest.TestCase):
             mpi_np.matmul(mpi_array_a, mpi_array_b)))
 
 
+
+class DistributedMatmulTest(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = MPI.COMM_WORLD
+        self.rank = self.comm.Get_rank()
+        self.procs = self.comm.Get_size()
+        self.np_array_a = np.arange(35, dtype=np.float64).reshape(7,5) / 7
+        self.np_array_b = np.arange(30, dtype=np.float64).reshape(5,6) - 9
+
+
+    def check_product(self, expected, mpi_result, dist_class=Block):
+        self.assertTrue(isinstance(mpi_result, dist_class))
+        self.assertEqual(expected.shape, mpi_result.globalshape)
+        self.assertEqual(mpi_result.layout.local_shape, mpi_result.shape)
+        self.assertTrue(np.allclose(expected, mpi_result.collect_data()))
+
+
+    def test_block_and_replicated_operands(self):
+        expected = np.matmul(self.np_array_a, self.np_array_b)
+        mpi_array_a = mpi_np.array(self.np_array_a, dist='b')
+        mpi_array_b = mpi_np.array(self.np_array_b, dist='b')
+        replicated_a = mpi_np.array(self.np_array_a, dist='r')
+        replicated_b = mpi_np.array(self.np_array_b, dist='r')
+
+        #Local product keeps the rows of a
+        result = mpi_np.matmul(mpi_array_a, replicated_b)
+        self.check_product(expected, result)
+        self.assertEqual(mpi_array_a.local_to_global[0],
+                         result.local_to_global[0])
+        self.check_product(expected, mpi_np.matmul(replicated_a, mpi_array_b))
+        self.check_product(
+            np.matmul(self.np_array_a, self.np_array_b[:, 0]),
+            mpi_np.matmul(mpi_array_a, replicated_b[:, 0]))
+        self.check_product(
+            np.matmul(self.np_array_a[0], self.np_array_b),
+            mpi_np.matmul(replicated_a[0], mpi_array_b))
+
+
+    def test_all_distribution_pairs(self):
+        expected = np.matmul(self.np_array_a, self.np_array_b)
+        for dist_a, dist_b in itertools.product(['b', 'bb', 'bc', 'r'],
+                                                repeat=2):
+            if dist_a == dist_b == 'r':
+                continue
+            mpi_array_a = mpi_np.array(self.np_array_a, dist=dist_a)
+            mpi_array_b = mpi_np.array(self.np_array_b, dist=dist_b)
+            dist_class = BlockBlock if dist_a == dist_b == 'bb' else Block
+            self.check_product(expected,
+                               mpi_np.matmul(mpi_array_a, mpi_array_b),
+                               dist_class)
+
+
+    def test_summa_partitions_of_block_block_operands(self):
+        mpi_array_a = mpi_np.array(self.np_array_a, dist='bb')
+        mpi_array_b = mpi_np.array(self.np_array_b, dist='bb')
+        result = mpi_np.matmul(mpi_array_a, mpi_array_b)
+        self.assertEqual(mpi_np.zeros((7, 6), dist='bb').layout, result.layout)
+        row_start, row_end = mpi_array_a.local_to_global[0]
+        col_start, col_end = mpi_array_b.local_to_global[1]
+        self.assertTrue(np.allclose(
+            np.matmul(self.np_array_a, self.np_array_b)[row_start:row_end,
+                                                       col_start:col_end],
+            result))
+
+
+    def test_unevenly_partitioned_block_operands(self):
+        #Rows held by the first and last ranks only
+        mpi_array_a = mpi_np.array(self.np_array_a, dist='b')
+        selected_a = mpi_array_a[[0, 1, 6, 2, 5]]
+        weights = [1] * (self.procs - 1) + [4]
+        weighted_b = mpi_np.array(self.np_array_b, weights=weights)
+        expected = np.matmul(self.np_array_a[[0, 1, 6, 2, 5]],
+                             self.np_array_b)
+
+        self.check_product(expected, mpi_np.matmul(selected_a, weighted_b))
+        self.check_product(expected.T @ expected,
+                           mpi_np.matmul(mpi_np.matmul(selected_a,
+                                                       weighted_b).T,
+                                         mpi_np.matmul(selected_a,
+                                                       weighted_b)))
+
+
+    def test_integer_and_mixed_dtype_operands(self):
+        np_array_a = np.arange(20).reshape(4,5)
+        mpi_array_a = mpi_np.array(np_array_a, dist='b')
+        mpi_array_b = mpi_np.array(self.np_array_b, dist='b')
+        result = mpi_np.matmul(mpi_array_a, mpi_array_a.T)
+        self.assertEqual(np_array_a.dtype, result.dtype)
+        self.assertTrue(np.alltrue(np.matmul(np_array_a, np_array_a.T) ==
+                                   result.collect_data()))
+        self.check_product(np.matmul(np_array_a, self.np_array_b),
+                           mpi_np.matmul(mpi_array_a, mpi_array_b))
+
+
+    def test_invalid_operands(self):
+        mpi_array_a = mpi_np.array(self.np_array_a, dist='b')
+        with self.assertRaises(ValueError):
+            mpi_np.matmul(mpi_array_a, mpi_array_a)
+        with self.assertRaises(NotSupportedError):
+            mpi_np.matmul(mpi_np.arange(5), mpi_array_a.T)
+
+
+class LinAlgSolversDefaultTest(unittest.TestCase):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        # Default distribution
+        parms['dist'] = 'b'
+        #Symmetric positive definite system
+        random = np.random.RandomState(0)
+        factor = random.rand(10, 10)
+        parms['matrix'] = factor @ factor.T + 10 * np.eye(10)
+        parms['rhs'] = random.rand(10, 3)
+        return parms
+
+
+    def setUp(self):
+        parms = self.create_setUp_parms()
+        self.comm = parms.get('comm')
+        self.dist = parms.get('dist')
+        self.matrix = parms.get('matrix')
+        self.rhs = parms.get('rhs')
+        self.mpi_matrix = mpi_np.array(self.matrix, comm=self.comm,
+                                       dist=self.dist)
+        self.mpi_rhs = mpi_np.array(self.rhs, comm=self.comm, dist=self.dist)
+        #Block-Block distribution requires 2 or more dimensions
+        self.mpi_vector = mpi_np.array(self.rhs[:, 0], comm=self.comm,
+                                       dist='b' if self.dist == 'bb' \
+                                            else self.dist)
+
+
+    def assert_solution(self, np_result, mpi_result):
+        self.assertTrue(isinstance(mpi_result, Block))
+        self.assertEqual(np_result.shape, mpi_result.globalshape)
+        self.assertTrue(np.allclose(np_result, mpi_result.collect_data()))
+
+
+    def test_solve(self):
+        self.assert_solution(np.linalg.solve(self.matrix, self.rhs),
+                             mpi_np.linalg.solve(self.mpi_matrix,
+                                                 self.mpi_rhs))
+        self.assert_solution(np.linalg.solve(self.matrix, self.rhs[:, 0]),
+                             mpi_np.linalg.solve(self.mpi_matrix,
+                                                 self.mpi_vector))
+        self.assert_solution(np.linalg.solve(self.matrix, self.rhs),
+                             mpi_np.linalg.solve(self.mpi_matrix, self.rhs))
+
+        #Pivoting required by zeros on the diagonal
+        permuted = np.roll(np.diag(np.arange(1., 11.)), 1, axis=0) + \
+                   np.triu(self.matrix, 2)
+        self.assert_solution(np.linalg.solve(permuted, self.rhs),
+                             mpi_np.linalg.solve(
+                                 mpi_np.array(permuted, comm=self.comm,
+                                              dist=self.dist),
+                                 self.mpi_rhs))
+
+
+    def test_lstsq(self):
+        a = self.matrix[:, :4]
+        mpi_a = mpi_np.array(a, comm=self.comm, dist=self.dist)
+        np_x, np_residuals, np_rank, np_s = \
+            np.linalg.lstsq(a, self.rhs, rcond=None)
+        x, residuals, rank, s = mpi_np.linalg.lstsq(mpi_a, self.mpi_rhs)
+        self.assert_solution(np_x, x)
+        self.assertTrue(np.allclose(np_residuals, residuals))
+        self.assertEqual(np_rank, rank)
+        self.assertTrue(np.allclose(np_s, s))
+
+        np_x, np_residuals, _, _ = \
+            np.linalg.lstsq(a, self.rhs[:, 0], rcond=None)
+        x, residuals, _, _ = mpi_np.linalg.lstsq(mpi_a, self.mpi_vector)
+        self.assert_solution(np_x, x)
+        self.assertTrue(np.allclose(np_residuals, residuals))
+
+        #Rank deficient systems have no residuals
+        deficient = np.hstack([a, a[:, :1]])
+        np_x, _, np_rank, _ = \
+            np.linalg.lstsq(deficient, self.rhs, rcond=None)
+        x, residuals, rank, _ = mpi_np.linalg.lstsq(
+            mpi_np.array(deficient, comm=self.comm, dist=self.dist),
+            self.mpi_rhs)
+        self.assert_solution(np_x, x)
+        self.assertEqual(np_rank, rank)
+        self.assertEqual((0,), residuals.shape)
+
+
+    def test_iterative_solvers(self):
+        np_x = np.linalg.solve(self.matrix, self.rhs[:, 0])
+        x, info = mpi_np.linalg.cg(self.mpi_matrix, self.mpi_vector,
+                                   tol=1e-10)
+        self.assertEqual(0, info)
+        self.assert_solution(np_x, x)
+
+        #Nonsymmetric system
+        nonsymmetric = self.matrix + np.triu(self.matrix, 1)
+        np_x = np.linalg.solve(nonsymmetric, self.rhs[:, 0])
+        mpi_nonsymmetric = mpi_np.array(nonsymmetric, comm=self.comm,
+                                        dist=self.dist)
+        x, info = mpi_np.linalg.gmres(mpi_nonsymmetric, self.mpi_vector,
+                                      tol=1e-10)
+        self.assertEqual(0, info)
+        self.assert_solution(np_x, x)
+        x, info = mpi_np.linalg.gmres(mpi_nonsymmetric, self.mpi_vector,
+                                      x0=np.ones(10), tol=1e-10, restart=3)
+        self.assertEqual(0, info)
+        self.assert_solution(np_x, x)
+
+        #Iteration limits are reported
+        _, info = mpi_np.linalg.cg(self.mpi_matrix, self.mpi_vector,
+                                   tol=1e-15, maxiter=1)
+        self.assertEqual(1, info)
+        _, info = mpi_np.linalg.gmres(mpi_nonsymmetric, self.mpi_vector,
+                                      tol=1e-15, restart=1, maxiter=2)
+        self.assertEqual(2, info)
+
+
+    def test_invalid_operands(self):
+        singular = self.matrix.copy()
+        singular[:, 3] = 0
+        with self.assertRaises(LinAlgError):
+            mpi_np.linalg.solve(mpi_np.array(singular, comm=self.comm,
+                                             dist=self.dist), self.mpi_rhs)
+        with self.assertRaises(ValueError):
+            mpi_np.linalg.solve(self.mpi_rhs, self.mpi_vector)
+        with self.assertRaises(ValueError):
+            mpi_np.linalg.solve(self.mpi_matrix, self.rhs[:5])
+        with self.assertRaises(ValueError):
+            mpi_np.linalg.lstsq(self.mpi_rhs, self.rhs[:5])
+        with self.assertRaises(ValueError):
+            mpi_np.linalg.cg(self.mpi_matrix, self.mpi_rhs)
+        with self.assertRaises(ValueError):
+            mpi_np.linalg.gmres(self.mpi_rhs, self.mpi_vector)
+
+
+class LinAlgSolversBlockBlockTest(LinAlgSolversDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Block-Block distribution
+        parms['dist'] = 'bb'
+        return parms
+
+
+class LinAlgSolversBlockCyclicTest(LinAlgSolversDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Block-Cyclic distribution
+        parms['dist'] = 'bc'
+        return parms
+
+
+class LinAlgSolversReplicatedTest(LinAlgSolversDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Replicated distribution
+        parms['dist'] = 'r'
+        return parms
+
+
+class BlockLinAlgSolversTest(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = MPI.COMM_WORLD
+        self.procs = self.comm.Get_size()
+
+
+    def test_uneven_partitions_and_complex_systems(self):
+        random = np.random.RandomState(1)
+        matrix = random.rand(7, 7) + 1j * random.rand(7, 7) + 7 * np.eye(7)
+        rhs = random.rand(7) + 1j * random.rand(7)
+        weights = [1] * (self.procs - 1) + [3]
+        mpi_matrix = mpi_np.array(matrix, comm=self.comm, weights=weights)
+        mpi_rhs = mpi_np.array(rhs, comm=self.comm)
+
+        x = mpi_np.linalg.solve(mpi_matrix, mpi_rhs)
+        self.assertEqual(mpi_matrix.layout.partitions(0).tolist(),
+                         x.layout.partitions(0).tolist())
+        self.assertTrue(np.allclose(np.linalg.solve(matrix, rhs),
+                                    x.collect_data()))
+        x, info = mpi_np.linalg.gmres(mpi_matrix, mpi_rhs, tol=1e-10)
+        self.assertEqual(0, info)
+        self.assertTrue(np.allclose(np.linalg.solve(matrix, rhs),
+                                    x.collect_data()))
+
+        hermitian = matrix @ matrix.conj().T
+        x, info = mpi_np.linalg.cg(hermitian, mpi_rhs, tol=1e-12)
+        self.assertEqual(0, info)
+        self.assertTrue(np.allclose(np.linalg.solve(hermitian, rhs),
+                                    x.collect_data()))
+
+
+    def test_systems_smaller_than_communicator(self):
+        #Ranks beyond the number of rows hold no rows
+        random = np.random.RandomState(4)
+        matrix = random.rand(3, 3) + 3 * np.eye(3)
+        rhs = random.rand(3, 2)
+        mpi_matrix = mpi_np.array(matrix, comm=self.comm)
+        for np_rhs, mpi_rhs in [(rhs, mpi_np.array(rhs, comm=self.comm)),
+                                (rhs[:, 0], rhs[:, 0])]:
+            x = mpi_np.linalg.solve(mpi_matrix, mpi_rhs)
+            self.assertEqual(np_rhs.shape, x.globalshape)
+            self.assertTrue(np.allclose(np.linalg.solve(matrix, np_rhs),
+                                        x.collect_data()))
+            x, residuals, rank, _ = mpi_np.linalg.lstsq(mpi_matrix, mpi_rhs)
+            self.assertEqual(3, rank)
+            self.assertTrue(np.allclose(
+                np.linalg.lstsq(matrix, np_rhs, rcond=None)[0],
+                x.collect_data()))
+
+        #Zero weight layouts leave ranks without rows
+        weights = [0] * (self.procs - 1) + [1]
+        x = mpi_np.linalg.solve(mpi_np.array(matrix, comm=self.comm,
+                                             weights=weights),
+                                rhs)
+        self.assertTrue(np.allclose(np.linalg.solve(matrix, rhs),
+                                    x.collect_data()))
+
+
+    def test_tall_and_skinny_least_squares(self):
+        #Fewer rows than processes on some ranks
+        random = np.random.RandomState(2)
+        a = random.rand(self.procs + 3, 3)
+        b = random.rand(self.procs + 3)
+        np_x, np_residuals, _, _ = np.linalg.lstsq(a, b, rcond=None)
+        x, residuals, _, _ = mpi_np.linalg.lstsq(
+            mpi_np.array(a, comm=self.comm), b)
+        self.assertTrue(np.allclose(np_x, x.collect_data()))
+        self.assertTrue(np.allclose(np_residuals, residuals))
+
+
+class DecompositionsDefaultTest(unittest.TestCase):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        # Default distribution
+        parms['dist'] = 'b'
+        parms['data'] = np.random.RandomState(3).rand(13, 4)
+        return parms
+
+
+    def setUp(self):
+        parms = self.create_setUp_parms()
+        self.comm = parms.get('comm')
+        self.dist = parms.get('dist')
+        self.data = parms.get('data')
+        self.mpi_array = mpi_np.array(self.data, comm=self.comm, dist=self.dist)
+
+
+    def assert_orthonormal_columns(self, mpi_result):
+        self.assertTrue(isinstance(mpi_result, Block))
+        collected = mpi_result.collect_data()
+        self.assertTrue(np.allclose(np.eye(collected.shape[1]),
+                                    collected.T @ collected))
+
+
+    def test_qr(self):
+        q, r = mpi_np.linalg.qr(self.mpi_array)
+        np_r = np.linalg.qr(self.data, mode='r')
+        self.assertEqual((13, 4), q.globalshape)
+        self.assert_orthonormal_columns(q)
+        self.assertTrue(isinstance(r, Replicated))
+        #R is unique up to the signs of its rows
+        self.assertTrue(np.allclose(np.abs(np_r), np.abs(r)))
+        self.assertTrue(np.allclose(np.triu(r), r))
+        self.assertTrue(np.allclose(self.data, q.collect_data() @ r))
+        self.assertTrue(np.allclose(r, mpi_np.linalg.qr(self.mpi_array,
+                                                        mode='r')))
+
+
+    def test_svd(self):
+        np_u, np_s, np_vh = np.linalg.svd(self.data, full_matrices=False)
+        u, s, vh = mpi_np.linalg.svd(self.mpi_array)
+        self.assertEqual(np_u.shape, u.globalshape)
+        self.assert_orthonormal_columns(u)
+        self.assertTrue(np.allclose(np_s, s))
+        #Singular vectors are unique up to their signs
+        self.assertTrue(np.allclose(np.abs(np_vh), np.abs(vh)))
+        self.assertTrue(np.allclose(self.data,
+                                    (u.collect_data() * s) @ vh))
+        self.assertTrue(np.allclose(np_s, mpi_np.linalg.svd(self.mpi_array,
+                                                            compute_uv=False)))
+
+
+    def test_pca(self):
+        centered = self.data - self.data.mean(axis=0)
+        _, np_s, np_vh = np.linalg.svd(centered, full_matrices=False)
+        scores, components, explained_variance = \
+            mpi_np.linalg.pca(self.mpi_array, n_components=2)
+        self.assertEqual((13, 2), scores.globalshape)
+        self.assertTrue(np.allclose(np.abs(np_vh[:2]), np.abs(components)))
+        self.assertTrue(np.allclose(np_s[:2]**2 / 12, explained_variance))
+        self.assertTrue(np.allclose(centered @ np.asarray(components).T,
+                                    scores.collect_data()))
+        self.assertTrue(np.allclose(np.var(scores.collect_data(), axis=0,
+                                           ddof=1),
+                                    explained_variance))
+
+
+    def test_unsupported_functionality(self):
+        with self.assertRaises(NotSupportedError):
+            mpi_np.linalg.qr(self.mpi_array, mode='complete')
+        with self.assertRaises(NotSupportedError):
+            mpi_np.linalg.svd(self.mpi_array, full_matrices=True)
+        with self.assertRaises(ValueError):
+            mpi_np.linalg.pca(self.mpi_array, n_components=5)
+        with self.assertRaises(ValueError):
+            mpi_np.linalg.qr(mpi_np.arange(5, comm=self.comm))
+
+
+class DecompositionsBlockBlockTest(DecompositionsDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Block-Block distribution
+        parms['dist'] = 'bb'
+        return parms
+
+
+class DecompositionsBlockCyclicTest(DecompositionsDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Block-Cyclic distribution
+        parms['dist'] = 'bc'
+        return parms
+
+
+class DecompositionsReplicatedTest(DecompositionsDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Replicated distribution
+        parms['dist'] = 'r'
+        return parms
+
+
+class BlockDecompositionsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = MPI.COMM_WORLD
+        self.procs = self.comm.Get_size()
+
+
+    def test_few_rows_per_process(self):
+        #Some ranks hold fewer rows than columns, or none at all
+        random = np.random.RandomState(4)
+        for rows in [self.procs + 5, self.procs - 1, 3]:
+            if rows < 1:
+                continue
+            data = random.rand(rows, 5)
+            q, r = mpi_np.linalg.qr(mpi_np.array(data, comm=self.comm))
+            self.assertEqual((rows, min(rows, 5)), q.globalshape)
+            self.assertEqual((min(rows, 5), 5), r.shape)
+            self.assertTrue(np.allclose(data, q.collect_data() @ r))
+
+            u, s, vh = mpi_np.linalg.svd(mpi_np.array(data, comm=self.comm))
+            self.assertTrue(np.allclose(np.linalg.svd(data, compute_uv=False),
+                                        s))
+            self.assertTrue(np.allclose(data, (u.collect_data() * s) @ vh))
+
+
+    def test_weighted_partitions_and_integer_data(self):
+        data = np.arange(60).reshape(20, 3) ** 2
+        weights = [1] * (self.procs - 1) + [4]
+        mpi_array = mpi_np.array(data, comm=self.comm, weights=weights)
+        q, r = mpi_np.linalg.qr(mpi_array)
+        self.assertEqual(mpi_array.layout.partitions(0).tolist(),
+                         q.layout.partitions(0).tolist())
+        self.assertEqual(np.float64, q.dtype)
+        self.assertTrue(np.allclose(data, q.collect_data() @ r))
+
+        #Wide matrices support full matrices
+        wide = np.random.RandomState(5).rand(3, 6)
+        u, s, vh = mpi_np.linalg.svd(mpi_np.array(wide, comm=self.comm),
+                                     full_matrices=True)
+        self.assertEqual((6, 6), vh.shape)
+        self.assertTrue(np.allclose(wide, (u.collect_data() * s) @ vh[:3]))
+
+
 if __name__ == '__main__':
     unittest.main()
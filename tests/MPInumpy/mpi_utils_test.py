@@ -2,9 +2,11 @@ import unittest
 from mpi4py import MPI
 import numpy as np
 
+from mpids.MPInumpy import mpi_utils
 from mpids.MPInumpy.mpi_utils import *
 from mpids.MPInumpy.mpi_utils import _displacments_from_counts
-from mpids.MPInumpy.errors import TypeError
+from mpids.MPInumpy.errors import NotSupportedError, TypeError
+from mpids.MPInumpy.layout import get_layout
 
 
 class HelperGetters(unittest.TestCase):
@@ -21,6 +23,36 @@ class HelperGetters(unittest.TestCase):
         self.assertEqual(MPI.COMM_WORLD.size, get_comm_size())
 
 
+class GetVectorCountsTest(unittest.TestCase):
+
+    def test_counts_and_displacements_in_rank_order(self):
+        counts, displacements = get_vector_counts([3, 0, 2, 1])
+        self.assertEqual(np.int32, counts.dtype)
+        self.assertEqual(np.int32, displacements.dtype)
+        self.assertTrue(np.array_equal([3, 0, 2, 1], counts))
+        self.assertTrue(np.array_equal([0, 3, 3, 5], displacements))
+
+        counts, displacements = get_vector_counts([], [])
+        self.assertEqual(0, counts.size)
+        self.assertEqual(0, displacements.size)
+
+
+    def test_counts_beyond_int_range_do_not_wrap(self):
+        max_int = np.iinfo(np.int32).max
+        for counts, displacements in [([max_int + 1, 0], None),
+                                      ([max_int, 1], None),
+                                      ([1, 1], [0, max_int])]:
+            if MPI.Get_version() < (4, 0):
+                with self.assertRaises(NotSupportedError):
+                    get_vector_counts(counts, displacements)
+            else:
+                large_counts, large_displacements = \
+                    get_vector_counts(counts, displacements)
+                self.assertEqual(np.int64, large_counts.dtype)
+                self.assertTrue(np.array_equal(counts, large_counts))
+                self.assertTrue(np.all(large_displacements >= 0))
+
+
 class AllGatherVTest(unittest.TestCase):
 
     def setUp(self):
@@ -64,6 +96,18 @@ class AllGatherVTest(unittest.TestCase):
         self.assertTrue(np.alltrue((array_1) == (array_2)))
 
 
+    @unittest.skipIf(MPI.Get_version() >= (4, 0),
+                     'MPI provides large count collectives')
+    def test_gather_beyond_int_counts_raise_not_supported_error(self):
+        #Raised before the gathered array is allocated
+        counts = np.full(self.num_procs, np.iinfo(np.int32).max // 2 + 1)
+        with self.assertRaises(NotSupportedError):
+            all_gather_v(self.local_data_1d, counts=[2**31] * self.num_procs)
+        if self.num_procs > 1:
+            with self.assertRaises(NotSupportedError):
+                all_gather_v(self.local_data_1d, counts=counts)
+
+
     def test_gather_empty_value_found_on_all_procs(self):
         local_data = np.array([])
         expected_gathered_data = np.array([] * self.num_procs)
@@ -297,6 +341,97 @@ class AllGatherVTest(unittest.TestCase):
         gathered_data = all_gather_v(local_data, shape=expected_gathered_data.shape)
         self.arrays_are_equivelant(gathered_data, expected_gathered_data)
 
+
+    def test_gather_with_precomputed_counts_and_displacements(self):
+        counts = np.arange(self.num_procs)
+        local_data = np.full(self.rank, self.rank, dtype=np.int64)
+        expected_gathered_data = \
+            np.repeat(np.arange(self.num_procs, dtype=np.int64), counts)
+
+        gathered_data = all_gather_v(local_data, counts=counts)
+        self.arrays_are_equivelant(gathered_data, expected_gathered_data)
+
+        #Data of ranks placed in reverse order
+        displacements = np.cumsum(counts[::-1])[::-1] - counts
+        gathered_data = all_gather_v(local_data, counts=counts,
+                                     displacements=displacements)
+        self.arrays_are_equivelant(
+            gathered_data,
+            np.repeat(np.arange(self.num_procs, dtype=np.int64)[::-1],
+                      counts[::-1]))
+
+
+    def test_gather_with_counts_from_layout(self):
+        layout = get_layout((self.num_procs + 3, 2), 'b')
+        local_data = np.full(layout.local_shape, self.rank, dtype=np.int64)
+        expected_gathered_data = \
+            np.repeat(np.arange(self.num_procs, dtype=np.int64),
+                      np.diff(layout.partitions(0), axis=1).ravel()) \
+              .repeat(2).reshape(-1, 2)
+
+        gathered_data = all_gather_v(local_data, shape=layout.globalshape,
+                                     layout=layout)
+        self.arrays_are_equivelant(gathered_data, expected_gathered_data)
+
+
+    def test_gather_structured_bool_and_datetime_data(self):
+        record_dtype = np.dtype([('key', np.float32), ('index', np.int64),
+                                 ('flag', bool)], align=True)
+        local_records = np.zeros(2, dtype=record_dtype)
+        local_records['key'] = self.rank + 0.5
+        local_records['index'] = [self.rank, -self.rank]
+        local_records['flag'] = [True, self.rank % 2 == 0]
+        gathered_records = all_gather_v(local_records)
+        self.assertEqual(record_dtype, gathered_records.dtype)
+        self.assertTrue(np.alltrue(np.arange(self.num_procs) + 0.5 ==
+                                   gathered_records['key'][::2]))
+        self.assertTrue(np.alltrue(
+            np.arange(self.num_procs) == gathered_records['index'][::2]))
+        self.assertTrue(np.alltrue(
+            -np.arange(self.num_procs) == gathered_records['index'][1::2]))
+        self.assertTrue(np.alltrue(
+            (np.arange(self.num_procs) % 2 == 0) ==
+            gathered_records['flag'][1::2]))
+
+        local_dates = np.datetime64('2020-01-01') + \
+            np.arange(2).astype('m8[D]') + self.rank
+        self.arrays_are_equivelant(
+            all_gather_v(local_dates),
+            (np.datetime64('2020-01-01') +
+             np.add.outer(np.arange(self.num_procs),
+                          np.arange(2)).astype('m8[D]')).ravel())
+
+
+    def test_gather_strided_views_in_place(self):
+        local_data = np.arange(12, dtype=np.float64).reshape(3, 4) + \
+            100 * self.rank
+        global_data = np.concatenate([local_data - 100 * (self.rank - rank)
+                                      for rank in range(self.num_procs)])
+        for view, global_view in [
+                (local_data[:, 1], global_data[:, 1]),
+                (local_data[::2, 1:3], global_data.reshape(-1, 3, 4)
+                                                  [:, ::2, 1:3]),
+                (local_data.T, np.concatenate(
+                    np.split(global_data, self.num_procs), axis=1).T)]:
+            message = get_mpi_message(view)
+            self.assertFalse(isinstance(message[0], np.ndarray))
+            self.assertEqual(1, message[1])
+            self.arrays_are_equivelant(all_gather_v(view),
+                                       global_view.ravel())
+
+
+    def test_all_gather_v_async_matches_blocking_gather(self):
+        future = all_gather_v_async(self.local_data_2d,
+                                    shape=self.global_data_2d.shape)
+        self.arrays_are_equivelant(future.wait(), self.global_data_2d)
+        self.assertTrue(future.test())
+
+        #Strided views and counts determined up front
+        counts = np.array([self.num_procs] * self.num_procs)
+        future = all_gather_v_async(self.local_data_2d[:, 0], counts=counts)
+        self.arrays_are_equivelant(future.wait(),
+                                   self.global_data_1d.ravel())
+
 class AllToAllTest(unittest.TestCase):
 
     def setUp(self):
@@ -542,6 +677,93 @@ class AllToAllVTest(unittest.TestCase):
             self.arrays_are_equivelant(received_array, expected_received_array)
 
 
+    def test_all_to_all_v_exchanges_unknown_recv_counts(self):
+        #Rank sends rank + 1 copies of its rank to every process
+        send_counts = np.full(self.size, self.rank + 1, dtype=np.int32)
+        send_data = np.full(send_counts.sum(), self.rank, dtype=np.int32)
+        expected_received_array = \
+            np.repeat(np.arange(self.size, dtype=np.int32),
+                      np.arange(1, self.size + 1))
+
+        received_array = all_to_all_v(send_data, send_counts)
+        self.arrays_are_equivelant(received_array, expected_received_array)
+
+
+    @unittest.skipIf(MPI.Get_version() >= (4, 0),
+                     'MPI provides large count collectives')
+    def test_all_to_all_v_beyond_int_counts_raise_not_supported_error(self):
+        send_data = np.arange(self.size, dtype=np.int32)
+        send_counts = np.ones(self.size, dtype=np.int64)
+        #Raised before any data or counts are exchanged
+        with self.assertRaises(NotSupportedError):
+            all_to_all_v(send_data, send_counts * 2**31)
+        with self.assertRaises(NotSupportedError):
+            all_to_all_v(send_data, send_counts, send_counts * 2**31)
+
+
+    def test_all_to_all_v_async_matches_blocking_exchange(self):
+        send_counts = np.full(self.size, self.rank + 1, dtype=np.int32)
+        send_data = np.full(send_counts.sum(), self.rank, dtype=np.int32)
+        expected_received_array = \
+            np.repeat(np.arange(self.size, dtype=np.int32),
+                      np.arange(1, self.size + 1))
+
+        future = all_to_all_v_async(send_data, send_counts,
+                                    recv_shape=(1, -1))
+        self.arrays_are_equivelant(future.wait(),
+                                   expected_received_array.reshape(1, -1))
+
+        #Strided send data is packed into a temporary kept by the future
+        strided_data = np.repeat(send_data, 2)[::2]
+        future = all_to_all_v_async(strided_data, send_counts)
+        del strided_data
+        local_work = [np.full(send_counts.sum(), -1, dtype=np.int32)
+                      for _ in range(50)]
+        self.arrays_are_equivelant(future.wait(), expected_received_array)
+
+
+class AllToAllWTest(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = MPI.COMM_WORLD
+        self.rank = self.comm.Get_rank()
+        self.size = self.comm.Get_size()
+
+
+    def test_supplying_a_non_numpy_array_raise_type_error(self):
+        with self.assertRaises(TypeError):
+            all_to_all_w([1] * self.size, [None] * self.size,
+                         np.empty(0), [None] * self.size)
+
+
+    def test_all_to_all_w_transfer_to_all_ranks_except_first(self):
+        #Entry r of each rank is placed in row rank of column 0 on rank r
+        send_data = np.arange(self.size, dtype=np.float64) + \
+            self.rank * self.size
+        recv_array = np.zeros((self.size, 2), dtype=np.float64)
+        send_types = [None] * self.size
+        recv_types = [None] * self.size
+        #No data is exchanged with the first rank
+        if self.rank != 0:
+            for rank in range(1, self.size):
+                send_types[rank] = \
+                    MPI.DOUBLE.Create_hindexed_block(1, [rank * 8]).Commit()
+                recv_types[rank] = \
+                    MPI.DOUBLE.Create_hindexed_block(1, [rank * 16]).Commit()
+
+        received = all_to_all_w(send_data, send_types, recv_array, recv_types)
+
+        expected_array = np.zeros((self.size, 2), dtype=np.float64)
+        if self.rank != 0:
+            expected_array[1:, 0] = \
+                np.arange(1, self.size) * self.size + self.rank
+        self.assertTrue(received is recv_array)
+        self.assertTrue(np.alltrue(expected_array == received))
+        for datatype in send_types + recv_types:
+            if datatype is not None:
+                datatype.Free()
+
+
 class BroadcastShapeTest(unittest.TestCase):
 
     def setUp(self):
@@ -631,6 +853,184 @@ class BroadcastArrayTest(unittest.TestCase):
             self.arrays_are_equivelant(local_data, self.data_2d_float)
 
 
+    def test_broadcasting_strided_and_datetime_arrays_from_all_ranks(self):
+        data_dates = np.arange('2020-01', '2021-01', dtype='M8[M]')
+        for root in range(self.size):
+            local_data = self.data_2d_float[::2, 1:] \
+                if self.rank == root else None
+            local_data = broadcast_array(local_data, comm=self.comm, root=root)
+            self.arrays_are_equivelant(local_data, self.data_2d_float[::2, 1:])
+
+            local_data = data_dates if self.rank == root else None
+            local_data = broadcast_array(local_data, comm=self.comm, root=root)
+            self.arrays_are_equivelant(local_data, data_dates)
+
+
+class MomentsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = MPI.COMM_WORLD
+        self.rank = self.comm.Get_rank()
+        self.size = self.comm.Get_size()
+        self.data = np.arange(self.size * 6, dtype=np.float64).reshape(-1, 2)**2
+
+
+    def moments(self, data):
+        return np.stack([np.full(data.shape[1], data.shape[0]),
+                         data.mean(axis=0),
+                         data.var(axis=0) * data.shape[0]], axis=-1)
+
+
+    def test_combine_moments(self):
+        combined_moments = combine_moments(self.moments(self.data[:2]),
+                                           self.moments(self.data[2:]))
+        self.assertTrue(np.allclose(self.moments(self.data), combined_moments))
+
+        #Empty moments leave combination unchanged
+        empty_moments = np.zeros((2, 3))
+        self.assertTrue(np.allclose(self.moments(self.data),
+                                    combine_moments(empty_moments,
+                                                    self.moments(self.data))))
+        self.assertTrue(np.alltrue(0 ==
+                                   combine_moments(empty_moments, empty_moments)))
+
+
+    def test_all_reduce_moments(self):
+        rows_per_rank = self.data.shape[0] // self.size
+        local_data = \
+            self.data[self.rank * rows_per_rank: (self.rank + 1) * rows_per_rank]
+        local_moments = self.moments(local_data)
+        global_moments = all_reduce_moments(local_moments, comm=self.comm)
+        self.assertTrue(global_moments is local_moments)
+        self.assertTrue(np.allclose(self.moments(self.data), global_moments))
+
+        #Moments of ranks with count of zero are ignored
+        local_moments = self.moments(self.data)
+        if self.rank != 0:
+            local_moments[...] = 0
+        all_reduce_moments(local_moments, comm=self.comm)
+        self.assertTrue(np.allclose(self.moments(self.data), local_moments))
+
+
+    def test_all_reduce_moments_with_invalid_moments_raise_type_error(self):
+        with self.assertRaises(TypeError):
+            all_reduce_moments([0., 0., 0.], comm=self.comm)
+        with self.assertRaises(TypeError):
+            all_reduce_moments(np.zeros((2, 3), dtype=np.float32),
+                               comm=self.comm)
+        with self.assertRaises(TypeError):
+            all_reduce_moments(np.zeros((3, 2)), comm=self.comm)
+
+
+    def comoments(self, data):
+        centered = data - data.mean(axis=0)
+        return np.concatenate([[data.shape[0]], data.mean(axis=0),
+                               (centered.T @ centered).ravel()])
+
+
+    def test_combine_comoments(self):
+        combined_comoments = combine_comoments(self.comoments(self.data[:2]),
+                                               self.comoments(self.data[2:]))
+        self.assertTrue(np.allclose(self.comoments(self.data),
+                                    combined_comoments))
+
+        #Empty comoments leave combination unchanged
+        empty_comoments = np.zeros(7)
+        self.assertTrue(np.allclose(self.comoments(self.data),
+                                    combine_comoments(empty_comoments,
+                                                      self.comoments(self.data))))
+        self.assertTrue(np.alltrue(0 == combine_comoments(empty_comoments,
+                                                          empty_comoments)))
+
+
+    def test_all_reduce_comoments(self):
+        rows_per_rank = self.data.shape[0] // self.size
+        local_data = \
+            self.data[self.rank * rows_per_rank: (self.rank + 1) * rows_per_rank]
+        local_comoments = self.comoments(local_data)
+        global_comoments = all_reduce_comoments(local_comoments, comm=self.comm)
+        self.assertTrue(global_comoments is local_comoments)
+        self.assertTrue(np.allclose(self.comoments(self.data), global_comoments))
+
+        #Comoments of ranks with count of zero are ignored
+        local_comoments = self.comoments(self.data)
+        if self.rank != 0:
+            local_comoments[...] = 0
+        all_reduce_comoments(local_comoments, comm=self.comm)
+        self.assertTrue(np.allclose(self.comoments(self.data), local_comoments))
+
+
+    def test_all_reduce_comoments_with_invalid_comoments_raise_type_error(self):
+        with self.assertRaises(TypeError):
+            all_reduce_comoments([0., 0., 0.], comm=self.comm)
+        with self.assertRaises(TypeError):
+            all_reduce_comoments(np.zeros(7, dtype=np.float32), comm=self.comm)
+        with self.assertRaises(TypeError):
+            all_reduce_comoments(np.zeros(6), comm=self.comm)
+
+
+class MPIDatatypeTest(unittest.TestCase):
+
+    def test_datatypes_are_created_once(self):
+        record_dtype = np.dtype([('key', np.float64), ('index', np.int32)],
+                                align=True)
+        self.assertTrue(get_mpi_datatype(np.float64) is
+                        get_mpi_datatype('f8'))
+        self.assertTrue(get_mpi_datatype(record_dtype) is
+                        get_mpi_datatype(record_dtype))
+
+
+    def test_datatype_extents_match_itemsize(self):
+        for dtype in [bool, np.int8, np.int64, np.float16, np.float64,
+                      np.complex128, '>i4', 'M8[s]', 'm8[ns]', 'S5', 'U3',
+                      'V7', '(2,3)f4',
+                      [('key', 'M8[D]'), ('value', '(2,)u2')],
+                      np.dtype([('key', np.float32), ('flag', bool)],
+                               align=True)]:
+            dtype = np.dtype(dtype)
+            self.assertEqual((0, dtype.itemsize),
+                             get_mpi_datatype(dtype).Get_extent())
+
+
+    def test_object_dtypes_raise_type_error(self):
+        with self.assertRaises(TypeError):
+            get_mpi_datatype(object)
+        with self.assertRaises(TypeError):
+            get_mpi_datatype([('key', np.float64), ('value', object)])
+
+
+    def test_messages_of_contiguous_and_strided_arrays(self):
+        data = np.arange(24, dtype=np.int32).reshape(4, 6)
+        message = get_mpi_message(data)
+        self.assertTrue(message[0] is data)
+        self.assertEqual([data.size, get_mpi_datatype(np.int32)], message[1:])
+
+        message = get_mpi_message(data[:, 1:5])
+        self.assertEqual(1, message[1])
+        self.assertEqual(16 * 4, message[2].Get_size())
+        #Views of matching strides share the cached datatype
+        self.assertTrue(message[2] is get_mpi_message(data[:, 2:])[2])
+
+        #Negative strides are copied
+        message = get_mpi_message(data[::-1])
+        self.assertTrue(isinstance(message[0], np.ndarray))
+        self.assertFalse(np.shares_memory(message[0], data))
+
+
+    def test_strided_datatypes_are_freed_beyond_limit(self):
+        data = np.arange(64, dtype=np.float64)
+        limit = mpi_utils.STRIDED_DATATYPES_LIMIT
+        try:
+            mpi_utils.STRIDED_DATATYPES_LIMIT = 2
+            datatypes = [get_mpi_message(data[::step])[2]
+                         for step in range(2, 6)]
+            self.assertTrue(len(mpi_utils._STRIDED_DATATYPES) <= 2)
+            self.assertEqual(MPI.DATATYPE_NULL, datatypes[0])
+            self.assertTrue(datatypes[-1] is get_mpi_message(data[::5])[2])
+        finally:
+            mpi_utils.STRIDED_DATATYPES_LIMIT = limit
+
+
 class ScatterVTest(unittest.TestCase):
 
     def setUp(self):
@@ -731,5 +1131,40 @@ class ScatterVTest(unittest.TestCase):
             self.arrays_are_equivelant(local_data, self.expected_data_2d_float)
 
 
+    def test_scatter_v_with_shapes_from_layout(self):
+        layout = get_layout((self.size + 3, 2), 'b', comm=self.comm)
+        data = np.arange((self.size + 3) * 2, dtype=np.float64).reshape(-1, 2)
+        for root in range(self.size):
+            local_data = data if self.rank == root else None
+            local_data = scatter_v(local_data, comm=self.comm, root=root,
+                                   layout=layout)
+            self.arrays_are_equivelant(local_data, data[layout.rank_index()])
+
+            #Known data types require no metadata at all
+            local_data = data if self.rank == root else None
+            local_data = scatter_v(local_data, comm=self.comm, root=root,
+                                   layout=layout, dtype=np.float64)
+            self.arrays_are_equivelant(local_data, data[layout.rank_index()])
+
+
+    def test_scatter_v_in_rank_order_without_displacements(self):
+        for root in range(self.size):
+            local_data = self.data_1d_int if self.rank == root else None
+            shapes = self.shapes_1d if self.rank == root else None
+            local_data = scatter_v(local_data, shapes=shapes, comm=self.comm,
+                                   root=root)
+            self.arrays_are_equivelant(local_data, self.expected_data_1d_int)
+
+
+    def test_scatter_v_structured_records(self):
+        layout = get_layout((self.size + 3,), 'b', comm=self.comm)
+        data = np.zeros(self.size + 3, dtype=[('key', 'U2'), ('index', 'i8')])
+        data['key'] = [str(index) for index in range(data.size)]
+        data['index'] = np.arange(data.size)
+        local_data = data if self.rank == 0 else None
+        local_data = scatter_v(local_data, comm=self.comm, layout=layout)
+        self.arrays_are_equivelant(local_data, data[layout.rank_index()])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,171 @@
+import gc
+import unittest
+import numpy as np
+from mpi4py import MPI
+from petsc4py import PETSc
+import mpids.MPInumpy as mpi_np
+from mpids.MPInumpy.distributions import Block
+from mpids.MPInumpy.errors import NotSupportedError, ValueError
+
+
+class PETScBridgeDefaultTest(unittest.TestCase):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        # Default distribution
+        parms['dist'] = 'b'
+        parms['data'] = np.arange(24, dtype=np.float64).reshape(6,4)
+        return parms
+
+
+    def setUp(self):
+        parms = self.create_setUp_parms()
+        self.comm = parms.get('comm')
+        self.dist = parms.get('dist')
+        self.data = parms.get('data')
+        self.mpi_array = mpi_np.array(self.data, comm=self.comm, dist=self.dist)
+
+
+    def test_round_trip_of_vectors_and_matrices(self):
+        petsc_vec = mpi_np.array(self.data[:, 0], comm=self.comm,
+                                 dist=self.dist).to_petsc()
+        self.assertTrue(isinstance(petsc_vec, PETSc.Vec))
+        self.assertEqual(self.data.shape[0], petsc_vec.getSize())
+        vec_array = mpi_np.from_petsc(petsc_vec, comm=self.comm)
+        self.assertTrue(isinstance(vec_array, Block))
+        self.assertTrue(np.alltrue(self.data[:, 0] ==
+                                   vec_array.collect_data()))
+
+        petsc_mat = self.mpi_array.to_petsc()
+        self.assertTrue(isinstance(petsc_mat, PETSc.Mat))
+        self.assertEqual(self.data.shape, petsc_mat.getSize())
+        mat_array = mpi_np.from_petsc(petsc_mat, comm=self.comm)
+        self.assertEqual(mpi_np.zeros(self.data.shape, comm=self.comm).layout,
+                         mat_array.layout)
+        self.assertTrue(np.alltrue(self.data == mat_array.collect_data()))
+
+
+    def test_petsc_operations_on_wrapped_arrays(self):
+        petsc_mat = self.mpi_array.to_petsc()
+        ones = petsc_mat.createVecRight()
+        ones.set(1.)
+        row_sums = petsc_mat.createVecLeft()
+        petsc_mat.mult(ones, row_sums)
+        result = mpi_np.from_petsc(row_sums, comm=self.comm)
+        self.assertTrue(np.allclose(self.data.sum(axis=1),
+                                    result.collect_data()))
+
+
+class PETScBridgeBlockTest(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = MPI.COMM_WORLD
+        self.data = np.arange(24, dtype=np.float64).reshape(6,4)
+        self.mpi_array = mpi_np.array(self.data, comm=self.comm)
+
+
+    def test_block_vectors_share_memory(self):
+        mpi_array = mpi_np.arange(10, dtype=np.float64, comm=self.comm)
+        petsc_vec = mpi_array.to_petsc()
+        petsc_vec.scale(2.)
+        self.assertTrue(np.alltrue(2 * np.arange(10) ==
+                                   mpi_array.collect_data()))
+
+        vec_array = mpi_np.from_petsc(petsc_vec, comm=self.comm)
+        self.assertEqual(mpi_array.layout, vec_array.layout)
+        self.assertTrue(np.shares_memory(vec_array, mpi_array))
+
+
+    def test_fortran_ordered_matrices_share_memory(self):
+        mpi_array = mpi_np.zeros(self.data.shape, comm=self.comm, order='F')
+        mpi_array[:] = self.data
+        petsc_mat = mpi_array.to_petsc()
+        self.assertTrue(np.shares_memory(petsc_mat.getDenseArray(),
+                                         mpi_array))
+        mat_array = mpi_np.from_petsc(petsc_mat, comm=self.comm)
+        self.assertTrue(np.shares_memory(mat_array, mpi_array))
+
+        #C ordered data is copied once, single rows are also Fortran ordered
+        self.assertEqual(self.mpi_array.flags['F_CONTIGUOUS'],
+                         np.shares_memory(
+                             self.mpi_array.to_petsc().getDenseArray(),
+                             self.mpi_array))
+
+
+    def test_views_keep_petsc_memory_alive(self):
+        petsc_vec = PETSc.Vec().createMPI((PETSc.DECIDE, 9), comm=self.comm)
+        petsc_vec.set(3.)
+        vec_array = mpi_np.from_petsc(petsc_vec, comm=self.comm)
+        del petsc_vec
+        gc.collect()
+        self.assertTrue(np.alltrue(3. == vec_array.collect_data()))
+
+
+    def test_chained_petsc_solver(self):
+        #Diagonally dominant system with known solution
+        np_system = np.eye(8) * 10 + np.arange(64).reshape(8,8) / 64
+        np_solution = np.arange(8, dtype=np.float64)
+        system = mpi_np.zeros((8, 8), comm=self.comm, order='F')
+        system[:] = np_system
+        rhs = mpi_np.array(np_system @ np_solution, comm=self.comm)
+
+        ksp = PETSc.KSP().create(comm=self.comm)
+        petsc_system = system.to_petsc()
+        ksp.setOperators(petsc_system)
+        ksp.setType('gmres')
+        ksp.getPC().setType('none')
+        ksp.setTolerances(rtol=1e-12)
+        solution = petsc_system.createVecRight()
+        ksp.solve(rhs.to_petsc(), solution)
+        self.assertTrue(np.allclose(
+            np_solution,
+            mpi_np.from_petsc(solution, comm=self.comm).collect_data()))
+        ksp.destroy()
+
+
+    def test_unsupported_functionality(self):
+        with self.assertRaises(NotSupportedError):
+            mpi_np.array(self.data, comm=self.comm, dist='r').to_petsc()
+        with self.assertRaises(NotSupportedError):
+            mpi_np.zeros((2, 3, 4), comm=self.comm).to_petsc()
+        sparse_mat = PETSc.Mat().createAIJ((6, 4), comm=self.comm)
+        sparse_mat.setUp()
+        sparse_mat.assemble()
+        with self.assertRaises(NotSupportedError):
+            mpi_np.from_petsc(sparse_mat, comm=self.comm)
+        with self.assertRaises(NotSupportedError):
+            mpi_np.from_petsc(self.data)
+        if self.comm.Get_size() > 1:
+            with self.assertRaises(ValueError):
+                mpi_np.from_petsc(self.mpi_array.to_petsc(),
+                                  comm=MPI.COMM_SELF)
+
+
+class PETScBridgeBlockBlockTest(PETScBridgeDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Block-Block distribution
+        parms['dist'] = 'bb'
+        return parms
+
+
+    def test_round_trip_of_vectors_and_matrices(self):
+        petsc_mat = self.mpi_array.to_petsc()
+        mat_array = mpi_np.from_petsc(petsc_mat, comm=self.comm)
+        self.assertTrue(isinstance(mat_array, Block))
+        self.assertTrue(np.alltrue(self.data == mat_array.collect_data()))
+
+
+class PETScBridgeBlockCyclicTest(PETScBridgeDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Block-Cyclic distribution
+        parms['dist'] = 'bc'
+        return parms
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+import unittest
+import numpy as np
+from mpi4py import MPI
+import mpids.MPInumpy as mpi_np
+from mpids.MPInumpy.errors import NotSupportedError, ValueError
+from mpids.MPInumpy.distributions.Replicated import Replicated
+
+
+class SortingDefaultTest(unittest.TestCase):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        # Default distribution
+        parms['dist'] = 'b'
+        #Keys with duplicates, sorted along local axis 1
+        parms['data'] = (np.arange(45, dtype=np.float64) * 7 % 11).reshape(9,5)
+        return parms
+
+
+    def setUp(self):
+        parms = self.create_setUp_parms()
+        self.comm = parms.get('comm')
+        self.dist = parms.get('dist')
+        self.data = parms.get('data')
+
+        self.mpi_array = mpi_np.array(self.data, comm=self.comm, dist=self.dist)
+
+
+    def collect(self, mpi_array):
+        return np.asarray(mpi_array.collect_data())
+
+
+    def test_sort_along_local_axis(self):
+        result = mpi_np.sort(self.mpi_array, axis=-1)
+        self.assertTrue(isinstance(result, type(self.mpi_array)))
+        self.assertTrue(result.layout is self.mpi_array.layout)
+        self.assertTrue(np.alltrue(np.sort(self.data) == self.collect(result)))
+
+        result = mpi_np.argsort(self.mpi_array, axis=-1, kind='stable')
+        self.assertTrue(np.alltrue(np.argsort(self.data, kind='stable') ==
+                                   self.collect(result)))
+
+
+    def test_numpy_functions_and_methods(self):
+        self.assertTrue(np.alltrue(np.sort(self.data) ==
+                                   self.collect(np.sort(self.mpi_array))))
+        self.assertTrue(np.alltrue(np.argsort(self.data, kind='stable') ==
+                                   self.collect(np.argsort(self.mpi_array,
+                                                           kind='stable'))))
+        self.mpi_array.sort()
+        self.assertTrue(np.alltrue(np.sort(self.data) ==
+                                   self.collect(self.mpi_array)))
+
+
+    def test_unsupported_functionality(self):
+        with self.assertRaises(ValueError):
+            mpi_np.sort(self.mpi_array, axis=self.data.ndim)
+        with self.assertRaises(NotSupportedError):
+            self.mpi_array.argsort(order='key')
+
+
+class SortingBlockBlockTest(SortingDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Block-Block distribution
+        parms['dist'] = 'bb'
+        parms['data'] = parms['data'].reshape(3,3,5)
+        return parms
+
+
+class SortingBlockCyclicTest(SortingDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Block-Cyclic distribution
+        parms['dist'] = 'bc'
+        return parms
+
+
+class SortingReplicatedTest(SortingDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Replicated distribution
+        parms['dist'] = 'r'
+        return parms
+
+
+    def collect(self, mpi_array):
+        self.assertTrue(isinstance(mpi_array, Replicated))
+        return np.asarray(mpi_array)
+
+
+    def test_sort_along_local_axis(self):
+        result = mpi_np.sort(self.mpi_array, axis=-1)
+        self.assertTrue(np.alltrue(np.sort(self.data) == self.collect(result)))
+
+
+    def test_unsupported_functionality(self):
+        with self.assertRaises(ValueError):
+            mpi_np.sort(self.mpi_array, axis=self.data.ndim)
+
+
+class SampleSortTest(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = MPI.COMM_WORLD
+        self.size = self.comm.Get_size()
+        rng = np.random.RandomState(3)
+        self.data = rng.randint(0, 5, size=103).astype(np.float64)
+        self.data[7] = np.nan
+        self.mpi_array = mpi_np.array(self.data, comm=self.comm, dist='b')
+
+
+    def test_sort_matches_numpy_and_is_evenly_partitioned(self):
+        result = mpi_np.sort(self.mpi_array)
+        self.assertTrue(isinstance(result, mpi_np.MPIArray))
+        self.assertEqual('b', result.dist)
+        self.assertEqual(self.mpi_array.layout, result.layout)
+        self.assertTrue(np.array_equal(np.sort(self.data),
+                                       result.collect_data(), equal_nan=True))
+
+
+    def test_argsort_returns_stable_global_indices(self):
+        result = mpi_np.argsort(self.mpi_array)
+        self.assertEqual(self.mpi_array.layout, result.layout)
+        self.assertTrue(np.alltrue(np.argsort(self.data, kind='stable') ==
+                                   result.collect_data()))
+
+        #Global indices select sorted keys
+        self.assertTrue(np.array_equal(np.sort(self.data),
+                                       self.data[result.collect_data()],
+                                       equal_nan=True))
+
+
+    def test_sort_in_place(self):
+        local_data = np.asarray(self.mpi_array)
+        self.mpi_array.sort()
+        self.assertTrue(np.shares_memory(local_data, self.mpi_array))
+        self.assertTrue(np.array_equal(np.sort(self.data),
+                                       self.mpi_array.collect_data(),
+                                       equal_nan=True))
+
+
+    def test_sort_flattened_array(self):
+        data = self.data[:100].reshape(20, 5)
+        mpi_array = mpi_np.array(data, comm=self.comm, dist='b')
+        result = mpi_np.sort(mpi_array, axis=None)
+        self.assertEqual((100,), result.globalshape)
+        self.assertTrue(np.array_equal(np.sort(data, axis=None),
+                                       result.collect_data(), equal_nan=True))
+        self.assertTrue(np.alltrue(np.argsort(data, axis=None, kind='stable') ==
+                                   mpi_np.argsort(mpi_array,
+                                                  axis=None).collect_data()))
+
+        with self.assertRaises(NotSupportedError):
+            mpi_np.sort(mpi_array, axis=0)
+
+
+    def test_sort_of_small_and_empty_arrays(self):
+        for data in [np.array([], dtype=np.int64),
+                     np.array([3]),
+                     np.arange(self.size - 1, -1, -1)]:
+            mpi_array = mpi_np.array(data, comm=self.comm, dist='b')
+            self.assertTrue(np.alltrue(np.sort(data) ==
+                                       mpi_np.sort(mpi_array).collect_data()))
+            self.assertTrue(np.alltrue(np.argsort(data) ==
+                                       mpi_np.argsort(mpi_array).collect_data()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import unittest
+import warnings
+import numpy as np
+from mpi4py import MPI
+import mpids.MPInumpy as mpi_np
+from mpids.MPInumpy.errors import NotSupportedError, ValueError
+from mpids.MPInumpy.distributions.Replicated import Replicated
+
+
+class StatisticsDefaultTest(unittest.TestCase):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        # Default distribution
+        parms['dist'] = 'b'
+        #Observations with a large offset relative to their spread
+        parms['data'] = 1e6 + np.random.RandomState(6).rand(11, 4)
+        return parms
+
+
+    def setUp(self):
+        parms = self.create_setUp_parms()
+        self.comm = parms.get('comm')
+        self.dist = parms.get('dist')
+        self.data = parms.get('data')
+
+        self.mpi_array = mpi_np.array(self.data, comm=self.comm, dist=self.dist)
+
+
+    def assert_replicated_result(self, np_result, mpi_result):
+        self.assertTrue(isinstance(mpi_result, Replicated))
+        self.assertEqual(np_result.shape, mpi_result.shape)
+        self.assertTrue(np.allclose(np_result, mpi_result, rtol=1e-7,
+                                    atol=1e-12))
+
+
+    def test_cov(self):
+        self.assert_replicated_result(np.cov(self.data, rowvar=False),
+                                      mpi_np.cov(self.mpi_array, rowvar=False))
+        self.assert_replicated_result(np.cov(self.data),
+                                      mpi_np.cov(self.mpi_array))
+        self.assert_replicated_result(
+            np.cov(self.data, rowvar=False, bias=True),
+            mpi_np.cov(self.mpi_array, rowvar=False, bias=True))
+        self.assert_replicated_result(
+            np.cov(self.data, rowvar=False, ddof=3),
+            mpi_np.cov(self.mpi_array, rowvar=False, ddof=3))
+        self.assert_replicated_result(np.cov(self.data, rowvar=False),
+                                      mpi_np.cov(self.data, rowvar=False))
+
+
+    def test_corrcoef(self):
+        self.assert_replicated_result(
+            np.corrcoef(self.data, rowvar=False),
+            mpi_np.corrcoef(self.mpi_array, rowvar=False))
+        self.assert_replicated_result(np.corrcoef(self.data),
+                                      mpi_np.corrcoef(self.mpi_array))
+
+
+    def test_unsupported_functionality(self):
+        with self.assertRaises(NotSupportedError):
+            mpi_np.cov(self.mpi_array, y=self.mpi_array)
+        with self.assertRaises(NotSupportedError):
+            mpi_np.corrcoef(self.mpi_array, y=self.mpi_array)
+
+
+class StatisticsBlockBlockTest(StatisticsDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Block-Block distribution
+        parms['dist'] = 'bb'
+        return parms
+
+
+class StatisticsBlockCyclicTest(StatisticsDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Block-Cyclic distribution
+        parms['dist'] = 'bc'
+        return parms
+
+
+class StatisticsReplicatedTest(StatisticsDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Replicated distribution
+        parms['dist'] = 'r'
+        return parms
+
+
+class BlockStatisticsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = MPI.COMM_WORLD
+        self.procs = self.comm.Get_size()
+
+
+    def test_one_dimensional_and_single_row_arrays(self):
+        data = np.arange(9, dtype=np.float64)**2
+        mpi_array = mpi_np.array(data, comm=self.comm)
+        self.assertEqual((), mpi_np.cov(mpi_array).shape)
+        self.assertTrue(np.allclose(np.cov(data), mpi_np.cov(mpi_array)))
+        self.assertTrue(np.allclose(np.corrcoef(data),
+                                    mpi_np.corrcoef(mpi_array)))
+
+        single_row = mpi_np.array(data.reshape(1, -1), comm=self.comm)
+        self.assertTrue(np.allclose(np.cov(data.reshape(1, -1), rowvar=False),
+                                    mpi_np.cov(single_row, rowvar=False)))
+
+
+    def test_uneven_partitions_and_integer_data(self):
+        #Fewer observations than processes
+        data = np.arange(6).reshape(2, 3) ** 2
+        mpi_array = mpi_np.array(data, comm=self.comm)
+        self.assertTrue(np.allclose(np.cov(data, rowvar=False),
+                                    mpi_np.cov(mpi_array, rowvar=False)))
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            np_result = np.cov(data, rowvar=False, ddof=2)
+        with self.assertWarns(RuntimeWarning):
+            mpi_result = mpi_np.cov(mpi_array, rowvar=False, ddof=2)
+        self.assertTrue(np.array_equal(np_result, np.asarray(mpi_result),
+                                       equal_nan=True))
+
+        weights = [1] * (self.procs - 1) + [5]
+        data = np.random.RandomState(7).rand(20, 3)
+        mpi_array = mpi_np.array(data, comm=self.comm, weights=weights)
+        self.assertTrue(np.allclose(np.corrcoef(data, rowvar=False),
+                                    mpi_np.corrcoef(mpi_array, rowvar=False)))
+
+
+    def test_invalid_arrays(self):
+        with self.assertRaises(ValueError):
+            mpi_np.cov(mpi_np.zeros((4, 3, 2), comm=self.comm))
+        with self.assertRaises(NotSupportedError):
+            mpi_np.cov(mpi_np.zeros((4, 3), dtype=np.complex128,
+                                    comm=self.comm))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import itertools
+import unittest
+import numpy as np
+from mpi4py import MPI
+import mpids.MPInumpy as mpi_np
+from mpids.MPInumpy.errors import ValueError
+from mpids.MPInumpy.layout import get_layout
+
+
+class TransposeDefaultTest(unittest.TestCase):
+
+    def create_setUp_parms(self):
+        parms = {}
+        parms['comm'] = MPI.COMM_WORLD
+        # Default distribution
+        parms['dist'] = 'b'
+        parms['data'] = np.arange(60, dtype=np.float64).reshape(5,4,3)
+        return parms
+
+
+    def setUp(self):
+        parms = self.create_setUp_parms()
+        self.comm = parms.get('comm')
+        self.dist = parms.get('dist')
+        self.data = parms.get('data')
+
+        self.mpi_array = mpi_np.array(self.data, comm=self.comm, dist=self.dist)
+
+
+    def assert_transposed(self, np_result, mpi_result):
+        self.assertTrue(isinstance(mpi_result, type(self.mpi_array)))
+        self.assertEqual(np_result.shape, mpi_result.globalshape)
+        self.assertEqual(mpi_result.layout.local_shape, mpi_result.shape)
+        self.assertTrue(np.alltrue(np_result == mpi_result.collect_data()))
+
+
+    def test_transpose_all_permutations(self):
+        for axes in itertools.permutations(range(self.data.ndim)):
+            self.assert_transposed(np.transpose(self.data, axes),
+                                   mpi_np.transpose(self.mpi_array, axes))
+        self.assert_transposed(self.data.T, mpi_np.transpose(self.mpi_array))
+
+
+    def test_numpy_functions_and_methods(self):
+        self.assert_transposed(self.data.T, self.mpi_array.T)
+        self.assert_transposed(self.data.T, self.mpi_array.transpose())
+        self.assert_transposed(self.data.transpose(1, 0, 2),
+                               self.mpi_array.transpose(1, 0, 2))
+        self.assert_transposed(self.data.transpose((2, 0, 1)),
+                               self.mpi_array.transpose((2, 0, 1)))
+        self.assert_transposed(np.transpose(self.data, (-1, 0, 1)),
+                               np.transpose(self.mpi_array, (-1, 0, 1)))
+        self.assert_transposed(np.swapaxes(self.data, 0, 2),
+                               np.swapaxes(self.mpi_array, 0, 2))
+        self.assert_transposed(self.data.swapaxes(-1, 1),
+                               self.mpi_array.swapaxes(-1, 1))
+
+
+    def test_transposed_array_operations(self):
+        transposed = self.mpi_array.T
+        self.assertTrue(np.alltrue(self.data.T.sum(axis=0) ==
+                                   transposed.sum(axis=0)))
+        self.assert_transposed(self.data.T * 2, transposed * 2)
+        self.assert_transposed(self.data, transposed.T)
+
+
+    def test_invalid_axes(self):
+        with self.assertRaises(ValueError):
+            mpi_np.transpose(self.mpi_array, (0, 1))
+        with self.assertRaises(ValueError):
+            mpi_np.transpose(self.mpi_array, (0, 1, 1))
+        with self.assertRaises(ValueError):
+            mpi_np.swapaxes(self.mpi_array, 0, self.data.ndim)
+
+
+class TransposeBlockBlockTest(TransposeDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Block-Block distribution
+        parms['dist'] = 'bb'
+        return parms
+
+
+class TransposeBlockCyclicTest(TransposeDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Block-Cyclic distribution
+        parms['dist'] = 'bc'
+        return parms
+
+
+class TransposeReplicatedTest(TransposeDefaultTest):
+
+    def create_setUp_parms(self):
+        parms = super().create_setUp_parms()
+        # Replicated distribution
+        parms['dist'] = 'r'
+        return parms
+
+
+class BlockTransposeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.comm = MPI.COMM_WORLD
+        self.procs = self.comm.Get_size()
+        self.data = np.arange(60, dtype=np.float64).reshape(5,4,3)
+        self.mpi_array = mpi_np.array(self.data, comm=self.comm)
+
+
+    def test_result_partitioned_along_new_axis_0(self):
+        for axes in [(1, 0, 2), (2, 1, 0), (0, 2, 1)]:
+            result = self.mpi_array.transpose(axes)
+            self.assertEqual(get_layout(result.globalshape, 'b',
+                                        comm=self.comm),
+                             result.layout)
+            self.assertTrue(np.alltrue(
+                np.transpose(self.data, axes)[result.layout.rank_index()] ==
+                result))
+
+
+    def test_uneven_and_weighted_partitions(self):
+        weights = [1] * (self.procs - 1) + [5]
+        weighted_array = mpi_np.array(self.data, comm=self.comm,
+                                      weights=weights)
+        result = weighted_array.T
+        self.assertEqual(weighted_array.layout.weights, result.layout.weights)
+        self.assertTrue(np.alltrue(self.data.T == result.collect_data()))
+
+        #Rows selected from the first ranks only
+        selected = self.mpi_array[self.mpi_array[:, 0, 0] < 20]
+        self.assertTrue(np.alltrue(self.data[self.data[:, 0, 0] < 20].T ==
+                                   selected.T.collect_data()))
+
+
+    def test_non_contiguous_and_empty_arrays(self):
+        view = self.mpi_array.get_view((slice(None), slice(1, 3)))
+        self.assertTrue(np.alltrue(self.data[:, 1:3].T ==
+                                   view.T.collect_data()))
+
+        empty_array = mpi_np.zeros((0, 3), comm=self.comm)
+        self.assertEqual((3, 0), empty_array.T.globalshape)
+        small_array = mpi_np.array(self.data[:2, :, 0], comm=self.comm)
+        self.assertTrue(np.alltrue(self.data[:2, :, 0].T ==
+                                   small_array.T.collect_data()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -28,6 +28,16 @@ class UtilsDistributionIndependentTest(unittest.TestCase):
         self.assertTrue(is_block_distributed(block))
         self.assertFalse(is_block_distributed(undist))
 
+        block_block = 'bb'
+        self.assertTrue(is_block_block_distributed(block_block))
+        self.assertFalse(is_block_block_distributed(block))
+        self.assertFalse(is_block_block_distributed(undist))
+
+        block_cyclic = 'bc'
+        self.assertTrue(is_block_cyclic_distributed(block_cyclic))
+        self.assertFalse(is_block_cyclic_distributed(block))
+        self.assertFalse(is_block_distributed(block_cyclic))
+
 
     def test_get_block_index(self):
         data_length = 10
@@ -54,6 +64,175 @@ class UtilsDistributionIndependentTest(unittest.TestCase):
             distribution_to_dimensions(('r','r'), procs)
 
 
+    def test_distribution_to_dimensions_block_block(self):
+        self.assertEqual(2, distribution_to_dimensions('bb', 4))
+
+
+    def test_distribution_to_dimensions_block_cyclic(self):
+        self.assertEqual(1, distribution_to_dimensions('bc', 4))
+
+
+    def test_get_block_cyclic_indices(self):
+        data_length = 11
+        num_procs = 3
+        block_size = 2
+        #Blocks: [0,1] [2,3] [4,5] [6,7] [8,9] [10]
+        rank_indices_map = {0: [0, 1, 6, 7],
+                            1: [2, 3, 8, 9],
+                            2: [4, 5, 10]}
+        counts = get_block_cyclic_counts(data_length, num_procs, block_size)
+        self.assertEqual([4, 4, 3], counts.tolist())
+        for axis_coord, expected_indices in rank_indices_map.items():
+            global_indices = get_block_cyclic_indices(data_length,
+                                                      num_procs,
+                                                      axis_coord,
+                                                      block_size)
+            self.assertEqual(expected_indices, global_indices.tolist())
+
+            axis_coords, local_indices = \
+                get_block_cyclic_index(global_indices, num_procs, block_size)
+            self.assertTrue(np.all(axis_coords == axis_coord))
+            self.assertEqual(list(range(len(expected_indices))),
+                             local_indices.tolist())
+
+
+    def test_global_to_local_key_block_cyclic(self):
+        globalshape = (11, 5)
+        #Coordinate 1 of 3 with block size 2 holds global rows [2, 3, 8, 9]
+        block_cyclic_parms = {'block_size': 2,
+                              'comm_dims': [3],
+                              'comm_coord': [1]}
+
+        self.assertEqual(3, global_to_local_key(9, globalshape, None,
+                                                **block_cyclic_parms))
+        self.assertEqual(2, global_to_local_key(-3, globalshape, None,
+                                                **block_cyclic_parms))
+        self.assertEqual(slice(0, 0),
+                         global_to_local_key(4, globalshape, None,
+                                             **block_cyclic_parms))
+        self.assertEqual([0, 1, 2, 3],
+                         global_to_local_key(slice(None), globalshape, None,
+                                             **block_cyclic_parms).tolist())
+        self.assertEqual([3, 1],
+                         global_to_local_key(slice(9, None, -6),
+                                             globalshape, None,
+                                             **block_cyclic_parms).tolist())
+
+        local_key = global_to_local_key((slice(3, 9), -1), globalshape, None,
+                                        **block_cyclic_parms)
+        self.assertEqual([1, 2], local_key[0].tolist())
+        self.assertEqual(4, local_key[1])
+
+        with self.assertRaises(IndexError):
+            global_to_local_key(11, globalshape, None, **block_cyclic_parms)
+        with self.assertRaises(IndexError):
+            global_to_local_key((0, 0, 0), globalshape, None,
+                                **block_cyclic_parms)
+        with self.assertRaises(NotSupportedError):
+            global_to_local_key([0, 1], globalshape, None,
+                                **block_cyclic_parms)
+
+
+    def test_get_reduction_identity(self):
+        self.assertEqual(0, get_reduction_identity(MPI.SUM, np.int32))
+        self.assertEqual(1, get_reduction_identity(MPI.PROD, np.float64))
+        self.assertEqual(np.iinfo(np.int16).min,
+                         get_reduction_identity(MPI.MAX, np.int16))
+        self.assertEqual(np.iinfo(np.uint8).max,
+                         get_reduction_identity(MPI.MIN, np.uint8))
+        self.assertEqual(-np.inf, get_reduction_identity(MPI.MAX, np.float64))
+        self.assertEqual(np.inf, get_reduction_identity(MPI.MIN, np.float32))
+        self.assertFalse(get_reduction_identity(MPI.MAX, np.bool_))
+        self.assertTrue(get_reduction_identity(MPI.MIN, np.bool_))
+
+
+    def test_determine_local_moments(self):
+        data = np.arange(60, dtype=np.int64).reshape(3, 4, 5)**2
+        for axis in [None, 0, 1, 2, -1, -3]:
+            local_moments = determine_local_moments(data, axis=axis)
+            count = data.size if axis is None else data.shape[axis]
+            self.assertTrue(np.alltrue(count == local_moments[..., 0]))
+            self.assertTrue(np.allclose(data.mean(axis=axis),
+                                        local_moments[..., 1]))
+            self.assertTrue(np.allclose(data.var(axis=axis) * count,
+                                        local_moments[..., 2]))
+
+        #Chunked pass over data matches single pass
+        with mock.patch('mpids.MPInumpy.utils.MOMENTS_CHUNK_SIZE', 7):
+            chunked_moments = determine_local_moments(data, axis=1)
+        self.assertTrue(np.allclose(determine_local_moments(data, axis=1),
+                                    chunked_moments))
+
+        #Empty data has count of zero
+        empty_moments = determine_local_moments(np.empty((0, 3)), axis=0)
+        self.assertEqual((3, 3), empty_moments.shape)
+        self.assertTrue(np.alltrue(0 == empty_moments))
+
+
+    def test_determine_local_comoments(self):
+        data = np.arange(30, dtype=np.int64).reshape(10, 3)**2
+        local_comoments = determine_local_comoments(data)
+        self.assertEqual((13,), local_comoments.shape)
+        self.assertEqual(10, local_comoments[0])
+        self.assertTrue(np.allclose(data.mean(axis=0), local_comoments[1:4]))
+        self.assertTrue(np.allclose(np.cov(data, rowvar=False, bias=True) * 10,
+                                    local_comoments[4:].reshape(3, 3)))
+
+        #Chunked pass over data matches single pass
+        with mock.patch('mpids.MPInumpy.utils.MOMENTS_CHUNK_SIZE', 7):
+            chunked_comoments = determine_local_comoments(data)
+        self.assertTrue(np.allclose(local_comoments, chunked_comoments))
+
+        #Empty data has count of zero
+        empty_comoments = determine_local_comoments(np.empty((0, 3)))
+        self.assertEqual((13,), empty_comoments.shape)
+        self.assertTrue(np.alltrue(0 == empty_comoments))
+
+
+    def test_determine_global_selection(self):
+        globalshape = (5, 4)
+        key = self.index_key_generator[1:, -1]
+        global_indices, int_axes = determine_global_selection(key, globalshape)
+        self.assertEqual([1], int_axes)
+        self.assertTrue(np.array_equal([1, 2, 3, 4], global_indices[0]))
+        self.assertTrue(np.array_equal([3], global_indices[1]))
+
+        key = self.index_key_generator[::-2]
+        global_indices, int_axes = determine_global_selection(key, globalshape)
+        self.assertEqual([], int_axes)
+        self.assertTrue(np.array_equal([4, 2, 0], global_indices[0]))
+        self.assertTrue(np.array_equal([0, 1, 2, 3], global_indices[1]))
+
+        #Integer keys of numpy types select as int keys
+        global_indices, int_axes = \
+            determine_global_selection((np.int64(-1), np.array([2])[0]),
+                                       globalshape)
+        self.assertEqual([0, 1], int_axes)
+        self.assertTrue(np.array_equal([[4], [2]], global_indices))
+
+        with self.assertRaises(IndexError):
+            determine_global_selection((0, 0, 0), globalshape)
+        with self.assertRaises(IndexError):
+            determine_global_selection(5, globalshape)
+        with self.assertRaises(NotSupportedError):
+            determine_global_selection([0, 1], globalshape)
+
+
+    def test_determine_local_shape_and_mapping_block_block(self):
+        globalshape = (5, 4, 3)
+        comm_dims = [2, 2]
+        expected = {(0, 0): ((3, 2, 3), {0: (0, 3), 1: (0, 2), 2: (0, 3)}),
+                    (0, 1): ((3, 2, 3), {0: (0, 3), 1: (2, 4), 2: (0, 3)}),
+                    (1, 0): ((2, 2, 3), {0: (3, 5), 1: (0, 2), 2: (0, 3)}),
+                    (1, 1): ((2, 2, 3), {0: (3, 5), 1: (2, 4), 2: (0, 3)})}
+        for comm_coord, (local_shape, local_to_global) in expected.items():
+            self.assertEqual((local_shape, local_to_global),
+                             determine_local_shape_and_mapping(globalshape,
+                                                               'bb',
+                                                               comm_dims,
+                                                               list(comm_coord)))
+
+
     def test_global_to_local_key_int(self):
         globalshape = (5, 5)
         local_to_global = {0 : (1, 4), 1 : (1, 4)}
@@ -487,6 +666,75 @@ class UtilsDistributionIndependentTest(unittest.TestCase):
             self.assertTrue(np.alltrue(np.array([0,0,6,0]) == recv_counts))
 
 
+    def test_get_block_indices_matches_get_block_index(self):
+        for data_length in [0, 3, 10, 17]:
+            for num_procs in [1, 3, 4]:
+                block_indices = get_block_indices(data_length, num_procs)
+                self.assertEqual((num_procs, 2), block_indices.shape)
+                for coord in range(num_procs):
+                    self.assertEqual(
+                        get_block_index(data_length, num_procs, coord),
+                        tuple(block_indices[coord]))
+
+
+    def test_get_weighted_block_indices(self):
+        #Equal weights match even partitions
+        for data_length in [0, 3, 10, 17]:
+            self.assertTrue(np.array_equal(
+                get_block_indices(data_length, 4),
+                get_weighted_block_indices(data_length, [1, 1, 1, 1])))
+        block_indices = get_weighted_block_indices(12, [1, 1, 2, 0, 2])
+        self.assertTrue(np.array_equal([[0, 2], [2, 4], [4, 8], [8, 8],
+                                        [8, 12]], block_indices))
+        #Blocks cover all entries
+        block_indices = get_weighted_block_indices(7, [0.3, 1.7, 1.1])
+        self.assertEqual(0, block_indices[0, 0])
+        self.assertEqual(7, block_indices[-1, 1])
+        self.assertTrue(np.array_equal(block_indices[1:, 0],
+                                       block_indices[:-1, 1]))
+
+
+    def test_determine_redistribution_plan(self):
+        rank = MPI.COMM_WORLD.rank
+        #Emulate a 4x3 matrix row distributed on a 4 process comm.
+        ##reshaping to a 3x4
+        plan = determine_redistribution_plan((4,3), (3,4))
+        self.assertTrue(isinstance(plan, RedistributionPlan))
+        #Plans are reused between calls
+        self.assertTrue(plan is determine_redistribution_plan((4,3), (3,4)))
+        if rank == 0:
+            self.assertTrue(np.alltrue(np.array([3,0,0,0]) == plan.send_counts))
+            self.assertTrue(np.alltrue(np.array([0,0,0,0]) == plan.send_displacements))
+            self.assertTrue(np.alltrue(np.array([3,1,0,0]) == plan.recv_counts))
+            self.assertTrue(np.alltrue(np.array([0,3,0,0]) == plan.recv_displacements))
+        elif rank == 1:
+            self.assertTrue(np.alltrue(np.array([1,2,0,0]) == plan.send_counts))
+            self.assertTrue(np.alltrue(np.array([0,1,0,0]) == plan.send_displacements))
+            self.assertTrue(np.alltrue(np.array([0,2,2,0]) == plan.recv_counts))
+            self.assertTrue(np.alltrue(np.array([0,0,2,0]) == plan.recv_displacements))
+        elif rank == 2:
+            self.assertTrue(np.alltrue(np.array([0,2,1,0]) == plan.send_counts))
+            self.assertTrue(np.alltrue(np.array([0,0,2,0]) == plan.send_displacements))
+            self.assertTrue(np.alltrue(np.array([0,0,1,3]) == plan.recv_counts))
+            self.assertTrue(np.alltrue(np.array([0,0,0,1]) == plan.recv_displacements))
+        else:
+            self.assertTrue(np.alltrue(np.array([0,0,3,0]) == plan.send_counts))
+            self.assertTrue(np.alltrue(np.array([0,0,0,0]) == plan.recv_counts))
+
+        #Custom partitions, move all of a 4 element vector to last rank
+        current_partitions = np.array([[0,1], [1,2], [2,3], [3,4]])
+        desired_partitions = np.array([[0,0], [0,0], [0,0], [0,4]])
+        plan = determine_redistribution_plan((4,), (4,),
+                                             current_partitions=current_partitions,
+                                             desired_partitions=desired_partitions)
+        self.assertTrue(np.alltrue(np.array([0,0,0,1]) == plan.send_counts))
+        if rank == 3:
+            self.assertTrue(np.alltrue(np.array([1,1,1,1]) == plan.recv_counts))
+            self.assertTrue(np.alltrue(np.array([0,1,2,3]) == plan.recv_displacements))
+        else:
+            self.assertTrue(np.alltrue(np.array([0,0,0,0]) == plan.recv_counts))
+
+
 class UtilsDefaultTest(unittest.TestCase):
 
     def create_setUp_parms(self):